@@ -6,6 +6,11 @@
 WORKFLOW_TYPE=$1
 INITIAL_REQUEST=$2
 
+# Spans for checkpoints, gates and steps when AGENT_TRACE names a trace file
+. "$(dirname "$0")/lib/trace.sh"
+
+cd "$(dirname "$0")/.." || exit 1
+
 # Colors for output
 GREEN='\033[0;32m'
 RED='\033[0;31m'
@@ -18,71 +23,136 @@ QUALITY_GATE_PASSED=true
 ISSUES_FOUND=""
 ADDITIONAL_STEPS=""
 
+# Gates queued while a batch is open, as --gate NAME COMMAND INPUTS arguments
+GATE_BATCH=false
+GATE_QUEUE=()
+
 function quality_gate() {
     local gate_name=$1
     local check_command=$2
+    local inputs=${3:-}  # files/dirs the check reads; default: the whole tree
+    
+    # Inside a batch, gates only queue up; run_quality_gates runs them together
+    if [ "$GATE_BATCH" = true ]; then
+        GATE_QUEUE+=(--gate "$gate_name" "$check_command" "$inputs")
+        echo "🕒 Queued Quality Gate: $gate_name"
+        return 0
+    fi
     
     echo -e "\n${BLUE}🔍 Quality Gate: $gate_name${NC}"
     echo "Running: $check_command"
     
-    # Actually run the quality check command (safely)
-    if bash -c "$check_command"; then
+    # Run the check through the gate cache: an unchanged command and inputs
+    # return the previous verdict instantly (GATE_CACHE=0 disables it,
+    # `python3 -m src.services.gate_cache invalidate` clears it)
+    if python3 -m src.services.gate_cache run "$gate_name" "$check_command" --inputs $inputs; then
         echo -e "${GREEN}✅ $gate_name passed${NC}"
         return 0
     else
-        echo -e "${RED}❌ $gate_name failed${NC}"
-        QUALITY_GATE_PASSED=false
-        
-        # Determine which agent should handle the failure
-        case $gate_name in
-            *"Coverage"*)
-                echo "Assigning to: Tester agent for coverage improvement"
-                add_remediation_steps "testing" "Increase test coverage to meet threshold"
-                ;;
-            *"Security"*)
-                echo "Assigning to: Security reviewer for audit"
-                add_remediation_steps "security" "Security vulnerabilities detected"
-                ;;
-            *"Design"*)
-                echo "Assigning to: Architect for design revision"
-                add_remediation_steps "architecture" "Design patterns need improvement"
+        gate_failed "$gate_name"
+        return 1
+    fi
+}
+
+function gate_failed() {
+    local gate_name=$1
+    
+    echo -e "${RED}❌ $gate_name failed${NC}"
+    QUALITY_GATE_PASSED=false
+    
+    # Determine which agent should handle the failure
+    case $gate_name in
+        *"Coverage"*)
+            echo "Assigning to: Tester agent for coverage improvement"
+            add_remediation_steps "testing" "Increase test coverage to meet threshold" "$gate_name"
+            ;;
+        *"Security"*)
+            echo "Assigning to: Security reviewer for audit"
+            add_remediation_steps "security" "Security vulnerabilities detected" "$gate_name"
+            ;;
+        *"Design"*)
+            echo "Assigning to: Architect for design revision"
+            add_remediation_steps "architecture" "Design patterns need improvement" "$gate_name"
+            ;;
+        *"Performance"*)
+            echo "Assigning to: Developer for optimization"
+            add_remediation_steps "performance" "Performance benchmarks not met" "$gate_name"
+            ;;
+        *)
+            echo "Assigning to: Appropriate agent based on failure"
+            add_remediation_steps "custom" "$gate_name needs attention" "$gate_name"
+            ;;
+    esac
+}
+
+function begin_quality_gates() {
+    GATE_BATCH=true
+    GATE_QUEUE=()
+}
+
+function run_quality_gates() {
+    # Run every queued gate at once; results stream in as each one finishes
+    # and failures are routed immediately. Returns 1 if any gate failed.
+    GATE_BATCH=false
+    local failed=0
+    local line t0
+    
+    trace_start t0
+    echo ""
+    while IFS= read -r line; do
+        case "$line" in
+            "::gate-passed:: "*)
+                echo -e "${GREEN}✅ ${line#* } passed${NC}"
                 ;;
-            *"Performance"*)
-                echo "Assigning to: Developer for optimization"
-                add_remediation_steps "performance" "Performance benchmarks not met"
+            "::gate-failed:: "*)
+                failed=$((failed + 1))
+                gate_failed "${line#* }"
                 ;;
             *)
-                echo "Assigning to: Appropriate agent based on failure"
-                add_remediation_steps "custom" "$gate_name needs attention"
+                echo "$line"
                 ;;
         esac
-        return 1
-    fi
+    done < <(python3 -m src.services.gate_runner --markers "${GATE_QUEUE[@]}")
+    trace_end "$t0" "quality gates" gate "gates=$((${#GATE_QUEUE[@]} / 4))" "failed=$failed"
+    GATE_QUEUE=()
+    
+    [ $failed -eq 0 ]
 }
 
 function review_checkpoint() {
     local phase=$1
     local work_description=$2
+    local t0
     
+    trace_start t0
     echo -e "\n${YELLOW}📋 Review Checkpoint: $phase${NC}"
     echo "Work completed: $work_description"
     
     # Spawn reviewer to check the work
     echo "Spawning Reviewer agent for $phase review..."
     
-    # In real use, this would actually spawn the reviewer
-    # For now, we'll simulate the review process
-    echo "[Reviewer would analyze: $work_description]"
-    
-    # Simulate review results
-    local review_result=$(shuf -i 1-10 -n 1)
+    local review_status
+    if [ -n "$REVIEW_CMD" ]; then
+        # Incremental review: only files changed since this phase was last
+        # approved are sent, and unchanged deltas reuse their earlier verdict
+        python3 -m src.services.review checkpoint "$phase" \
+            --description "$work_description" --inputs ${REVIEW_INPUTS:-.}
+        review_status=$?
+    else
+        # Without a reviewer command, simulate the review process
+        echo "[Reviewer would analyze: $work_description]"
+        [ "$(shuf -i 1-10 -n 1)" -gt 3 ]
+        review_status=$?
+    fi
     
-    if [ $review_result -gt 3 ]; then
+    if [ $review_status -eq 0 ]; then
         echo -e "${GREEN}✅ Review passed${NC}"
+        trace_end "$t0" "review $phase" review result=passed
         return 0
     else
         echo -e "${RED}❌ Review found issues${NC}"
         ISSUES_FOUND="$ISSUES_FOUND\n- Issues in $phase: needs rework"
+        trace_end "$t0" "review $phase" review result=issues
         return 1
     fi
 }
@@ -90,59 +160,20 @@ function review_checkpoint() {
 function add_remediation_steps() {
     local issue_type=$1
     local review_feedback=$2
+    local target=${3:-$issue_type}  # gate or phase the issue was found in
     
     echo -e "${YELLOW}🔧 Adding remediation steps for: $issue_type${NC}"
     echo "Review feedback: $review_feedback"
     
-    # Any agent can suggest remediation based on the issue
-    case $issue_type in
-        "architecture")
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Architect: Revise design based on review feedback"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Tester: Create test cases for revised design"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Product: Validate design meets requirements"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Reviewer: Re-review architecture"
-            ;;
-        "implementation")
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Developer: Fix implementation issues"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Tester: Add regression tests"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Architect: Verify implementation follows design"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Reviewer: Code review fixes"
-            ;;
-        "testing")
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Tester: Expand test coverage"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Developer: Fix failing tests"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- MLOps: Add performance benchmarks (if applicable)"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Reviewer: Validate test completeness"
-            ;;
-        "security")
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Reviewer: Conduct security audit"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Developer: Implement security fixes"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- DevOps: Update security configurations"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Tester: Security regression tests"
-            ;;
-        "performance")
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Developer: Optimize code"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Tester: Performance benchmarks"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- DevOps: Scale infrastructure"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Reviewer: Validate optimizations"
-            ;;
-        "documentation")
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Documentation: Update all docs"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- UX: Improve user guides"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Customer: Validate clarity"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Reviewer: Doc review"
-            ;;
-        "user-experience")
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- UX: Redesign based on feedback"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Customer: Validate improvements"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Developer: Implement UX changes"
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- Tester: Usability testing"
-            ;;
-        "custom")
-            # Allow any agent to add custom steps based on specific feedback
-            ADDITIONAL_STEPS="$ADDITIONAL_STEPS\n- [Agent determined by issue]: $review_feedback"
-            ;;
-    esac
+    # The issue type's playbook becomes typed queue items, one per agent, with
+    # the items each one waits for; reporting the same issue for the same
+    # target again merges into the queued items instead of repeating them.
+    # Items are scoped to this run's request, so other features' leftovers
+    # neither absorb these reports nor show up in ADDITIONAL_STEPS
+    python3 -m src.services.remediation --scope "$INITIAL_REQUEST" \
+        add "$issue_type" "$target" --feedback "$review_feedback"
+    ADDITIONAL_STEPS=$(python3 -m src.services.remediation \
+        --scope "$INITIAL_REQUEST" show --plain)
 }
 
 function adaptive_feature_workflow() {
@@ -152,18 +183,21 @@ function adaptive_feature_workflow() {
     echo "This workflow adapts based on review results and quality gates"
     echo ""
     
+    # The gates are independent checks: queue them per phase, run them together
+    begin_quality_gates
+    
     # Phase 1: Architecture with immediate review
     echo -e "\n${GREEN}Phase 1: Architecture & Design Review${NC}"
     echo "▶️ Architect: Designing $feature"
     # claude -p "You are the Architect. Design: $feature" --verbose
     
     if ! review_checkpoint "Architecture" "Design for $feature"; then
-        add_remediation_steps "architecture" "Design does not meet scalability requirements"
+        add_remediation_steps "architecture" "Design does not meet scalability requirements" "Architecture"
         echo "⚠️ Architecture needs revision"
     fi
     
     # Quality Gate: Design validation
-    quality_gate "Design Validation" "test -f .claude/tasks/taskboard.md && echo 'Design documented'"
+    quality_gate "Design Validation" "test -f .claude/tasks/taskboard.md && echo 'Design documented'" ".claude/tasks/taskboard.md"
     
     # Phase 2: Test Planning (parallel with development)
     echo -e "\n${GREEN}Phase 2: Test Planning & Initial Development${NC}"
@@ -178,20 +212,24 @@ function adaptive_feature_workflow() {
     
     # Mid-implementation review
     if ! review_checkpoint "Implementation Progress" "50% of $feature implemented"; then
-        add_remediation_steps "implementation" "Code quality issues found"
+        add_remediation_steps "implementation" "Code quality issues found" "Implementation Progress"
     fi
     
-    # Quality Gate: Code coverage
-    quality_gate "Code Coverage" "python -m pytest tests/ --cov=src --cov-fail-under=90 2>/dev/null || echo 'Coverage check'"
+    # Quality Gate: Code coverage. The gates below run at the same time and
+    # also run pytest, so this is the only one that writes coverage data
+    # (.coverage, htmlcov/, coverage.xml) and the pytest cache
+    quality_gate "Code Coverage" "python -m pytest tests/ --ignore=tests/benchmarks --cov=src --cov-fail-under=90 2>/dev/null || echo 'Coverage check'" "src tests pyproject.toml"
     
     # Phase 4: Security and Performance Review
     echo -e "\n${GREEN}Phase 4: Security & Performance Review${NC}"
     echo "▶️ Reviewer: Security audit of $feature"
     echo "▶️ Tester: Performance testing"
     
-    if ! quality_gate "Security Scan" "python -m bandit -r src/ 2>/dev/null || echo 'Security scan'"; then
-        add_remediation_steps "security" "Vulnerabilities found in code"
-    fi
+    quality_gate "Security Scan" "python -m bandit -r src/ 2>/dev/null || echo 'Security scan'" "src"
+    
+    # Quality Gate: Performance benchmarks. The only gate that runs them (they
+    # write one results file); BENCH_STRICT makes a regression fail the gate
+    quality_gate "Performance" "BENCH=1 BENCH_STRICT=1 python -m pytest tests/benchmarks -q --no-cov -p no:cacheprovider 2>/dev/null" "src tests/benchmarks pyproject.toml"
     
     # Phase 5: Final Review and Documentation
     echo -e "\n${GREEN}Phase 5: Final Review & Documentation${NC}"
@@ -199,18 +237,27 @@ function adaptive_feature_workflow() {
     echo "▶️ Documentation: Update all docs"
     
     # Final quality gate with actual test execution
-    quality_gate "Final Quality Check" "python -m pytest tests/ -v 2>/dev/null || echo 'Tests executed'"
+    quality_gate "Final Quality Check" "python -m pytest tests/ --ignore=tests/benchmarks -v --no-cov -p no:cacheprovider 2>/dev/null || echo 'Tests executed'" "src tests pyproject.toml"
+    
+    # Run all queued gates concurrently; each failure adds remediation steps
+    run_quality_gates
     
     # Adaptive response to issues
-    if [ ! -z "$ISSUES_FOUND" ]; then
+    if [ -n "$ISSUES_FOUND" ] || [ -n "$ADDITIONAL_STEPS" ]; then
         echo -e "\n${YELLOW}📊 Issues Found During Workflow:${NC}"
         echo -e "$ISSUES_FOUND"
         
         echo -e "\n${YELLOW}🔧 Additional Steps Added:${NC}"
         echo -e "$ADDITIONAL_STEPS"
         
-        echo -e "\n${BLUE}Executing remediation steps...${NC}"
-        # Would execute the additional steps here
+        # The queue persists in .cache/remediation; REMEDIATION_RUN=1 runs it
+        # now, in parallel loops that each do less than the one before
+        if [ "$REMEDIATION_RUN" = "1" ]; then
+            echo -e "\n${BLUE}Executing remediation steps...${NC}"
+            python3 -m src.services.remediation --scope "$INITIAL_REQUEST" run
+        else
+            echo -e "\n${BLUE}Run them with: python3 -m src.services.remediation --scope \"$INITIAL_REQUEST\" run${NC}"
+        fi
     fi
     
     # Summary
@@ -244,8 +291,10 @@ function continuous_review_workflow() {
         "documentation:Update docs"
     )
     
+    local t0
     for step in "${steps[@]}"; do
         IFS=':' read -r agent task_desc <<< "$step"
+        trace_start t0
         
         echo -e "\n${GREEN}▶️ $agent: $task_desc${NC}"
         
@@ -263,17 +312,18 @@ function continuous_review_workflow() {
                 steps+=("reviewer:Re-review changes")
             fi
         fi
+        trace_end "$t0" "step $agent" workflow "task=$task_desc"
     done
 }
 
 # Main execution
 case "$WORKFLOW_TYPE" in
     "adaptive")
-        adaptive_feature_workflow "$INITIAL_REQUEST"
+        trace_run "adaptive workflow" workflow adaptive_feature_workflow "$INITIAL_REQUEST"
         ;;
     
     "continuous")
-        continuous_review_workflow "$INITIAL_REQUEST"
+        trace_run "continuous workflow" workflow continuous_review_workflow "$INITIAL_REQUEST"
         ;;
     
     *)
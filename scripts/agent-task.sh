@@ -3,6 +3,8 @@
 # Simple wrapper for agents to manage their tasks
 # Usage: ./agent-task.sh <action> [args]
 
+cd "$(dirname "$0")/.." || exit 1
+
 ACTION=$1
 AGENT=${AGENT:-unknown}
 TASK_ID=${TASK_ID:-$(echo $AGENT | tr '[:lower:]' '[:upper:]')-$(date +%s | tail -c 4)}
@@ -11,10 +13,10 @@ case "$ACTION" in
     "start")
         # Agent starting a task
         DESCRIPTION=${2:-"Working on assigned task"}
-        echo "📝 Creating task $TASK_ID"
-        python scripts/taskboard-helper.py add "$AGENT" "$TASK_ID" P1 "$DESCRIPTION"
-        echo "▶️  Starting task $TASK_ID"
-        python scripts/taskboard-helper.py start "$TASK_ID"
+        # One batch: a single taskboard transaction and rewrite
+        echo "📝 Creating and starting task $TASK_ID"
+        printf 'add %s %s P1 %s\nstart %s\n' "$AGENT" "$TASK_ID" "$DESCRIPTION" "$TASK_ID" \
+            | python scripts/taskboard-helper.py batch
         ;;
     
     "complete")
@@ -0,0 +1,64 @@
+#!/bin/bash
+
+# Tracing shim for the orchestration scripts
+# Source it, then time regions as spans in the Chrome trace file named by
+# $AGENT_TRACE (see src/utils/tracing.py). With AGENT_TRACE unset every
+# function returns immediately without forking.
+#
+#   . "$(dirname "$0")/lib/trace.sh"
+#   trace_start t0
+#   ...
+#   trace_end "$t0" "review Architecture" review result=passed
+#   trace_run "gate batch" gate run_quality_gates
+
+TRACE_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
+
+# Scripts cd around; every process must append to the same file
+if [ -n "$AGENT_TRACE" ]; then
+    case "$AGENT_TRACE" in
+        /*) ;;
+        *) AGENT_TRACE="$PWD/$AGENT_TRACE" ;;
+    esac
+    export AGENT_TRACE
+fi
+
+function trace_start() {
+    # Store the current time (microseconds since the epoch) in variable $1
+    [ -n "$AGENT_TRACE" ] || return 0
+    if [ -n "$EPOCHREALTIME" ]; then
+        printf -v "$1" '%s' "${EPOCHREALTIME/[.,]/}"
+    else
+        printf -v "$1" '%s' "$(python3 -c 'import time; print(time.time_ns() // 1000)')"
+    fi
+}
+
+function trace_end() {
+    # trace_end START NAME CATEGORY [key=value ...]
+    [ -n "$AGENT_TRACE" ] && [ -n "$1" ] || return 0
+    local start=$1 name=$2 cat=$3 end spec
+    shift 3
+    trace_start end
+    local args=()
+    for spec in "$@"; do
+        args+=(--arg "$spec")
+    done
+    PYTHONPATH="$TRACE_ROOT${PYTHONPATH:+:$PYTHONPATH}" python3 -m src.utils.tracing \
+        record "$name" --cat "$cat" --start "$start" --end "$end" \
+        --pid $$ --process "${0##*/}" "${args[@]}" > /dev/null 2>&1 || true
+}
+
+function trace_run() {
+    # trace_run NAME CATEGORY command [args ...] - run a command (or function)
+    # in the current shell as a span; returns the command's status
+    local name=$1 cat=$2 t0 status
+    shift 2
+    if [ -z "$AGENT_TRACE" ]; then
+        "$@"
+        return
+    fi
+    trace_start t0
+    "$@"
+    status=$?
+    trace_end "$t0" "$name" "$cat" "exit_code=$status"
+    return $status
+}
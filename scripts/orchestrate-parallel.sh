@@ -3,8 +3,12 @@
 # Parallel Orchestration Script with iTerm2 and headless support
 # Allows agents to run truly in parallel
 
-# Find claude command
-if command -v claude &> /dev/null; then
+cd "$(dirname "$0")/.." || exit 1
+
+# Find claude command (an explicit CLAUDE_CMD, e.g. tests/stubs/fake_agent.py, wins)
+if [ -n "$CLAUDE_CMD" ]; then
+    :
+elif command -v claude &> /dev/null; then
     CLAUDE_CMD="claude"
 elif [ -x "${HOME}/.claude/local/claude" ]; then
     CLAUDE_CMD="${HOME}/.claude/local/claude"
@@ -12,13 +16,45 @@ else
     echo "Error: Claude CLI not found."
     exit 1
 fi
+export CLAUDE_CMD  # used by the agent supervisor
+
+# headless or iterm; supervisor commands (monitor, status, ...) need no mode
+case "$1" in
+    "headless"|"iterm")
+        MODE=$1
+        shift
+        ;;
+    *)
+        MODE=headless
+        ;;
+esac
+
+function start_taskboard_server() {
+    # One resident taskboard process serves every agent's taskboard-helper.py
+    # call instead of each call re-opening the board
+    python3 -m src.services.taskboard_server start > /dev/null 2>&1 || true
+}
+
+function start_supervisor() {
+    # Headless agents run as children of one resident supervisor, which
+    # tracks each task's PID, exit code and log and can cancel or restart it.
+    # It also paces launches (AGENT_SPAWN_RATE, AGENT_SPAWN_BURST,
+    # AGENT_MAX_IN_FLIGHT, AGENT_MAX_LOAD, AGENT_MIN_FREE_MB), so spawns are
+    # queued instead of sleeping between them
+    python3 -m src.services.supervisor start > /dev/null 2>&1 || true
+}
 
-MODE=${1:-headless}  # headless or iterm
-shift
+function make_task_id() {
+    # An optional sequence number keeps IDs unique when several tasks for the
+    # same agent are spawned within the same second
+    echo "$(echo $1 | tr '[:lower:]' '[:upper:]')-$(date +%s | tail -c 4)${2:+-$2}"
+}
 
 function spawn_headless() {
     local agent=$1
     local task=$2
+    local registered_id=$3  # set when the task is already on the taskboard
+    local seq=$4  # position in a custom fan-out
     # Create secure temporary log file
     local logfile=$(mktemp -t "claude-${agent}-XXXXXX.log")
     chmod 600 "$logfile"
@@ -28,33 +64,42 @@ function spawn_headless() {
     # Capitalize agent name
     local agent_name=$(echo "$agent" | sed 's/^./\U&/')
     
-    # Create a unique task ID
-    local task_id="$(echo $agent | tr '[:lower:]' '[:upper:]')-$(date +%s | tail -c 4)"
+    # Use the registered task ID or create a unique one
+    local task_id=${registered_id:-$(make_task_id "$agent" "$seq")}
+    local steps="1. Start work: python scripts/taskboard-helper.py start $task_id
+2. When done: python scripts/taskboard-helper.py complete $task_id"
+    if [ -z "$registered_id" ]; then
+        steps="1. Add your task: python scripts/taskboard-helper.py add $agent $task_id P1 '$task'
+2. Start work: python scripts/taskboard-helper.py start $task_id
+3. When done: python scripts/taskboard-helper.py complete $task_id"
+    fi
     
-    # Run in background with output to logfile
-    nohup $CLAUDE_CMD -p "You are the $agent_name Agent. First run /${agent} to load your role. 
+    # Run in background under the supervisor with output to logfile
+    python3 -m src.services.supervisor spawn "$agent" "$task_id" "You are the $agent_name Agent. First run /${agent} to load your role. 
 
 IMPORTANT: Update the taskboard using these commands:
-1. Add your task: python scripts/taskboard-helper.py add $agent $task_id P1 '$task'
-2. Start work: python scripts/taskboard-helper.py start $task_id
-3. When done: python scripts/taskboard-helper.py complete $task_id
+$steps
 
-Now complete: $task" --verbose > "$logfile" 2>&1 &
-    
-    echo "   PID: $! - Agent running in background"
+Now complete: $task" --log "$logfile"
 }
 
 function spawn_iterm() {
     local agent=$1
     local task=$2
+    local registered_id=$3  # set when the task is already on the taskboard
+    local seq=$4  # position in a custom fan-out
     
     echo "🖥️  Spawning $agent agent in new iTerm2 window"
     
     # Capitalize agent name
     local agent_name=$(echo "$agent" | sed 's/^./\U&/')
     
-    # Create a unique task ID
-    local task_id="$(echo $agent | tr '[:lower:]' '[:upper:]')-$(date +%s | tail -c 4)"
+    # Use the registered task ID or create a unique one
+    local task_id=${registered_id:-$(make_task_id "$agent" "$seq")}
+    local steps="1. Start work: python scripts/taskboard-helper.py start $task_id 2. When done: python scripts/taskboard-helper.py complete $task_id."
+    if [ -z "$registered_id" ]; then
+        steps="1. Add your task: python scripts/taskboard-helper.py add $agent $task_id P1 \\\"$task\\\" 2. Start work: python scripts/taskboard-helper.py start $task_id 3. When done: python scripts/taskboard-helper.py complete $task_id."
+    fi
     
     # Create AppleScript to open new iTerm window
     osascript <<EOF
@@ -64,56 +109,75 @@ tell application "iTerm2"
         write text "cd $(pwd)"
         write text "echo '🤖 $agent_name Agent Started'"
         write text "echo 'Task ID: $task_id'"
-        write text "$CLAUDE_CMD -p 'You are the $agent_name Agent. First run /${agent} to load your role. IMPORTANT: Update the taskboard using these commands: 1. Add your task: python scripts/taskboard-helper.py add $agent $task_id P1 \"$task\" 2. Start work: python scripts/taskboard-helper.py start $task_id 3. When done: python scripts/taskboard-helper.py complete $task_id. Now complete: $task' --verbose"
+        write text "$CLAUDE_CMD -p 'You are the $agent_name Agent. First run /${agent} to load your role. IMPORTANT: Update the taskboard using these commands: $steps Now complete: $task' --verbose"
     end tell
 end tell
 EOF
 }
 
+function audit_task() {
+    case $1 in
+        "architect")
+            echo "Review repository architecture, .claude directory structure, and design patterns"
+            ;;
+        "reviewer")
+            echo "Audit code quality, security, and compliance with project rules"
+            ;;
+        "tester")
+            echo "Validate test coverage, test quality, and testing best practices"
+            ;;
+        "documentation")
+            echo "Verify documentation completeness and accuracy"
+            ;;
+        "devops")
+            echo "Check CI/CD configuration and deployment readiness"
+            ;;
+    esac
+}
+
 function parallel_audit() {
     echo "🔍 Starting Parallel Repository Audit"
     echo "Mode: $MODE"
     echo ""
     
+    if [ "$MODE" = "headless" ]; then
+        start_taskboard_server
+        start_supervisor
+    fi
+    
     # Define audit tasks (bash 3 compatible)
     agents=("architect" "reviewer" "tester" "documentation" "devops")
     
-    # Spawn all agents
+    # Register every audit task in one taskboard batch (a single rewrite)
+    task_ids=()
     for agent in "${agents[@]}"; do
-        case $agent in
-            "architect")
-                task="Review repository architecture, .claude directory structure, and design patterns"
-                ;;
-            "reviewer")
-                task="Audit code quality, security, and compliance with project rules"
-                ;;
-            "tester")
-                task="Validate test coverage, test quality, and testing best practices"
-                ;;
-            "documentation")
-                task="Verify documentation completeness and accuracy"
-                ;;
-            "devops")
-                task="Check CI/CD configuration and deployment readiness"
-                ;;
-        esac
+        task_ids+=("$(make_task_id "$agent")")
+    done
+    for i in "${!agents[@]}"; do
+        echo "add ${agents[$i]} ${task_ids[$i]} P1 $(audit_task "${agents[$i]}")"
+    done | python scripts/taskboard-helper.py batch
+    echo ""
+    
+    # Spawn all agents
+    for i in "${!agents[@]}"; do
+        agent=${agents[$i]}
+        task=$(audit_task "$agent")
         
         if [ "$MODE" = "iterm" ]; then
-            spawn_iterm "$agent" "$task"
+            spawn_iterm "$agent" "$task" "${task_ids[$i]}"
         else
-            spawn_headless "$agent" "$task"
+            spawn_headless "$agent" "$task" "${task_ids[$i]}"
         fi
-        
-        sleep 1  # Small delay between spawns
     done
     
     if [ "$MODE" = "headless" ]; then
         echo ""
         echo "📊 All agents spawned in background"
-        echo "Monitor logs with: tail -f /tmp/claude-*.log"
+        echo "Follow all agent output with: $0 logs"
+        echo "Follow agent start/exit events with: $0 events"
         echo ""
-        echo "Active agent processes:"
-        ps aux | grep "[c]laude -p" | awk '{print $2, $11, $12, $13, $14}'
+        echo "Active agents:"
+        python3 -m src.services.supervisor list
     else
         echo ""
         echo "✅ All agents spawned in separate iTerm2 windows"
@@ -128,17 +192,25 @@ function custom_parallel() {
     
     IFS=',' read -ra TASK_LIST <<< "$tasks"
     
-    for task in "${TASK_LIST[@]}"; do
-        IFS=':' read -r agent task_desc <<< "$task"
+    if [ "$MODE" = "headless" ]; then
+        start_taskboard_server
+        start_supervisor
+    fi
+    
+    for i in "${!TASK_LIST[@]}"; do
+        IFS=':' read -r agent task_desc <<< "${TASK_LIST[$i]}"
         
         if [ "$MODE" = "iterm" ]; then
-            spawn_iterm "$agent" "$task_desc"
+            spawn_iterm "$agent" "$task_desc" "" "$((i + 1))"
         else
-            spawn_headless "$agent" "$task_desc"
+            spawn_headless "$agent" "$task_desc" "" "$((i + 1))"
         fi
-        
-        sleep 0.5
     done
+    
+    if [ "$MODE" = "headless" ]; then
+        echo ""
+        python3 -m src.services.supervisor metrics
+    fi
 }
 
 # Main execution
@@ -155,18 +227,42 @@ case "${1:-help}" in
         echo "📊 Monitoring active agents:"
         echo ""
         
-        # Show running processes
-        echo "Running Claude processes:"
-        ps aux | grep "[c]laude -p" | awk '{print "PID:", $2, "Started:", $9}'
-        
-        echo ""
-        echo "Recent logs:"
-        ls -lt /tmp/claude-*.log 2>/dev/null | head -10
+        # Task, agent, PID, status, exit code and log for every agent
+        python3 -m src.services.supervisor list
+        ;;
+    
+    "status")
+        python3 -m src.services.supervisor status "$2"
+        ;;
+    
+    "logs")
+        # One merged stream of every agent's log, prefixed by agent and task
+        # ID (extra args, e.g. --json or --exit-when-done, are passed through)
+        shift
+        python3 -m src.services.log_mux "$@"
+        ;;
+    
+    "events")
+        # Stream agent start/exit/cancel/restart events as they happen
+        python3 -m src.services.supervisor events --follow
+        ;;
+    
+    "metrics")
+        # Admission limits, queue depth and how long launches waited
+        python3 -m src.services.supervisor metrics
+        ;;
+    
+    "cancel")
+        python3 -m src.services.supervisor cancel "$2"
+        ;;
+    
+    "restart")
+        python3 -m src.services.supervisor restart "$2"
         ;;
     
     "kill-all")
         echo "🛑 Stopping all Claude agents..."
-        pkill -f "claude.*-p.*Agent"
+        python3 -m src.services.supervisor cancel --all
         echo "✅ All agents stopped"
         ;;
     
@@ -177,6 +273,12 @@ case "${1:-help}" in
         echo "  audit              - Run parallel audit with all agents"
         echo "  custom <tasks>     - Run custom parallel tasks"
         echo "  monitor            - Show running agents and logs"
+        echo "  status [task-id]   - Show one agent task (or all of them)"
+        echo "  logs [--json]      - Follow all agent logs as one labelled stream"
+        echo "  events             - Follow agent start/exit events"
+        echo "  metrics            - Show launch queue waits and admission limits"
+        echo "  cancel <task-id>   - Stop one agent task"
+        echo "  restart <task-id>  - Restart one agent task"
         echo "  kill-all           - Stop all running agents"
         echo ""
         echo "Examples:"
@@ -3,6 +3,8 @@
 # Spawn a Claude agent in headless mode
 # Usage: ./spawn-agent.sh <agent-type> "<task>"
 
+cd "$(dirname "$0")/.." || exit 1
+
 AGENT_TYPE=$1
 TASK=$2
 
@@ -12,6 +14,15 @@ if [ -z "$AGENT_TYPE" ] || [ -z "$TASK" ]; then
     exit 1
 fi
 
+# A running warm pool (python3 -m src.services.agent_pool start) already has
+# the role loaded, so the task skips CLI start-up and the role-loading turn
+if python3 -m src.services.agent_pool status > /dev/null 2>&1; then
+    echo "⚡ Handing $AGENT_TYPE task to the warm agent pool..."
+    echo "📋 Task: $TASK"
+    echo ""
+    exec python3 -m src.services.agent_pool submit "$AGENT_TYPE" "$TASK"
+fi
+
 # Construct the prompt to load the agent and execute the task
 PROMPT="First, load your role by running the /$AGENT_TYPE command. Then complete this task: $TASK"
 
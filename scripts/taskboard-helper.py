@@ -1,125 +1,221 @@
 #!/usr/bin/env python3
 """
 Taskboard Helper - A more robust way to update the taskboard
+
+Updates go through the indexed taskboard store (src/services/taskboard_store.py),
+so each call touches one task instead of rewriting the whole board.
+taskboard.md is re-rendered from the store after each change (by the server's
+flush thread when one is running), or on demand with `render`.
+
+When a taskboard server is running (python3 -m src.services.taskboard_server start)
+this script is a thin client for it; otherwise it opens the store directly.
+
+Finished tasks don't pile up in "Recent Completions": older or surplus ones
+are archived to compressed monthly files (.claude/tasks/archive/) as tasks
+complete, or on demand with `compact`, and `find` still looks them up.
+
+`query` filters tasks by assignee, status, priority, section or age using the
+store's indexes, printing a table or JSON (`query --agent developer --json`).
+
+`batch` applies many operations read from stdin in one transaction and one
+taskboard.md write. Each line is either a helper command
+(`add architect ARCH-001 P1 Design auth`, `start ARCH-001`, ...) or a JSON
+object (`{"action": "start", "task_id": "ARCH-001"}`).
 """
 
+import argparse
+import json
 import sys
-import os
-import re
-from datetime import datetime
 from pathlib import Path
 
-TASKBOARD_PATH = Path(".claude/tasks/taskboard.md")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-def read_taskboard():
-    """Read the current taskboard content."""
-    return TASKBOARD_PATH.read_text()
+from src.services.taskboard_server import TaskboardClient  # noqa: E402
+from src.services.taskboard_store import (  # noqa: E402
+    TASKBOARD_PATH,
+    TaskboardError,
+    TaskboardStore,
+)
 
-def write_taskboard(content):
-    """Write updated content to taskboard."""
-    # Create backup
-    backup_path = TASKBOARD_PATH.with_suffix('.md.bak')
-    TASKBOARD_PATH.rename(backup_path)
-    
-    # Write new content
-    TASKBOARD_PATH.write_text(content)
-    print(f"✅ Taskboard updated successfully")
 
-def add_task(agent, task_id, description, priority="P2"):
-    """Add a new task to the backlog."""
-    content = read_taskboard()
-    date = datetime.now().strftime("%Y-%m-%d")
-    
-    new_task = f"""### [{task_id}] {description}
-- **Priority**: {priority}
-- **Assigned**: @{agent}
-- **Created**: {date}
-- **Updated**: {date}
-- **Status**: Backlog
+# Helper actions that move a task, and the section they move it to
+MOVE_ACTIONS = {
+    "start": "In Progress",
+    "review": "Review",
+    "test": "Testing",
+    "complete": "Recent Completions",
+}
 
-"""
-    
-    # Find the right section based on priority
-    if priority == "P1":
-        section = "### High Priority (P1)"
-        placeholder = "_No high priority tasks_"
-    elif priority == "P2":
-        section = "### Medium Priority (P2)"
-        placeholder = "_No medium priority tasks_"
-    else:
-        section = "### Low Priority (P3)"
-        placeholder = "_No low priority tasks_"
-    
-    # Replace placeholder or add after section header
-    if placeholder in content:
-        content = content.replace(placeholder, new_task.strip())
+
+def open_store():
+    """Connect to the taskboard server, or open the store directly."""
+    return TaskboardClient.connect() or TaskboardStore(TASKBOARD_PATH)
+
+def refresh_view(store):
+    """Bring taskboard.md up to date after a change.
+
+    A running server flushes the view from its own thread, so the client
+    leaves it to that; with the store opened directly nothing would render
+    it later, so a stale view is written now. That splices the stored task
+    blocks together; only the changed task was rendered again.
+    """
+    if isinstance(store, TaskboardStore):
+        store.render()
     else:
-        # Add after section header
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if line.strip() == section:
-                lines.insert(i + 1, new_task.strip())
-                break
-        content = '\n'.join(lines)
-    
-    write_taskboard(content)
+        store.maybe_render()
+
+def add_task(agent, task_id, description, priority="P2"):
+    """Add a new task to the backlog."""
+    with open_store() as store:
+        try:
+            store.add_task(agent, task_id, description, priority)
+        except TaskboardError as e:
+            print(f"❌ {e}")
+            return False
+        refresh_view(store)
     print(f"📝 Added task {task_id} to {priority} backlog")
+    return True
 
 def move_task(task_id, new_section):
     """Move a task to a different section."""
-    content = read_taskboard()
-    date = datetime.now().strftime("%Y-%m-%d")
-    
-    # Extract task
-    task_pattern = rf"### \[{task_id}\].*?(?=###|\n\n|\Z)"
-    match = re.search(task_pattern, content, re.DOTALL)
-    
-    if not match:
+    with open_store() as store:
+        try:
+            store.move_task(task_id, new_section)
+        except TaskboardError as e:
+            print(f"❌ {e}")
+            return False
+        refresh_view(store)
+    print(f"➡️  Moved task {task_id} to {new_section}")
+    return True
+
+def render_taskboard():
+    """Regenerate taskboard.md from the store."""
+    with open_store() as store:
+        store.render(force=True)
+    print(f"✅ Taskboard updated successfully")
+
+def show_taskboard():
+    """Print the current board, rendering it first if it is stale."""
+    with open_store() as store:
+        store.render()
+        print(store.render_text())
+
+def compact_taskboard():
+    """Archive old completions now."""
+    with open_store() as store:
+        archived = store.compact()
+    print(f"🗄️  Archived {archived} completed task(s)")
+
+def find_task(task_id):
+    """Print a task from the board or the archive."""
+    with open_store() as store:
+        task = store.find(task_id)
+    if task is None:
         print(f"❌ Task {task_id} not found")
-        return
-    
-    task_content = match.group(0).strip()
-    
-    # Remove from current location
-    content = re.sub(task_pattern, "", content, count=1, flags=re.DOTALL)
-    
-    # Update task metadata
-    task_content = re.sub(r"Updated: \d{4}-\d{2}-\d{2}", f"Updated: {date}", task_content)
-    
-    # Update status based on section
-    status_map = {
-        "In Progress": "In Progress",
-        "Review": "Review",
-        "Testing": "Testing",
-        "Recent Completions": "Done"
-    }
-    
-    if new_section in status_map:
-        task_content = re.sub(r"Status: \w+", f"Status: {status_map[new_section]}", task_content)
-    
-    # Find section and add task
-    section_pattern = rf"### {new_section}\n"
-    if re.search(section_pattern, content):
-        # Remove placeholder if exists
-        placeholder_map = {
-            "In Progress": "_No tasks currently in progress_",
-            "Review": "_No tasks currently in review_",
-            "Testing": "_No tasks currently in testing_",
-            "Recent Completions": "_No recently completed tasks_"
-        }
-        
-        if new_section in placeholder_map:
-            placeholder = placeholder_map[new_section]
-            if placeholder in content:
-                content = content.replace(placeholder, task_content + "\n")
-            else:
-                # Add after section header
-                content = re.sub(section_pattern, f"{section_pattern}{task_content}\n\n", content)
+        return False
+    if "partition" in task:
+        where = f"archived {task['archived']} to {task['partition']}"
+    else:
+        where = task["section"]
+    print(f"🔎 [{task_id}] {task['title']} ({where})")
+    for key in ("priority", "assigned", "created", "updated", "status"):
+        if task.get(key):
+            print(f"   {key.capitalize()}: {task[key]}")
+    return True
+
+def query_tasks(argv):
+    """Print the tasks matching command line filters as a table or JSON."""
+    parser = argparse.ArgumentParser(prog="taskboard-helper.py query")
+    parser.add_argument("--agent", action="append", help="Assignee (repeatable)")
+    parser.add_argument("--status", action="append", help="Status (repeatable)")
+    parser.add_argument("--priority", action="append", help="P1, P2, ... (repeatable)")
+    parser.add_argument("--section", action="append", help="Board section (repeatable)")
+    parser.add_argument("--stale-days", type=float, help="Not updated for N days")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--json", action="store_true", help="One JSON object per task")
+    args = parser.parse_args(argv)
+
+    with open_store() as store:
+        tasks = store.query(
+            assigned=args.agent,
+            status=args.status,
+            priority=args.priority,
+            section=args.section,
+            stale_days=args.stale_days,
+            limit=args.limit,
+        )
+    if args.json:
+        for task in tasks:
+            print(json.dumps(task))
+        return tasks
+
+    columns = ("task_id", "priority", "status", "assigned", "updated", "title")
+    rows = [[str(task.get(column) or "") for column in columns] for task in tasks]
+    widths = [max([len(column)] + [len(row[i]) for row in rows])
+              for i, column in enumerate(columns[:-1])]
+    header = ["ID", "PRIORITY", "STATUS", "ASSIGNED", "UPDATED", "TITLE"]
+    for row in [header] + rows:
+        cells = [cell.ljust(width) for cell, width in zip(row, widths)]
+        print("  ".join(cells + [row[-1]]))
+    print(f"🔎 {len(tasks)} task(s)")
+    return tasks
+
+def parse_operation(line):
+    """Turn one batch line (helper command or JSON object) into an operation."""
+    if line.startswith("{"):
+        operation = json.loads(line)
+        if not isinstance(operation, dict):
+            raise ValueError("JSON operations must be objects")
+    else:
+        parts = line.split(None, 4)
+        operation = {"action": parts[0]}
+        if parts[0] == "add":
+            if len(parts) < 5:
+                raise ValueError("add requires <agent> <task-id> <priority> <description>")
+            operation.update(
+                agent=parts[1], task_id=parts[2], priority=parts[3], description=parts[4]
+            )
+        elif len(parts) > 1:
+            operation["task_id"] = parts[1]
+            if len(parts) > 2:
+                operation["section"] = line.split(None, 2)[2]
+    action = operation.get("action")
+    if action in MOVE_ACTIONS:
+        operation["action"] = "move"
+        operation["section"] = MOVE_ACTIONS[action]
+    return operation
+
+def batch(lines, as_json=False):
+    """Apply operations read from ``lines`` with one commit and one render."""
+    entries = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            entries.append(parse_operation(line))
+        except (ValueError, IndexError) as e:
+            entries.append({"action": None, "task_id": None, "ok": False,
+                            "error": f"line {number}: {e}"})
+
+    operations = [entry for entry in entries if "ok" not in entry]
+    with open_store() as store:
+        applied = iter(store.batch(operations))
+        results = [entry if "ok" in entry else next(applied) for entry in entries]
+        if any(result["ok"] for result in results):
+            store.render()
+
+    for result in results:
+        if as_json:
+            print(json.dumps(result))
+        elif result["ok"]:
+            print(f"✅ {result['action']} {result['task_id']}")
         else:
-            content = re.sub(section_pattern, f"{section_pattern}{task_content}\n\n", content)
-    
-    write_taskboard(content)
-    print(f"➡️  Moved task {task_id} to {new_section}")
+            print(f"❌ {result['error']}")
+    applied_count = sum(1 for result in results if result["ok"])
+    if not as_json:
+        print(f"📦 Applied {applied_count}/{len(results)} operations")
+    return applied_count == len(results)
 
 def main():
     if len(sys.argv) < 2:
@@ -130,10 +226,20 @@ def main():
         print("  review <task-id>")
         print("  test <task-id>")
         print("  complete <task-id>")
+        print("  render              (regenerate taskboard.md from the store)")
+        print("  batch [--json]      (apply operations from stdin, one per line)")
+        print("  show                (print the current board)")
+        print("  find <task-id>      (look a task up, including archived ones)")
+        print("  compact             (archive old completions now)")
+        print("  query [filters]     (--agent/--status/--priority/--section/--stale-days,"
+              " --json)")
         print("\nExamples:")
         print("  python taskboard-helper.py add architect ARCH-001 P1 'Design authentication'")
         print("  python taskboard-helper.py start ARCH-001")
         print("  python taskboard-helper.py complete ARCH-001")
+        print("  python taskboard-helper.py query --priority P1 --status Review")
+        print("  printf 'add tester TEST-001 P2 Write tests\\nstart TEST-001\\n' |"
+              " python taskboard-helper.py batch")
         sys.exit(1)
     
     action = sys.argv[1]
@@ -146,35 +252,47 @@ def main():
         task_id = sys.argv[3]
         priority = sys.argv[4]
         description = ' '.join(sys.argv[5:])
-        add_task(agent, task_id, description, priority)
-    
-    elif action == "start":
-        if len(sys.argv) < 3:
-            print("Error: start requires <task-id>")
+        if not add_task(agent, task_id, description, priority):
             sys.exit(1)
-        move_task(sys.argv[2], "In Progress")
     
-    elif action == "review":
+    elif action in MOVE_ACTIONS:
         if len(sys.argv) < 3:
-            print("Error: review requires <task-id>")
+            print(f"Error: {action} requires <task-id>")
+            sys.exit(1)
+        if not move_task(sys.argv[2], MOVE_ACTIONS[action]):
             sys.exit(1)
-        move_task(sys.argv[2], "Review")
     
-    elif action == "test":
+    elif action == "render":
+        render_taskboard()
+    
+    elif action == "show":
+        show_taskboard()
+    
+    elif action == "find":
         if len(sys.argv) < 3:
-            print("Error: test requires <task-id>")
+            print("Error: find requires <task-id>")
+            sys.exit(1)
+        if not find_task(sys.argv[2]):
             sys.exit(1)
-        move_task(sys.argv[2], "Testing")
     
-    elif action == "complete":
-        if len(sys.argv) < 3:
-            print("Error: complete requires <task-id>")
+    elif action == "compact":
+        compact_taskboard()
+    
+    elif action == "query":
+        query_tasks(sys.argv[2:])
+    
+    elif action == "batch":
+        if not batch(sys.stdin, as_json="--json" in sys.argv[2:]):
             sys.exit(1)
-        move_task(sys.argv[2], "Recent Completions")
     
     else:
         print(f"Unknown action: {action}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    except TaskboardError as e:
+        # e.g. a hand edit to taskboard.md that lists a task twice
+        print(f"❌ {e}")
+        sys.exit(1)
\ No newline at end of file
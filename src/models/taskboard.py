@@ -0,0 +1,340 @@
+"""
+Taskboard Model - structured representation of ``taskboard.md``.
+
+The board is parsed in a single pass into ``Section`` objects whose items
+are either raw markdown lines or ``Task`` records. Serializing an unmodified
+board reproduces the original document byte for byte; edits are made on the
+objects and only the touched tasks change when the board is written again.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Task fields rendered as "- **Label**: value" lines, in canonical order
+FIELDS = (
+    ("priority", "Priority"),
+    ("assigned", "Assigned"),
+    ("created", "Created"),
+    ("updated", "Updated"),
+    ("status", "Status"),
+)
+FIELD_KEYS = {label: key for key, label in FIELDS}
+
+# Placeholder shown under a known section while it has no tasks
+PLACEHOLDERS = {
+    "In Progress": "_No tasks currently in progress_",
+    "Review": "_No tasks currently in review_",
+    "Testing": "_No tasks currently in testing_",
+    "Recent Completions": "_No recently completed tasks_",
+    "High Priority (P1)": "_No high priority tasks_",
+    "Medium Priority (P2)": "_No medium priority tasks_",
+    "Low Priority (P3)": "_No low priority tasks_",
+}
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+TASK_HEADING_RE = re.compile(r"^### \[([^\]]+)\](?: (.*))?$")
+FIELD_RE = re.compile(r"^- \*\*(Priority|Assigned|Created|Updated|Status)\*\*: (.*)$")
+
+Item = Union[str, "Task"]
+
+
+class Task:
+    """One task block: a ``### [ID] title`` heading plus its field lines.
+
+    ``layout`` is None for blocks in canonical field order. Otherwise it
+    records the original line order, with a field key for each field line
+    and None for each line taken from ``extra``.
+    """
+
+    __slots__ = (
+        "task_id",
+        "title",
+        "priority",
+        "assigned",
+        "created",
+        "updated",
+        "status",
+        "extra",
+        "layout",
+    )
+
+    def __init__(
+        self,
+        task_id: str,
+        title: Optional[str] = "",
+        priority: Optional[str] = None,
+        assigned: Optional[str] = None,
+        created: Optional[str] = None,
+        updated: Optional[str] = None,
+        status: Optional[str] = None,
+        extra: Tuple[str, ...] = (),
+        layout: Optional[Tuple[Optional[str], ...]] = None,
+    ):
+        self.task_id = task_id
+        self.title = title
+        self.priority = priority
+        self.assigned = assigned
+        self.created = created
+        self.updated = updated
+        self.status = status
+        self.extra = extra
+        self.layout = layout
+
+    def __repr__(self) -> str:
+        return f"Task({self.task_id!r}, {self.title!r}, status={self.status!r})"
+
+    def lines(self) -> List[str]:
+        """Render the task as markdown lines."""
+        heading = f"### [{self.task_id}]"
+        if self.title is not None:
+            heading += f" {self.title}"
+        out = [heading]
+        if self.layout is None:
+            for key, label in FIELDS:
+                value = getattr(self, key)
+                if value is not None:
+                    out.append(f"- **{label}**: {value}")
+            out.extend(self.extra)
+            return out
+        extra = iter(self.extra)
+        for entry in self.layout:
+            if entry is None:
+                out.append(next(extra))
+            else:
+                out.append(f"- **{dict(FIELDS)[entry]}**: {getattr(self, entry)}")
+        return out
+
+    def set(self, key: str, value: Optional[str]) -> None:
+        """Set a field; a custom layout gains a line for a field it lacked."""
+        if self.layout is not None and value is not None and key not in self.layout:
+            fields = [i for i, entry in enumerate(self.layout) if entry is not None]
+            at = fields[-1] + 1 if fields else 0
+            self.layout = self.layout[:at] + (key,) + self.layout[at:]
+        setattr(self, key, value)
+
+    def as_dict(self) -> Dict[str, Optional[str]]:
+        """Return the task fields as a plain dict."""
+        record: Dict[str, Optional[str]] = {
+            "task_id": self.task_id,
+            "title": self.title,
+        }
+        for key, _ in FIELDS:
+            record[key] = getattr(self, key)
+        record["extra"] = "\n".join(self.extra)
+        return record
+
+
+class Section:
+    """A heading and the lines and tasks beneath it."""
+
+    __slots__ = ("heading", "title", "level", "items")
+
+    def __init__(self, heading: str, items: Optional[List[Item]] = None):
+        self.heading = heading
+        match = HEADING_RE.match(heading)
+        self.level = len(match.group(1)) if match else 0
+        self.title = match.group(2).strip() if match else ""
+        self.items: List[Item] = items if items is not None else []
+
+    def __repr__(self) -> str:
+        return f"Section({self.title!r}, tasks={len(self.tasks())})"
+
+    def tasks(self) -> List[Task]:
+        """Tasks in this section, in board order."""
+        return [item for item in self.items if isinstance(item, Task)]
+
+    @property
+    def placeholder(self) -> Optional[str]:
+        """The placeholder text used when this section is empty."""
+        return PLACEHOLDERS.get(self.title)
+
+    def insert_top(self, task: Task) -> None:
+        """Insert a task first in the section, replacing its placeholder."""
+        if self.placeholder in self.items:
+            self.items.remove(self.placeholder)
+        if self.items[:1] == [""]:
+            self.items.insert(0, task)
+        else:
+            self.items[0:0] = [task, ""]
+
+    def remove(self, task: Task) -> None:
+        """Remove a task and its separating blank line."""
+        index = self.items.index(task)
+        end = index + 1
+        if end < len(self.items) - 1 and self.items[end] == "":
+            end += 1
+        del self.items[index:end]
+        if self.placeholder and not self.tasks():
+            self.items.insert(0, self.placeholder)
+
+    def fill(self, tasks: Sequence[Item]) -> None:
+        """Place ``tasks`` at the top of a section that holds none yet.
+
+        Each entry is a ``Task`` or a task block already rendered to text.
+        """
+        if tasks:
+            body = list(self.items)
+            while body and body[0] == "":
+                body.pop(0)
+            self.items = [entry for task in tasks for entry in (task, "")] + body
+        elif self.placeholder and self.placeholder not in self.items:
+            self.items.insert(0, self.placeholder)
+
+
+class Taskboard:
+    """A parsed board with an index from task ID to its section."""
+
+    __slots__ = ("preamble", "sections", "_index")
+
+    def __init__(self, preamble: Optional[List[str]] = None):
+        self.preamble: List[str] = preamble if preamble is not None else []
+        self.sections: List[Section] = []
+        self._index: Dict[str, Tuple[Task, Section]] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._index
+
+    def _register(self, task: Task, section: Section) -> None:
+        self._index.setdefault(task.task_id, (task, section))
+
+    def tasks(self) -> Iterator[Tuple[Task, Section]]:
+        """Iterate every task with its section, in document order."""
+        for section in self.sections:
+            for task in section.tasks():
+                yield task, section
+
+    def task(self, task_id: str) -> Optional[Task]:
+        """Look up a task by ID."""
+        entry = self._index.get(task_id)
+        return entry[0] if entry else None
+
+    def section_of(self, task_id: str) -> Optional[Section]:
+        """The section that currently holds a task."""
+        entry = self._index.get(task_id)
+        return entry[1] if entry else None
+
+    def section(self, title: str) -> Optional[Section]:
+        """The first section with the given title."""
+        for section in self.sections:
+            if section.title == title:
+                return section
+        return None
+
+    def add(self, task: Task, section_title: str) -> None:
+        """Add a task at the top of a section, creating the section if needed."""
+        section = self.section(section_title) or self.add_section(section_title)
+        section.insert_top(task)
+        self._index[task.task_id] = (task, section)
+
+    def add_section(self, title: str) -> Section:
+        """Append a new ``###`` section after a blank line."""
+        section = Section(f"### {title}")
+        if self.sections and self.sections[-1].items[-1:] != [""]:
+            self.sections[-1].items.append("")
+        self.sections.append(section)
+        return section
+
+    def remove(self, task_id: str) -> Task:
+        """Remove a task from the board."""
+        task, section = self._index.pop(task_id)
+        section.remove(task)
+        return task
+
+    def move(self, task_id: str, section_title: str) -> Task:
+        """Move a task to the top of another section."""
+        task = self.remove(task_id)
+        self.add(task, section_title)
+        return task
+
+    def serialize(self) -> str:
+        """Render the board back to markdown."""
+        out = list(self.preamble)
+        for section in self.sections:
+            out.append(section.heading)
+            for item in section.items:
+                if isinstance(item, Task):
+                    out.extend(item.lines())
+                else:
+                    out.append(item)
+        return "\n".join(out)
+
+
+class TaskboardParser:
+    """Single-pass, incremental parser: ``feed`` text chunks, then ``close``."""
+
+    def __init__(self) -> None:
+        self.board = Taskboard()
+        self._section: Optional[Section] = None
+        self._task: Optional[Task] = None
+        self._layout: List[Optional[str]] = []
+        self._extra: List[str] = []
+        self._partial = ""
+
+    def feed(self, chunk: str) -> None:
+        """Consume a chunk of text; complete lines are parsed immediately."""
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line)
+
+    def close(self) -> Taskboard:
+        """Finish parsing and return the board."""
+        self._line(self._partial)
+        self._end_task()
+        return self.board
+
+    def _items(self) -> List[Item]:
+        if self._section is None:
+            return self.board.preamble  # type: ignore[return-value]
+        return self._section.items
+
+    def _line(self, line: str) -> None:
+        if self._task is not None:
+            if line and not line.isspace() and not HEADING_RE.match(line):
+                field = FIELD_RE.match(line)
+                key = FIELD_KEYS[field.group(1)] if field else None
+                if key and getattr(self._task, key) is None:
+                    setattr(self._task, key, field.group(2))  # type: ignore[union-attr]
+                    self._layout.append(key)
+                else:
+                    self._extra.append(line)
+                    self._layout.append(None)
+                return
+            self._end_task()
+
+        task_match = TASK_HEADING_RE.match(line)
+        if task_match and self._section is not None:
+            self._task = Task(task_match.group(1), task_match.group(2))
+            self._items().append(self._task)
+            self.board._register(self._task, self._section)
+        elif HEADING_RE.match(line):
+            self._section = Section(line)
+            self.board.sections.append(self._section)
+        else:
+            self._items().append(line)
+
+    def _end_task(self) -> None:
+        task = self._task
+        if task is None:
+            return
+        task.extra = tuple(self._extra)
+        canonical: List[Optional[str]] = [
+            key for key, _ in FIELDS if getattr(task, key) is not None
+        ]
+        canonical += [None] * len(self._extra)
+        if self._layout != canonical:
+            task.layout = tuple(self._layout)
+        self._task = None
+        self._layout = []
+        self._extra = []
+
+
+def parse(text: Union[str, Iterable[str]]) -> Taskboard:
+    """Parse a taskboard document (or an iterable of text chunks)."""
+    parser = TaskboardParser()
+    for chunk in [text] if isinstance(text, str) else text:
+        parser.feed(chunk)
+    return parser.close()
@@ -3,8 +3,11 @@
 # Import your services here to expose them at the package level
 # from .user_service import UserService
 # from .auth_service import AuthService
+from .taskboard_store import TaskboardError, TaskboardStore
 
 __all__ = [
     # "UserService",
     # "AuthService",
-]
\ No newline at end of file
+    "TaskboardError",
+    "TaskboardStore",
+]
@@ -0,0 +1,182 @@
+"""
+Admission Control - rate-limited, capacity-aware agent launches.
+
+``orchestrate-parallel.sh`` used to sleep a fixed 0.5-1s between spawns: a
+60-agent fan-out wasted up to a minute before the last agent even started,
+and the delay still let any number of agents pile up on the machine. The
+supervisor now queues spawn requests and admits them through this
+controller instead:
+
+* a token bucket bounds the launch rate (``rate`` per second, with bursts of
+  up to ``burst`` back-to-back launches),
+* at most ``max_in_flight`` agents run at once, and
+* optionally, no agent starts while the 1-minute load average is above
+  ``max_load`` or available memory is below ``min_free_mb``.
+
+Every admitted launch records how long it waited in the queue, and
+``metrics()`` reports the wait distribution and why launches were held
+back. A limit of 0 switches that check off. Defaults come from the
+environment:
+
+    AGENT_SPAWN_RATE      launches per second (default 4)
+    AGENT_SPAWN_BURST     launches allowed back to back (default 8)
+    AGENT_MAX_IN_FLIGHT   agents running at once (default 16)
+    AGENT_MAX_LOAD        1-minute load average ceiling (default off)
+    AGENT_MIN_FREE_MB     available memory floor in MiB (default off)
+"""
+
+import collections
+import os
+import time
+from typing import Any, Callable, Deque, Dict, Optional
+
+from .scheduler import env_number
+
+# Seconds between re-checks while held back by load, memory or capacity
+RECHECK_INTERVAL = 1.0
+
+# Queue waits kept for the percentile metrics
+WAIT_SAMPLES = 1000
+
+
+class TokenBucket:
+    """Classic token bucket; a ``rate`` of 0 means unlimited."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: Optional[float] = None):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic() if now is None else now
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def try_acquire(self, now: float) -> bool:
+        """Take one token if one is available."""
+        if self.rate <= 0:
+            return True
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until the next token is available."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+
+def load_average() -> Optional[float]:
+    """The 1-minute load average, or None where the OS doesn't report it."""
+    try:
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+
+
+def free_memory_mb() -> Optional[float]:
+    """Available memory in MiB from ``/proc/meminfo``, or None elsewhere."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class AdmissionController:
+    """Decide when the next queued agent may start, and record queue waits."""
+
+    def __init__(
+        self,
+        rate: float = 4.0,
+        burst: float = 8.0,
+        max_in_flight: int = 16,
+        max_load: float = 0.0,
+        min_free_mb: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        load: Callable[[], Optional[float]] = load_average,
+        free_memory: Callable[[], Optional[float]] = free_memory_mb,
+    ):
+        self.bucket = TokenBucket(rate, burst, clock())
+        self.max_in_flight = max_in_flight
+        self.max_load = max_load
+        self.min_free_mb = min_free_mb
+        self.clock = clock
+        self.load = load
+        self.free_memory = free_memory
+        self.admitted = 0
+        self.held_back: Dict[str, int] = collections.Counter()
+        self.waits: Deque[float] = collections.deque(maxlen=WAIT_SAMPLES)
+        self.max_wait = 0.0
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        """Controller configured by the ``AGENT_*`` environment variables."""
+        return cls(
+            rate=env_number("AGENT_SPAWN_RATE", 4.0),
+            burst=env_number("AGENT_SPAWN_BURST", 8.0),
+            max_in_flight=int(env_number("AGENT_MAX_IN_FLIGHT", 16)),
+            max_load=env_number("AGENT_MAX_LOAD", 0.0),
+            min_free_mb=env_number("AGENT_MIN_FREE_MB", 0.0),
+        )
+
+    def admit(self, in_flight: int) -> float:
+        """Admit one launch (returning 0) or return seconds to wait first."""
+        if self.max_in_flight and in_flight >= self.max_in_flight:
+            # An exiting agent frees a slot sooner; callers re-check on exits
+            return self._hold("in_flight", RECHECK_INTERVAL)
+        if self.max_load:
+            load = self.load()
+            if load is not None and load > self.max_load:
+                return self._hold("load", RECHECK_INTERVAL)
+        if self.min_free_mb:
+            free = self.free_memory()
+            if free is not None and free < self.min_free_mb:
+                return self._hold("memory", RECHECK_INTERVAL)
+        now = self.clock()
+        if not self.bucket.try_acquire(now):
+            return self._hold("rate", self.bucket.wait_time(now))
+        self.admitted += 1
+        return 0.0
+
+    def _hold(self, reason: str, delay: float) -> float:
+        self.held_back[reason] += 1
+        return max(delay, 0.001)
+
+    def record_wait(self, seconds: float) -> None:
+        """Record how long an admitted launch sat in the queue."""
+        self.waits.append(seconds)
+        self.max_wait = max(self.max_wait, seconds)
+
+    def percentile(self, fraction: float) -> float:
+        """Queue wait at ``fraction`` (0-1) over the recent samples."""
+        if not self.waits:
+            return 0.0
+        ordered = sorted(self.waits)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Limits, admissions and queue-wait statistics."""
+        return {
+            "rate": self.bucket.rate,
+            "burst": self.bucket.capacity,
+            "max_in_flight": self.max_in_flight,
+            "max_load": self.max_load,
+            "min_free_mb": self.min_free_mb,
+            "admitted": self.admitted,
+            "held_back": dict(self.held_back),
+            "wait_mean": sum(self.waits) / len(self.waits) if self.waits else 0.0,
+            "wait_p50": self.percentile(0.5),
+            "wait_p95": self.percentile(0.95),
+            "wait_max": self.max_wait,
+        }
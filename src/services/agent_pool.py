@@ -0,0 +1,791 @@
+"""
+Agent Pool - resident, pre-warmed agent workers with their roles loaded.
+
+Every spawn path starts a fresh CLI process and then spends its first turn
+on "First run /<agent> to load your role", so each task pays process
+start-up plus a role-loading turn before any work happens. The pool keeps
+``size`` workers per role running the CLI in streaming mode
+(``--input-format stream-json --output-format stream-json``), each of which
+has already been given its role prompt from ``.claude/commands/<role>.md``.
+Tasks are queued per role and handed to the next idle worker as one more
+turn of its session.
+
+A worker is recycled - closed and replaced by a freshly warmed one - after
+``max_tasks`` tasks, so sessions don't accumulate context forever, and as
+soon as it dies or a task times out. Replacements warm up while the worker
+thread is idle, so tasks normally never wait for a start-up.
+
+Every warm-up is timed. A task handed to an already warm worker skips a
+whole cold start; one that arrived while its worker was still warming up
+only waits for the rest of it. The pool reports the difference as launch
+latency saved.
+
+The pool runs in-process for one fan-out (``run``) or as a resident server
+(``start``), which ``spawn-agent.sh`` and ``orchestrate.sh parallel`` use
+when it is running. Protocol: newline-delimited JSON over a Unix domain
+socket, as for the supervisor. Point ``$CLAUDE_CMD`` at
+``tests/stubs/fake_agent.py`` (``FAKE_AGENT_STARTUP`` simulates start-up
+cost) to use the pool without the real CLI.
+
+Usage:
+    python3 -m src.services.agent_pool run "architect:design API,developer:build it"
+    python3 -m src.services.agent_pool start --roles architect developer --size 2
+    python3 -m src.services.agent_pool submit architect "Review the API design"
+    python3 -m src.services.agent_pool stats
+    python3 -m src.services.agent_pool stop
+"""
+
+import argparse
+import collections
+import json
+import os
+import queue
+import shlex
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..utils import tracing
+from .scheduler import _terminate, env_number, parse_tasks
+
+SOCKET_PATH = Path(os.environ.get("AGENT_POOL_SOCKET", ".claude/agent-pool.sock"))
+COMMANDS_DIR = Path(".claude/commands")
+
+# Seconds a worker gets to load its role before it counts as failed
+WARMUP_TIMEOUT = 300.0
+
+
+class PoolError(Exception):
+    """Raised when a worker can't start, dies or times out, or a role is unknown."""
+
+
+@dataclass
+class PoolResult:
+    """Outcome of one task handed to a pooled worker."""
+
+    role: str
+    prompt: str
+    ok: bool
+    output: str
+    duration: float
+    queue_wait: float
+    startup_wait: float = 0.0
+    worker_pid: Optional[int] = None
+    log_path: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the result as plain JSON-serializable data."""
+        return dict(self.__dict__)
+
+
+def pool_command() -> List[str]:
+    """Command line of a resident, streaming agent CLI."""
+    claude_cmd = shlex.split(os.environ.get("CLAUDE_CMD", "claude"))
+    return [
+        *claude_cmd,
+        "-p",
+        "--input-format",
+        "stream-json",
+        "--output-format",
+        "stream-json",
+        "--verbose",
+    ]
+
+
+def role_prompt(role: str, commands_dir: Path = COMMANDS_DIR) -> str:
+    """The role's command file, or its slash command when there is none."""
+    path = Path(commands_dir) / f"{role}.md"
+    try:
+        return path.read_text().replace("$ARGUMENTS", "").strip()
+    except OSError:
+        return f"/{role}"
+
+
+def available_roles(commands_dir: Path = COMMANDS_DIR) -> List[str]:
+    """Every role with a command file."""
+    return sorted(path.stem for path in Path(commands_dir).glob("*.md"))
+
+
+class PoolWorker:
+    """One resident agent CLI session, warmed with its role prompt."""
+
+    __slots__ = (
+        "role",
+        "proc",
+        "events",
+        "reader",
+        "log",
+        "log_path",
+        "tasks_done",
+        "warmup",
+        "ready",
+    )
+
+    def __init__(self, role: str, command: List[str], log_path: Path):
+        self.role = role
+        self.log_path = str(log_path)
+        self.tasks_done = 0
+        self.warmup = 0.0
+        self.ready = 0.0
+        self.events: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self.log: IO[bytes] = open(log_path, "ab")
+        try:
+            self.proc = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=self.log,
+                start_new_session=True,
+            )
+        except OSError as e:
+            self.log.close()
+            raise PoolError(f"Failed to start {role} worker: {e}") from e
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    @property
+    def pid(self) -> int:
+        """Process ID of the CLI."""
+        return self.proc.pid
+
+    @property
+    def alive(self) -> bool:
+        """Whether the CLI is still running."""
+        return self.proc.poll() is None
+
+    def _read(self) -> None:
+        # Decode stdout into events; None marks the end of the stream
+        assert self.proc.stdout is not None
+        for line in self.proc.stdout:
+            self.log.write(line)
+            self.log.flush()
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(event, dict):
+                self.events.put(event)
+        self.events.put(None)
+
+    def warm(self, prompt: str, timeout: float = WARMUP_TIMEOUT) -> float:
+        """Load the role; return how long start-up and loading took."""
+        start = time.monotonic()
+        self.ask(prompt, timeout)
+        self.ready = time.monotonic()
+        self.warmup = self.ready - start
+        return self.warmup
+
+    def ask(self, prompt: str, timeout: Optional[float] = None) -> Tuple[bool, str]:
+        """Run one turn; return whether it succeeded and its result text."""
+        message = {"type": "user", "message": {"role": "user", "content": prompt}}
+        try:
+            assert self.proc.stdin is not None
+            self.proc.stdin.write((json.dumps(message) + "\n").encode())
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise PoolError(f"{self.role} worker is gone: {e}") from e
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise PoolError(f"{self.role} worker timed out")
+            try:
+                event = self.events.get(timeout=remaining)
+            except queue.Empty:
+                raise PoolError(f"{self.role} worker timed out") from None
+            if event is None:
+                raise PoolError(f"{self.role} worker exited ({self.proc.wait()})")
+            if event.get("type") == "result":
+                return not event.get("is_error"), str(event.get("result", ""))
+
+    def kill(self) -> None:
+        """Terminate the CLI (and anything it spawned) right away."""
+        _terminate(self.proc)
+
+    def close(self) -> None:
+        """End the session, killing the CLI if it doesn't exit by itself."""
+        try:
+            if self.proc.stdin:
+                self.proc.stdin.close()
+            self.proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            _terminate(self.proc)
+        self.reader.join(timeout=5)
+        self.log.close()
+
+
+_Job = Tuple[str, "Future[PoolResult]", float]
+
+
+class AgentPool:
+    """Per-role queues served by warm, periodically recycled workers."""
+
+    def __init__(
+        self,
+        roles: Iterable[str] = (),
+        size: int = 1,
+        max_tasks: int = 20,
+        timeout: Optional[float] = None,
+        command: Callable[[], List[str]] = pool_command,
+        commands_dir: Path = COMMANDS_DIR,
+        log_dir: Optional[Path] = None,
+    ):
+        self.size = max(1, size)
+        self.max_tasks = max(1, max_tasks)
+        self.timeout = timeout or None
+        self.command = command
+        self.commands_dir = Path(commands_dir)
+        self.log_dir = Path(log_dir) if log_dir else Path(tempfile.gettempdir())
+        self._queues: Dict[str, "queue.Queue[Optional[_Job]]"] = {}
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stats = {
+            "tasks": 0,
+            "failed": 0,
+            "worker_starts": 0,
+            "recycled": 0,
+            "warmup_total": 0.0,
+            "startup_wait_total": 0.0,
+            "queue_wait_total": 0.0,
+        }
+        for role in roles:
+            self.add_role(role)
+
+    def __enter__(self) -> "AgentPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def roles(self) -> List[str]:
+        """Roles with workers."""
+        with self._lock:
+            return sorted(self._queues)
+
+    def add_role(self, role: str) -> None:
+        """Start ``size`` workers for a role (no-op when it already has them)."""
+        with self._lock:
+            if role in self._queues:
+                return
+            jobs: "queue.Queue[Optional[_Job]]" = queue.Queue()
+            self._queues[role] = jobs
+            for _ in range(self.size):
+                thread = threading.Thread(
+                    target=self._serve, args=(role, jobs), daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, role: str, prompt: str) -> "Future[PoolResult]":
+        """Queue a task for the next idle worker of ``role``."""
+        self.add_role(role)
+        future: "Future[PoolResult]" = Future()
+        self._queues[role].put((prompt, future, time.monotonic()))
+        return future
+
+    def run(
+        self,
+        tasks: List[Tuple[str, str]],
+        on_result: Optional[Callable[[PoolResult], None]] = None,
+    ) -> List[PoolResult]:
+        """Run ``(role, prompt)`` tasks; return results in input order."""
+        futures = [self.submit(role, prompt) for role, prompt in tasks]
+        if on_result:
+            for future in futures:
+                future.add_done_callback(lambda f: on_result(f.result()))
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """Finish queued tasks, then stop every worker."""
+        with self._lock:
+            for jobs in self._queues.values():
+                for _ in range(self.size):
+                    jobs.put(None)
+            threads = list(self._threads)
+        for thread in threads:
+            thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Task counts, warm-ups and the launch latency the pool saved."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        starts = stats["worker_starts"]
+        cold_start = stats["warmup_total"] / starts if starts else 0.0
+        stats["roles"] = self.roles
+        stats["cold_start"] = cold_start
+        # Each task would have paid a cold start, minus what it waited anyway
+        stats["launch_saved"] = max(
+            0.0, stats["tasks"] * cold_start - stats["startup_wait_total"]
+        )
+        stats["queue_wait_mean"] = (
+            stats["queue_wait_total"] / stats["tasks"] if stats["tasks"] else 0.0
+        )
+        return stats
+
+    # -- workers ------------------------------------------------------------
+
+    def _count(self, **deltas: float) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                self._stats[name] += delta
+
+    def _start_worker(self, role: str) -> Optional[PoolWorker]:
+        # None when no worker can be had (an unwritable log directory, a
+        # missing binary, a worker that dies warming up); the task then fails
+        try:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            fd, log_name = tempfile.mkstemp(
+                prefix=f"claude-pool-{role}-", suffix=".log", dir=str(self.log_dir)
+            )
+            os.close(fd)
+            worker = PoolWorker(role, self.command(), Path(log_name))
+        except (PoolError, OSError):
+            return None
+        try:
+            warmup = worker.warm(role_prompt(role, self.commands_dir))
+        except (PoolError, OSError):
+            worker.close()
+            return None
+        self._count(worker_starts=1, warmup_total=warmup)
+        return worker
+
+    def _serve(self, role: str, jobs: "queue.Queue[Optional[_Job]]") -> None:
+        # Warm up before the first task arrives, and again after each recycle
+        worker = self._start_worker(role)
+        try:
+            while True:
+                job = jobs.get()
+                if job is None:
+                    return
+                prompt, future, submitted = job
+                if worker is None or not worker.alive:
+                    if worker:
+                        worker.close()
+                    worker = self._start_worker(role)
+                result: Optional[PoolResult] = None
+                failure: Optional[BaseException] = None
+                try:
+                    result = self._run(role, worker, prompt, submitted)
+                except Exception as e:
+                    # This task fails; the thread goes on to the next one
+                    failure = e
+                finally:
+                    # Whatever happened, the submitter is never left waiting
+                    if result is not None:
+                        future.set_result(result)
+                    else:
+                        future.set_exception(
+                            failure or PoolError(f"{role} task was interrupted")
+                        )
+                if worker and (not worker.alive or worker.tasks_done >= self.max_tasks):
+                    worker.close()
+                    self._count(recycled=1)
+                    worker = self._start_worker(role)
+        finally:
+            if worker:
+                worker.close()
+
+    def _run(
+        self, role: str, worker: Optional[PoolWorker], prompt: str, submitted: float
+    ) -> PoolResult:
+        queue_wait = time.monotonic() - submitted
+        # Start-up this task sat through, had the worker not been ready
+        startup_wait = max(0.0, worker.ready - submitted) if worker else 0.0
+        start = time.monotonic()
+        span = tracing.span(f"pool task {role}", "agent", queue_wait=queue_wait)
+        with span:
+            if worker is None:
+                ok, output = False, f"Could not start a {role} worker"
+            else:
+                try:
+                    ok, output = worker.ask(prompt, self.timeout)
+                except PoolError as e:
+                    # Timed out or died mid-task: its session can't be reused
+                    ok, output = False, str(e)
+                    worker.kill()
+                worker.tasks_done += 1
+            span.set(ok=ok, startup_wait=startup_wait)
+        self._count(
+            tasks=1,
+            failed=int(not ok),
+            queue_wait_total=queue_wait,
+            startup_wait_total=startup_wait,
+        )
+        return PoolResult(
+            role,
+            prompt,
+            ok,
+            output,
+            time.monotonic() - start,
+            queue_wait,
+            startup_wait,
+            worker.pid if worker else None,
+            worker.log_path if worker else None,
+        )
+
+
+class PoolClient:
+    """Client for a resident pool server."""
+
+    def __init__(
+        self, socket_path: Path = SOCKET_PATH, timeout: Optional[float] = None
+    ):
+        self.socket_path = Path(socket_path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(str(self.socket_path))
+        self._reader = self.sock.makefile("r")
+
+    @classmethod
+    def connect(cls, socket_path: Path = SOCKET_PATH) -> Optional["PoolClient"]:
+        """Connect to the pool, or return None when none is running."""
+        if not Path(socket_path).exists():
+            return None
+        try:
+            return cls(socket_path)
+        except OSError:
+            return None
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._reader.close()
+        self.sock.close()
+
+    def __enter__(self) -> "PoolClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def call(self, action: str, **args: Any) -> Dict[str, Any]:
+        """Send one request and return its response, raising on errors."""
+        self.sock.sendall(
+            (json.dumps({"action": action, "args": args}) + "\n").encode()
+        )
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Agent pool closed the connection")
+        response: Dict[str, Any] = json.loads(line)
+        if not response.get("ok"):
+            raise PoolError(response.get("error", "Unknown agent pool error"))
+        return response
+
+    def submit(self, role: str, prompt: str) -> PoolResult:
+        """Run one task on a warm worker and wait for its result."""
+        return PoolResult(**self.call("submit", role=role, prompt=prompt)["result"])
+
+    def stats(self) -> Dict[str, Any]:
+        """Task counts, warm-ups and launch latency saved."""
+        stats: Dict[str, Any] = self.call("stats")["stats"]
+        return stats
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "PoolServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                response = self.server.dispatch(
+                    request["action"], request.get("args") or {}
+                )
+                response["ok"] = True
+            except (PoolError, KeyError, TypeError, ValueError) as e:
+                response = {"ok": False, "error": str(e)}
+            except Exception as e:
+                # Failures such as a full disk are reported too, instead of
+                # dropping the connection
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(response) + "\n").encode())
+            self.wfile.flush()
+
+
+class PoolServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve tasks from one resident ``AgentPool``."""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(
+        self, socket_path: Path, pool: AgentPool, idle_timeout: Optional[float] = None
+    ):
+        self.socket_path = Path(socket_path)
+        self.pool = pool
+        self.idle_timeout = idle_timeout
+        self.last_request = time.monotonic()
+        self.busy = 0
+        self.stopping = threading.Event()
+        self._actions: Dict[str, Callable[..., Dict[str, Any]]] = {
+            "ping": lambda: {"pid": os.getpid(), "roles": pool.roles},
+            "submit": self._submit,
+            "stats": lambda: {"stats": pool.stats()},
+            "shutdown": self._request_shutdown,
+        }
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        super().__init__(str(self.socket_path), _RequestHandler)
+        os.chmod(self.socket_path, 0o600)
+        if idle_timeout:
+            threading.Thread(target=self._idle_loop, daemon=True).start()
+
+    def dispatch(self, action: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request against the pool."""
+        self.last_request = time.monotonic()
+        if action not in self._actions:
+            raise PoolError(f"Unknown action: {action}")
+        return self._actions[action](**args)
+
+    def _submit(self, role: str, prompt: str) -> Dict[str, Any]:
+        self.busy += 1
+        try:
+            return {"result": self.pool.submit(role, prompt).result().as_dict()}
+        finally:
+            self.busy -= 1
+            self.last_request = time.monotonic()
+
+    def _request_shutdown(self) -> Dict[str, Any]:
+        self.stopping.set()
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return {}
+
+    def _idle_loop(self) -> None:
+        """Exit once no task has been submitted for ``idle_timeout`` seconds."""
+        while not self.stopping.wait(1.0):
+            idle = time.monotonic() - self.last_request
+            if self.idle_timeout and idle > self.idle_timeout and not self.busy:
+                self._request_shutdown()
+
+    def server_close(self) -> None:
+        """Stop the workers and remove the socket."""
+        super().server_close()
+        self.pool.close()
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+def serve(
+    pool: AgentPool,
+    socket_path: Path = SOCKET_PATH,
+    idle_timeout: Optional[float] = None,
+) -> None:
+    """Run the pool server in the foreground until it is shut down."""
+    server = PoolServer(socket_path, pool, idle_timeout)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def start(
+    socket_path: Path = SOCKET_PATH, serve_args: Optional[List[str]] = None
+) -> bool:
+    """Start a detached pool server unless one is already running."""
+    existing = PoolClient.connect(socket_path)
+    if existing:
+        existing.close()
+        return False
+    subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "src.services.agent_pool",
+            "--socket",
+            str(socket_path),
+            "serve",
+            *(serve_args or []),
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        client = PoolClient.connect(socket_path)
+        if client:
+            client.close()
+            return True
+        time.sleep(0.05)
+    raise TimeoutError(f"Agent pool did not start on {socket_path}")
+
+
+def format_result(result: PoolResult) -> str:
+    """One status line for a finished task."""
+    status = f"✅ {result.role} finished" if result.ok else f"❌ {result.role} failed"
+    return (
+        f"{status} ({result.duration:.1f}s, waited {result.queue_wait:.1f}s,"
+        f" worker {result.worker_pid}) - Log: {result.log_path}"
+    )
+
+
+def format_stats(stats: Dict[str, Any]) -> List[str]:
+    """Warm-pool report lines, including the launch latency saved."""
+    return [
+        f"⚡ Warm pool: {stats['tasks']} task(s) on {stats['worker_starts']}"
+        f" worker start(s), {stats['recycled']} recycled, {stats['failed']} failed",
+        f"   Cold start (CLI start-up + role load): {stats['cold_start']:.2f}s average",
+        f"   Launch latency saved: ~{stats['launch_saved']:.1f}s"
+        f" ({stats['tasks']} × {stats['cold_start']:.2f}s, less"
+        f" {stats['startup_wait_total']:.1f}s tasks spent waiting for warm-ups)",
+        f"   Queue wait: {stats['queue_wait_mean']:.2f}s average",
+    ]
+
+
+def _run_remote(
+    socket_path: Path,
+    tasks: List[Tuple[str, str]],
+    report: Callable[[PoolResult], None],
+) -> List[PoolResult]:
+    # One connection per task; the server runs them on its warm workers
+    def submit(task: Tuple[str, str]) -> PoolResult:
+        with PoolClient(socket_path) as client:
+            result = client.submit(*task)
+        report(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=len(tasks) or 1) as executor:
+        return list(executor.map(submit, tasks))
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Warm pool of resident agents")
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="Run agent:task pairs on warm workers")
+    run_parser.add_argument("tasks", help="Comma-separated agent:task pairs")
+    serve_parser = sub.add_parser("serve", help="Run the pool in the foreground")
+    start_parser = sub.add_parser("start", help="Detach and serve")
+    for p in (run_parser, serve_parser, start_parser):
+        p.add_argument(
+            "--size",
+            type=int,
+            default=int(env_number("AGENT_POOL_SIZE", 1)),
+            help="Warm workers per role (env AGENT_POOL_SIZE)",
+        )
+        p.add_argument(
+            "--max-tasks",
+            type=int,
+            default=int(env_number("AGENT_POOL_MAX_TASKS", 20)),
+            help="Tasks per worker before it is recycled (env AGENT_POOL_MAX_TASKS)",
+        )
+        p.add_argument(
+            "--timeout",
+            type=float,
+            default=env_number("ORCHESTRATE_TIMEOUT", 1800),
+            help="Seconds per task, 0 for none (env ORCHESTRATE_TIMEOUT)",
+        )
+    for p in (serve_parser, start_parser):
+        p.add_argument("--roles", nargs="*", default=[], help="Roles to pre-warm")
+        p.add_argument(
+            "--all-roles",
+            action="store_true",
+            help="Pre-warm every role in .claude/commands",
+        )
+        p.add_argument(
+            "--idle-timeout",
+            type=float,
+            default=600.0,
+            help="Exit after this many idle seconds (0 to never exit)",
+        )
+    submit_parser = sub.add_parser("submit", help="Run one task on the resident pool")
+    submit_parser.add_argument("role")
+    submit_parser.add_argument("prompt")
+    sub.add_parser("status", help="Exit 0 when a pool is running")
+    sub.add_parser("stats", help="Show tasks served and launch latency saved")
+    sub.add_parser("stop", help="Stop the resident pool and its workers")
+    args = parser.parse_args()
+
+    if args.command in ("serve", "start"):
+        roles = available_roles() if args.all_roles else args.roles
+        if args.command == "start":
+            serve_args = ["--size", str(args.size), "--max-tasks", str(args.max_tasks)]
+            serve_args += ["--timeout", str(args.timeout)]
+            serve_args += ["--idle-timeout", str(args.idle_timeout), "--roles", *roles]
+            if start(args.socket, serve_args):
+                print(f"✅ Agent pool started on {args.socket} ({args.size} per role)")
+            else:
+                print(f"ℹ️  Agent pool already running on {args.socket}")
+            return
+        pool = AgentPool(roles, args.size, args.max_tasks, args.timeout)
+        serve(pool, args.socket, args.idle_timeout or None)
+        return
+
+    if args.command == "run":
+        try:
+            agent_tasks = parse_tasks(args.tasks)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(2)
+        # The role is already loaded, so workers only get the task itself
+        tasks = [(task.agent, task.description) for task in agent_tasks]
+
+        def report(result: PoolResult) -> None:
+            print(format_result(result), flush=True)
+
+        print(f"⚡ Running {len(tasks)} agent task(s) on warm workers")
+        client = PoolClient.connect(args.socket)
+        if client:
+            client.close()
+            results = _run_remote(args.socket, tasks, report)
+            with PoolClient(args.socket) as client:
+                stats = client.stats()
+        else:
+            # No resident pool: one per run, sized to the widest role
+            counts = collections.Counter(role for role, _ in tasks)
+            size = min(args.size, max(counts.values(), default=1))
+            roles = list(counts)
+            with AgentPool(roles, size, args.max_tasks, args.timeout) as pool:
+                results = pool.run(tasks, on_result=report)
+                stats = pool.stats()
+        print("\n".join(format_stats(stats)))
+        failed = [result for result in results if not result.ok]
+        if failed:
+            print(f"❌ {len(failed)} of {len(results)} pooled tasks failed")
+            sys.exit(1)
+        print("✅ All pooled tasks completed")
+        return
+
+    client = PoolClient.connect(args.socket)
+    if client is None:
+        print("⚪ Agent pool is not running")
+        sys.exit(0 if args.command == "stop" else 1)
+    try:
+        with client:
+            if args.command == "status":
+                info = client.call("ping")
+                roles = ", ".join(info["roles"]) or "none yet"
+                print(f"🟢 Agent pool running (PID {info['pid']}), roles: {roles}")
+            elif args.command == "stats":
+                print("\n".join(format_stats(client.stats())))
+            elif args.command == "stop":
+                client.call("shutdown")
+                deadline = time.monotonic() + 10
+                while args.socket.exists() and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                print("🛑 Agent pool stopped")
+            elif args.command == "submit":
+                result = client.submit(args.role, args.prompt)
+                print(result.output)
+                print(format_result(result))
+                sys.exit(0 if result.ok else 1)
+    except PoolError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Gate Cache - content-addressed results for quality-gate commands.
+
+A quality gate is a shell command whose verdict only depends on the command
+and the files it inspects. The cache keys each result by a hash of the gate
+name and command plus the content of its input files, so re-running a gate on
+unchanged code returns the stored pass or fail (and output) instantly,
+while any edit to an input produces a new key and a fresh run.
+
+File digests are memoized by (size, mtime, inode), so hashing the inputs of
+a large tree only reads the files that changed since the previous call.
+Results are kept in SQLite under ``.cache/gates`` and evicted least recently
+used first once the entry count or total output size exceeds its bound.
+
+Usage:
+    python3 -m src.services.gate_cache run "Security Scan" "bandit -r src/" --inputs src
+    python3 -m src.services.gate_cache invalidate [--gate "Security Scan"]
+    python3 -m src.services.gate_cache stats
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Set, Tuple
+
+from ..utils import tracing
+
+CACHE_DIR = Path(os.environ.get("GATE_CACHE_DIR", ".cache/gates"))
+
+# Directories that never count as gate inputs
+SKIP_DIRS = {
+    ".git",
+    ".cache",
+    "__pycache__",
+    ".pytest_cache",
+    ".mypy_cache",
+    "htmlcov",
+    "node_modules",
+    ".venv",
+    "venv",
+}
+
+# Stored output per entry is truncated beyond this many bytes
+MAX_OUTPUT_BYTES = 1_000_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    gate TEXT NOT NULL,
+    command TEXT NOT NULL,
+    exit_code INTEGER NOT NULL,
+    output BLOB NOT NULL,
+    duration REAL NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_use ON results (last_used);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    stamp TEXT NOT NULL,
+    digest TEXT NOT NULL
+);
+"""
+
+
+class GateResult:
+    """Verdict of one gate run, fresh or from the cache."""
+
+    __slots__ = ("gate", "command", "exit_code", "output", "duration", "cached")
+
+    def __init__(
+        self,
+        gate: str,
+        command: str,
+        exit_code: int,
+        output: bytes,
+        duration: float,
+        cached: bool = False,
+    ):
+        self.gate = gate
+        self.command = command
+        self.exit_code = exit_code
+        self.output = output
+        self.duration = duration
+        self.cached = cached
+
+    @property
+    def passed(self) -> bool:
+        """Whether the gate command succeeded."""
+        return self.exit_code == 0
+
+
+def _walk(root: Path) -> Iterator[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            yield Path(dirpath) / name
+
+
+def _tracked_files() -> Optional[List[Path]]:
+    """Tracked and untracked, non-ignored files when inside a git work tree."""
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [Path(p) for p in result.stdout.decode().split("\0") if p]
+
+
+def expand_inputs(inputs: Sequence[str]) -> List[Path]:
+    """Resolve input paths, directories and globs to a sorted file list.
+
+    With no inputs, the whole working tree (minus git-ignored files) counts.
+    """
+    if not inputs:
+        tracked = _tracked_files()
+        listed = tracked if tracked is not None else list(_walk(Path(".")))
+        return sorted(set(listed))
+    files: Set[Path] = set()
+    for pattern in inputs:
+        is_glob = any(c in pattern for c in "*?[")
+        matches = sorted(Path(".").glob(pattern)) if is_glob else []
+        for path in matches or [Path(pattern)]:
+            if path.is_dir():
+                files.update(_walk(path))
+            else:
+                files.add(path)
+    return sorted(files)
+
+
+class GateCache:
+    """LRU, size-bounded store of gate results keyed by command and inputs."""
+
+    def __init__(
+        self,
+        cache_dir: Path = CACHE_DIR,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries or int(
+            os.environ.get("GATE_CACHE_MAX_ENTRIES", "256")
+        )
+        self.max_bytes = max_bytes or int(
+            os.environ.get("GATE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        )
+        self.conn = sqlite3.connect(
+            str(self.cache_dir / "cache.db"), timeout=60, isolation_level=None
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "GateCache":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- keys ---------------------------------------------------------------
+
+    def file_digest(self, path: Path) -> str:
+        """Content hash of ``path``, memoized by size, mtime and inode."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return "missing"
+        stamp = f"{stat.st_size}:{stat.st_mtime_ns}:{stat.st_ino}"
+        row = self.conn.execute(
+            "SELECT stamp, digest FROM files WHERE path = ?", (str(path),)
+        ).fetchone()
+        if row and row[0] == stamp:
+            return str(row[1])
+        sha = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(block)
+        except OSError:
+            return "unreadable"
+        digest = sha.hexdigest()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, stamp, digest) VALUES (?, ?, ?)",
+            (str(path), stamp, digest),
+        )
+        return digest
+
+    def key(self, gate: str, command: str, inputs: Sequence[str] = ()) -> str:
+        """Cache key for a gate's ``command`` run against the current ``inputs``."""
+        sha = hashlib.sha256(f"{gate}\0{command}\0".encode())
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for path in expand_inputs(inputs):
+                sha.update(f"{path}\0{self.file_digest(path)}\n".encode())
+        finally:
+            self.conn.execute("COMMIT")
+        return sha.hexdigest()
+
+    # -- results ------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[GateResult]:
+        """Return the cached result for ``key`` and mark it recently used."""
+        row = self.conn.execute(
+            "SELECT gate, command, exit_code, output, duration FROM results"
+            " WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        self.conn.execute(
+            "UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key)
+        )
+        return GateResult(row[0], row[1], row[2], bytes(row[3]), row[4], cached=True)
+
+    def put(self, key: str, result: GateResult) -> None:
+        """Store a result, then evict least recently used entries if needed."""
+        now = time.time()
+        output = result.output
+        if len(output) > MAX_OUTPUT_BYTES:
+            output = output[-MAX_OUTPUT_BYTES:]
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (key, gate, command, exit_code, output,"
+            " duration, created, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                result.gate,
+                result.command,
+                result.exit_code,
+                output,
+                result.duration,
+                now,
+                now,
+            ),
+        )
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond the count and size bounds."""
+        rows = self.conn.execute(
+            "SELECT key, LENGTH(output) FROM results ORDER BY last_used DESC"
+        ).fetchall()
+        kept = total = 0
+        stale = []
+        for key, size in rows:
+            if kept < self.max_entries and total + size <= self.max_bytes:
+                kept += 1
+                total += size
+            else:
+                stale.append((key,))
+        self.conn.executemany("DELETE FROM results WHERE key = ?", stale)
+        return len(stale)
+
+    def invalidate(self, gate: Optional[str] = None) -> int:
+        """Forget cached results, for one gate or for all of them."""
+        if gate is None:
+            cursor = self.conn.execute("DELETE FROM results")
+        else:
+            cursor = self.conn.execute("DELETE FROM results WHERE gate = ?", (gate,))
+        return cursor.rowcount
+
+    def stats(self) -> Tuple[int, int]:
+        """Number of cached results and their total output size in bytes."""
+        row = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(output)), 0) FROM results"
+        ).fetchone()
+        return int(row[0]), int(row[1])
+
+
+def execute(gate: str, command: str, stream: bool = False) -> GateResult:
+    """Run a gate command with ``bash -c``, capturing and optionally echoing it."""
+    start = time.monotonic()
+    proc = subprocess.Popen(
+        ["bash", "-c", command], stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+    assert proc.stdout is not None
+    chunks = []
+    for line in proc.stdout:
+        chunks.append(line)
+        if stream:
+            sys.stdout.buffer.write(line)
+            sys.stdout.flush()
+    proc.wait()
+    return GateResult(
+        gate, command, proc.returncode, b"".join(chunks), time.monotonic() - start
+    )
+
+
+def run_gate(
+    gate: str,
+    command: str,
+    inputs: Sequence[str] = (),
+    cache: Optional[GateCache] = None,
+    stream: bool = False,
+) -> GateResult:
+    """Return the gate's cached verdict for the current inputs, or run it."""
+    with tracing.span(f"gate {gate}", "gate") as span:
+        if cache is None:
+            result = execute(gate, command, stream)
+        else:
+            key = cache.key(gate, command, inputs)
+            cached = cache.get(key)
+            if cached is None:
+                result = execute(gate, command, stream)
+                cache.put(key, result)
+            else:
+                result = cached
+                if stream:
+                    sys.stdout.buffer.write(result.output)
+                    sys.stdout.flush()
+        span.set(passed=result.passed, cached=result.cached)
+    return result
+
+
+def cache_enabled() -> bool:
+    """The cache can be switched off with ``GATE_CACHE=0``."""
+    return os.environ.get("GATE_CACHE", "1") not in ("0", "false", "no")
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Cached quality-gate runner")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="Run a gate, reusing a cached verdict")
+    run_parser.add_argument("gate")
+    run_parser.add_argument("check_command")
+    run_parser.add_argument(
+        "--inputs", nargs="*", default=[], help="Files, directories or globs it reads"
+    )
+    run_parser.add_argument("--no-cache", action="store_true")
+    invalidate_parser = sub.add_parser("invalidate", help="Forget cached verdicts")
+    invalidate_parser.add_argument("--gate", help="Only this gate")
+    sub.add_parser("stats", help="Show cache size")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if args.no_cache or not cache_enabled():
+            result = run_gate(args.gate, args.check_command, stream=True)
+        else:
+            with GateCache() as cache:
+                result = run_gate(
+                    args.gate, args.check_command, args.inputs, cache, stream=True
+                )
+        if result.cached:
+            verdict = "pass" if result.passed else "fail"
+            took = f"took {result.duration:.1f}s"
+            print(f"♻️  Cached {verdict} for unchanged inputs ({took} originally)")
+        sys.exit(result.exit_code)
+
+    with GateCache() as cache:
+        if args.command == "invalidate":
+            removed = cache.invalidate(args.gate)
+            print(f"🗑️  Removed {removed} cached gate result(s)")
+        else:
+            count, size = cache.stats()
+            print(f"📦 {count} cached gate result(s), {size / 1024:.1f} KiB of output")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Gate Runner - run independent quality gates concurrently.
+
+``adaptive-workflow.sh`` used to run its gates one after another even though
+none of them depends on another, so the gate phase took the sum of every
+gate's duration. The runner starts all queued gates at once (each is its own
+``bash -c`` process, looked up in the gate cache first), prints each gate's
+output as a single block the moment it finishes, and ends with one
+aggregated verdict, so the phase takes about as long as the slowest gate.
+
+With ``--markers`` every result is followed by a ``::gate-passed:: NAME`` or
+``::gate-failed:: NAME`` line, which the shell script reads to route each
+failure to ``add_remediation_steps`` while the other gates are still running.
+
+Usage:
+    python3 -m src.services.gate_runner \\
+        --gate "Security Scan" "bandit -r src/" "src" \\
+        --gate "Code Coverage" "pytest --cov=src" "src tests"
+"""
+
+import argparse
+import shlex
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from .gate_cache import GateCache, GateResult, cache_enabled, run_gate
+from .scheduler import env_number
+
+
+@dataclass
+class GateSpec:
+    """One queued gate: its name, check command and the inputs it reads."""
+
+    name: str
+    command: str
+    inputs: List[str] = field(default_factory=list)
+
+
+@dataclass
+class GateReport:
+    """Aggregated verdict of a gate run."""
+
+    results: List[GateResult]
+    wall_time: float
+
+    @property
+    def passed(self) -> bool:
+        """Whether every gate passed."""
+        return all(result.passed for result in self.results)
+
+    @property
+    def failed(self) -> List[GateResult]:
+        """Failed gates, in completion order."""
+        return [result for result in self.results if not result.passed]
+
+    @property
+    def serial_time(self) -> float:
+        """How long the gates would have taken one after another."""
+        return sum(result.duration for result in self.results)
+
+
+def _run_spec(spec: GateSpec, use_cache: bool) -> GateResult:
+    # One cache connection per worker thread; SQLite connections aren't shared
+    if not use_cache:
+        return run_gate(spec.name, spec.command)
+    with GateCache() as cache:
+        return run_gate(spec.name, spec.command, spec.inputs, cache)
+
+
+def run_gates(
+    gates: List[GateSpec],
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+    on_result: Optional[Callable[[GateResult], None]] = None,
+) -> GateReport:
+    """Run every gate concurrently, reporting each result as it completes."""
+    start = time.monotonic()
+    results: List[GateResult] = []
+    if not gates:
+        return GateReport(results, 0.0)
+    # Gates are subprocesses, so threads only wait on them
+    with ThreadPoolExecutor(max_workers=max_workers or len(gates)) as pool:
+        futures = [pool.submit(_run_spec, spec, use_cache) for spec in gates]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return GateReport(results, time.monotonic() - start)
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run quality gates concurrently")
+    parser.add_argument(
+        "--gate",
+        nargs=3,
+        action="append",
+        default=[],
+        metavar=("NAME", "COMMAND", "INPUTS"),
+        help="A gate, with its inputs as one space-separated string",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=int(env_number("GATE_MAX_PARALLEL", 0)) or None,
+        help="Gates allowed to run at once (env GATE_MAX_PARALLEL, default all)",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument(
+        "--markers", action="store_true", help="Print a status line per gate"
+    )
+    args = parser.parse_args()
+
+    gates = [
+        GateSpec(name, cmd, shlex.split(inputs)) for name, cmd, inputs in args.gate
+    ]
+    print(f"🚦 Running {len(gates)} quality gates concurrently", flush=True)
+
+    def report(result: GateResult) -> None:
+        source = "cached" if result.cached else f"{result.duration:.1f}s"
+        print(f"\n🔍 Quality Gate: {result.gate} ({source})")
+        print(f"Running: {result.command}")
+        sys.stdout.flush()
+        sys.stdout.buffer.write(result.output)
+        if result.output and not result.output.endswith(b"\n"):
+            sys.stdout.buffer.write(b"\n")
+        sys.stdout.flush()
+        if args.markers:
+            status = "passed" if result.passed else "failed"
+            print(f"::gate-{status}:: {result.gate}")
+        sys.stdout.flush()
+
+    gate_report = run_gates(
+        gates,
+        max_workers=args.max_workers,
+        use_cache=not args.no_cache and cache_enabled(),
+        on_result=report,
+    )
+    failed = len(gate_report.failed)
+    print(
+        f"\n⏱️  Gates took {gate_report.wall_time:.1f}s"
+        f" ({gate_report.serial_time:.1f}s if run one after another)"
+    )
+    if failed:
+        print(f"❌ {failed} of {len(gates)} quality gates failed")
+        sys.exit(1)
+    print(f"✅ All {len(gates)} quality gates passed")
+
+
+if __name__ == "__main__":
+    main()
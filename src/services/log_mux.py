@@ -0,0 +1,430 @@
+"""
+Log Multiplexer - follow every agent log as one labelled stream.
+
+Headless agents each write their own log file, and ``tail -f
+/tmp/claude-*.log`` interleaves them unlabelled and only sees the files that
+existed when it started. The multiplexer follows all active agent logs from
+one asyncio loop and writes a single merged, line-buffered stream with each
+line prefixed by its agent and task ID (or as JSON lines with ``--json``).
+
+Logs are discovered from the agent supervisor's registry (falling back to a
+glob), so agents spawned later are picked up automatically. Files are
+polled: busy logs every ``interval`` seconds, quiet ones with exponential
+backoff up to ``MAX_BACKOFF``, so a hundred idle agents cost about a hundred
+cheap reads and stats per second. A log whose inode changes or that shrinks is
+treated as rotated or truncated: the rest of the old file is drained and the
+new one is read from the start. A log whose agent has been inactive for a
+whole refresh cycle is drained and closed, so finished agents hold no file
+open and cost no polls; if the task restarts, its log is followed again from
+where reading stopped. The last ``buffer_lines`` lines of every agent are
+kept in memory for callers that want recent output.
+
+Usage:
+    python3 -m src.services.log_mux                       # supervisor's agents
+    python3 -m src.services.log_mux --json --exit-when-done
+    python3 -m src.services.log_mux --glob "/tmp/claude-*.log"
+    python3 -m src.services.log_mux architect:ARCH-1=/tmp/a.log dev:DEV-1=/tmp/d.log
+"""
+
+import argparse
+import asyncio
+import collections
+import glob
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import (
+    IO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .supervisor import ACTIVE, SOCKET_PATH, SupervisorClient, SupervisorError
+
+# Most bytes read from one log per poll, so a chatty agent can't starve others
+READ_CHUNK = 64 * 1024
+
+# Quiet logs back off up to this many seconds between polls
+MAX_BACKOFF = 2.0
+
+DEFAULT_GLOB = str(Path(tempfile.gettempdir()) / "claude-*.log")
+LOG_NAME_RE = re.compile(r"claude-(?P<agent>.+)-(?P<suffix>[^-]+)\.log$")
+
+
+class LogSource(NamedTuple):
+    """A log file and the agent task writing it."""
+
+    agent: str
+    task_id: str
+    path: str
+    active: bool = True
+
+
+# Where reading a file stopped: its inode and byte offset
+Position = Tuple[Optional[int], int]
+
+
+class FollowedLog:
+    """Read position and rotation state for one followed file."""
+
+    __slots__ = (
+        "source",
+        "file",
+        "inode",
+        "partial",
+        "idle",
+        "next_poll",
+        "finished",
+    )
+
+    def __init__(
+        self,
+        source: LogSource,
+        from_start: bool = True,
+        resume: Optional[Position] = None,
+    ):
+        self.source = source
+        self.file: Optional[IO[bytes]] = None
+        self.inode: Optional[int] = None
+        self.partial = b""
+        self.idle = 0
+        self.next_poll = 0.0
+        # Whether the agent was already inactive at the last refresh
+        self.finished = not source.active
+        self._open(seek_end=not from_start)
+        if resume:
+            self._resume(*resume)
+
+    @property
+    def position(self) -> Position:
+        """Inode and offset reading has reached."""
+        return self.inode, self.file.tell() if self.file else 0
+
+    def _open(self, seek_end: bool = False) -> None:
+        try:
+            self.file = open(self.source.path, "rb")
+        except OSError:
+            self.file = None
+            return
+        self.inode = os.fstat(self.file.fileno()).st_ino
+        if seek_end:
+            self.file.seek(0, os.SEEK_END)
+
+    def _resume(self, inode: Optional[int], offset: int) -> None:
+        # Same file and not truncated since: carry on where reading stopped
+        if self.file is None or inode != self.inode:
+            return
+        if os.fstat(self.file.fileno()).st_size >= offset:
+            self.file.seek(offset)
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def poll(self) -> List[str]:
+        """Complete lines written since the last poll."""
+        if self.file is None:
+            self._open()
+            if self.file is None:
+                return []
+        data = self.file.read(READ_CHUNK)
+        if data:
+            return self._split(data)
+        try:
+            stat = os.stat(self.source.path)
+        except OSError:
+            return []
+        if stat.st_ino == self.inode and stat.st_size >= self.file.tell():
+            return []
+        # Rotated or truncated: the old file is drained, start the new one
+        lines = self.flush()
+        self.close()
+        self._open()
+        if self.file:
+            lines += self._split(self.file.read(READ_CHUNK))
+        return lines
+
+    def _split(self, data: bytes) -> List[str]:
+        *lines, self.partial = (self.partial + data).split(b"\n")
+        return [line.decode(errors="replace").rstrip("\r") for line in lines]
+
+    def flush(self) -> List[str]:
+        """Any final unterminated line."""
+        rest, self.partial = self.partial, b""
+        return [rest.decode(errors="replace")] if rest else []
+
+
+class LogMultiplexer:
+    """Merge many agent logs into one prefixed, line-buffered stream."""
+
+    def __init__(
+        self,
+        discover: Callable[[], Iterable[LogSource]],
+        out: IO[str] = sys.stdout,
+        json_lines: bool = False,
+        buffer_lines: int = 200,
+        interval: float = 0.1,
+        from_start: bool = False,
+    ):
+        self.discover = discover
+        self.out = out
+        self.json_lines = json_lines
+        self.interval = interval
+        self.from_start = from_start
+        self.buffer_lines = buffer_lines
+        self.logs: Dict[str, FollowedLog] = {}
+        self.retired: Dict[str, Position] = {}
+        self.buffers: Dict[str, Deque[str]] = {}
+        self._started = False
+
+    def tail(self, task_id: str, lines: Optional[int] = None) -> List[str]:
+        """The most recent lines from one agent task."""
+        buffer = list(self.buffers.get(task_id, ()))
+        return buffer[-lines:] if lines else buffer
+
+    def refresh(self) -> bool:
+        """Pick up new logs and retire finished ones.
+
+        Return whether any agent is still active. A log whose agent was
+        already inactive (or gone) at the previous refresh has had a full
+        cycle to write its last lines, so it is drained and closed.
+        """
+        sources = {source.path: source for source in self.discover()}
+        retired = 0
+        for path, followed in list(self.logs.items()):
+            source = sources.get(path)
+            if source is not None:
+                followed.source = source
+            if source is None or not source.active:
+                if followed.finished:
+                    retired += self._retire(path)
+                    continue
+                followed.finished = True
+            else:
+                followed.finished = False
+        for path, source in sources.items():
+            if path in self.logs or (path in self.retired and not source.active):
+                continue
+            # Logs already present at start-up are tailed, new agents read whole
+            from_start = self.from_start or self._started
+            self.logs[path] = FollowedLog(
+                source, from_start, self.retired.pop(path, None)
+            )
+            self.buffers.setdefault(
+                source.task_id, collections.deque(maxlen=self.buffer_lines)
+            )
+        self._started = True
+        if retired:
+            self.out.flush()
+        return any(source.active for source in sources.values())
+
+    def poll(self, now: Optional[float] = None) -> int:
+        """Read every log that is due; return the number of lines written."""
+        now = time.monotonic() if now is None else now
+        written = 0
+        for followed in self.logs.values():
+            if followed.next_poll > now:
+                continue
+            lines = followed.poll()
+            if lines:
+                followed.idle = 0
+                self._emit(followed.source, lines)
+                written += len(lines)
+            else:
+                followed.idle += 1
+            backoff = min(MAX_BACKOFF, self.interval * 2 ** min(followed.idle, 5))
+            followed.next_poll = now + (self.interval if lines else backoff)
+        if written:
+            self.out.flush()
+        return written
+
+    def drain(self) -> None:
+        """Read everything that is left, including unterminated last lines."""
+        for followed in self.logs.values():
+            self._drain_one(followed)
+            followed.close()
+        self.out.flush()
+
+    def _drain_one(self, followed: FollowedLog) -> int:
+        written = 0
+        while True:
+            lines = followed.poll()
+            if not lines:
+                break
+            self._emit(followed.source, lines)
+            written += len(lines)
+        rest = followed.flush()
+        self._emit(followed.source, rest)
+        return written + len(rest)
+
+    def _retire(self, path: str) -> int:
+        # Stop following a finished agent's log; remember where reading stopped
+        followed = self.logs.pop(path)
+        written = self._drain_one(followed)
+        self.retired[path] = followed.position
+        followed.close()
+        return written
+
+    def _emit(self, source: LogSource, lines: List[str]) -> None:
+        buffer = self.buffers.setdefault(
+            source.task_id, collections.deque(maxlen=self.buffer_lines)
+        )
+        buffer.extend(lines)
+        if self.json_lines:
+            stamp = time.time()
+            for line in lines:
+                record = {
+                    "time": stamp,
+                    "agent": source.agent,
+                    "task_id": source.task_id,
+                    "line": line,
+                }
+                self.out.write(json.dumps(record) + "\n")
+        else:
+            prefix = f"[{source.agent} {source.task_id}] "
+            self.out.write("".join(f"{prefix}{line}\n" for line in lines))
+
+    async def run(
+        self,
+        stop: Optional[asyncio.Event] = None,
+        exit_when_done: bool = False,
+        refresh_every: float = 1.0,
+    ) -> None:
+        """Follow logs until ``stop`` is set (or every agent has finished)."""
+        stop = stop or asyncio.Event()
+        next_refresh = 0.0
+        try:
+            while not stop.is_set():
+                now = time.monotonic()
+                if now >= next_refresh:
+                    active = self.refresh()
+                    next_refresh = now + refresh_every
+                    if exit_when_done and not active:
+                        break
+                self.poll(now)
+                try:
+                    await asyncio.wait_for(stop.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.drain()
+
+
+def supervisor_sources(socket_path: Path = SOCKET_PATH) -> List[LogSource]:
+    """Logs of every agent the supervisor knows about."""
+    client = SupervisorClient.connect(socket_path)
+    if client is None:
+        return []
+    try:
+        with client:
+            agents = client.list()
+    except (OSError, ConnectionError, SupervisorError):
+        return []
+    return [
+        LogSource(
+            info["agent"],
+            info["task_id"],
+            info["log_path"],
+            info["status"] in ACTIVE,
+        )
+        for info in agents
+    ]
+
+
+def recently_written(path: str, within: float = 60.0) -> bool:
+    """Whether a file was modified in the last ``within`` seconds."""
+    try:
+        return time.time() - os.stat(path).st_mtime < within
+    except OSError:
+        return False
+
+
+def glob_sources(pattern: str = DEFAULT_GLOB) -> List[LogSource]:
+    """Logs matching a glob; a file counts as active while recently written."""
+    sources = []
+    for path in sorted(glob.glob(pattern)):
+        match = LOG_NAME_RE.search(os.path.basename(path))
+        agent = match.group("agent") if match else Path(path).stem
+        task_id = match.group("suffix") if match else Path(path).stem
+        sources.append(LogSource(agent, task_id, path, recently_written(path)))
+    return sources
+
+
+def parse_source(spec: str) -> LogSource:
+    """Parse ``agent:TASK-ID=path`` (or just ``path``)."""
+    label, sep, path = spec.rpartition("=")
+    if not sep:
+        return LogSource(Path(spec).stem, Path(spec).stem, spec)
+    agent, _, task_id = label.partition(":")
+    return LogSource(agent, task_id or agent, path)
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Follow all agent logs at once")
+    parser.add_argument(
+        "sources", nargs="*", help="agent:TASK-ID=path (default: supervisor's agents)"
+    )
+    parser.add_argument("--glob", help="Follow files matching this pattern instead")
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH)
+    parser.add_argument("--json", action="store_true", help="Write JSON lines")
+    parser.add_argument(
+        "--from-start", action="store_true", help="Replay existing logs from the top"
+    )
+    parser.add_argument(
+        "--exit-when-done",
+        action="store_true",
+        help="Stop once no followed agent is running",
+    )
+    parser.add_argument("--interval", type=float, default=0.1)
+    parser.add_argument("--buffer-lines", type=int, default=200)
+    args = parser.parse_args()
+
+    discover: Callable[[], Iterable[LogSource]]
+    if args.sources:
+        fixed = [parse_source(spec) for spec in args.sources]
+
+        def discover() -> Iterable[LogSource]:
+            # Explicit files are active while they are still being written
+            return [s._replace(active=recently_written(s.path)) for s in fixed]
+
+    elif args.glob:
+        pattern = args.glob
+
+        def discover() -> Iterable[LogSource]:
+            return glob_sources(pattern)
+
+    else:
+        socket_path = args.socket
+
+        def discover() -> Iterable[LogSource]:
+            sources = supervisor_sources(socket_path)
+            return sources if sources else glob_sources()
+
+    mux = LogMultiplexer(
+        discover,
+        json_lines=args.json,
+        buffer_lines=args.buffer_lines,
+        interval=args.interval,
+        from_start=args.from_start,
+    )
+    try:
+        asyncio.run(mux.run(exit_when_done=args.exit_when_done))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
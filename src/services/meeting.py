@@ -0,0 +1,367 @@
+"""
+Meeting Engine - multi-agent meetings run in rounds.
+
+A meeting is a sequence of rounds, each a set of agent turns. Turns within a
+round are independent contributions (the Product Manager's priorities, the
+Developer's estimates and the Tester's risks in a planning meeting), so they
+run concurrently; the next round, typically the facilitator's summary,
+starts once all of them have finished. Meetings therefore take as long as
+their slowest turn per round rather than the sum of every turn.
+
+Each turn is told what was said before it. Rather than the full text of
+every earlier answer, it receives a compacted transcript: each contribution
+is stripped of blank lines and trimmed to an equal share of a fixed
+character budget (``MEETING_CONTEXT_CHARS``), so prompts stay small however
+long the meeting gets.
+
+Definition format (``scripts/meetings/<type>.json``)::
+
+    {
+      "name": "planning",
+      "description": "Sprint/project planning with relevant agents",
+      "title": "📅 Sprint Planning Meeting",
+      "convening": "Scrum Master, Product Manager, Developer, Tester",
+      "rounds": [
+        {"turns": [{"agent": "scrum", "label": "Scrum Master facilitating",
+                    "prompt": "You are the Scrum Master. ... {topic}"}]},
+        {"turns": [{"agent": "developer", ...}, {"agent": "tester", ...}]}
+      ]
+    }
+
+``{topic}`` in a prompt is replaced with the meeting topic. Agents run
+through the bounded scheduler, so ``ORCHESTRATE_TIMEOUT`` and
+``ORCHESTRATE_RETRIES`` apply to each turn.
+
+Usage:
+    python3 -m src.services.meeting run planning "Sprint 5 planning"
+    python3 -m src.services.meeting run technical "Database choice" --transcript adr.md
+    python3 -m src.services.meeting show planning
+    python3 -m src.services.meeting list
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils import tracing
+from .scheduler import AgentTask, Scheduler, TaskResult, env_number
+from .workflow import AGENT_NAMES
+
+MEETING_DIR = Path(__file__).resolve().parent.parent.parent / "scripts" / "meetings"
+
+# Characters of earlier discussion handed to each turn
+CONTEXT_CHARS = 4000
+
+# Smallest share of the budget a single contribution is trimmed to
+MIN_ENTRY_CHARS = 200
+
+NUMBERS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣"]
+
+
+class MeetingError(Exception):
+    """Raised for invalid or unknown meeting definitions."""
+
+
+def compact(text: str, limit: int) -> str:
+    """Condense an agent's answer to at most ``limit`` characters.
+
+    Blank lines and code fences are dropped and lines are joined; if that is
+    still too long, the middle is elided, keeping the opening (usually the
+    position taken) and the end (usually the conclusion).
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    flat = " ".join(line for line in lines if line and not line.startswith("```"))
+    if len(flat) <= limit:
+        return flat
+    marker = " […] "
+    head = (limit - len(marker)) * 2 // 3
+    tail = limit - len(marker) - head
+    return flat[:head].rstrip() + marker + flat[len(flat) - tail :].lstrip()
+
+
+class Transcript:
+    """Contributions in the order the meeting heard them."""
+
+    def __init__(self) -> None:
+        self.entries: List[Tuple[str, str]] = []
+
+    def add(self, speaker: str, text: str) -> None:
+        """Record one speaker's contribution."""
+        self.entries.append((speaker, text.strip()))
+
+    def compacted(self, budget: int = CONTEXT_CHARS) -> str:
+        """The discussion so far, fitted into about ``budget`` characters."""
+        if not self.entries:
+            return ""
+        share = max(MIN_ENTRY_CHARS, budget // len(self.entries))
+        return "\n".join(
+            f"- {speaker}: {compact(text, share)}" for speaker, text in self.entries
+        )
+
+    def markdown(self, title: str, topic: str) -> str:
+        """The full transcript as a markdown document."""
+        out = [f"# {title}", "", f"**Topic**: {topic}", ""]
+        for speaker, text in self.entries:
+            out += [f"## {speaker}", "", text, ""]
+        return "\n".join(out)
+
+
+class Turn:
+    """One agent's contribution to a round."""
+
+    __slots__ = ("agent", "label", "prompt", "speaker")
+
+    def __init__(
+        self, agent: str, prompt: str, label: str = "", speaker: Optional[str] = None
+    ):
+        self.agent = agent
+        self.prompt = prompt
+        self.label = label or agent
+        self.speaker = speaker or AGENT_NAMES.get(agent, agent[:1].upper() + agent[1:])
+
+    def task(self, topic: str, context: str = "") -> AgentTask:
+        """The agent task for this turn, with the discussion so far appended."""
+        prompt = self.prompt.replace("{topic}", topic)
+        if context:
+            prompt += (
+                "\n\nThe meeting so far (condensed, earliest first):\n"
+                f"{context}\n\nBuild on these points rather than repeating them."
+            )
+        return AgentTask(self.agent, self.label, prompt)
+
+
+class Meeting:
+    """A meeting type: rounds of turns, each round run concurrently."""
+
+    def __init__(
+        self,
+        name: str,
+        rounds: List[List[Turn]],
+        title: str = "",
+        description: str = "",
+        convening: str = "",
+    ):
+        if not rounds or not all(rounds):
+            raise MeetingError(f"{name}: every round needs at least one turn")
+        self.name = name
+        self.rounds = rounds
+        self.title = title or name
+        self.description = description
+        self.convening = convening
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Meeting":
+        """Build a meeting from its JSON definition."""
+        try:
+            rounds = [
+                [
+                    Turn(t["agent"], t["prompt"], t.get("label", ""), t.get("speaker"))
+                    for t in r["turns"]
+                ]
+                for r in data["rounds"]
+            ]
+        except (KeyError, TypeError) as e:
+            raise MeetingError(f"Invalid meeting definition: missing {e}") from None
+        return cls(
+            data.get("name", "meeting"),
+            rounds,
+            data.get("title", ""),
+            data.get("description", ""),
+            data.get("convening", ""),
+        )
+
+
+def load_meeting(name_or_path: str) -> Meeting:
+    """Load a meeting by type (from ``scripts/meetings``) or from a file."""
+    path = Path(name_or_path)
+    if not path.suffix:
+        path = MEETING_DIR / f"{name_or_path}.json"
+    if not path.exists():
+        raise MeetingError(f"Unknown meeting type: {name_or_path}")
+    try:
+        data = json.loads(path.read_text())
+    except json.JSONDecodeError as e:
+        raise MeetingError(f"{path}: {e}") from None
+    return Meeting.from_dict(data)
+
+
+def agent_output(result: TaskResult) -> str:
+    """What the agent said on its final attempt, read from its log."""
+    if result.log_path is None or not result.log_path.exists():
+        return ""
+    text = result.log_path.read_text(errors="replace")
+    # A retried turn's log holds every attempt; keep the last one
+    return text.split(f"\n--- attempt {result.attempts} ---\n", 1)[-1]
+
+
+class MeetingRun:
+    """Outcome of a meeting."""
+
+    def __init__(
+        self,
+        meeting: Meeting,
+        transcript: Transcript,
+        results: List[TaskResult],
+        elapsed: float,
+    ):
+        self.meeting = meeting
+        self.transcript = transcript
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        """Whether every turn succeeded."""
+        return all(result.ok for result in self.results)
+
+
+class MeetingEngine:
+    """Run a meeting round by round, with each round's turns in parallel."""
+
+    def __init__(
+        self,
+        scheduler: Optional[Scheduler] = None,
+        context_chars: int = CONTEXT_CHARS,
+        verbose: bool = True,
+    ):
+        self.scheduler = scheduler or Scheduler()
+        self.context_chars = context_chars
+        self.verbose = verbose
+
+    def _say(self, message: str) -> None:
+        if self.verbose:
+            print(message, flush=True)
+
+    def run(self, meeting: Meeting, topic: str) -> MeetingRun:
+        """Hold the meeting; return the transcript and every turn's result."""
+        start = time.monotonic()
+        transcript = Transcript()
+        results: List[TaskResult] = []
+        workers = min(self.scheduler.max_workers, max(map(len, meeting.rounds)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                for n, turns in enumerate(meeting.rounds, 1):
+                    number = NUMBERS[n - 1] if n <= len(NUMBERS) else f"{n}."
+                    labels = ", ".join(turn.label for turn in turns)
+                    self._say(f"\n{number} {labels}...")
+                    context = transcript.compacted(self.context_chars)
+                    with tracing.span(
+                        f"meeting round {n}", "meeting", turns=len(turns)
+                    ):
+                        spoken = self._run_round(pool, turns, topic, context)
+                    # Record the round in definition order, whatever finished first
+                    for turn, (result, output) in zip(turns, spoken):
+                        results.append(result)
+                        text = output if result.ok else "(no contribution)"
+                        transcript.add(turn.speaker, text)
+            except BaseException:
+                self.scheduler.cancel()
+                raise
+        return MeetingRun(meeting, transcript, results, time.monotonic() - start)
+
+    def _run_round(
+        self, pool: ThreadPoolExecutor, turns: List[Turn], topic: str, context: str
+    ) -> List[Tuple[TaskResult, str]]:
+        """Run a round's turns concurrently, reporting each as it finishes."""
+        futures = {
+            pool.submit(self._take_turn, turn, turn.task(topic, context)): turn
+            for turn in turns
+        }
+        spoken: Dict[int, Tuple[TaskResult, str]] = {}
+        for future in as_completed(futures):
+            turn = futures[future]
+            result = future.result()
+            output = agent_output(result)
+            spoken[id(turn)] = (result, output)
+            self._report(turn, result, output, len(turns) > 1)
+        return [spoken[id(turn)] for turn in turns]
+
+    def _take_turn(self, turn: Turn, task: AgentTask) -> TaskResult:
+        with tracing.span(f"meeting turn {turn.speaker}", "meeting") as span:
+            result = self.scheduler.run_one(task)
+            span.set(ok=result.ok, context_chars=len(task.prompt))
+        return result
+
+    def _report(
+        self, turn: Turn, result: TaskResult, output: str, headed: bool
+    ) -> None:
+        if headed:
+            self._say(f"\n💬 {turn.label} ({result.duration:.1f}s)")
+        if output:
+            self._say(output.rstrip("\n"))
+        if not result.ok:
+            reason = "timed out" if result.timed_out else "failed"
+            self._say(
+                f"❌ {turn.speaker} {reason} (exit {result.exit_code})"
+                f" - Log: {result.log_path}"
+            )
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run multi-agent meetings")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="Hold a meeting on a topic")
+    run_parser.add_argument("meeting", help="Meeting type or JSON file")
+    run_parser.add_argument("topic", nargs="+")
+    run_parser.add_argument(
+        "--transcript", type=Path, help="Write the full transcript (markdown) here"
+    )
+    show_parser = sub.add_parser("show", help="Print a meeting's rounds")
+    show_parser.add_argument("meeting")
+    sub.add_parser("list", help="List the meeting types")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for path in sorted(MEETING_DIR.glob("*.json")):
+            meeting = load_meeting(str(path))
+            print(f"  {meeting.name:14} - {meeting.description}")
+        return
+
+    try:
+        meeting = load_meeting(args.meeting)
+    except MeetingError as e:
+        print(str(e))
+        sys.exit(1)
+
+    if args.command == "show":
+        for n, turns in enumerate(meeting.rounds, 1):
+            print(f"{n}. {', '.join(turn.label for turn in turns)}")
+        return
+
+    topic = " ".join(args.topic)
+    widest = max(map(len, meeting.rounds))
+    scheduler = Scheduler(
+        max_workers=int(env_number("ORCHESTRATE_MAX_PARALLEL", widest)),
+        timeout=env_number("ORCHESTRATE_TIMEOUT", 1800),
+        retries=int(env_number("ORCHESTRATE_RETRIES", 0)),
+    )
+    engine = MeetingEngine(
+        scheduler, int(env_number("MEETING_CONTEXT_CHARS", CONTEXT_CHARS))
+    )
+    print(meeting.title)
+    print(f"Convening: {meeting.convening}")
+    try:
+        run = engine.run(meeting, topic)
+    except KeyboardInterrupt:
+        print("🛑 Meeting cancelled, running agents terminated")
+        sys.exit(130)
+
+    agent_time = sum(result.duration for result in run.results)
+    print(
+        f"\n📊 {len(run.results)} turns in {len(meeting.rounds)} rounds"
+        f" took {run.elapsed:.1f}s ({agent_time:.1f}s of agent time)"
+    )
+    if args.transcript:
+        args.transcript.parent.mkdir(parents=True, exist_ok=True)
+        args.transcript.write_text(run.transcript.markdown(meeting.title, topic))
+        print(f"📝 Transcript: {args.transcript}")
+    sys.exit(0 if run.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,543 @@
+"""
+Remediation Queue - deduplicated, dependency-ordered remediation work.
+
+``add_remediation_steps`` in ``adaptive-workflow.sh`` used to append lines
+of text to ``ADDITIONAL_STEPS``: every failure of the same gate added the
+same steps again, the steps carried no order beyond the text, and nothing
+ran them. The remediation queue stores typed items instead. Each reported
+issue expands through its playbook into one item per agent, with the items
+it has to wait for, and an item is identified by (agent, issue type,
+target): reporting the same issue again merges into the queued item rather
+than adding a copy.
+
+The queue lives in SQLite under ``.cache/remediation``, so it survives
+between workflow runs. Items belong to a scope (``--scope``, e.g. the
+feature a workflow works on): the same gate failing for two features gives
+two sets of items, and each workflow only shows and runs its own. ``run``
+hands the pending items to the workflow
+engine as a dependency graph: every item whose prerequisites are done
+starts right away, higher-priority issues (security first) ahead of the
+rest, up to ``--max-parallel`` agents at a time. A failed item is retried in
+the next loop, together with the items it held up, until it has used
+``REMEDIATION_MAX_ATTEMPTS`` attempts; items that depend on an item that
+gave up are blocked. A loop only follows one that finished at least one
+item, so each loop runs strictly fewer items than the one before.
+
+Usage:
+    python3 -m src.services.remediation add testing "Code Coverage" \\
+        --feedback "Increase test coverage to meet threshold"
+    python3 -m src.services.remediation show [--plain | --all]
+    python3 -m src.services.remediation run [--max-parallel 4] [--max-loops 3]
+    python3 -m src.services.remediation clear [--done]
+    python3 -m src.services.remediation --scope "user auth" show --plain
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..utils import tracing
+from .router import REVIEWER, RouterError, load_router
+from .scheduler import Scheduler, env_number
+from .workflow import Step, Workflow, WorkflowEngine, WorkflowRun, agent_name
+
+STATE_DIR = Path(os.environ.get("REMEDIATION_CACHE_DIR", ".cache/remediation"))
+
+# Remediation playbooks: issue type -> (agent, action, agents it waits for)
+PLAYBOOKS: Dict[str, List[Tuple[str, str, Tuple[str, ...]]]] = {
+    "architecture": [
+        ("architect", "Revise design based on review feedback", ()),
+        ("tester", "Create test cases for revised design", ("architect",)),
+        ("product", "Validate design meets requirements", ("architect",)),
+        ("reviewer", "Re-review architecture", ("tester", "product")),
+    ],
+    "implementation": [
+        ("developer", "Fix implementation issues", ()),
+        ("tester", "Add regression tests", ("developer",)),
+        ("architect", "Verify implementation follows design", ("developer",)),
+        ("reviewer", "Code review fixes", ("tester", "architect")),
+    ],
+    "testing": [
+        ("tester", "Expand test coverage", ()),
+        ("developer", "Fix failing tests", ("tester",)),
+        ("mlops", "Add performance benchmarks (if applicable)", ()),
+        ("reviewer", "Validate test completeness", ("developer", "mlops")),
+    ],
+    "security": [
+        ("reviewer", "Conduct security audit", ()),
+        ("developer", "Implement security fixes", ("reviewer",)),
+        ("devops", "Update security configurations", ("reviewer",)),
+        ("tester", "Security regression tests", ("developer", "devops")),
+    ],
+    "performance": [
+        ("developer", "Optimize code", ()),
+        ("tester", "Performance benchmarks", ("developer",)),
+        ("devops", "Scale infrastructure", ()),
+        ("reviewer", "Validate optimizations", ("tester", "devops")),
+    ],
+    "documentation": [
+        ("documentation", "Update all docs", ()),
+        ("ux", "Improve user guides", ()),
+        ("customer", "Validate clarity", ("documentation", "ux")),
+        ("reviewer", "Doc review", ("customer",)),
+    ],
+    "user-experience": [
+        ("ux", "Redesign based on feedback", ()),
+        ("customer", "Validate improvements", ("ux",)),
+        ("developer", "Implement UX changes", ("ux",)),
+        ("tester", "Usability testing", ("developer",)),
+    ],
+}
+
+# Issue types in the order their items are started when several are ready;
+# "custom" issues have no playbook: one item for the agent the feedback routes to
+PRIORITY = [
+    "security",
+    "architecture",
+    "implementation",
+    "testing",
+    "performance",
+    "user-experience",
+    "documentation",
+    "custom",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scope TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    issue TEXT NOT NULL,
+    target TEXT NOT NULL,
+    action TEXT NOT NULL,
+    feedback TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    needs TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    reports INTEGER NOT NULL DEFAULT 1,
+    log TEXT NOT NULL DEFAULT '',
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    UNIQUE (scope, agent, issue, target)
+);
+CREATE INDEX IF NOT EXISTS items_by_status ON items (scope, status, priority, id);
+"""
+
+COLUMNS = (
+    "id, agent, issue, target, action, feedback, priority, needs, status,"
+    " attempts, reports, log"
+)
+
+
+class RemediationError(Exception):
+    """Raised for unknown issue types."""
+
+
+@dataclass
+class RemediationItem:
+    """One agent's part in remediating an issue."""
+
+    id: int
+    agent: str
+    issue: str
+    target: str
+    action: str
+    feedback: str = ""
+    priority: int = 0
+    needs: List[str] = field(default_factory=list)
+    status: str = "pending"  # "pending", "done", "failed" or "blocked"
+    attempts: int = 0
+    reports: int = 1
+    log: str = ""
+
+    @property
+    def label(self) -> str:
+        """``Agent: action (target)``, as shown in the workflow output."""
+        return f"{agent_name(self.agent)}: {self.action} ({self.target})"
+
+    def step(self, needs: Sequence[int]) -> Step:
+        """The workflow step that runs this item."""
+        prompt = f"{self.action} for {self.target}."
+        if self.feedback and self.feedback != self.action:
+            prompt += f" Review feedback: {self.feedback}"
+        return Step(
+            str(self.id),
+            self.agent,
+            prompt,
+            self.label,
+            [str(need) for need in needs],
+        )
+
+
+@dataclass
+class LoopReport:
+    """Outcome of one remediation loop."""
+
+    number: int
+    run: WorkflowRun
+    blocked: List[RemediationItem] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        """How many items the loop took on."""
+        return len(self.run.outcomes)
+
+    def count(self, status: str) -> int:
+        """Items that ended the loop ``passed``, ``failed`` or ``skipped``."""
+        return sum(o.status == status for o in self.run.outcomes.values())
+
+
+def route_custom(feedback: str) -> str:
+    """The agent a free-form issue goes to: its first routed specialist."""
+    try:
+        rules = load_router().route(feedback)
+    except RouterError:
+        rules = []
+    agents = [rule.agent for rule in rules if rule.agent != REVIEWER]
+    return agents[0] if agents else "developer"
+
+
+def playbook(issue: str, feedback: str = "") -> List[Tuple[str, str, Tuple[str, ...]]]:
+    """The items an issue of type ``issue`` expands into."""
+    if issue == "custom":
+        return [(route_custom(feedback), feedback or "Address reported issue", ())]
+    try:
+        return PLAYBOOKS[issue]
+    except KeyError:
+        known = ", ".join(PRIORITY)
+        raise RemediationError(
+            f"Unknown issue type: {issue} (expected one of: {known})"
+        ) from None
+
+
+class RemediationQueue:
+    """Persistent queue of remediation items, deduplicated by agent/issue/target.
+
+    A queue only sees the items of its ``scope``; the scopes share one
+    database.
+    """
+
+    def __init__(
+        self,
+        state_dir: Path = STATE_DIR,
+        max_attempts: Optional[int] = None,
+        scope: str = "",
+    ):
+        self.max_attempts = max(
+            1, max_attempts or int(env_number("REMEDIATION_MAX_ATTEMPTS", 2))
+        )
+        self.scope = scope
+        state_dir = Path(state_dir)
+        state_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(
+            str(state_dir / "queue.db"), timeout=60, isolation_level=None
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the queue database."""
+        self.conn.close()
+
+    def __enter__(self) -> "RemediationQueue":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # -- queueing -----------------------------------------------------------
+
+    def add(self, issue: str, target: str, feedback: str = "") -> Tuple[int, int]:
+        """Queue the items for an issue; return how many were new and merged.
+
+        An item already pending only records the new report. One that has
+        finished (or was blocked) is reopened while it has attempts left.
+        """
+        steps = playbook(issue, feedback)
+        priority = PRIORITY.index(issue)
+        added = merged = 0
+        now = time.time()
+        with self._transaction():
+            for agent, action, needs in steps:
+                row = self.conn.execute(
+                    "SELECT id, status, attempts FROM items"
+                    " WHERE scope = ? AND agent = ? AND issue = ? AND target = ?",
+                    (self.scope, agent, issue, target),
+                ).fetchone()
+                if row is None:
+                    self.conn.execute(
+                        "INSERT INTO items (scope, agent, issue, target, action,"
+                        " feedback, priority, needs, status, created, updated)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?, ?)",
+                        (
+                            self.scope,
+                            agent,
+                            issue,
+                            target,
+                            action,
+                            feedback,
+                            priority,
+                            ",".join(needs),
+                            now,
+                            now,
+                        ),
+                    )
+                    added += 1
+                    continue
+                item_id, status, attempts = row
+                if status != "pending" and attempts < self.max_attempts:
+                    status = "pending"
+                self.conn.execute(
+                    "UPDATE items SET feedback = ?, status = ?,"
+                    " reports = reports + 1, updated = ? WHERE id = ?",
+                    (feedback, status, now, item_id),
+                )
+                merged += 1
+        return added, merged
+
+    def items(self, statuses: Optional[Sequence[str]] = None) -> List[RemediationItem]:
+        """Queued items, highest priority first, optionally only some statuses."""
+        query = f"SELECT {COLUMNS} FROM items WHERE scope = ?"
+        params: Tuple[str, ...] = (self.scope,)
+        if statuses:
+            query += f" AND status IN ({', '.join('?' * len(statuses))})"
+            params += tuple(statuses)
+        rows = self.conn.execute(query + " ORDER BY priority, id", params).fetchall()
+        return [
+            RemediationItem(
+                id=row[0],
+                agent=row[1],
+                issue=row[2],
+                target=row[3],
+                action=row[4],
+                feedback=row[5],
+                priority=row[6],
+                needs=[need for need in row[7].split(",") if need],
+                status=row[8],
+                attempts=row[9],
+                reports=row[10],
+                log=row[11],
+            )
+            for row in rows
+        ]
+
+    def clear(self, statuses: Optional[Sequence[str]] = None) -> int:
+        """Remove items (all of them, or those with the given statuses)."""
+        if not statuses:
+            cursor = self.conn.execute(
+                "DELETE FROM items WHERE scope = ?", (self.scope,)
+            )
+            return int(cursor.rowcount)
+        placeholders = ", ".join("?" * len(statuses))
+        cursor = self.conn.execute(
+            f"DELETE FROM items WHERE scope = ? AND status IN ({placeholders})",
+            (self.scope, *statuses),
+        )
+        return int(cursor.rowcount)
+
+    # -- execution ----------------------------------------------------------
+
+    def plan(self) -> Tuple[Workflow, List[RemediationItem]]:
+        """The pending items as a workflow, and the items newly blocked.
+
+        An item whose prerequisite is done waits for nothing; one whose
+        prerequisite failed for good (or is itself blocked) is blocked.
+        Planning only reads the queue; ``run_loop`` records the blocks.
+        """
+        everything = self.items()
+        by_key = {(i.issue, i.target, i.agent): i for i in everything}
+        batch = {i.id: i for i in everything if i.status == "pending"}
+        needs: Dict[int, List[int]] = {}
+        blocked: List[RemediationItem] = []
+        changed = True
+        while changed:
+            changed = False
+            for item in list(batch.values()):
+                needs[item.id] = []
+                for agent in item.needs:
+                    dep = by_key.get((item.issue, item.target, agent))
+                    if dep is None or dep.status == "done":
+                        continue
+                    if dep.id not in batch:
+                        del batch[item.id]
+                        item.status = "blocked"
+                        blocked.append(item)
+                        changed = True
+                        break
+                    needs[item.id].append(dep.id)
+        steps = [item.step(needs[item.id]) for item in batch.values()]
+        return Workflow("remediation", steps), blocked
+
+    def run_loop(self, engine: WorkflowEngine, number: int = 1) -> Optional[LoopReport]:
+        """Run every pending item once; None when nothing is left to run."""
+        workflow, blocked = self.plan()
+        for item in blocked:
+            self._finish(item.id, "blocked")
+        if not workflow.steps:
+            return None
+        with tracing.span(f"remediation loop {number}", "remediation") as span:
+            run = engine.run(workflow)
+            for step_id, outcome in run.outcomes.items():
+                if outcome.status == "skipped" or outcome.result is None:
+                    continue  # held up by a failed item; retried with it
+                self.conn.execute(
+                    "UPDATE items SET attempts = attempts + 1, log = ? WHERE id = ?",
+                    (str(outcome.result.log_path), int(step_id)),
+                )
+                if outcome.status == "passed":
+                    self._finish(int(step_id), "done")
+                else:
+                    self.conn.execute(
+                        "UPDATE items SET status = 'failed'"
+                        " WHERE id = ? AND attempts >= ?",
+                        (int(step_id), self.max_attempts),
+                    )
+            report = LoopReport(number, run, blocked)
+            span.set(
+                items=report.size,
+                passed=report.count("passed"),
+                failed=report.count("failed"),
+            )
+        return report
+
+    def drain(
+        self, engine: WorkflowEngine, max_loops: Optional[int] = None
+    ) -> List[LoopReport]:
+        """Run loops until the queue is empty or a loop finishes nothing.
+
+        The next loop only runs what the previous one left pending, so it
+        is strictly smaller, or it doesn't run at all.
+        """
+        reports: List[LoopReport] = []
+        while max_loops is None or len(reports) < max_loops:
+            report = self.run_loop(engine, len(reports) + 1)
+            if report is None:
+                break
+            reports.append(report)
+            if len(self.items(["pending"])) >= report.size:
+                break  # no item finished: another loop would repeat this one
+        return reports
+
+    def _finish(self, item_id: int, status: str) -> None:
+        self.conn.execute(
+            "UPDATE items SET status = ?, updated = ? WHERE id = ?",
+            (status, time.time(), item_id),
+        )
+
+
+def print_items(queue: RemediationQueue, show_all: bool) -> None:
+    """Print the pending items wave by wave, then the ones that gave up."""
+    workflow, blocked = queue.plan()
+    for n, wave in enumerate(workflow.levels(), 1):
+        for step_id in wave:
+            print(f"{n}. {workflow.steps[step_id].label}")
+    marks = {"failed": "❌", "blocked": "⛔", "done": "✅"}
+    statuses = ["failed", "blocked", "done"] if show_all else ["failed", "blocked"]
+    stopped = sorted(
+        queue.items(statuses) + blocked, key=lambda item: (item.priority, item.id)
+    )
+    for item in stopped:
+        print(f"{marks[item.status]} {item.label} [{item.status}]")
+    if not workflow.steps:
+        print("✅ No remediation pending")
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Remediation work queue")
+    parser.add_argument(
+        "--scope", default="", help="Feature or run the items belong to"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    add_parser = sub.add_parser("add", help="Queue the remediation for an issue")
+    add_parser.add_argument("issue", help=f"Issue type ({', '.join(PRIORITY)})")
+    add_parser.add_argument("target", help="Gate, phase or component affected")
+    add_parser.add_argument("--feedback", default="")
+    show_parser = sub.add_parser("show", help="List queued items in run order")
+    show_parser.add_argument(
+        "--plain", action="store_true", help="Pending items as '- Agent: action'"
+    )
+    show_parser.add_argument("--all", action="store_true", help="Include done items")
+    run_parser = sub.add_parser("run", help="Run pending items in parallel loops")
+    run_parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=int(env_number("REMEDIATION_MAX_PARALLEL", os.cpu_count() or 4)),
+    )
+    run_parser.add_argument("--max-loops", type=int)
+    clear_parser = sub.add_parser("clear", help="Remove queued items")
+    clear_parser.add_argument(
+        "--done", action="store_true", help="Only remove finished items"
+    )
+    args = parser.parse_args()
+
+    with RemediationQueue(scope=args.scope) as queue:
+        if args.command == "add":
+            try:
+                added, merged = queue.add(args.issue, args.target, args.feedback)
+            except RemediationError as e:
+                print(f"❌ {e}")
+                sys.exit(2)
+            print(f"🔧 Queued {added} remediation item(s), {merged} already queued")
+            return
+        if args.command == "show":
+            if args.plain:
+                for item in queue.items(["pending"]):
+                    print(f"- {item.label}")
+            else:
+                print_items(queue, args.all)
+            return
+        if args.command == "clear":
+            removed = queue.clear(["done"] if args.done else None)
+            print(f"🗑️  Removed {removed} item(s)")
+            return
+
+        scheduler = Scheduler(
+            max_workers=args.max_parallel,
+            timeout=env_number("ORCHESTRATE_TIMEOUT", 1800),
+            retries=int(env_number("ORCHESTRATE_RETRIES", 0)),
+        )
+        engine = WorkflowEngine(args.max_parallel, scheduler)
+        try:
+            reports = queue.drain(engine, args.max_loops)
+        except KeyboardInterrupt:
+            print("🛑 Cancelled, running agents terminated")
+            sys.exit(130)
+        for report in reports:
+            print(
+                f"🔁 Loop {report.number}: {report.count('passed')} done,"
+                f" {report.count('failed')} failed, {report.count('skipped')}"
+                f" waiting of {report.size} item(s) in {report.run.elapsed:.1f}s"
+            )
+            for item in report.blocked:
+                print(f"⛔ Blocked: {item.label}")
+        left = {
+            status: len(queue.items([status]))
+            for status in ("pending", "failed", "blocked")
+        }
+    print(
+        f"📋 Remediation queue: {left['pending']} pending, {left['failed']} failed,"
+        f" {left['blocked']} blocked"
+    )
+    sys.exit(0 if not any(left.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
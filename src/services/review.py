@@ -0,0 +1,414 @@
+"""
+Incremental Review - send a reviewer only what changed since its last approval.
+
+``review_checkpoint`` in ``adaptive-workflow.sh`` only simulated a review,
+and a real reviewer plugged into it would have re-read all of a phase's
+work on every pass of a fix-and-retry loop. The incremental reviewer
+snapshots the working tree as a git tree (through a temporary index, so the
+real index is never touched) and diffs it against the tree recorded when
+the phase was last approved (``HEAD`` before the first approval). Each
+changed file's hunks go to the reviewer command on stdin, one call per
+file, concurrently.
+
+A file's verdict is memoized by its path and the blobs on both sides of the
+diff, so in a retry loop only the files touched since the previous pass are
+sent again; the rest reuse their earlier verdict. When every file passes,
+the snapshot becomes the phase's approved tree and later passes start from
+there.
+
+The reviewer command (``$REVIEW_CMD``) runs with ``bash -c``; it reads the
+file's diff on stdin, gets ``REVIEW_PHASE``, ``REVIEW_FILE``,
+``REVIEW_STATUS`` and ``REVIEW_DESCRIPTION`` in its environment, and
+approves by exiting 0. Its output is kept as the review notes.
+
+Usage:
+    REVIEW_CMD="./my-reviewer" python3 -m src.services.review checkpoint \\
+        "Implementation" --description "auth endpoints" --inputs src tests
+    python3 -m src.services.review status
+    python3 -m src.services.review reset [PHASE]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..utils import tracing
+from .scheduler import env_number
+
+STATE_DIR = Path(os.environ.get("REVIEW_CACHE_DIR", ".cache/reviews"))
+
+# git's well-known hash of the empty tree, the base of a repository without HEAD
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS approvals (
+    phase TEXT PRIMARY KEY,
+    tree TEXT NOT NULL,
+    approved REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS verdicts (
+    phase TEXT NOT NULL,
+    command TEXT NOT NULL,
+    path TEXT NOT NULL,
+    old_blob TEXT NOT NULL,
+    new_blob TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    output TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (phase, command, path, old_blob, new_blob)
+);
+"""
+
+
+class ReviewError(Exception):
+    """Raised when the work tree can't be snapshotted or diffed."""
+
+
+@dataclass
+class FileChange:
+    """One file that differs between the approved tree and the snapshot."""
+
+    path: str
+    status: str
+    old_blob: str
+    new_blob: str
+
+
+@dataclass
+class FileReview:
+    """The reviewer's verdict on one changed file."""
+
+    path: str
+    status: str
+    passed: bool
+    output: str
+    cached: bool = False
+    duration: float = 0.0
+
+
+@dataclass
+class ReviewReport:
+    """Outcome of one checkpoint."""
+
+    phase: str
+    base: str
+    tree: str
+    files: List[FileReview] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        """Whether every changed file was approved."""
+        return all(review.passed for review in self.files)
+
+    @property
+    def reviewed(self) -> List[FileReview]:
+        """Files actually sent to the reviewer on this pass."""
+        return [review for review in self.files if not review.cached]
+
+    @property
+    def memoized(self) -> List[FileReview]:
+        """Files whose verdict was reused from an earlier pass."""
+        return [review for review in self.files if review.cached]
+
+
+def git(*args: str, env: Optional[Dict[str, str]] = None) -> str:
+    """Run a git command and return its output."""
+    try:
+        result = subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True, env=env
+        )
+    except FileNotFoundError:
+        raise ReviewError("git is not installed") from None
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.strip() or f"git {args[0]} failed"
+        raise ReviewError(message) from None
+    return result.stdout
+
+
+class IncrementalReviewer:
+    """Review the changes since each phase's last approved tree."""
+
+    def __init__(
+        self,
+        command: str,
+        state_dir: Path = STATE_DIR,
+        max_workers: Optional[int] = None,
+    ):
+        self.command = command
+        self.max_workers = max_workers or int(env_number("REVIEW_MAX_PARALLEL", 4))
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(
+            str(self.state_dir / "reviews.db"), timeout=60, isolation_level=None
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the state database."""
+        self.conn.close()
+
+    def __enter__(self) -> "IncrementalReviewer":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # -- trees --------------------------------------------------------------
+
+    def snapshot(self, paths: Sequence[str] = (".",)) -> str:
+        """The working tree (tracked and untracked, not ignored) as a git tree."""
+        index = git("rev-parse", "--git-path", "index").strip()
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, GIT_INDEX_FILE=os.path.join(tmp, "index"))
+            # Starting from a copy of the real index lets git skip unchanged files
+            if os.path.exists(index):
+                shutil.copyfile(index, env["GIT_INDEX_FILE"])
+            git("add", "-A", "--", *paths, *self._exclude_state(), env=env)
+            return git("write-tree", env=env).strip()
+
+    def _exclude_state(self) -> List[str]:
+        # The state database must never show up as a change to review
+        top = Path(git("rev-parse", "--show-toplevel").strip())
+        try:
+            state = self.state_dir.resolve().relative_to(top.resolve())
+        except ValueError:
+            return []
+        ignored = subprocess.run(
+            ["git", "check-ignore", "-q", f"{state}/reviews.db"], cwd=top
+        )
+        # git refuses pathspecs naming ignored files, and needs none for them
+        return [] if ignored.returncode == 0 else [f":(top,exclude){state}"]
+
+    def approved(self, phase: str) -> Optional[str]:
+        """The tree recorded when ``phase`` was last approved."""
+        row = self.conn.execute(
+            "SELECT tree FROM approvals WHERE phase = ?", (phase,)
+        ).fetchone()
+        return str(row[0]) if row else None
+
+    def base(self, phase: str) -> str:
+        """What ``phase`` is reviewed against: its approved tree, else HEAD."""
+        approved = self.approved(phase)
+        if approved:
+            return approved
+        try:
+            return git("rev-parse", "HEAD^{tree}").strip()
+        except ReviewError:
+            return EMPTY_TREE
+
+    def changes(
+        self, base: str, tree: str, paths: Sequence[str] = (".",)
+    ) -> List[FileChange]:
+        """Files that differ between two trees, with their blobs."""
+        raw = git("diff", "--raw", "-z", "--no-renames", base, tree, "--", *paths)
+        fields = raw.split("\0")
+        changes = []
+        for meta, path in zip(fields[::2], fields[1::2]):
+            _, _, old_blob, new_blob, status = meta.lstrip(":").split()
+            changes.append(FileChange(path, status, old_blob, new_blob))
+        return changes
+
+    # -- review -------------------------------------------------------------
+
+    def checkpoint(
+        self, phase: str, paths: Sequence[str] = (".",), description: str = ""
+    ) -> ReviewReport:
+        """Review what changed since ``phase`` was last approved."""
+        paths = list(paths) or ["."]
+        tree = self.snapshot(paths)
+        base = self.base(phase)
+        report = ReviewReport(phase, base, tree)
+        with tracing.span(f"review {phase}", "review") as span:
+            pending = []
+            for change in self.changes(base, tree, paths):
+                cached = self._verdict(phase, change)
+                if cached is not None:
+                    report.files.append(cached)
+                else:
+                    pending.append(change)
+            if pending:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    reviews = list(
+                        pool.map(
+                            lambda c: self._review(phase, base, tree, c, description),
+                            pending,
+                        )
+                    )
+                for change, review in zip(pending, reviews):
+                    self._remember(phase, change, review)
+                    report.files.append(review)
+            report.files.sort(key=lambda review: review.path)
+            if report.passed:
+                self._approve(phase, tree)
+            span.set(
+                passed=report.passed,
+                files=len(report.files),
+                reviewed=len(report.reviewed),
+            )
+        return report
+
+    def _review(
+        self, phase: str, base: str, tree: str, change: FileChange, description: str
+    ) -> FileReview:
+        start = time.monotonic()
+        hunks = git(
+            "diff", "--no-renames", base, tree, "--", f":(top,literal){change.path}"
+        )
+        env = dict(
+            os.environ,
+            REVIEW_PHASE=phase,
+            REVIEW_FILE=change.path,
+            REVIEW_STATUS=change.status,
+            REVIEW_DESCRIPTION=description,
+        )
+        proc = subprocess.run(
+            ["bash", "-c", self.command],
+            input=hunks,
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        return FileReview(
+            change.path,
+            change.status,
+            proc.returncode == 0,
+            proc.stdout + proc.stderr,
+            duration=time.monotonic() - start,
+        )
+
+    def _verdict(self, phase: str, change: FileChange) -> Optional[FileReview]:
+        row = self.conn.execute(
+            "SELECT passed, output FROM verdicts WHERE phase = ? AND command = ?"
+            " AND path = ? AND old_blob = ? AND new_blob = ?",
+            (phase, self.command, change.path, change.old_blob, change.new_blob),
+        ).fetchone()
+        if row is None:
+            return None
+        return FileReview(change.path, change.status, bool(row[0]), row[1], True)
+
+    def _remember(self, phase: str, change: FileChange, review: FileReview) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO verdicts (phase, command, path, old_blob,"
+            " new_blob, passed, output, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                phase,
+                self.command,
+                change.path,
+                change.old_blob,
+                change.new_blob,
+                int(review.passed),
+                review.output,
+                time.time(),
+            ),
+        )
+
+    def _approve(self, phase: str, tree: str) -> None:
+        # Verdicts are keyed by the old base's blobs, so none can match again
+        with self._transaction():
+            self.conn.execute(
+                "INSERT OR REPLACE INTO approvals (phase, tree, approved)"
+                " VALUES (?, ?, ?)",
+                (phase, tree, time.time()),
+            )
+            self.conn.execute("DELETE FROM verdicts WHERE phase = ?", (phase,))
+
+    # -- state --------------------------------------------------------------
+
+    def approvals(self) -> List[Tuple[str, str, float]]:
+        """Every phase's approved tree and when it was approved."""
+        rows = self.conn.execute(
+            "SELECT phase, tree, approved FROM approvals ORDER BY phase"
+        ).fetchall()
+        return [(str(phase), str(tree), float(at)) for phase, tree, at in rows]
+
+    def reset(self, phase: Optional[str] = None) -> int:
+        """Forget approvals and verdicts, for one phase or for all of them."""
+        if phase is None:
+            self.conn.execute("DELETE FROM verdicts")
+            return int(self.conn.execute("DELETE FROM approvals").rowcount)
+        self.conn.execute("DELETE FROM verdicts WHERE phase = ?", (phase,))
+        cursor = self.conn.execute("DELETE FROM approvals WHERE phase = ?", (phase,))
+        return int(cursor.rowcount)
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Incremental review checkpoints")
+    sub = parser.add_subparsers(dest="command", required=True)
+    check_parser = sub.add_parser("checkpoint", help="Review changes for a phase")
+    check_parser.add_argument("phase")
+    check_parser.add_argument("--description", default="")
+    check_parser.add_argument(
+        "--inputs", nargs="*", default=["."], help="Paths the phase covers"
+    )
+    check_parser.add_argument(
+        "--reviewer",
+        default=os.environ.get("REVIEW_CMD"),
+        help="Reviewer command (env REVIEW_CMD)",
+    )
+    sub.add_parser("status", help="Show approved trees")
+    reset_parser = sub.add_parser("reset", help="Forget approvals and verdicts")
+    reset_parser.add_argument("phase", nargs="?")
+    args = parser.parse_args()
+
+    if args.command == "checkpoint" and not args.reviewer:
+        print("❌ No reviewer command (pass --reviewer or set REVIEW_CMD)")
+        sys.exit(2)
+
+    with IncrementalReviewer(getattr(args, "reviewer", None) or "") as reviewer:
+        if args.command == "status":
+            for phase, tree, approved in reviewer.approvals():
+                when = time.strftime("%Y-%m-%d %H:%M", time.localtime(approved))
+                print(f"✅ {phase:<28} {tree[:12]}  {when}")
+            return
+        if args.command == "reset":
+            removed = reviewer.reset(args.phase)
+            print(f"🗑️  Forgot {removed} approval(s)")
+            return
+
+        try:
+            report = reviewer.checkpoint(args.phase, args.inputs, args.description)
+        except ReviewError as e:
+            print(f"❌ Review failed: {e}")
+            sys.exit(2)
+
+    if not report.files:
+        print(f"✅ No changes since the last approved {args.phase} review")
+        return
+    for review in report.files:
+        mark = "✅" if review.passed else "❌"
+        source = " (memoized)" if review.cached else f" ({review.duration:.1f}s)"
+        print(f"{mark} {review.status} {review.path}{source}")
+        if not review.passed:
+            for line in review.output.rstrip().splitlines():
+                print(f"   {line}")
+    print(
+        f"📋 Sent {len(report.reviewed)} of {len(report.files)} changed file(s)"
+        f" to the reviewer ({len(report.memoized)} memoized)"
+    )
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == "__main__":
+    main()
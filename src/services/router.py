@@ -0,0 +1,225 @@
+"""
+Triage Router - keyword routing of requests to agents in one pass.
+
+``orchestrate.sh analyze`` used to test the request against every rule's
+keywords with a chain of shell pattern matches, so routing cost grew with
+the number of rules and a backlog could only be routed one process at a
+time. The router compiles every rule's keywords into a single Aho-Corasick
+automaton: one scan over the request finds every keyword occurrence, so
+routing takes time linear in the request's length no matter how many rules
+there are, and the automaton is built once for any number of requests.
+
+Rules live in ``scripts/routing/<name>.json``. Matching is a case-sensitive
+substring test, exactly like the shell's ``[[ $REQUEST == *"kw"* ]]``, and
+agents are listed in rule order after the ``always`` entries. The Reviewer
+is always suggested, first, even if a rule file leaves it out.
+
+Usage:
+    python3 -m src.services.router route "implement user authentication"
+    python3 -m src.services.router batch requests.txt > routes.jsonl
+    python3 -m src.services.router batch - --summary < requests.txt
+"""
+
+import argparse
+import collections
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+RULES_DIR = Path(__file__).resolve().parent.parent.parent / "scripts" / "routing"
+
+REVIEWER = "reviewer"
+REVIEWER_LABEL = "Reviewer Agent: For continuous quality checks (ALWAYS)"
+
+
+class RouterError(Exception):
+    """Raised for missing or malformed routing rules."""
+
+
+@dataclass
+class Rule:
+    """Suggest ``agent`` when the request contains any of ``keywords``."""
+
+    agent: str
+    label: str
+    keywords: List[str] = field(default_factory=list)
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton mapping keywords to the rules that own them."""
+
+    def __init__(self, keywords: Iterable[Tuple[str, int]]):
+        # Node 0 is the root; goto[n] maps a character to the next node
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[Set[int]] = [set()]
+        for keyword, rule in keywords:
+            if not keyword:
+                raise RouterError("Empty routing keyword")
+            node = 0
+            for char in keyword:
+                nxt = self.goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append(set())
+                node = nxt
+            self.outputs[node].add(rule)
+        self._link()
+
+    def _link(self) -> None:
+        # Breadth-first: a node's failure link is the longest proper suffix
+        # that is also a trie path, and it inherits that node's outputs
+        pending = collections.deque(self.goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, child in self.goto[node].items():
+                pending.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.outputs[child] |= self.outputs[self.fail[child]]
+
+    def matches(self, text: str) -> Set[int]:
+        """Rules with at least one keyword occurring in ``text``."""
+        found: Set[int] = set()
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found |= outputs[node]
+        return found
+
+
+class TriageRouter:
+    """Route request text to the agents whose keywords it mentions."""
+
+    def __init__(self, rules: List[Rule], always: Iterable[Rule] = ()):
+        always = list(always)
+        if not any(rule.agent == REVIEWER for rule in always):
+            always.insert(0, Rule(REVIEWER, REVIEWER_LABEL))
+        self.always = always
+        self.rules = rules
+        self.automaton = KeywordAutomaton(
+            (keyword, index)
+            for index, rule in enumerate(rules)
+            for keyword in rule.keywords
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TriageRouter":
+        """Build a router from a rule file's parsed JSON."""
+        try:
+            always = [Rule(r["agent"], r["label"]) for r in data.get("always", [])]
+            rules = [
+                Rule(r["agent"], r["label"], list(r["keywords"])) for r in data["rules"]
+            ]
+        except (KeyError, TypeError) as e:
+            raise RouterError(f"Malformed routing rule: {e}") from None
+        return cls(rules, always)
+
+    def route(self, text: str) -> List[Rule]:
+        """Suggested agents for one request: the always rules, then matches."""
+        matched = self.automaton.matches(text)
+        return self.always + [self.rules[i] for i in sorted(matched)]
+
+    def route_many(self, texts: Iterable[str]) -> Iterator[List[Rule]]:
+        """Route every request, reusing the compiled automaton."""
+        for text in texts:
+            yield self.route(text)
+
+
+def load_router(name_or_path: str = "analyze") -> TriageRouter:
+    """Load routing rules by name (from ``scripts/routing``) or from a file."""
+    path = Path(name_or_path)
+    if not path.suffix:
+        path = RULES_DIR / f"{name_or_path}.json"
+    if not path.exists():
+        raise RouterError(f"Routing rules not found: {name_or_path}")
+    try:
+        data = json.loads(path.read_text())
+    except json.JSONDecodeError as e:
+        raise RouterError(f"{path}: {e}") from None
+    return TriageRouter.from_dict(data)
+
+
+def route_batch(router: TriageRouter, source: IO[str], out: IO[str]) -> Dict[str, Any]:
+    """Route one request per line of ``source`` to JSON lines on ``out``."""
+    start = time.monotonic()
+    counts: "collections.Counter[str]" = collections.Counter()
+    routed = 0
+    for number, line in enumerate(source, 1):
+        request = line.rstrip("\n")
+        if not request.strip():
+            continue
+        agents = [rule.agent for rule in router.route(request)]
+        counts.update(agents)
+        routed += 1
+        record = {"line": number, "request": request, "agents": agents}
+        out.write(json.dumps(record) + "\n")
+    return {
+        "requests": routed,
+        "seconds": time.monotonic() - start,
+        "agents": dict(counts),
+    }
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Route requests to agents")
+    parser.add_argument("--rules", default="analyze", help="Rule set name or JSON file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    route_parser = sub.add_parser("route", help="Print suggestions for one request")
+    route_parser.add_argument("request", nargs="*")
+    route_parser.add_argument("--json", action="store_true", help="Print agent names")
+    batch_parser = sub.add_parser("batch", help="Route one request per line")
+    batch_parser.add_argument("file", help="Request file, or - for stdin")
+    batch_parser.add_argument(
+        "--summary", action="store_true", help="Print counts per agent to stderr"
+    )
+    args = parser.parse_args()
+
+    try:
+        router = load_router(args.rules)
+    except RouterError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.command == "route":
+        rules = router.route(" ".join(args.request))
+        if args.json:
+            print(json.dumps([rule.agent for rule in rules]))
+        else:
+            for rule in rules:
+                print(f"- {rule.label}")
+        return
+
+    source = sys.stdin if args.file == "-" else open(args.file)
+    try:
+        summary = route_batch(router, source, sys.stdout)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    if args.summary:
+        rate = summary["requests"] / summary["seconds"] if summary["seconds"] else 0
+        print(
+            f"🔀 Routed {summary['requests']} requests in {summary['seconds']:.2f}s"
+            f" ({rate:,.0f}/s)",
+            file=sys.stderr,
+        )
+        for agent, count in sorted(summary["agents"].items(), key=lambda a: -a[1]):
+            print(f"   {agent:<14} {count}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Agent Scheduler - bounded worker pool for running agents in parallel.
+
+``orchestrate.sh parallel`` used to start one background agent per
+``agent:task`` pair and ``wait`` on all of them, with no cap on how many ran
+at once, no per-task exit status and no timeouts. The scheduler runs the
+same agent commands through a fixed-size pool: at most ``max_workers``
+agents run at a time, each attempt is killed after ``timeout`` seconds, and
+failed or timed-out tasks are retried with exponential backoff. Every task's
+output goes to its own log file and its exit code is reported at the end.
+
+The agent CLI comes from ``$CLAUDE_CMD`` (default ``claude``); point it at
+``tests/stubs/fake_agent.py`` to exercise the scheduler without the real CLI.
+
+Usage:
+    python3 -m src.services.scheduler "architect:design API,developer:setup project"
+    python3 -m src.services.scheduler --max-workers 4 --timeout 900 --retries 2 "..."
+"""
+
+import argparse
+import os
+import random
+import shlex
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, List, Optional, Set, Tuple
+
+from ..utils import tracing
+
+# Seconds a timed-out agent gets to exit after SIGTERM before it is killed
+KILL_GRACE = 5.0
+
+
+@dataclass
+class AgentTask:
+    """One ``agent:task`` pair to run, with the prompt handed to the agent."""
+
+    agent: str
+    description: str
+    prompt: str = ""
+
+    def __post_init__(self) -> None:
+        # Default prompt: load the agent's role, then hand it the task
+        if not self.prompt:
+            # Imported here: the workflow module imports this one
+            from .workflow import agent_name
+
+            self.prompt = (
+                f"You are the {agent_name(self.agent)} Agent. First run"
+                f" /{self.agent} to load your role, then: {self.description}"
+            )
+
+
+@dataclass
+class TaskResult:
+    """Outcome of a task after its final attempt."""
+
+    task: AgentTask
+    exit_code: Optional[int]
+    attempts: int
+    duration: float
+    timed_out: bool = False
+    log_path: Optional[Path] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the task eventually succeeded."""
+        return self.exit_code == 0
+
+
+def parse_tasks(spec: str) -> List[AgentTask]:
+    """Parse ``agent1:task1,agent2:task2`` into tasks."""
+    tasks = []
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        agent, _, description = item.partition(":")
+        if not agent.strip():
+            raise ValueError(f"Missing agent in '{item}'")
+        tasks.append(AgentTask(agent.strip(), description.strip()))
+    return tasks
+
+
+def agent_command(task: AgentTask) -> List[str]:
+    """Command line that runs one agent task with the configured CLI."""
+    claude_cmd = shlex.split(os.environ.get("CLAUDE_CMD", "claude"))
+    return [*claude_cmd, "-p", task.prompt, "--verbose"]
+
+
+class Scheduler:
+    """Run agent tasks through a bounded pool with timeouts and retries."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        retries: int = 0,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        log_dir: Optional[Path] = None,
+        command: Callable[[AgentTask], List[str]] = agent_command,
+        on_result: Optional[Callable[[TaskResult], None]] = None,
+    ):
+        self.max_workers = max(1, max_workers or os.cpu_count() or 4)
+        self.timeout = timeout or None
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.log_dir = Path(log_dir) if log_dir else Path(tempfile.gettempdir())
+        self.command = command
+        self.on_result = on_result
+        self._running: Set[subprocess.Popen] = set()
+        self._running_lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def run(self, tasks: List[AgentTask]) -> List[TaskResult]:
+        """Run every task and return their results in input order."""
+        results: List[Optional[TaskResult]] = [None] * len(tasks)
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {
+                pool.submit(self.run_one, task): i for i, task in enumerate(tasks)
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if self.on_result:
+                    self.on_result(result)
+        except BaseException:
+            # Interrupted: don't leave agents running behind the caller's back
+            self.cancel()
+            raise
+        finally:
+            pool.shutdown(wait=True)
+        return [result for result in results if result is not None]
+
+    def cancel(self) -> None:
+        """Stop scheduling retries and terminate every running agent."""
+        self._cancelled.set()
+        with self._running_lock:
+            running = list(self._running)
+        for proc in running:
+            _terminate(proc)
+
+    def backoff_delay(self, retry: int) -> float:
+        """Delay before the ``retry``-th retry: capped exponential, jittered."""
+        delay = min(self.max_backoff, self.backoff * 2 ** (retry - 1))
+        return float(delay * random.uniform(0.5, 1.0))
+
+    def run_one(self, task: AgentTask) -> TaskResult:
+        """Run a single task, with retries, in the calling thread."""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        fd, log_name = tempfile.mkstemp(
+            prefix=f"claude-{task.agent}-", suffix=".log", dir=str(self.log_dir)
+        )
+        start = time.monotonic()
+        exit_code: Optional[int] = None
+        timed_out = False
+        attempts = 0
+        span = tracing.span(f"agent {task.agent}", "agent", task=task.description)
+        with span, os.fdopen(fd, "wb") as log:
+            for attempt in range(1, self.retries + 2):
+                if attempt > 1:
+                    if self._cancelled.wait(self.backoff_delay(attempt - 1)):
+                        break
+                    log.write(f"\n--- attempt {attempt} ---\n".encode())
+                    log.flush()
+                if self._cancelled.is_set():
+                    break
+                attempts = attempt
+                exit_code, timed_out = self._attempt(task, log)
+                if exit_code == 0:
+                    break
+            span.set(exit_code=exit_code, attempts=attempts, timed_out=timed_out)
+        return TaskResult(
+            task,
+            exit_code,
+            attempts,
+            time.monotonic() - start,
+            timed_out,
+            Path(log_name),
+        )
+
+    def _attempt(self, task: AgentTask, log: BinaryIO) -> Tuple[int, bool]:
+        """Run the agent once; return its exit code and whether it timed out."""
+        try:
+            proc = subprocess.Popen(
+                self.command(task),
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        except OSError as e:
+            log.write(f"Failed to start agent: {e}\n".encode())
+            return 127, False
+        with self._running_lock:
+            self._running.add(proc)
+        # A cancel() that ran before the add above never saw this process
+        if self._cancelled.is_set():
+            _terminate(proc)
+        try:
+            proc.wait(timeout=self.timeout)
+            return proc.returncode, False
+        except subprocess.TimeoutExpired:
+            _terminate(proc)
+            return proc.returncode, True
+        finally:
+            with self._running_lock:
+                self._running.discard(proc)
+
+
+def _terminate(proc: subprocess.Popen) -> None:
+    """Terminate an agent and everything it spawned, escalating to SIGKILL."""
+    for sig, grace in ((signal.SIGTERM, KILL_GRACE), (signal.SIGKILL, None)):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            pass
+        try:
+            proc.wait(timeout=grace)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def env_number(name: str, default: float) -> float:
+    """Numeric setting from the environment, or ``default`` when unset."""
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run agents through a bounded pool")
+    parser.add_argument("tasks", help="Comma-separated agent:task pairs")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=int(env_number("ORCHESTRATE_MAX_PARALLEL", os.cpu_count() or 4)),
+        help="Agents allowed to run at once (env ORCHESTRATE_MAX_PARALLEL)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=env_number("ORCHESTRATE_TIMEOUT", 1800),
+        help="Seconds per attempt, 0 for none (env ORCHESTRATE_TIMEOUT)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=int(env_number("ORCHESTRATE_RETRIES", 1)),
+        help="Retries per failed task (env ORCHESTRATE_RETRIES)",
+    )
+    parser.add_argument("--backoff", type=float, default=2.0, help="First retry delay")
+    parser.add_argument("--log-dir", type=Path, default=None)
+    args = parser.parse_args()
+
+    try:
+        tasks = parse_tasks(args.tasks)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    def report(result: TaskResult) -> None:
+        task = result.task
+        attempts = f"{result.attempts} attempt{'s' if result.attempts != 1 else ''}"
+        if result.ok:
+            status = f"✅ {task.agent} finished"
+        elif result.timed_out:
+            status = f"⏱️  {task.agent} timed out"
+        else:
+            status = f"❌ {task.agent} failed"
+        print(
+            f"{status} (exit {result.exit_code}, {attempts}, {result.duration:.1f}s)"
+            f" - Log: {result.log_path}",
+            flush=True,
+        )
+
+    scheduler = Scheduler(
+        max_workers=args.max_workers,
+        timeout=args.timeout,
+        retries=args.retries,
+        backoff=args.backoff,
+        log_dir=args.log_dir,
+        on_result=report,
+    )
+    print(f"🚀 Running {len(tasks)} agents, {scheduler.max_workers} at a time")
+    for task in tasks:
+        print(f"Queued {task.agent} for: {task.description}")
+
+    try:
+        results = scheduler.run(tasks)
+    except KeyboardInterrupt:
+        scheduler.cancel()
+        print("🛑 Cancelled, running agents terminated")
+        sys.exit(130)
+
+    failed = [result for result in results if not result.ok]
+    if failed:
+        print(f"❌ {len(failed)} of {len(results)} parallel tasks failed")
+        sys.exit(1)
+    print("✅ All parallel tasks completed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,789 @@
+"""
+Agent Supervisor - a resident parent process for headless agents.
+
+``orchestrate-parallel.sh`` used to ``nohup`` each agent, print ``$!`` and
+forget it; monitoring meant scraping ``ps aux`` and ``ls /tmp/claude-*.log``
+and stopping meant ``pkill -f``. Nothing tied a PID to the task it was
+working on, and nobody collected exit codes.
+
+The supervisor spawns agents as its own children and keeps a registry keyed
+by task ID: agent, PID, start and end time, exit code, log path and restart
+count. Status lookups are a dict access, every start, exit, cancel and
+restart is appended to an event feed that clients can follow, and cancel or
+restart act on exactly one task's process group.
+
+Spawn requests are queued and started as the admission controller allows
+(a token-bucket launch rate, a cap on agents in flight and optional load or
+memory checks; see ``admission``), so callers can submit a whole fan-out at
+once. ``metrics`` reports how long launches waited in the queue.
+
+Protocol: newline-delimited JSON over a Unix domain socket, as for the
+taskboard server. Each request is ``{"action": ..., "args": {...}}`` and each
+response is ``{"ok": true, ...}`` or ``{"ok": false, "error": "..."}``. The
+``watch`` action instead streams one event per line until the client
+disconnects.
+
+Usage:
+    python3 -m src.services.supervisor start
+    python3 -m src.services.supervisor spawn architect ARCH-123 "Design the API"
+    python3 -m src.services.supervisor status ARCH-123
+    python3 -m src.services.supervisor list
+    python3 -m src.services.supervisor events --follow
+    python3 -m src.services.supervisor metrics
+    python3 -m src.services.supervisor cancel ARCH-123     # or --all
+    python3 -m src.services.supervisor restart ARCH-123
+    python3 -m src.services.supervisor stop
+"""
+
+import argparse
+import collections
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from ..utils import tracing
+from .admission import AdmissionController
+from .scheduler import AgentTask, _terminate, agent_command
+
+SOCKET_PATH = Path(os.environ.get("SUPERVISOR_SOCKET", ".claude/supervisor.sock"))
+
+# Statuses of agents that are waiting to start or still running
+ACTIVE = ("queued", "starting", "running")
+
+# Events kept for clients that ask for history
+MAX_EVENTS = 10_000
+
+
+class SupervisorError(Exception):
+    """Raised for unknown tasks and invalid supervisor requests."""
+
+
+class AgentRecord:
+    """Registry entry for one supervised agent task."""
+
+    __slots__ = (
+        "task_id",
+        "agent",
+        "command",
+        "cwd",
+        "log_path",
+        "pid",
+        "queued",
+        "queue_wait",
+        "started",
+        "ended",
+        "exit_code",
+        "status",
+        "restarts",
+        "proc",
+    )
+
+    def __init__(
+        self, task_id: str, agent: str, command: List[str], cwd: str, log_path: Path
+    ):
+        self.task_id = task_id
+        self.agent = agent
+        self.command = command
+        self.cwd = cwd
+        self.log_path = log_path
+        self.pid: Optional[int] = None
+        self.queued = time.time()
+        self.queue_wait: Optional[float] = None
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+        self.exit_code: Optional[int] = None
+        self.status = "queued"  # starting, running, exited, failed or cancelled
+        self.restarts = 0
+        self.proc: Optional[subprocess.Popen] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the record as plain JSON-serializable data."""
+        return {
+            "task_id": self.task_id,
+            "agent": self.agent,
+            "pid": self.pid,
+            "status": self.status,
+            "queued": self.queued,
+            "queue_wait": self.queue_wait,
+            "started": self.started,
+            "ended": self.ended,
+            "exit_code": self.exit_code,
+            "log_path": str(self.log_path),
+            "restarts": self.restarts,
+        }
+
+
+class Supervisor:
+    """Spawn, track, cancel and restart agent processes."""
+
+    def __init__(
+        self,
+        log_dir: Optional[Path] = None,
+        admission: Optional[AdmissionController] = None,
+    ):
+        self.log_dir = Path(log_dir) if log_dir else Path(tempfile.gettempdir())
+        self.admission = admission or AdmissionController.from_env()
+        self._agents: Dict[str, AgentRecord] = {}
+        self._queue: Deque[AgentRecord] = collections.deque()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._events: Deque[Dict[str, Any]] = collections.deque(maxlen=MAX_EVENTS)
+        self._seq = 0
+
+    # -- registry -----------------------------------------------------------
+
+    def spawn(
+        self,
+        agent: str,
+        task_id: str,
+        command: List[str],
+        cwd: Optional[str] = None,
+        log_path: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Queue an agent for a task; it starts as soon as it is admitted."""
+        with self._lock:
+            existing = self._agents.get(task_id)
+            if existing and existing.status in ACTIVE:
+                raise SupervisorError(f"Task {task_id} is already running")
+            if log_path:
+                path = Path(log_path)
+            else:
+                self.log_dir.mkdir(parents=True, exist_ok=True)
+                fd, name = tempfile.mkstemp(
+                    prefix=f"claude-{agent}-", suffix=".log", dir=str(self.log_dir)
+                )
+                os.close(fd)
+                path = Path(name)
+            record = AgentRecord(task_id, agent, command, cwd or os.getcwd(), path)
+            self._agents[task_id] = record
+            self._queue.append(record)
+            self._admit()
+            if record.status == "queued":
+                # Held back; the event also wakes the dispatcher
+                self._emit("queued", record)
+            return record.as_dict()
+
+    def status(self, task_id: str) -> Dict[str, Any]:
+        """Current state of one task."""
+        with self._lock:
+            return self._record(task_id).as_dict()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Every task the supervisor knows about, oldest first."""
+        with self._lock:
+            return [record.as_dict() for record in self._agents.values()]
+
+    def running(self) -> int:
+        """Number of agents running or waiting to start."""
+        with self._lock:
+            return sum(r.status in ACTIVE for r in self._agents.values())
+
+    def metrics(self) -> Dict[str, Any]:
+        """Admission limits, queue depth and queue-wait statistics."""
+        with self._lock:
+            return {
+                **self.admission.metrics(),
+                "queued": len(self._queue),
+                "in_flight": self._in_flight(),
+            }
+
+    def cancel(self, task_id: str) -> Dict[str, Any]:
+        """Terminate one task's agent (and everything it spawned)."""
+        with self._lock:
+            record = self._record(task_id)
+            if record.status == "queued":
+                # Never started: drop it from the queue
+                self._queue.remove(record)
+                record.status = "cancelled"
+                record.ended = time.time()
+                self._emit("cancelled", record)
+                return record.as_dict()
+            proc = record.proc
+            if record.status not in ACTIVE or proc is None:
+                return record.as_dict()
+            record.status = "cancelled"
+        _terminate(proc)
+        with self._lock:
+            return record.as_dict()
+
+    def cancel_all(self) -> List[Dict[str, Any]]:
+        """Cancel every running agent."""
+        with self._lock:
+            task_ids = [r.task_id for r in self._agents.values() if r.status in ACTIVE]
+        return [self.cancel(task_id) for task_id in task_ids]
+
+    def restart(self, task_id: str) -> Dict[str, Any]:
+        """Cancel a task's agent if it is running, then start it again.
+
+        Restarts are operator actions and bypass the admission queue.
+        """
+        self.cancel(task_id)
+        with self._lock:
+            record = self._record(task_id)
+            record.restarts += 1
+            with open(record.log_path, "ab") as log:
+                log.write(f"\n--- restart {record.restarts} ---\n".encode())
+            self._start(record)
+            return record.as_dict()
+
+    def _record(self, task_id: str) -> AgentRecord:
+        record = self._agents.get(task_id)
+        if record is None:
+            raise SupervisorError(f"Unknown task: {task_id}")
+        return record
+
+    # -- admission ----------------------------------------------------------
+
+    def _in_flight(self) -> int:
+        # Called with the lock held
+        return sum(r.status in ("starting", "running") for r in self._agents.values())
+
+    def _admit(self) -> float:
+        """Start queued agents while admitted; return the delay until the next."""
+        # Called with the lock held
+        while self._queue:
+            delay = self.admission.admit(self._in_flight())
+            if delay:
+                if self._dispatcher is None:
+                    self._dispatcher = threading.Thread(
+                        target=self._dispatch, daemon=True
+                    )
+                    self._dispatcher.start()
+                return delay
+            record = self._queue.popleft()
+            record.queue_wait = time.time() - record.queued
+            self.admission.record_wait(record.queue_wait)
+            self._start(record)
+        return 0.0
+
+    def _dispatch(self) -> None:
+        # Re-check the queue when a token is due or an agent starts or exits
+        with self._changed:
+            while True:
+                delay = self._admit()
+                self._changed.wait(delay or None)
+
+    def _start(self, record: AgentRecord) -> None:
+        # Called with the lock held
+        record.exit_code = None
+        record.ended = None
+        record.started = time.time()
+        try:
+            with open(record.log_path, "ab") as log:
+                proc = subprocess.Popen(
+                    record.command,
+                    cwd=record.cwd,
+                    stdin=subprocess.DEVNULL,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True,
+                )
+        except OSError as e:
+            record.status = "failed"
+            record.exit_code = 127
+            record.ended = record.started
+            record.proc = None
+            self._emit("failed", record, error=str(e))
+            return
+        record.proc = proc
+        record.pid = proc.pid
+        record.status = "running"
+        self._emit("restarted" if record.restarts else "started", record)
+        threading.Thread(target=self._reap, args=(record, proc), daemon=True).start()
+
+    def _reap(self, record: AgentRecord, proc: subprocess.Popen) -> None:
+        code = proc.wait()
+        with self._lock:
+            if record.proc is not proc:
+                return  # restarted since; the new process owns the record
+            record.exit_code = code
+            record.ended = time.time()
+            if record.status != "cancelled":
+                record.status = "exited" if code == 0 else "failed"
+            self._trace(record)
+            self._emit(
+                "cancelled" if record.status == "cancelled" else "exited", record
+            )
+
+    def _trace(self, record: AgentRecord) -> None:
+        # Spawn-to-exit (and any queue wait before it) on the agent's own lane
+        if not tracing.enabled() or record.started is None or record.ended is None:
+            return
+        started, ended = record.started * 1e6, record.ended * 1e6
+        queue_wait = record.queue_wait or 0.0
+        # Only launches the admission controller actually held back
+        if queue_wait >= 0.001 and not record.restarts:
+            tracing.complete(
+                f"queued {record.task_id}",
+                started - queue_wait * 1e6,
+                started,
+                "admission",
+                tid=record.pid,
+            )
+        tracing.complete(
+            f"agent {record.agent}",
+            started,
+            ended,
+            "agent",
+            tid=record.pid,
+            task_id=record.task_id,
+            status=record.status,
+            exit_code=record.exit_code,
+            restarts=record.restarts,
+        )
+
+    # -- events -------------------------------------------------------------
+
+    def _emit(self, event: str, record: AgentRecord, **extra: Any) -> None:
+        # Called with the lock held
+        self._seq += 1
+        self._events.append(
+            {
+                "seq": self._seq,
+                "time": time.time(),
+                "event": event,
+                "task_id": record.task_id,
+                "agent": record.agent,
+                "pid": record.pid,
+                "exit_code": record.exit_code,
+                **extra,
+            }
+        )
+        self._changed.notify_all()
+
+    def events(
+        self, since: int = 0, timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Events after sequence number ``since``, waiting up to ``timeout``."""
+        with self._changed:
+            if timeout:
+                self._changed.wait_for(lambda: self._seq > since, timeout)
+            return [event for event in self._events if event["seq"] > since]
+
+    def watch(
+        self, since: int = 0, stop: Optional[threading.Event] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield events as they happen, starting after ``since``."""
+        while stop is None or not stop.is_set():
+            for event in self.events(since, timeout=0.5):
+                since = event["seq"]
+                yield event
+
+
+class SupervisorClient:
+    """Client for a running supervisor; mirrors the ``Supervisor`` API."""
+
+    def __init__(self, socket_path: Path = SOCKET_PATH, timeout: float = 30.0):
+        self.socket_path = Path(socket_path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(str(self.socket_path))
+        self._reader = self.sock.makefile("r")
+
+    @classmethod
+    def connect(cls, socket_path: Path = SOCKET_PATH) -> Optional["SupervisorClient"]:
+        """Connect to the supervisor, or return None when none is running."""
+        if not Path(socket_path).exists():
+            return None
+        try:
+            return cls(socket_path)
+        except OSError:
+            return None
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._reader.close()
+        self.sock.close()
+
+    def __enter__(self) -> "SupervisorClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _send(self, action: str, args: Dict[str, Any]) -> None:
+        self.sock.sendall(
+            (json.dumps({"action": action, "args": args}) + "\n").encode()
+        )
+
+    def _receive(self) -> Dict[str, Any]:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Supervisor closed the connection")
+        response: Dict[str, Any] = json.loads(line)
+        if not response.get("ok"):
+            raise SupervisorError(response.get("error", "Unknown supervisor error"))
+        return response
+
+    def call(self, action: str, **args: Any) -> Dict[str, Any]:
+        """Send one request and return its response, raising on errors."""
+        self._send(action, args)
+        return self._receive()
+
+    def spawn(
+        self,
+        agent: str,
+        task_id: str,
+        command: List[str],
+        cwd: Optional[str] = None,
+        log_path: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Start an agent for a task."""
+        agent_info: Dict[str, Any] = self.call(
+            "spawn",
+            agent=agent,
+            task_id=task_id,
+            command=command,
+            cwd=cwd or os.getcwd(),
+            log_path=log_path,
+        )["agent"]
+        return agent_info
+
+    def status(self, task_id: str) -> Dict[str, Any]:
+        """Current state of one task."""
+        agent_info: Dict[str, Any] = self.call("status", task_id=task_id)["agent"]
+        return agent_info
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Every task the supervisor knows about."""
+        agents: List[Dict[str, Any]] = self.call("list")["agents"]
+        return agents
+
+    def cancel(self, task_id: str) -> Dict[str, Any]:
+        """Terminate one task's agent."""
+        agent_info: Dict[str, Any] = self.call("cancel", task_id=task_id)["agent"]
+        return agent_info
+
+    def cancel_all(self) -> List[Dict[str, Any]]:
+        """Terminate every running agent."""
+        agents: List[Dict[str, Any]] = self.call("cancel_all")["agents"]
+        return agents
+
+    def restart(self, task_id: str) -> Dict[str, Any]:
+        """Restart one task's agent."""
+        agent_info: Dict[str, Any] = self.call("restart", task_id=task_id)["agent"]
+        return agent_info
+
+    def events(self, since: int = 0) -> List[Dict[str, Any]]:
+        """Events recorded after sequence number ``since``."""
+        events: List[Dict[str, Any]] = self.call("events", since=since)["events"]
+        return events
+
+    def metrics(self) -> Dict[str, Any]:
+        """Admission limits, queue depth and queue-wait statistics."""
+        metrics: Dict[str, Any] = self.call("metrics")["metrics"]
+        return metrics
+
+    def watch(self, since: int = 0) -> Iterator[Dict[str, Any]]:
+        """Follow the event feed; this connection is dedicated to it."""
+        self.sock.settimeout(None)
+        self._send("watch", {"since": since})
+        while True:
+            yield self._receive()["event"]
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "SupervisorServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                action = request["action"]
+                args = request.get("args") or {}
+                if action == "watch":
+                    self._stream(int(args.get("since", 0)))
+                    return
+                response = self.server.dispatch(action, args)
+                response["ok"] = True
+            except (SupervisorError, KeyError, TypeError, ValueError) as e:
+                response = {"ok": False, "error": str(e)}
+            except Exception as e:
+                # Failures such as a full disk while spawning are reported
+                # too, instead of dropping the connection
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self._write(response)
+
+    def _write(self, message: Dict[str, Any]) -> None:
+        self.wfile.write((json.dumps(message) + "\n").encode())
+        self.wfile.flush()
+
+    def _stream(self, since: int) -> None:
+        stop = self.server.stopping
+        try:
+            for event in self.server.supervisor.watch(since, stop):
+                self._write({"ok": True, "event": event})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class SupervisorServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve supervisor requests from one resident ``Supervisor``."""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(
+        self,
+        socket_path: Path,
+        supervisor: Supervisor,
+        idle_timeout: Optional[float] = None,
+    ):
+        self.socket_path = Path(socket_path)
+        self.supervisor = supervisor
+        self.idle_timeout = idle_timeout
+        self.last_request = time.monotonic()
+        self.stopping = threading.Event()
+        self._actions: Dict[str, Callable[..., Dict[str, Any]]] = {
+            "ping": lambda: {"pid": os.getpid()},
+            "spawn": lambda **kw: {"agent": supervisor.spawn(**kw)},
+            "status": lambda task_id: {"agent": supervisor.status(task_id)},
+            "list": lambda: {"agents": supervisor.list()},
+            "cancel": lambda task_id: {"agent": supervisor.cancel(task_id)},
+            "cancel_all": lambda: {"agents": supervisor.cancel_all()},
+            "restart": lambda task_id: {"agent": supervisor.restart(task_id)},
+            "events": lambda since=0: {"events": supervisor.events(since)},
+            "metrics": lambda: {"metrics": supervisor.metrics()},
+            "shutdown": self._request_shutdown,
+        }
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        super().__init__(str(self.socket_path), _RequestHandler)
+        os.chmod(self.socket_path, 0o600)
+        if idle_timeout:
+            threading.Thread(target=self._idle_loop, daemon=True).start()
+
+    def dispatch(self, action: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request against the supervisor."""
+        self.last_request = time.monotonic()
+        if action not in self._actions:
+            raise SupervisorError(f"Unknown action: {action}")
+        return self._actions[action](**args)
+
+    def _request_shutdown(self) -> Dict[str, Any]:
+        self.stopping.set()
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return {}
+
+    def _idle_loop(self) -> None:
+        """Exit once idle with no agents left to supervise."""
+        while not self.stopping.wait(1.0):
+            idle = time.monotonic() - self.last_request
+            if self.idle_timeout and idle > self.idle_timeout:
+                if not self.supervisor.running():
+                    self._request_shutdown()
+
+    def server_close(self) -> None:
+        """Stop streaming and remove the socket."""
+        self.stopping.set()
+        super().server_close()
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+def serve(
+    socket_path: Path = SOCKET_PATH, idle_timeout: Optional[float] = None
+) -> None:
+    """Run the supervisor in the foreground until it is shut down."""
+    server = SupervisorServer(socket_path, Supervisor(), idle_timeout)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def start(socket_path: Path = SOCKET_PATH, idle_timeout: float = 600.0) -> bool:
+    """Start a detached supervisor unless one is already running."""
+    existing = SupervisorClient.connect(socket_path)
+    if existing:
+        existing.close()
+        return False
+    subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "src.services.supervisor",
+            "--socket",
+            str(socket_path),
+            "serve",
+            "--idle-timeout",
+            str(idle_timeout),
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        client = SupervisorClient.connect(socket_path)
+        if client:
+            client.close()
+            return True
+        time.sleep(0.05)
+    raise TimeoutError(f"Supervisor did not start on {socket_path}")
+
+
+def format_agent(info: Dict[str, Any]) -> str:
+    """One status line for an agent record."""
+    icons = {
+        "queued": "⏳",
+        "running": "🟢",
+        "exited": "✅",
+        "failed": "❌",
+        "cancelled": "🛑",
+    }
+    started = info["started"] or info["queued"] or time.time()
+    elapsed = (info["ended"] or time.time()) - started
+    exit_code = "" if info["exit_code"] is None else f" exit {info['exit_code']}"
+    restarts = f" restarts {info['restarts']}" if info["restarts"] else ""
+    return (
+        f"{icons.get(info['status'], '⚪')} {info['task_id']:<16} {info['agent']:<14}"
+        f" PID {info['pid']} {info['status']}{exit_code} {elapsed:.0f}s{restarts}"
+        f" - Log: {info['log_path']}"
+    )
+
+
+def format_event(event: Dict[str, Any]) -> str:
+    """One line of the event feed."""
+    stamp = time.strftime("%H:%M:%S", time.localtime(event["time"]))
+    exit_code = "" if event["exit_code"] is None else f" (exit {event['exit_code']})"
+    return (
+        f"[{stamp}] #{event['seq']} {event['task_id']} {event['event']}"
+        f" - {event['agent']} PID {event['pid']}{exit_code}"
+    )
+
+
+def format_metrics(metrics: Dict[str, Any]) -> List[str]:
+    """Admission report lines."""
+
+    def limit(value: float, unit: str = "") -> str:
+        return f"{value:g}{unit}" if value else "off"
+
+    held = ", ".join(f"{n} by {why}" for why, n in sorted(metrics["held_back"].items()))
+    return [
+        f"📈 Admission: {metrics['admitted']} admitted, {metrics['queued']} queued,"
+        f" {metrics['in_flight']} in flight",
+        f"   Queue wait: mean {metrics['wait_mean']:.2f}s,"
+        f" p50 {metrics['wait_p50']:.2f}s, p95 {metrics['wait_p95']:.2f}s,"
+        f" max {metrics['wait_max']:.2f}s",
+        f"   Limits: {limit(metrics['rate'], '/s')} launches (burst"
+        f" {metrics['burst']:g}), {limit(metrics['max_in_flight'])} in flight,"
+        f" load {limit(metrics['max_load'])}, free memory"
+        f" {limit(metrics['min_free_mb'], ' MiB')}",
+        f"   Held back: {held or 'never'}",
+    ]
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Supervisor for headless agents")
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="Run in the foreground")
+    start_parser = sub.add_parser("start", help="Detach and serve")
+    for p in (serve_parser, start_parser):
+        p.add_argument(
+            "--idle-timeout",
+            type=float,
+            default=600.0,
+            help="Exit after this many idle seconds with no agents (0 to never exit)",
+        )
+    sub.add_parser("stop", help="Stop the supervisor (agents keep running)")
+    spawn_parser = sub.add_parser("spawn", help="Start an agent for a task")
+    spawn_parser.add_argument("agent")
+    spawn_parser.add_argument("task_id")
+    spawn_parser.add_argument("prompt")
+    spawn_parser.add_argument("--log", help="Log file (default: a new temp file)")
+    status_parser = sub.add_parser("status", help="Show one task, or all of them")
+    status_parser.add_argument("task_id", nargs="?")
+    sub.add_parser("list", help="Show every supervised task")
+    cancel_parser = sub.add_parser("cancel", help="Stop a task's agent")
+    cancel_parser.add_argument("task_id", nargs="?")
+    cancel_parser.add_argument("--all", action="store_true")
+    restart_parser = sub.add_parser("restart", help="Restart a task's agent")
+    restart_parser.add_argument("task_id")
+    events_parser = sub.add_parser("events", help="Print the event feed")
+    events_parser.add_argument("--since", type=int, default=0)
+    events_parser.add_argument("--follow", "-f", action="store_true")
+    sub.add_parser("metrics", help="Show admission limits and queue waits")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket, args.idle_timeout or None)
+        return
+    if args.command == "start":
+        if start(args.socket, args.idle_timeout):
+            print(f"✅ Supervisor started on {args.socket}")
+        else:
+            print(f"ℹ️  Supervisor already running on {args.socket}")
+        return
+
+    client = SupervisorClient.connect(args.socket)
+    if client is None:
+        print("⚪ Supervisor is not running")
+        sys.exit(0 if args.command in ("stop", "cancel") else 1)
+    try:
+        with client:
+            if args.command == "stop":
+                client.call("shutdown")
+                deadline = time.monotonic() + 10
+                while args.socket.exists() and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                print("🛑 Supervisor stopped")
+            elif args.command == "spawn":
+                command = agent_command(AgentTask(args.agent, "", args.prompt))
+                info = client.spawn(args.agent, args.task_id, command, None, args.log)
+                if info["status"] == "queued":
+                    print(f"   ⏳ Task {args.task_id} queued for admission")
+                else:
+                    print(f"   PID: {info['pid']} - Task {args.task_id} running")
+            elif args.command == "status" and args.task_id:
+                print(format_agent(client.status(args.task_id)))
+            elif args.command in ("status", "list"):
+                agents = client.list()
+                if not agents:
+                    print("No supervised agents")
+                for info in agents:
+                    print(format_agent(info))
+            elif args.command == "cancel":
+                if args.all:
+                    cancelled = client.cancel_all()
+                    print(f"🛑 Cancelled {len(cancelled)} agent(s)")
+                elif args.task_id:
+                    print(format_agent(client.cancel(args.task_id)))
+                else:
+                    parser.error("cancel needs a task ID or --all")
+            elif args.command == "restart":
+                print(format_agent(client.restart(args.task_id)))
+            elif args.command == "events":
+                events = (
+                    client.watch(args.since)
+                    if args.follow
+                    else iter(client.events(args.since))
+                )
+                for event in events:
+                    print(format_event(event), flush=True)
+            elif args.command == "metrics":
+                print("\n".join(format_metrics(client.metrics())))
+    except SupervisorError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Taskboard Archive - compressed, date-partitioned storage for finished tasks.
+
+Moving a task to "Recent Completions" used to keep it on the board forever,
+so a long-running board grew without bound and every read and rewrite got
+slower. The store now compacts that section: completed tasks older than a
+threshold, or beyond a count, are appended to gzip-compressed JSON-lines
+files under ``.claude/tasks/archive/``, one per month of completion
+(``completed-2025-01.jsonl.gz``), and removed from the live board.
+
+The store keeps a small ``task_id -> partition`` index next to its tasks, so
+an archived task is found by reading a single month's file. The index can
+always be rebuilt from the files themselves, and is rebuilt automatically
+when a store opens without one (a fresh clone, a deleted database).
+
+Usage:
+    python scripts/taskboard-helper.py compact
+    python scripts/taskboard-helper.py find ARCH-001
+"""
+
+import gzip
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+ARCHIVE_NAME = "archive"
+PARTITION_RE = re.compile(r"^completed-(?P<partition>.+)\.jsonl\.gz$")
+DATE_RE = re.compile(r"^(\d{4})-(\d{2})")
+
+
+def partition_for(date: Optional[str]) -> str:
+    """The month partition (``2025-01``) a completion date belongs to."""
+    match = DATE_RE.match(date or "")
+    return f"{match.group(1)}-{match.group(2)}" if match else "undated"
+
+
+class TaskArchive:
+    """Append-only gzip partitions of archived task rows."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def path(self, partition: str) -> Path:
+        """The file holding one partition."""
+        return self.directory / f"completed-{partition}.jsonl.gz"
+
+    def partitions(self) -> List[str]:
+        """Every partition on disk, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        names = (PARTITION_RE.match(p.name) for p in self.directory.iterdir())
+        return sorted(match.group("partition") for match in names if match)
+
+    def append(self, partition: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """Append rows to a partition; return how many were written.
+
+        Each call adds one gzip member, which readers see as a continuation
+        of the same stream, so existing data is never rewritten.
+        """
+        data = "".join(json.dumps(row, sort_keys=True) + "\n" for row in rows)
+        if not data:
+            return 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.path(partition), "ab") as f:
+            f.write(gzip.compress(data.encode()))
+            f.flush()
+            os.fsync(f.fileno())
+        return data.count("\n")
+
+    def read(self, partition: str) -> Iterator[Dict[str, Any]]:
+        """Rows of one partition in the order they were archived."""
+        path = self.path(partition)
+        if not path.exists():
+            return
+        with gzip.open(path, "rt") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def find(self, partition: str, task_id: str) -> Optional[Dict[str, Any]]:
+        """The most recently archived copy of a task in a partition."""
+        found = None
+        for row in self.read(partition):
+            if row.get("task_id") == task_id:
+                found = row
+        return found
+
+    def scan(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Every archived row with its partition, for rebuilding the index."""
+        for partition in self.partitions():
+            for row in self.read(partition):
+                yield partition, row
@@ -0,0 +1,357 @@
+"""
+Taskboard Server - a resident taskboard process agents talk to over a socket.
+
+Each ``taskboard-helper.py`` call otherwise pays interpreter start-up plus
+opening (and possibly re-importing) the board. The server keeps one
+``TaskboardStore`` open, serializes mutations through the store's group
+commit, and flushes ``taskboard.md`` asynchronously from a background thread.
+
+Protocol: newline-delimited JSON over a Unix domain socket. Each request is
+``{"action": ..., "args": {...}}`` and each response is ``{"ok": true, ...}``
+or ``{"ok": false, "error": "..."}``.
+
+Usage:
+    python3 -m src.services.taskboard_server start      # detach and serve
+    python3 -m src.services.taskboard_server start --taskboard path/to/taskboard.md
+    python3 -m src.services.taskboard_server status
+    python3 -m src.services.taskboard_server stop
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .taskboard_store import TASKBOARD_PATH, TaskboardError, TaskboardStore
+
+SOCKET_PATH = Path(
+    os.environ.get("TASKBOARD_SOCKET", str(TASKBOARD_PATH.with_suffix(".sock")))
+)
+
+# Where ``python3 -m src.services...`` resolves, whatever the caller's cwd
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+class TaskboardClient:
+    """Client for a running taskboard server; mirrors the store API."""
+
+    def __init__(self, socket_path: Path = SOCKET_PATH, timeout: float = 30.0):
+        self.socket_path = Path(socket_path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(str(self.socket_path))
+        self._reader = self.sock.makefile("r")
+
+    @classmethod
+    def connect(cls, socket_path: Path = SOCKET_PATH) -> Optional["TaskboardClient"]:
+        """Connect to the server, or return None when none is running."""
+        if not Path(socket_path).exists():
+            return None
+        try:
+            return cls(socket_path)
+        except OSError:
+            return None
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._reader.close()
+        self.sock.close()
+
+    def __enter__(self) -> "TaskboardClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def call(self, action: str, **args: Any) -> Dict[str, Any]:
+        """Send one request and return its response, raising on errors."""
+        self.sock.sendall(
+            (json.dumps({"action": action, "args": args}) + "\n").encode()
+        )
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Taskboard server closed the connection")
+        response: Dict[str, Any] = json.loads(line)
+        if not response.get("ok"):
+            raise TaskboardError(response.get("error", "Unknown server error"))
+        return response
+
+    def add_task(
+        self, agent: str, task_id: str, description: str, priority: str = "P2"
+    ) -> Dict[str, Any]:
+        """Add a new task to the backlog section for its priority."""
+        task: Dict[str, Any] = self.call(
+            "add",
+            agent=agent,
+            task_id=task_id,
+            description=description,
+            priority=priority,
+        )["task"]
+        return task
+
+    def move_task(self, task_id: str, new_section: str) -> Dict[str, Any]:
+        """Move a task to the top of another section."""
+        task: Dict[str, Any] = self.call("move", task_id=task_id, section=new_section)[
+            "task"
+        ]
+        return task
+
+    def batch(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply many operations in one server-side transaction."""
+        results: List[Dict[str, Any]] = self.call("batch", operations=operations)[
+            "results"
+        ]
+        return results
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a task by ID."""
+        task: Optional[Dict[str, Any]] = self.call("get", task_id=task_id)["task"]
+        return task
+
+    def find(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a task on the board or in the archive."""
+        task: Optional[Dict[str, Any]] = self.call("find", task_id=task_id)["task"]
+        return task
+
+    def query(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Tasks matching the filters (see ``TaskboardStore.query``)."""
+        tasks: List[Dict[str, Any]] = self.call("query", **filters)["tasks"]
+        return tasks
+
+    def compact(self) -> int:
+        """Archive old completions now."""
+        return int(self.call("compact")["archived"])
+
+    def render(self, force: bool = False) -> bool:
+        """Ask the server to write ``taskboard.md`` now."""
+        return bool(self.call("render", force=force)["rendered"])
+
+    def maybe_render(self) -> bool:
+        """No-op: the server flushes the view on its own schedule."""
+        return False
+
+    def render_text(self) -> str:
+        """Render the board as markdown without writing it."""
+        return str(self.call("show")["text"])
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "TaskboardServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                response = self.server.dispatch(
+                    request["action"], request.get("args") or {}
+                )
+                response["ok"] = True
+            except (TaskboardError, KeyError, TypeError, ValueError) as e:
+                response = {"ok": False, "error": str(e)}
+            except Exception as e:
+                # Storage failures (a locked database, a full disk) are
+                # reported too, instead of dropping the connection
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(response) + "\n").encode())
+            self.wfile.flush()
+
+
+class TaskboardServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve taskboard requests from one resident store."""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(
+        self,
+        socket_path: Path,
+        store: TaskboardStore,
+        flush_interval: float = 1.0,
+        idle_timeout: Optional[float] = None,
+    ):
+        self.socket_path = Path(socket_path)
+        self.store = store
+        self.flush_interval = flush_interval
+        self.idle_timeout = idle_timeout
+        self.last_request = time.monotonic()
+        self._stopping = threading.Event()
+        self._actions: Dict[str, Callable[..., Dict[str, Any]]] = {
+            "ping": lambda: {"pid": os.getpid()},
+            "add": lambda agent, task_id, description, priority="P2": {
+                "task": store.add_task(agent, task_id, description, priority)
+            },
+            "move": lambda task_id, section: {
+                "task": store.move_task(task_id, section)
+            },
+            "batch": lambda operations: {"results": store.batch(operations)},
+            "get": lambda task_id: {"task": store.get(task_id)},
+            "find": lambda task_id: {"task": store.find(task_id)},
+            "compact": lambda: {"archived": store.compact()},
+            "query": lambda **filters: {"tasks": store.query(**filters)},
+            "render": lambda force=False: {"rendered": store.render(force)},
+            "show": lambda: {"text": store.render_text()},
+            "shutdown": self._request_shutdown,
+        }
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        super().__init__(str(self.socket_path), _RequestHandler)
+        os.chmod(self.socket_path, 0o600)
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def dispatch(self, action: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request against the store."""
+        self.last_request = time.monotonic()
+        if action not in self._actions:
+            raise TaskboardError(f"Unknown action: {action}")
+        return self._actions[action](**args)
+
+    def _request_shutdown(self) -> Dict[str, Any]:
+        self._stopping.set()
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return {}
+
+    def _flush_loop(self) -> None:
+        """Write the markdown view in the background whenever it is stale.
+
+        A failed write is reported and retried on the next tick; letting it
+        end the thread would leave the view stale for the server's lifetime.
+        """
+        while not self._stopping.wait(self.flush_interval):
+            try:
+                if self.store.is_stale():
+                    self.store.render()
+            except Exception as e:
+                print(f"⚠️  Taskboard flush failed: {e}", file=sys.stderr)
+            idle = time.monotonic() - self.last_request
+            if self.idle_timeout and idle > self.idle_timeout:
+                self._request_shutdown()
+
+    def server_close(self) -> None:
+        """Flush pending updates and remove the socket."""
+        self._stopping.set()
+        super().server_close()
+        self.store.render()
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+def serve(
+    socket_path: Path = SOCKET_PATH,
+    markdown_path: Path = TASKBOARD_PATH,
+    flush_interval: float = 1.0,
+    idle_timeout: Optional[float] = None,
+) -> None:
+    """Run the server in the foreground until it is shut down."""
+    with TaskboardStore(markdown_path) as store:
+        server = TaskboardServer(socket_path, store, flush_interval, idle_timeout)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
+def start(
+    socket_path: Path = SOCKET_PATH,
+    idle_timeout: float = 600.0,
+    markdown_path: Path = TASKBOARD_PATH,
+) -> bool:
+    """Start a detached server unless one is already running."""
+    existing = TaskboardClient.connect(socket_path)
+    if existing:
+        existing.close()
+        return False
+    # The server runs from the repository root, so hand it absolute paths
+    subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "src.services.taskboard_server",
+            "serve",
+            "--socket",
+            str(Path(socket_path).resolve()),
+            "--taskboard",
+            str(Path(markdown_path).resolve()),
+            "--idle-timeout",
+            str(idle_timeout),
+        ],
+        cwd=REPO_ROOT,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        client = TaskboardClient.connect(socket_path)
+        if client:
+            client.close()
+            return True
+        time.sleep(0.05)
+    raise TimeoutError(f"Taskboard server did not start on {socket_path}")
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Resident taskboard server")
+    parser.add_argument("command", choices=["serve", "start", "stop", "status"])
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH)
+    parser.add_argument(
+        "--taskboard",
+        type=Path,
+        default=TASKBOARD_PATH,
+        help="The taskboard.md the server keeps up to date",
+    )
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=600.0,
+        help="Exit after this many idle seconds (0 to never exit)",
+    )
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(
+            args.socket,
+            args.taskboard,
+            flush_interval=args.flush_interval,
+            idle_timeout=args.idle_timeout or None,
+        )
+    elif args.command == "start":
+        if start(args.socket, args.idle_timeout, args.taskboard):
+            print(f"✅ Taskboard server started on {args.socket}")
+        else:
+            print(f"ℹ️  Taskboard server already running on {args.socket}")
+    else:
+        client = TaskboardClient.connect(args.socket)
+        try:
+            if not client:
+                raise ConnectionError
+            with client:
+                pid = client.call("ping")["pid"]
+                if args.command == "stop":
+                    client.call("shutdown")
+        except (OSError, ConnectionError):
+            print("⚪ Taskboard server is not running")
+            sys.exit(1 if args.command == "status" else 0)
+        if args.command == "status":
+            print(f"🟢 Taskboard server running (PID {pid})")
+        else:
+            deadline = time.monotonic() + 10
+            while args.socket.exists() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            print("🛑 Taskboard server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,884 @@
+"""
+Taskboard Store - indexed, append-only storage for the agent taskboard.
+
+Tasks live in a SQLite database next to ``taskboard.md``. Every mutation is
+appended to an ``events`` journal and applied to a ``tasks`` table keyed by
+task ID, so an update touches a single indexed row instead of re-reading and
+rewriting the whole board. ``taskboard.md`` becomes a rendered view of the
+store that is regenerated lazily (at most once per render interval) or on
+demand. Each task row keeps its rendered markdown block, refreshed when the
+task changes, so writing the view splices stored text into the board's
+skeleton instead of re-rendering every task.
+
+Hand edits to ``taskboard.md`` are not lost: when the view changed on disk
+since it was last rendered, it is re-imported and the journal entries that
+were not yet part of the view are replayed on top of it. A task keeps the
+field order it was written with, and an edit that repeats a task ID is
+rejected rather than dropping one of the copies.
+
+Concurrent writers are safe. Every commit holds an advisory ``flock`` on
+``taskboard.lock``, the view is written to a temporary file and atomically
+renamed into place, and mutations submitted concurrently through one store
+are group-committed: whichever caller wins the commit lock applies every
+queued update in a single transaction followed by at most one view write.
+
+"Recent Completions" stays bounded. Whenever tasks are completed, finished
+tasks older than ``archive_days`` or beyond the newest ``keep_completed``
+are moved to compressed monthly archive files (see ``taskboard_archive``)
+and recorded in an ``archived`` index, so ``find`` still looks them up by ID.
+
+``query`` answers questions like "what is @developer working on" or "P1
+tasks untouched for a week" from secondary indexes on assignee, status,
+priority and updated date. SQLite maintains them on every mutation, so a
+query reads only the matching rows instead of rescanning the board.
+"""
+
+import fcntl
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ..models.taskboard import Task, Taskboard, parse
+from ..utils import tracing
+from .taskboard_archive import ARCHIVE_NAME, TaskArchive, partition_for
+
+TASKBOARD_PATH = Path(".claude/tasks/taskboard.md")
+
+# A query filter: one value or any of several
+Filter = Union[None, str, Sequence[str]]
+
+# Index entries counted per filter when choosing which index a query uses
+PROBE_LIMIT = 1000
+
+# Section finished tasks move to; it is compacted into the archive
+COMPLETED_SECTION = "Recent Completions"
+
+# Section a task lands in when it is added with a given priority
+PRIORITY_SECTIONS = {
+    "P1": "High Priority (P1)",
+    "P2": "Medium Priority (P2)",
+    "P3": "Low Priority (P3)",
+}
+
+# Status written to a task when it moves into a workflow section
+STATUS_MAP = {
+    "In Progress": "In Progress",
+    "Review": "Review",
+    "Testing": "Testing",
+    COMPLETED_SECTION: "Done",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    priority TEXT,
+    assigned TEXT,
+    created TEXT,
+    updated TEXT,
+    status TEXT,
+    extra TEXT NOT NULL DEFAULT '',
+    layout TEXT,
+    block TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_by_section ON tasks (section, position);
+CREATE INDEX IF NOT EXISTS tasks_by_assigned ON tasks (assigned);
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS tasks_by_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS tasks_by_updated ON tasks (updated);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    op TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS archived (
+    task_id TEXT PRIMARY KEY,
+    partition TEXT NOT NULL,
+    archived TEXT NOT NULL
+);
+"""
+
+# Columns added to ``tasks`` after its first release: (name, type)
+ADDED_COLUMNS = (("layout", "TEXT"), ("block", "TEXT"))
+
+# The task fields returned by reads (the layout and block are internal)
+TASK_COLUMNS = (
+    "task_id, title, section, position, priority, assigned, created, updated,"
+    " status, extra"
+)
+
+
+class TaskboardError(Exception):
+    """Raised when a taskboard operation cannot be applied."""
+
+
+def today() -> str:
+    """Return the date stamp written into task metadata."""
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def split_board(board: Taskboard) -> List[Tuple[Task, str]]:
+    """Detach every task (and known placeholder) from a parsed board.
+
+    What is left on ``board`` is the skeleton the store renders tasks into;
+    the tasks are returned in document order with their section titles.
+    """
+    tasks: List[Tuple[Task, str]] = []
+    for section in board.sections:
+        items = section.items
+        kept: List[Union[str, Task]] = []
+        for i, item in enumerate(items):
+            if isinstance(item, Task):
+                tasks.append((item, section.title))
+            elif (
+                item == ""
+                and i
+                and isinstance(items[i - 1], Task)
+                and i < len(items) - 1
+            ):
+                # The blank line separating blocks belongs to the task
+                continue
+            elif item.strip() != section.placeholder:
+                kept.append(item)
+        section.items = kept
+    return tasks
+
+
+def row_to_task(row: Dict[str, Any]) -> Task:
+    """Build a model ``Task`` from a ``tasks`` table row."""
+    layout = row["layout"]
+    return Task(
+        row["task_id"],
+        row["title"],
+        row["priority"],
+        row["assigned"],
+        row["created"],
+        row["updated"],
+        row["status"],
+        tuple(row["extra"].split("\n")) if row["extra"] else (),
+        tuple(json.loads(layout)) if layout else None,
+    )
+
+
+def task_columns(task: Task) -> Dict[str, Any]:
+    """The ``layout`` and ``block`` column values stored with a task."""
+    return {
+        "layout": json.dumps(task.layout) if task.layout is not None else None,
+        "block": "\n".join(task.lines()),
+    }
+
+
+def render_board(skeleton: str, blocks: Dict[str, List[str]]) -> str:
+    """Render the skeleton with each section's task blocks (or placeholder)."""
+    board = parse(skeleton)
+    filled = set()
+    for section in board.sections:
+        if section.title not in filled:
+            filled.add(section.title)
+            section.fill(blocks.get(section.title, []))
+    # Sections that only exist in the store are appended to the view
+    for title, section_blocks in blocks.items():
+        if title not in filled:
+            board.add_section(title).fill(section_blocks)
+    return board.serialize()
+
+
+class _PendingUpdate:
+    """A mutation waiting in the group-commit queue."""
+
+    __slots__ = ("op", "task_id", "payload", "error", "done")
+
+    def __init__(self, op: str, task_id: str, payload: Dict[str, Any]):
+        self.op = op
+        self.task_id = task_id
+        self.payload = payload
+        self.error: Optional[BaseException] = None
+        self.done = False
+
+
+def _add_payload(agent: str, description: str, priority: str) -> Dict[str, Any]:
+    return {
+        "agent": agent,
+        "title": description,
+        "priority": priority,
+        "section": PRIORITY_SECTIONS.get(priority, PRIORITY_SECTIONS["P3"]),
+        "date": today(),
+    }
+
+
+def _build_update(operation: Dict[str, Any]) -> _PendingUpdate:
+    """Turn a batch operation into a pending update."""
+    action = operation.get("action")
+    try:
+        if action == "add":
+            payload = _add_payload(
+                operation["agent"],
+                operation["description"],
+                operation.get("priority", "P2"),
+            )
+            return _PendingUpdate("add", operation["task_id"], payload)
+        if action == "move":
+            payload = {"section": operation["section"], "date": today()}
+            return _PendingUpdate("move", operation["task_id"], payload)
+    except KeyError as e:
+        raise TaskboardError(f"{action} requires {e.args[0]}") from None
+    raise TaskboardError(f"Unknown operation: {action}")
+
+
+def atomic_write(path: Path, content: str) -> None:
+    """Write ``content`` to ``path`` via a temporary file and an atomic rename.
+
+    Readers see either the previous file or the new one, never a missing or
+    partially written file. The file keeps its permissions (a new one gets
+    the usual ``0o666`` less the umask, not ``mkstemp``'s ``0o600``).
+    """
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent)
+    )
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class TaskboardStore:
+    """SQLite-backed taskboard with an append-only event journal."""
+
+    def __init__(
+        self,
+        markdown_path: Path = TASKBOARD_PATH,
+        db_path: Optional[Path] = None,
+        render_interval: Optional[float] = None,
+        archive_days: Optional[float] = None,
+        keep_completed: Optional[int] = None,
+    ):
+        self.markdown_path = Path(markdown_path)
+        self.db_path = (
+            Path(db_path) if db_path else self.markdown_path.with_suffix(".db")
+        )
+        self.lock_path = self.db_path.with_suffix(".lock")
+        if render_interval is None:
+            render_interval = float(os.environ.get("TASKBOARD_RENDER_INTERVAL", "2"))
+        self.render_interval = render_interval
+        # 0 switches a limit off
+        if archive_days is None:
+            archive_days = float(os.environ.get("TASKBOARD_ARCHIVE_DAYS", "30"))
+        if keep_completed is None:
+            keep_completed = int(os.environ.get("TASKBOARD_KEEP_COMPLETED", "50"))
+        self.archive_days = archive_days
+        self.keep_completed = keep_completed
+        self.archive = TaskArchive(self.markdown_path.parent / ARCHIVE_NAME)
+        self.commits = 0
+        self._queue: List[_PendingUpdate] = []
+        self._queue_lock = threading.Lock()
+        self._db_lock = threading.RLock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(
+            str(self.db_path), timeout=60, isolation_level=None, check_same_thread=False
+        )
+        self.conn.row_factory = sqlite3.Row
+        with self._locked():
+            self.conn.executescript(SCHEMA)
+            self._add_columns()
+            with self._transaction():
+                self._sync_view()
+                if not self._indexed() and self.archive.partitions():
+                    self._rebuild_index()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "TaskboardStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- locking ------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the in-process lock and the cross-process advisory lock."""
+        with self._db_lock:
+            with open(self.lock_path, "a") as lock_file:
+                with tracing.span("taskboard lock wait", "taskboard"):
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _add_columns(self) -> None:
+        """Bring a database created by an earlier version up to the schema.
+
+        Rows from before get their rendered block once, here.
+        """
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+        missing = [(name, kind) for name, kind in ADDED_COLUMNS if name not in columns]
+        if not missing:
+            return
+        with self._transaction():
+            for name, kind in missing:
+                self.conn.execute(f"ALTER TABLE tasks ADD COLUMN {name} {kind}")
+            self.conn.executemany(
+                "UPDATE tasks SET block = ? WHERE task_id = ?",
+                [
+                    ("\n".join(row_to_task(row).lines()), row["task_id"])
+                    for row in self.conn.execute("SELECT * FROM tasks")
+                ],
+            )
+
+    # -- metadata -----------------------------------------------------------
+
+    def _meta(self, key: str, default: str = "") -> str:
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row["value"] if row else default
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def _view_stamp(self) -> str:
+        try:
+            stat = self.markdown_path.stat()
+        except FileNotFoundError:
+            return ""
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _last_seq(self) -> int:
+        row = self.conn.execute("SELECT MAX(seq) AS seq FROM events").fetchone()
+        return row["seq"] or 0
+
+    # -- import / render ----------------------------------------------------
+
+    def _sync_view(self) -> None:
+        """Import ``taskboard.md`` if it is new or was edited by hand.
+
+        Must be called inside a transaction while holding the store lock.
+        """
+        stamp = self._view_stamp()
+        if not stamp or stamp == self._meta("view_stamp"):
+            return
+        pending = self.conn.execute(
+            "SELECT op, task_id, payload FROM events WHERE seq > ? ORDER BY seq",
+            (int(self._meta("rendered_seq", "0")),),
+        ).fetchall()
+        self._import(self.markdown_path.read_text())
+        for event in pending:
+            try:
+                self._apply(event["op"], event["task_id"], json.loads(event["payload"]))
+            except TaskboardError:
+                # The hand edit already added or removed this task
+                pass
+        self._set_meta("view_stamp", stamp)
+
+    def _import(self, text: str) -> None:
+        board = parse(text)
+        tasks = split_board(board)
+        counts = Counter(task.task_id for task, _ in tasks)
+        duplicates = sorted(task_id for task_id, n in counts.items() if n > 1)
+        if duplicates:
+            raise TaskboardError(
+                f"{self.markdown_path} lists task(s) more than once:"
+                f" {', '.join(duplicates)}; keep one block per task ID"
+            )
+        self.conn.execute("DELETE FROM tasks")
+        self._set_meta("skeleton", board.serialize())
+        self.conn.executemany(
+            "INSERT INTO tasks (task_id, title, section, position, priority,"
+            " assigned, created, updated, status, extra, layout, block)"
+            " VALUES (:task_id, :title, :section, :position, :priority, :assigned,"
+            " :created, :updated, :status, :extra, :layout, :block)",
+            (
+                dict(
+                    task.as_dict(),
+                    **task_columns(task),
+                    title=task.title or "",
+                    section=section,
+                    position=n,
+                )
+                for n, (task, section) in enumerate(tasks)
+            ),
+        )
+
+    def import_markdown(self) -> int:
+        """Replace the store contents with the current ``taskboard.md``."""
+        with self._locked(), self._transaction():
+            self._import(self.markdown_path.read_text())
+            self._set_meta("view_stamp", self._view_stamp())
+            self._set_meta("rendered_seq", str(self._last_seq()))
+        return self.count()
+
+    def render_text(self) -> str:
+        """Render the board as markdown without writing it."""
+        with self._db_lock:
+            skeleton = self._meta("skeleton")
+            by_section: Dict[str, List[str]] = {}
+            for section, block in self.conn.execute(
+                "SELECT section, block FROM tasks ORDER BY section, position"
+            ):
+                by_section.setdefault(section, []).append(block)
+        return render_board(skeleton, by_section)
+
+    def is_stale(self) -> bool:
+        """Whether the store holds changes not yet written to the view."""
+        with self._db_lock:
+            return self._last_seq() > int(self._meta("rendered_seq", "0"))
+
+    def render(self, force: bool = False) -> bool:
+        """Write ``taskboard.md`` if it is out of date; return True if written."""
+        with self._locked():
+            return self._render(force)
+
+    def _render(self, force: bool = False) -> bool:
+        if not force and not self.is_stale():
+            return False
+        with tracing.span("taskboard render", "taskboard"), self._transaction():
+            seq = self._last_seq()
+            atomic_write(self.markdown_path, self.render_text())
+            self._set_meta("view_stamp", self._view_stamp())
+            self._set_meta("rendered_seq", str(seq))
+            self._set_meta("rendered_at", str(time.time()))
+        return True
+
+    def maybe_render(self) -> bool:
+        """Render lazily: at most once per ``render_interval`` seconds.
+
+        Only for long-lived callers that render again later; a short-lived
+        one must call ``render`` or the view can stay stale.
+        """
+        with self._db_lock:
+            last = float(self._meta("rendered_at", "0"))
+        if time.time() - last < self.render_interval:
+            return False
+        return self.render()
+
+    # -- mutations ----------------------------------------------------------
+
+    def _submit(self, op: str, task_id: str, payload: Dict[str, Any]) -> None:
+        """Queue a mutation and group-commit it with any concurrent ones."""
+        update = _PendingUpdate(op, task_id, payload)
+        with self._queue_lock:
+            self._queue.append(update)
+        with self._locked():
+            if not update.done:
+                with self._queue_lock:
+                    batch, self._queue = self._queue, []
+                self._commit(batch)
+        if update.error:
+            raise update.error
+
+    def _commit(self, batch: List[_PendingUpdate]) -> None:
+        """Apply a batch of updates in one transaction."""
+        span = tracing.span("taskboard commit", "taskboard", updates=len(batch))
+        try:
+            with span, self._transaction():
+                self._sync_view()
+                for update in batch:
+                    self.conn.execute("SAVEPOINT op")
+                    try:
+                        self._apply(update.op, update.task_id, update.payload)
+                    except TaskboardError as e:
+                        update.error = e
+                        self.conn.execute("ROLLBACK TO op")
+                    else:
+                        self._journal(update.op, update.task_id, update.payload)
+                    self.conn.execute("RELEASE op")
+                if any(
+                    update.op == "move"
+                    and update.error is None
+                    and update.payload["section"] == COMPLETED_SECTION
+                    for update in batch
+                ):
+                    self._compact()
+            self.commits += 1
+        except BaseException as e:
+            # The whole batch was rolled back: every caller waiting on it
+            # must see the failure, not just the thread that committed
+            for update in batch:
+                if update.error is None:
+                    update.error = e
+            raise
+        finally:
+            for update in batch:
+                update.done = True
+
+    def _journal(self, op: str, task_id: str, payload: Dict[str, Any]) -> None:
+        self.conn.execute(
+            "INSERT INTO events (ts, op, task_id, payload) VALUES (?, ?, ?, ?)",
+            (datetime.now().isoformat(), op, task_id, json.dumps(payload)),
+        )
+
+    def _top_position(self, section: str) -> int:
+        row = self.conn.execute(
+            "SELECT MIN(position) AS pos FROM tasks WHERE section = ?", (section,)
+        ).fetchone()
+        return (row["pos"] if row["pos"] is not None else 0) - 1
+
+    def _exists(self, task_id: str) -> bool:
+        return (
+            self.conn.execute(
+                "SELECT 1 FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+            is not None
+        )
+
+    def _partition(self, task_id: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT partition FROM archived WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        return row["partition"] if row else None
+
+    def _apply(self, op: str, task_id: str, payload: Dict[str, Any]) -> None:
+        if op == "add":
+            if self._exists(task_id):
+                raise TaskboardError(f"Task {task_id} already exists")
+            if self._partition(task_id):
+                raise TaskboardError(f"Task {task_id} already exists (archived)")
+            section = payload["section"]
+            task = Task(
+                task_id,
+                payload["title"],
+                payload["priority"],
+                f"@{payload['agent']}",
+                payload["date"],
+                payload["date"],
+                "Backlog",
+            )
+            self.conn.execute(
+                "INSERT INTO tasks (task_id, title, section, position, priority,"
+                " assigned, created, updated, status, extra, layout, block)"
+                " VALUES (:task_id, :title, :section, :position, :priority,"
+                " :assigned, :created, :updated, :status, :extra, :layout, :block)",
+                dict(
+                    task.as_dict(),
+                    **task_columns(task),
+                    section=section,
+                    position=self._top_position(section),
+                ),
+            )
+        elif op == "move":
+            row = self.conn.execute(
+                "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+            if row is None:
+                if self._partition(task_id):
+                    raise TaskboardError(f"Task {task_id} is archived")
+                raise TaskboardError(f"Task {task_id} not found")
+            section = payload["section"]
+            task = row_to_task(row)
+            task.set("updated", payload["date"])
+            if section in STATUS_MAP:
+                task.set("status", STATUS_MAP[section])
+            self.conn.execute(
+                "UPDATE tasks SET section = :section, position = :position,"
+                " updated = :updated, status = :status, layout = :layout,"
+                " block = :block WHERE task_id = :task_id",
+                dict(
+                    task.as_dict(),
+                    **task_columns(task),
+                    section=section,
+                    position=self._top_position(section),
+                ),
+            )
+        elif op == "archive":
+            if not self._exists(task_id):
+                raise TaskboardError(f"Task {task_id} not found")
+            self.conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO archived (task_id, partition, archived)"
+                " VALUES (?, ?, ?)",
+                (task_id, payload["partition"], payload["date"]),
+            )
+        else:
+            raise TaskboardError(f"Unknown operation: {op}")
+
+    def add_task(
+        self, agent: str, task_id: str, description: str, priority: str = "P2"
+    ) -> Dict[str, Any]:
+        """Add a new task to the backlog section for its priority."""
+        self._submit("add", task_id, _add_payload(agent, description, priority))
+        return self.get(task_id) or {}
+
+    def move_task(self, task_id: str, new_section: str) -> Dict[str, Any]:
+        """Move a task to the top of another section."""
+        self._submit("move", task_id, {"section": new_section, "date": today()})
+        return self.get(task_id) or {}
+
+    def batch(self, operations: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply many operations in a single transaction.
+
+        Each operation is ``{"action": "add", "agent", "task_id",
+        "description", "priority"}`` or ``{"action": "move", "task_id",
+        "section"}``. A failing operation is rolled back on its own and
+        reported; the others still apply. Returns one result per operation.
+        """
+        updates: List[_PendingUpdate] = []
+        for operation in operations:
+            try:
+                update = _build_update(operation)
+            except TaskboardError as e:
+                update = _PendingUpdate(
+                    str(operation.get("action")), str(operation.get("task_id")), {}
+                )
+                update.error = e
+                update.done = True
+            updates.append(update)
+        pending = [update for update in updates if not update.done]
+        if pending:
+            with self._locked():
+                self._commit(pending)
+        return [
+            {
+                "action": update.op,
+                "task_id": update.task_id,
+                "ok": update.error is None,
+                "error": str(update.error) if update.error else None,
+            }
+            for update in updates
+        ]
+
+    # -- archive ------------------------------------------------------------
+
+    def _compact(self) -> int:
+        """Archive completions past the age or count limit.
+
+        Must be called inside a transaction while holding the store lock.
+        The rows are appended to the archive files before the transaction
+        commits; should it fail, the orphaned copies are simply never indexed.
+        """
+        if not (self.archive_days or self.keep_completed):
+            return 0
+        rows = self.conn.execute(
+            f"SELECT {TASK_COLUMNS} FROM tasks WHERE section = ? ORDER BY position",
+            (COMPLETED_SECTION,),
+        ).fetchall()
+        cutoff = ""
+        if self.archive_days:
+            oldest = datetime.now() - timedelta(days=self.archive_days)
+            cutoff = oldest.strftime("%Y-%m-%d")
+        expired = [
+            dict(row)
+            for n, row in enumerate(rows)
+            if (self.keep_completed and n >= self.keep_completed)
+            or (cutoff and row["updated"] and row["updated"] < cutoff)
+        ]
+        if not expired:
+            return 0
+        date = today()
+        partitions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in expired:
+            row["archived"] = date
+            partitions[partition_for(row["updated"])].append(row)
+        with tracing.span("taskboard archive", "taskboard", tasks=len(expired)):
+            for partition, part in partitions.items():
+                self.archive.append(partition, part)
+                for row in part:
+                    payload = {"partition": partition, "date": date}
+                    self._apply("archive", row["task_id"], payload)
+                    self._journal("archive", row["task_id"], payload)
+        return len(expired)
+
+    def compact(self) -> int:
+        """Archive old completions now; return how many tasks were archived."""
+        with self._locked():
+            with self._transaction():
+                self._sync_view()
+                archived = self._compact()
+            if archived:
+                self._render()
+        return archived
+
+    def _indexed(self) -> bool:
+        return (
+            self.conn.execute("SELECT 1 FROM archived LIMIT 1").fetchone() is not None
+        )
+
+    def _rebuild_index(self) -> int:
+        self.conn.execute("DELETE FROM archived")
+        count = 0
+        for partition, row in self.archive.scan():
+            self.conn.execute(
+                "INSERT OR REPLACE INTO archived (task_id, partition, archived)"
+                " VALUES (?, ?, ?)",
+                (row["task_id"], partition, row.get("archived", "")),
+            )
+            count += 1
+        return count
+
+    def rebuild_archive_index(self) -> int:
+        """Re-index every archive file; return the number of rows read."""
+        with self._locked(), self._transaction():
+            return self._rebuild_index()
+
+    def find(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a task on the board or, failing that, in the archive."""
+        task = self.get(task_id)
+        if task is not None:
+            return task
+        with self._db_lock:
+            partition = self._partition(task_id)
+        if partition is None:
+            return None
+        task = self.archive.find(partition, task_id)
+        return dict(task, partition=partition) if task else None
+
+    def archive_counts(self) -> Dict[str, int]:
+        """Number of archived tasks per partition."""
+        with self._db_lock:
+            rows = self.conn.execute(
+                "SELECT partition, COUNT(*) AS n FROM archived GROUP BY partition"
+            )
+            return {row["partition"]: row["n"] for row in rows}
+
+    # -- reads --------------------------------------------------------------
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a task by ID."""
+        with self._db_lock:
+            row = self.conn.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def tasks(self, section: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List tasks, optionally restricted to one section, in board order."""
+        with self._db_lock:
+            if section is None:
+                rows = self.conn.execute(
+                    f"SELECT {TASK_COLUMNS} FROM tasks ORDER BY section, position"
+                )
+            else:
+                rows = self.conn.execute(
+                    f"SELECT {TASK_COLUMNS} FROM tasks WHERE section = ?"
+                    " ORDER BY position",
+                    (section,),
+                )
+            return [dict(row) for row in rows]
+
+    def query(
+        self,
+        assigned: Filter = None,
+        status: Filter = None,
+        priority: Filter = None,
+        section: Filter = None,
+        updated_before: Optional[str] = None,
+        stale_days: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Tasks matching every given filter, in board order.
+
+        ``assigned``, ``status``, ``priority`` and ``section`` take one value
+        or a list of alternatives (``assigned`` with or without the ``@``).
+        ``updated_before`` (``YYYY-MM-DD``) or ``stale_days`` select tasks
+        whose last update is older than that.
+        """
+        # (index, clause, parameters) per filter
+        filters: List[Tuple[str, str, List[Any]]] = []
+
+        def match(column: str, value: Filter, prefix: str = "") -> None:
+            if value is None:
+                return
+            values = [value] if isinstance(value, str) else list(value)
+            values = [v if v.startswith(prefix) else prefix + v for v in values]
+            clause = f"{column} IN ({', '.join('?' * len(values))})"
+            filters.append((f"tasks_by_{column}", clause, values))
+
+        match("assigned", assigned, "@")
+        match("status", status)
+        match("priority", priority)
+        match("section", section)
+        if stale_days is not None:
+            cutoff = datetime.now() - timedelta(days=stale_days)
+            stale = cutoff.strftime("%Y-%m-%d")
+            updated_before = min(updated_before or stale, stale)
+        if updated_before:
+            filters.append(("tasks_by_updated", "updated < ?", [updated_before]))
+
+        with self._db_lock:
+            sql = f"SELECT {TASK_COLUMNS} FROM tasks"
+            params: List[Any] = []
+            if filters:
+                index = min(filters, key=self._probe)[0]
+                sql += f" INDEXED BY {index} WHERE "
+                sql += " AND ".join(clause for _, clause, _ in filters)
+                params = [value for _, _, values in filters for value in values]
+            sql += " ORDER BY section, position"
+            if limit:
+                sql += " LIMIT ?"
+                params.append(limit)
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def _probe(self, query_filter: Tuple[str, str, List[Any]]) -> int:
+        """Rows a filter matches, counted through its index up to a cap.
+
+        SQLite's planner has no per-value statistics, so on a board where
+        nearly every task is ``P2`` it may walk the priority index for "P2
+        tasks in Review". Counting a bounded prefix of each filter's index
+        range finds the most selective one for a few microseconds.
+        """
+        index, clause, values = query_filter
+        row = self.conn.execute(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM tasks INDEXED BY {index}"
+            f" WHERE {clause} LIMIT ?)",
+            (*values, PROBE_LIMIT),
+        ).fetchone()
+        return int(row[0])
+
+    def count(self) -> int:
+        """Number of tasks on the board."""
+        with self._db_lock:
+            return int(self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0])
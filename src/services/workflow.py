@@ -0,0 +1,451 @@
+"""
+Workflow Engine - run agent workflows as dependency graphs.
+
+A workflow is a JSON document listing steps and the steps each one needs.
+Every step whose dependencies have succeeded is started right away, up to
+``max_parallel`` at a time, so independent steps (tests and docs that only
+depend on the architecture, say) overlap instead of running back to back.
+When a step fails, every step that depends on it, directly or not, is
+skipped; unrelated branches keep going. A step marked ``"gate": true`` is a
+quality gate: when it fails, no further step starts on any branch (steps
+already running finish). At the end the engine reports each
+step's outcome and the critical path: the chain of dependent steps that
+determined the total wall-clock time.
+
+Definition format (``scripts/workflows/<name>.json``)::
+
+    {
+      "name": "workflow",
+      "description": "Standard development workflow with quality gates",
+      "steps": [
+        {"id": "architecture", "agent": "architect",
+         "label": "Architecture Phase",
+         "prompt": "Design the architecture for {target}"},
+        {"id": "architecture-review", "agent": "reviewer", "gate": true,
+         "label": "Quality Gate: Architecture Review",
+         "prompt": "Review the architecture design for {target}",
+         "needs": ["architecture"]}
+      ]
+    }
+
+``{target}`` in a prompt is replaced with the feature, model, app or product
+the workflow runs for. Agents run through the bounded scheduler, so
+``ORCHESTRATE_TIMEOUT`` and ``ORCHESTRATE_RETRIES`` apply to each step.
+
+Usage:
+    python3 -m src.services.workflow run workflow "user authentication"
+    python3 -m src.services.workflow sequence "architect:design,developer:build"
+    python3 -m src.services.workflow show ml-workflow
+    python3 -m src.services.workflow list
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .scheduler import AgentTask, Scheduler, TaskResult, env_number, parse_tasks
+
+WORKFLOW_DIR = Path(__file__).resolve().parent.parent.parent / "scripts" / "workflows"
+
+# Display names for agents whose role name is not just the capitalized ID
+AGENT_NAMES = {
+    "devops": "DevOps",
+    "mlops": "MLOps",
+    "ux": "UX",
+    "project": "Project Manager",
+    "product": "Product Manager",
+    "portfolio": "Portfolio Manager",
+    "research": "Research Team",
+    "customer": "Customer Voice",
+    "scrum": "Scrum Master",
+}
+
+
+class WorkflowError(Exception):
+    """Raised for invalid workflow definitions."""
+
+
+def agent_name(agent: str) -> str:
+    """Display name of an agent ID (``devops`` -> ``DevOps``)."""
+    return AGENT_NAMES.get(agent, agent[:1].upper() + agent[1:])
+
+
+def agent_prompt(agent: str, instructions: str) -> str:
+    """Prompt that loads an agent's role before handing it instructions."""
+    name = agent_name(agent)
+    return (
+        f"You are the {name} Agent. First run /{agent} to load your role. "
+        f"{instructions}"
+    )
+
+
+class Step:
+    """One node of a workflow graph."""
+
+    __slots__ = ("id", "agent", "label", "prompt", "needs", "gate")
+
+    def __init__(
+        self,
+        id: str,
+        agent: str,
+        prompt: str,
+        label: str = "",
+        needs: Optional[List[str]] = None,
+        gate: bool = False,
+    ):
+        self.id = id
+        self.agent = agent
+        self.prompt = prompt
+        self.label = label or id
+        self.needs = list(needs or [])
+        self.gate = gate
+
+    def task(self, target: str) -> AgentTask:
+        """The agent task this step runs for ``target``."""
+        instructions = self.prompt.replace("{target}", target)
+        return AgentTask(
+            self.agent, instructions, agent_prompt(self.agent, instructions)
+        )
+
+
+class Workflow:
+    """A validated, acyclic set of steps."""
+
+    def __init__(self, name: str, steps: List[Step], description: str = ""):
+        self.name = name
+        self.description = description
+        self.steps = {step.id: step for step in steps}
+        if len(self.steps) != len(steps):
+            raise WorkflowError(f"{name}: duplicate step IDs")
+        for step in steps:
+            for need in step.needs:
+                if need not in self.steps:
+                    raise WorkflowError(f"{name}: {step.id} needs unknown step {need}")
+        self.order = self._topological_order()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Workflow":
+        """Build a workflow from its JSON definition."""
+        try:
+            steps = [
+                Step(
+                    s["id"],
+                    s["agent"],
+                    s["prompt"],
+                    s.get("label", ""),
+                    s.get("needs"),
+                    s.get("gate", False),
+                )
+                for s in data["steps"]
+            ]
+        except (KeyError, TypeError) as e:
+            raise WorkflowError(f"Invalid workflow definition: missing {e}") from None
+        return cls(data.get("name", "workflow"), steps, data.get("description", ""))
+
+    @classmethod
+    def sequence(cls, tasks: List[AgentTask]) -> "Workflow":
+        """A linear workflow where each task depends on the one before it."""
+        steps: List[Step] = []
+        for n, task in enumerate(tasks):
+            step = Step(
+                f"{n + 1}-{task.agent}", task.agent, f"Then: {task.description}"
+            )
+            step.needs = [steps[-1].id] if steps else []
+            steps.append(step)
+        return cls("sequence", steps)
+
+    def _topological_order(self) -> List[str]:
+        remaining = {step_id: len(step.needs) for step_id, step in self.steps.items()}
+        dependents = self.dependents()
+        ready = [step_id for step_id, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            step_id = ready.pop(0)
+            order.append(step_id)
+            for child in dependents[step_id]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+        if len(order) != len(self.steps):
+            cycle = sorted(set(self.steps) - set(order))
+            raise WorkflowError(
+                f"{self.name}: dependency cycle among {', '.join(cycle)}"
+            )
+        return order
+
+    def dependents(self) -> Dict[str, List[str]]:
+        """Map each step to the steps that directly need it."""
+        children: Dict[str, List[str]] = {step_id: [] for step_id in self.steps}
+        for step in self.steps.values():
+            for need in step.needs:
+                children[need].append(step.id)
+        return children
+
+    def levels(self) -> List[List[str]]:
+        """Group steps into waves that could all run at the same time."""
+        depth: Dict[str, int] = {}
+        for step_id in self.order:
+            needs = self.steps[step_id].needs
+            depth[step_id] = 1 + max((depth[need] for need in needs), default=-1)
+        waves: List[List[str]] = [
+            [] for _ in range(max(depth.values(), default=-1) + 1)
+        ]
+        for step_id in self.order:
+            waves[depth[step_id]].append(step_id)
+        return waves
+
+
+def load_workflow(name_or_path: str) -> Workflow:
+    """Load a workflow by name (from ``scripts/workflows``) or from a file."""
+    path = Path(name_or_path)
+    if not path.suffix:
+        path = WORKFLOW_DIR / f"{name_or_path}.json"
+    if not path.exists():
+        raise WorkflowError(f"Workflow not found: {name_or_path}")
+    try:
+        data = json.loads(path.read_text())
+    except json.JSONDecodeError as e:
+        raise WorkflowError(f"{path}: {e}") from None
+    return Workflow.from_dict(data)
+
+
+class StepOutcome:
+    """What happened to one step during a run."""
+
+    __slots__ = ("step", "status", "result", "blocked_by")
+
+    def __init__(
+        self,
+        step: Step,
+        status: str,
+        result: Optional[TaskResult] = None,
+        blocked_by: Optional[str] = None,
+    ):
+        self.step = step
+        self.status = status  # "passed", "failed" or "skipped"
+        self.result = result
+        self.blocked_by = blocked_by
+
+    @property
+    def duration(self) -> float:
+        """Wall-clock seconds the step ran for (0 if it never ran)."""
+        return self.result.duration if self.result else 0.0
+
+
+class WorkflowRun:
+    """Outcome of a workflow run."""
+
+    def __init__(
+        self, workflow: Workflow, outcomes: Dict[str, StepOutcome], elapsed: float
+    ):
+        self.workflow = workflow
+        self.outcomes = outcomes
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        """Whether every step passed."""
+        return all(outcome.status == "passed" for outcome in self.outcomes.values())
+
+    @property
+    def failed_gates(self) -> List[str]:
+        """Quality gate steps that failed and stopped the run."""
+        return [
+            step_id
+            for step_id, outcome in self.outcomes.items()
+            if outcome.step.gate and outcome.status == "failed"
+        ]
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """Longest chain of dependent steps by duration, and its length."""
+        finish: Dict[str, float] = {}
+        via: Dict[str, Optional[str]] = {}
+        for step_id in self.workflow.order:
+            needs = self.workflow.steps[step_id].needs
+            before = max(needs, key=lambda need: finish[need], default=None)
+            via[step_id] = before
+            finish[step_id] = self.outcomes[step_id].duration + (
+                finish[before] if before else 0.0
+            )
+        if not finish:
+            return [], 0.0
+        last = max(finish, key=lambda s: finish[s])
+        path: List[str] = []
+        current: Optional[str] = last
+        while current:
+            path.append(current)
+            current = via[current]
+        return path[::-1], finish[last]
+
+
+class WorkflowEngine:
+    """Run a workflow's ready steps in parallel, up to ``max_parallel``."""
+
+    def __init__(
+        self,
+        max_parallel: Optional[int] = None,
+        scheduler: Optional[Scheduler] = None,
+        verbose: bool = True,
+    ):
+        self.max_parallel = max(1, max_parallel or os.cpu_count() or 4)
+        self.scheduler = scheduler or Scheduler(max_workers=self.max_parallel)
+        self.verbose = verbose
+
+    def _say(self, message: str) -> None:
+        if self.verbose:
+            print(message, flush=True)
+
+    def run(self, workflow: Workflow, target: str = "") -> WorkflowRun:
+        """Run every step, respecting dependencies; return the outcomes."""
+        start = time.monotonic()
+        waiting = {step_id: set(step.needs) for step_id, step in workflow.steps.items()}
+        dependents = workflow.dependents()
+        outcomes: Dict[str, StepOutcome] = {}
+        running: Dict[Future, str] = {}
+
+        def skip_dependents(step_id: str, cause: str) -> None:
+            for child in dependents[step_id]:
+                if child not in outcomes:
+                    waiting.pop(child, None)
+                    outcomes[child] = StepOutcome(
+                        workflow.steps[child], "skipped", blocked_by=cause
+                    )
+                    self._say(
+                        f"⏭️  Skipping {workflow.steps[child].label}"
+                        f" ({cause} failed)"
+                    )
+                    skip_dependents(child, cause)
+
+        def stop(gate: str) -> None:
+            for step_id in [s for s in workflow.order if s in waiting]:
+                del waiting[step_id]
+                outcomes[step_id] = StepOutcome(
+                    workflow.steps[step_id], "skipped", blocked_by=gate
+                )
+                self._say(
+                    f"⏭️  Skipping {workflow.steps[step_id].label}"
+                    f" (quality gate {gate} failed)"
+                )
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            try:
+                while waiting or running:
+                    ready = [s for s in workflow.order if waiting.get(s) == set()]
+                    for step_id in ready[: self.max_parallel - len(running)]:
+                        del waiting[step_id]
+                        step = workflow.steps[step_id]
+                        self._say(f"▶️  {step.label} ({step.agent})")
+                        future = pool.submit(self.scheduler.run_one, step.task(target))
+                        running[future] = step_id
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        step_id = running.pop(future)
+                        step = workflow.steps[step_id]
+                        result = future.result()
+                        passed = result.ok
+                        outcomes[step_id] = StepOutcome(
+                            step, "passed" if passed else "failed", result
+                        )
+                        if passed:
+                            self._say(f"✅ {step.label} ({result.duration:.1f}s)")
+                            for child in dependents[step_id]:
+                                waiting.get(child, set()).discard(step_id)
+                        else:
+                            reason = "timed out" if result.timed_out else "failed"
+                            self._say(
+                                f"❌ {step.label} {reason} (exit {result.exit_code})"
+                                f" - Log: {result.log_path}"
+                            )
+                            skip_dependents(step_id, step_id)
+                            if step.gate:
+                                stop(step_id)
+            except BaseException:
+                self.scheduler.cancel()
+                raise
+        return WorkflowRun(workflow, outcomes, time.monotonic() - start)
+
+
+def report(run: WorkflowRun) -> None:
+    """Print the per-step summary and the critical path."""
+    counts = {"passed": 0, "failed": 0, "skipped": 0}
+    for outcome in run.outcomes.values():
+        counts[outcome.status] += 1
+    serial = sum(outcome.duration for outcome in run.outcomes.values())
+    path, length = run.critical_path()
+    print("")
+    print(
+        f"📊 {counts['passed']} passed, {counts['failed']} failed,"
+        f" {counts['skipped']} skipped in {run.elapsed:.1f}s"
+        f" ({serial:.1f}s of agent time)"
+    )
+    if path:
+        print(f"🧭 Critical path ({length:.1f}s): {' → '.join(path)}")
+    for gate in run.failed_gates:
+        print(f"🚧 Stopped at {run.workflow.steps[gate].label}")
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run agent workflows as DAGs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="Run a workflow for a target")
+    run_parser.add_argument("workflow", help="Workflow name or JSON file")
+    run_parser.add_argument("target", nargs="*", help="Feature, model, app or product")
+    seq_parser = sub.add_parser("sequence", help="Run agent:task pairs in order")
+    seq_parser.add_argument("tasks")
+    show_parser = sub.add_parser("show", help="Print a workflow's steps by wave")
+    show_parser.add_argument("workflow")
+    sub.add_parser("list", help="List the built-in workflows")
+    for p in (run_parser, seq_parser):
+        p.add_argument(
+            "--max-parallel",
+            type=int,
+            default=int(env_number("ORCHESTRATE_MAX_PARALLEL", os.cpu_count() or 4)),
+        )
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for path in sorted(WORKFLOW_DIR.glob("*.json")):
+            workflow = load_workflow(str(path))
+            print(f"{workflow.name:22} {workflow.description}")
+        return
+
+    try:
+        if args.command == "sequence":
+            workflow = Workflow.sequence(parse_tasks(args.tasks))
+        else:
+            workflow = load_workflow(args.workflow)
+    except (WorkflowError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    if args.command == "show":
+        for n, wave in enumerate(workflow.levels(), 1):
+            labels = ", ".join(workflow.steps[s].label for s in wave)
+            print(f"{n}. {labels}")
+        return
+
+    scheduler = Scheduler(
+        max_workers=args.max_parallel,
+        timeout=env_number("ORCHESTRATE_TIMEOUT", 1800),
+        retries=int(env_number("ORCHESTRATE_RETRIES", 0)),
+    )
+    engine = WorkflowEngine(args.max_parallel, scheduler)
+    try:
+        run = engine.run(workflow, " ".join(getattr(args, "target", [])))
+    except KeyboardInterrupt:
+        print("🛑 Cancelled, running agents terminated")
+        sys.exit(130)
+    report(run)
+    sys.exit(0 if run.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Tracing - lightweight spans for the orchestration hot paths.
+
+Workflow runs print emoji banners but used to record no timings, so there
+was no way to tell whether a run was slow in its gates, its agents, the
+taskboard lock or a meeting turn. Tracing records those as spans in a Chrome
+trace file (the JSON array format read by ``chrome://tracing`` and
+https://ui.perfetto.dev), one complete (``"ph": "X"``) event per line.
+
+Tracing is off unless ``AGENT_TRACE`` names the trace file. When it is off,
+``span()`` returns a shared do-nothing context manager, so an instrumented
+call costs one function call and no allocation beyond its arguments.
+
+Every process appends to the same file with single ``O_APPEND`` writes, so
+the Python helpers, the supervisor and the bash scripts (through
+``scripts/lib/trace.sh``, which calls ``record`` below) can all trace one
+run. Timestamps are wall-clock microseconds so spans from different
+processes line up. The array is left unterminated, as the format allows.
+
+Usage:
+    AGENT_TRACE=/tmp/run.trace.json ./scripts/adaptive-workflow.sh adaptive "auth"
+    python3 -m src.utils.tracing summary /tmp/run.trace.json
+
+    from src.utils import tracing
+    with tracing.span("gate Security Scan", "gate") as span:
+        span.set(passed=True)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+TRACE_ENV = "AGENT_TRACE"
+
+
+def now_us() -> int:
+    """Wall-clock time in microseconds since the epoch."""
+    return time.time_ns() // 1000
+
+
+class TraceWriter:
+    """Append trace events to one Chrome trace file."""
+
+    __slots__ = ("path", "fd", "named", "lock")
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND)
+            os.write(self.fd, b"[\n")
+        except FileExistsError:
+            self.fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+        self.named: Set[int] = set()
+        self.lock = threading.Lock()
+
+    def write(self, event: Dict[str, Any], process: Optional[str] = None) -> None:
+        """Append one event, naming its process the first time it is seen."""
+        lines = []
+        pid = event["pid"]
+        if pid not in self.named:
+            with self.lock:
+                first = pid not in self.named
+                self.named.add(pid)
+            if first:
+                label = process or Path(sys.argv[0] or "python").name
+                lines.append(
+                    {
+                        "name": "process_name",
+                        "ph": "M",
+                        "pid": pid,
+                        "tid": event["tid"],
+                        "args": {"name": f"{label} ({pid})"},
+                    }
+                )
+        lines.append(event)
+        data = "".join(
+            json.dumps(line, separators=(",", ":"), default=str) + ",\n"
+            for line in lines
+        )
+        # One write per call: O_APPEND keeps concurrent writers' lines whole
+        os.write(self.fd, data.encode())
+
+    def close(self) -> None:
+        """Close the trace file."""
+        os.close(self.fd)
+
+
+_writer: Optional[TraceWriter] = None
+
+
+def configure(path: Optional[str]) -> None:
+    """Trace to ``path`` from now on, or switch tracing off with None."""
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+    if not path:
+        return
+    try:
+        _writer = TraceWriter(Path(path).resolve())
+    except OSError as e:
+        print(f"⚠️  Tracing disabled, cannot open {path}: {e}", file=sys.stderr)
+
+
+def _configure_from_env() -> None:
+    configure(os.environ.get(TRACE_ENV))
+    if _writer is not None:
+        # Child processes may run elsewhere; hand them the absolute path
+        os.environ[TRACE_ENV] = str(_writer.path)
+
+
+_configure_from_env()
+
+
+def enabled() -> bool:
+    """Whether spans are being recorded."""
+    return _writer is not None
+
+
+def complete(
+    name: str,
+    start: float,
+    end: float,
+    cat: str = "app",
+    pid: Optional[int] = None,
+    tid: Optional[int] = None,
+    process: Optional[str] = None,
+    **args: Any,
+) -> None:
+    """Record a span that has already happened (``start``/``end`` in µs)."""
+    writer = _writer
+    if writer is None:
+        return
+    event = {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "ts": int(start),
+        "dur": max(0, int(end - start)),
+        "pid": os.getpid() if pid is None else pid,
+        "tid": threading.get_native_id() if tid is None else tid,
+        "args": args,
+    }
+    writer.write(event, process)
+
+
+class Span:
+    """A timed region, recorded when the ``with`` block exits."""
+
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name: str, cat: str, args: Dict[str, Any]):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0
+
+    def __enter__(self) -> "Span":
+        self.start = now_us()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        complete(self.name, self.start, now_us(), self.cat, **self.args)
+
+    def set(self, **args: Any) -> None:
+        """Attach arguments (a verdict, a count) before the span ends."""
+        self.args.update(args)
+
+
+class _NullSpan:
+    """The span handed out while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        return None
+
+    def set(self, **args: Any) -> None:
+        """Ignore arguments."""
+
+
+NULL_SPAN = _NullSpan()
+
+
+def span(name: str, cat: str = "app", **args: Any) -> Any:
+    """Time a ``with`` block as a span (a no-op while tracing is off)."""
+    if _writer is None:
+        return NULL_SPAN
+    return Span(name, cat, args)
+
+
+def read_events(path: Path) -> List[Dict[str, Any]]:
+    """Events from a trace file, tolerating the unterminated array."""
+    events = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip().rstrip(",")
+            if line in ("", "[", "]"):
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crashed writer
+    return events
+
+
+def summarize(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Count, total, mean and max duration per span name, slowest first."""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for event in events:
+        if event.get("ph") != "X":
+            continue
+        entry = totals.setdefault(
+            event["name"],
+            {"name": event["name"], "cat": event.get("cat", ""), "count": 0},
+        )
+        seconds = event.get("dur", 0) / 1e6
+        entry["count"] += 1
+        entry["total"] = entry.get("total", 0.0) + seconds
+        entry["max"] = max(entry.get("max", 0.0), seconds)
+    rows = sorted(totals.values(), key=lambda entry: -entry["total"])
+    for entry in rows:
+        entry["mean"] = entry["total"] / entry["count"]
+    return rows
+
+
+def parse_arg(spec: str) -> Tuple[str, Any]:
+    """``key=value`` with numbers and true/false decoded."""
+    key, _, value = spec.partition("=")
+    try:
+        return key, json.loads(value)
+    except json.JSONDecodeError:
+        return key, value
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Record and summarize traces")
+    parser.add_argument(
+        "--file", default=os.environ.get(TRACE_ENV), help=f"Trace file (${TRACE_ENV})"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    record_parser = sub.add_parser("record", help="Record a finished span")
+    record_parser.add_argument("name")
+    record_parser.add_argument("--cat", default="script")
+    record_parser.add_argument("--start", type=int, required=True, help="µs epoch")
+    record_parser.add_argument("--end", type=int, help="µs epoch (default: now)")
+    record_parser.add_argument("--pid", type=int, help="Process to file it under")
+    record_parser.add_argument("--process", help="Name for that process")
+    record_parser.add_argument(
+        "--arg", action="append", default=[], help="key=value span argument"
+    )
+    run_parser = sub.add_parser("run", help="Run a command inside a span")
+    run_parser.add_argument("name")
+    run_parser.add_argument("--cat", default="script")
+    run_parser.add_argument("cmd", nargs=argparse.REMAINDER)
+    summary_parser = sub.add_parser("summary", help="Where the time went")
+    summary_parser.add_argument("trace", nargs="?", help="Trace file")
+    summary_parser.add_argument("--top", type=int, default=20)
+    summary_parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "summary":
+        path = args.trace or args.file
+        if not path or not Path(path).exists():
+            print(f"❌ No trace file (pass one or set ${TRACE_ENV})", file=sys.stderr)
+            sys.exit(1)
+        rows = summarize(read_events(Path(path)))[: args.top]
+        if args.json:
+            print(json.dumps(rows, indent=2))
+            return
+        print(f"{'SPAN':<40} {'COUNT':>6} {'TOTAL':>9} {'MEAN':>9} {'MAX':>9}")
+        for row in rows:
+            print(
+                f"{row['name'][:40]:<40} {row['count']:>6} {row['total']:>8.3f}s"
+                f" {row['mean']:>8.3f}s {row['max']:>8.3f}s"
+            )
+        return
+
+    configure(args.file)
+    if args.command == "record":
+        end = args.end if args.end is not None else now_us()
+        complete(
+            args.name,
+            args.start,
+            end,
+            args.cat,
+            pid=args.pid,
+            tid=args.pid,
+            process=args.process,
+            **dict(parse_arg(spec) for spec in args.arg),
+        )
+        return
+
+    cmd = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+    if not cmd:
+        parser.error("run needs a command")
+    with span(args.name, args.cat) as timed:
+        code = subprocess.call(cmd)
+        timed.set(exit_code=code)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark fixtures and the end-of-session results report.
+
+Benchmarks are slow and rewrite the results file, so a plain ``pytest`` run
+skips them; ``BENCH=1`` or ``-m benchmark`` runs them.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from tests.benchmarks.harness import BASELINE_PATH, RECORDER, RESULTS_PATH
+
+_REPORT = {}
+
+BENCH_DIR = Path(__file__).parent
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark every benchmark, and skip them unless they were asked for."""
+    wanted = os.environ.get("BENCH") == "1" or "benchmark" in config.option.markexpr
+    skip = pytest.mark.skip(reason="benchmarks run with BENCH=1 or -m benchmark")
+    for item in items:
+        if BENCH_DIR not in Path(item.fspath).parents:
+            continue
+        item.add_marker(pytest.mark.benchmark)
+        if not wanted:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def bench():
+    """The session's benchmark recorder."""
+    return RECORDER
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write results, compare them with the baseline, optionally update it."""
+    if not RECORDER.results:
+        return
+    report = RECORDER.report()
+    RECORDER.write(report, RESULTS_PATH)
+    if os.environ.get("BENCH_UPDATE_BASELINE") == "1":
+        baseline = {key: report[key] for key in ("created", "python", "machine")}
+        RECORDER.write({**baseline, "results": report["results"]}, BASELINE_PATH)
+    _REPORT.update(report)
+    if report["regressions"] and os.environ.get("BENCH_STRICT") == "1":
+        session.exitstatus = 1
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Summarize the benchmark results and any regressions."""
+    if not _REPORT:
+        return
+    write = terminalreporter.write_line
+    write("")
+    write(f"📊 {len(_REPORT['results'])} benchmark(s) written to {RESULTS_PATH}")
+    if os.environ.get("BENCH_UPDATE_BASELINE") == "1":
+        write(f"📌 Baseline updated: {BASELINE_PATH}")
+    for regression in _REPORT["regressions"]:
+        write(
+            f"🐢 {regression['name']}: {regression['ratio']:.2f}x slower than baseline"
+            f" ({regression['baseline'] * 1e6:.0f} ->"
+            f" {regression['current'] * 1e6:.0f} us/op,"
+            f" tolerance {regression['tolerance']:g}x)"
+        )
+    if not _REPORT["regressions"]:
+        write(
+            f"✅ No regressions beyond the baseline tolerances"
+            f" (default {_REPORT['tolerance']:g}x)"
+        )
@@ -0,0 +1,150 @@
+"""
+Benchmark harness - timings, JSON results and baseline comparison.
+
+Every benchmark records the median of ``repeat`` timed runs per operation
+under a stable name (``taskboard.add_task[10000]``); a median shrugs off the
+odd slow run that a single best or worst time would not. At the end of the
+session the results are written to ``BENCH_RESULTS`` (default
+``.cache/benchmarks/results.json``) together with a comparison against the
+stored ``tests/benchmarks/baseline.json``: a benchmark regresses when it is
+more than its tolerance times slower than its baseline and the difference
+is above a small noise floor. The tolerance is ``BENCH_TOLERANCE`` (default
+1.5), widened for benchmarks that pass their own, e.g. short timings that
+swing with the machine's load.
+
+Environment:
+    BENCH_SIZES             board sizes to run (default "1000,10000"; add
+                            100000 for the large boards)
+    BENCH_TOLERANCE         default slowdown factor that counts as a
+                            regression
+    BENCH_STRICT=1          fail the run when anything regressed
+    BENCH_UPDATE_BASELINE=1 store this run's results as the new baseline
+"""
+
+import json
+import os
+import platform
+import statistics
+import time
+from pathlib import Path
+
+from tests.conftest import SAMPLE_TASKBOARD
+
+ALL_SIZES = [1_000, 10_000, 100_000]
+RESULTS_PATH = Path(os.environ.get("BENCH_RESULTS", ".cache/benchmarks/results.json"))
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Differences below this many seconds per operation are treated as noise
+NOISE_FLOOR = 0.002
+
+
+def bench_sizes():
+    """Board sizes selected with ``BENCH_SIZES``."""
+    value = os.environ.get("BENCH_SIZES", "1000,10000")
+    return [int(size) for size in value.split(",") if size.strip()]
+
+
+def make_board(count):
+    """Build a sample board with ``count`` tasks in the P2 backlog."""
+    blocks = [
+        f"### [DEV-{n:05d}] Generated task {n}\n"
+        f"- **Priority**: P2\n- **Assigned**: @developer\n"
+        f"- **Created**: 2025-01-01\n- **Updated**: 2025-01-01\n- **Status**: Backlog\n"
+        for n in range(count)
+    ]
+    head, tail = SAMPLE_TASKBOARD.split("### [DEV-001]")
+    tail = tail.split("\n\n", 1)[1]
+    return head + "\n".join(blocks) + "\n" + tail
+
+
+def timed(label, func):
+    """Run ``func`` once and print how long it took."""
+    start = time.perf_counter()
+    result = func()
+    print(f"\n{label}: {(time.perf_counter() - start) * 1000:.1f} ms")
+    return result
+
+
+class Recorder:
+    """Collect benchmark timings and compare them with a baseline."""
+
+    def __init__(self):
+        self.results = {}
+
+    def measure(self, name, func, repeat=5, ops=1, setup=None, tolerance=None):
+        """Time ``func`` (after an untimed ``setup``); keep the median run.
+
+        ``ops`` is the number of operations one call performs, so results
+        are comparable per operation. ``tolerance`` widens the default
+        regression threshold for this benchmark. Returns the last call's
+        result.
+        """
+        times = []
+        result = None
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+        median = statistics.median(times)
+        self.results[name] = {
+            "seconds": median,
+            "best": min(times),
+            "ops": ops,
+            "per_op": median / ops,
+            "repeat": repeat,
+        }
+        if tolerance:
+            self.results[name]["tolerance"] = tolerance
+        print(f"\n{name}: {median * 1000:.1f} ms ({median / ops * 1e6:.0f} us/op)")
+        return result
+
+    def compare(self, baseline, tolerance):
+        """Benchmarks more than their tolerance slower than the baseline.
+
+        ``tolerance`` is the default; a benchmark's own tolerance can only
+        widen it.
+        """
+        regressions = []
+        for name, result in sorted(self.results.items()):
+            base = baseline.get(name)
+            if not base:
+                continue
+            limit = max(tolerance, result.get("tolerance", tolerance))
+            ratio = result["per_op"] / base["per_op"] if base["per_op"] else 1.0
+            slower = result["per_op"] - base["per_op"]
+            if ratio > limit and slower * result["ops"] > NOISE_FLOOR:
+                regressions.append(
+                    {
+                        "name": name,
+                        "baseline": base["per_op"],
+                        "current": result["per_op"],
+                        "ratio": ratio,
+                        "tolerance": limit,
+                    }
+                )
+        return regressions
+
+    def report(self, baseline_path=BASELINE_PATH, tolerance=None):
+        """Results plus the regression comparison, as written to JSON."""
+        tolerance = tolerance or float(os.environ.get("BENCH_TOLERANCE", "1.5"))
+        baseline = {}
+        if baseline_path.exists():
+            baseline = json.loads(baseline_path.read_text()).get("results", {})
+        return {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "tolerance": tolerance,
+            "results": self.results,
+            "regressions": self.compare(baseline, tolerance),
+        }
+
+    def write(self, report, path=RESULTS_PATH):
+        """Write a report (or a new baseline) as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+RECORDER = Recorder()
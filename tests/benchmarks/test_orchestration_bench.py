@@ -0,0 +1,65 @@
+"""
+Benchmarks for orchestration fan-out and request routing.
+
+Fan-out runs the stub agent (tests/stubs/fake_agent.py), so it measures the
+scheduler's own overhead: process start-up, log files and bookkeeping.
+"""
+
+import io
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.services.router import load_router, route_batch
+from src.services.scheduler import AgentTask, Scheduler
+from tests.benchmarks.harness import ALL_SIZES, bench_sizes
+
+FAKE_AGENT = Path(__file__).parent.parent / "stubs" / "fake_agent.py"
+FAN_OUT = [8, 32]
+# Process start-up swings with the machine's load
+PROCESS_TOLERANCE = 2.0
+WORDS = (
+    "implement deploy the API test model docs guide feature code user auth"
+    " service Docker training validate quality design login page"
+).split()
+
+
+def fake_command(task):
+    """Run the stub agent instead of the real CLI."""
+    return [sys.executable, str(FAKE_AGENT), "-p", task.prompt]
+
+
+class TestOrchestrationBenchmark:
+    """Time scheduler fan-out and batch routing."""
+
+    @pytest.mark.parametrize("width", FAN_OUT)
+    def test_fan_out(self, bench, tmp_path, width):
+        """Every stub agent in a fan-out runs and exits cleanly."""
+        tasks = [AgentTask("developer", f"task {n}") for n in range(width)]
+        scheduler = Scheduler(max_workers=width, log_dir=tmp_path, command=fake_command)
+        results = bench.measure(
+            f"orchestration.fan_out[{width}]",
+            lambda: scheduler.run(tasks),
+            repeat=3,
+            ops=width,
+            tolerance=PROCESS_TOLERANCE,
+        )
+        assert all(result.ok for result in results)
+
+    @pytest.mark.parametrize("count", ALL_SIZES, ids=lambda count: f"{count}")
+    def test_route_batch(self, bench, count):
+        """Batch routing is linear in the total request text."""
+        if count not in bench_sizes():
+            pytest.skip(f"{count} requests not in BENCH_SIZES")
+        rng = random.Random(count)
+        text = "".join(" ".join(rng.choices(WORDS, k=12)) + "\n" for _ in range(count))
+        router = load_router()
+        summary = bench.measure(
+            f"routing.batch[{count}]",
+            lambda: route_batch(router, io.StringIO(text), io.StringIO()),
+            ops=count,
+            tolerance=2.0,
+        )
+        assert summary["agents"]["reviewer"] == count
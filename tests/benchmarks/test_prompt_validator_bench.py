@@ -0,0 +1,74 @@
+"""
+Benchmarks for PromptValidator.validate_against_baseline on large prompt sets.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests.benchmarks.harness import bench_sizes
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "template"))
+from validate_prompts import PromptValidator  # noqa: E402
+
+PROMPT_SETS = [1_000, 10_000]
+
+PROMPT = """# {name} Agent
+
+## Role
+You are the {name} agent for this project.
+
+## Responsibilities
+- Keep the taskboard current
+- Coordinate with the other agents
+
+## Workflow
+{body}
+"""
+
+
+@pytest.fixture(params=PROMPT_SETS, ids=lambda count: f"{count}")
+def validator(request, tmp_path):
+    """A validator over ``count`` generated prompts with a fresh baseline."""
+    count = request.param
+    if count not in bench_sizes():
+        pytest.skip(f"{count} prompts not in BENCH_SIZES")
+    commands = tmp_path / "commands"
+    commands.mkdir()
+    body = "Follow the project rules.\n" * 40
+    for n in range(count):
+        name = f"agent{n:05d}"
+        (commands / f"{name}.md").write_text(PROMPT.format(name=name, body=body))
+    validator = PromptValidator()
+    validator.commands_dir = commands
+    validator.baseline_file = tmp_path / "baseline.json"
+    validator.stat_cache_file = tmp_path / "stat_cache.json"
+    validator.create_baseline()
+    validator.count = count
+    return validator
+
+
+class TestPromptValidatorBenchmark:
+    """Time baseline validation with and without the signature cache."""
+
+    def test_validate_unchanged(self, bench, validator):
+        """Incremental validation only stats unchanged prompts."""
+        issues = bench.measure(
+            f"prompts.validate[{validator.count}]",
+            validator.validate_against_baseline,
+            ops=validator.count,
+            tolerance=2.0,
+        )
+        assert issues == []
+
+    def test_validate_full(self, bench, validator):
+        """A full validation re-reads and hashes every prompt."""
+        validator.incremental = False
+        issues = bench.measure(
+            f"prompts.validate_full[{validator.count}]",
+            validator.validate_against_baseline,
+            ops=validator.count,
+            tolerance=2.0,
+        )
+        assert issues == []
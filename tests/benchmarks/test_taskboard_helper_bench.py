@@ -0,0 +1,159 @@
+"""
+Benchmarks for taskboard-helper.py on 1k, 10k and 100k-task boards.
+
+The helper's functions are timed in-process, exactly as the command line
+runs them (taskboard.md refresh included), so the numbers show the store and
+view work rather than interpreter start-up; one command-line round trip per
+size is timed as well. Run with ``BENCH=1 pytest tests/benchmarks -s`` to see
+the timings (``BENCH_SIZES=1000,10000,100000`` includes the largest board).
+"""
+
+import importlib.util
+import itertools
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.models.taskboard import parse
+from src.services.taskboard_store import TaskboardStore
+from tests.benchmarks.harness import ALL_SIZES, bench_sizes, make_board
+
+HELPER = Path(__file__).parent.parent.parent / "scripts" / "taskboard-helper.py"
+
+# Helper calls timed per measurement
+OPS = 20
+
+# Writes wait on fsync, whose latency swings with the machine's load
+DISK_TOLERANCE = 2.0
+
+
+@pytest.fixture(scope="module")
+def helper():
+    """scripts/taskboard-helper.py imported as a module."""
+    spec = importlib.util.spec_from_file_location("taskboard_helper", HELPER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(params=ALL_SIZES, ids=lambda size: f"{size}")
+def size(request):
+    if request.param not in bench_sizes():
+        pytest.skip(f"{request.param} tasks not in BENCH_SIZES")
+    return request.param
+
+
+@pytest.fixture
+def board(taskboard_path, size, helper, monkeypatch):
+    """A generated board of ``size`` tasks, already imported by the store."""
+    taskboard_path.write_text(make_board(size))
+    monkeypatch.setattr(helper, "TASKBOARD_PATH", taskboard_path)
+    TaskboardStore(taskboard_path).close()
+    return taskboard_path
+
+
+class TestTaskboardHelperBenchmark:
+    """Time helper operations as the board grows."""
+
+    def test_add_task(self, bench, board, helper, size):
+        """Adding a task, taskboard.md refresh included."""
+        ids = itertools.count()
+
+        def add():
+            for _ in range(OPS):
+                n = next(ids)
+                assert helper.add_task("developer", f"BENCH-{n:05d}", f"Task {n}", "P1")
+
+        bench.measure(
+            f"taskboard.add_task[{size}]", add, ops=OPS, tolerance=DISK_TOLERANCE
+        )
+
+    def test_move_task(self, bench, board, helper, size):
+        """Moving a task re-renders one record, then refreshes the view."""
+        sections = itertools.cycle(["In Progress", "Review", "Testing"])
+
+        def move():
+            section = next(sections)
+            for n in range(OPS):
+                assert helper.move_task(f"DEV-{n:05d}", section)
+
+        bench.measure(
+            f"taskboard.move_task[{size}]", move, ops=OPS, tolerance=DISK_TOLERANCE
+        )
+
+    def test_parse_and_serialize(self, bench, size):
+        """The full markdown round trip stays byte exact."""
+        text = make_board(size)
+        board = bench.measure(
+            f"taskboard.parse[{size}]", lambda: parse(text), tolerance=2.0
+        )
+        out = bench.measure(
+            f"taskboard.serialize[{size}]", board.serialize, tolerance=2.0
+        )
+        assert out == text
+
+    def test_store_import_and_render(self, bench, board, helper, size):
+        """Importing a board into a fresh store and rendering it back."""
+        text = board.read_text()
+
+        def fresh_store():
+            for path in board.parent.glob("taskboard.db*"):
+                path.unlink()
+
+        def import_board():
+            TaskboardStore(board).close()
+
+        bench.measure(
+            f"taskboard.import[{size}]",
+            import_board,
+            setup=fresh_store,
+            tolerance=DISK_TOLERANCE,
+        )
+        bench.measure(
+            f"taskboard.render[{size}]",
+            helper.render_taskboard,
+            tolerance=DISK_TOLERANCE,
+        )
+        assert board.read_text() == text
+
+    def test_query(self, bench, board, size):
+        """Dashboard queries for 50 tasks cost the same on any board size."""
+        with TaskboardStore(board) as store:
+            store.batch(
+                [
+                    {"action": "move", "task_id": f"DEV-{n:05d}", "section": "Review"}
+                    for n in range(0, size, size // 50)
+                ]
+            )
+
+            def query():
+                for _ in range(OPS):
+                    store.query(status="Review", priority="P2")
+                    store.query(assigned="architect", stale_days=7)
+
+            bench.measure(f"taskboard.query[{size}]", query, ops=OPS * 2)
+
+    def test_command_line_add(self, bench, board, size):
+        """One ``taskboard-helper.py add`` run, interpreter start-up included."""
+        ids = itertools.count()
+
+        def add():
+            n = next(ids)
+            subprocess.run(
+                [
+                    sys.executable,
+                    str(HELPER),
+                    "add",
+                    "tester",
+                    f"CLI-{n}",
+                    "P2",
+                    "Check",
+                ],
+                cwd=board.parent.parent.parent,
+                check=True,
+                capture_output=True,
+            )
+
+        bench.measure(f"taskboard.cli_add[{size}]", add, tolerance=DISK_TOLERANCE)
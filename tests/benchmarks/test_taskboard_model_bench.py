@@ -0,0 +1,38 @@
+"""
+Benchmarks for parsing and serializing large taskboards.
+
+Run with ``BENCH=1 pytest tests/benchmarks -s`` to see the timings.
+"""
+
+import time
+
+from src.models.taskboard import parse
+from src.services.taskboard_store import TaskboardStore
+from tests.benchmarks.harness import make_board, timed
+
+TASK_COUNT = 10_000
+
+
+class TestTaskboardModelBenchmark:
+    """Time the model and store on a 10k-task board."""
+
+    def test_parse_and_serialize_10k(self):
+        """Parsing and serializing 10k tasks is fast and byte exact."""
+        text = make_board(TASK_COUNT)
+        start = time.perf_counter()
+        board = timed("parse 10k tasks", lambda: parse(text))
+        out = timed("serialize 10k tasks", board.serialize)
+        assert len(board) == TASK_COUNT
+        assert out == text
+        assert time.perf_counter() - start < 5.0
+
+    def test_store_import_and_render_10k(self, taskboard_path):
+        """The store imports and renders a 10k-task board byte for byte."""
+        text = make_board(TASK_COUNT)
+        taskboard_path.write_text(text)
+        start = time.perf_counter()
+        store = timed("store import 10k tasks", lambda: TaskboardStore(taskboard_path))
+        with store:
+            assert store.count() == TASK_COUNT
+            assert timed("store render 10k tasks", store.render_text) == text
+        assert time.perf_counter() - start < 15.0
@@ -0,0 +1,50 @@
+"""Shared pytest fixtures and configuration."""
+
+import pytest
+
+SAMPLE_TASKBOARD = """# Project Taskboard
+
+## Current Sprint
+
+### In Progress
+_No tasks currently in progress_
+
+### Review
+_No tasks currently in review_
+
+### Testing
+_No tasks currently in testing_
+
+### Recent Completions
+_No recently completed tasks_
+
+## Backlog
+
+### High Priority (P1)
+_No high priority tasks_
+
+### Medium Priority (P2)
+### [DEV-001] Set up project structure
+- **Priority**: P2
+- **Assigned**: @developer
+- **Created**: 2025-01-01
+- **Updated**: 2025-01-01
+- **Status**: Backlog
+
+### Low Priority (P3)
+_No low priority tasks_
+
+## Agent Assignments
+
+- @architect: design
+- @developer: implementation
+"""
+
+
+@pytest.fixture
+def taskboard_path(tmp_path):
+    """A sample taskboard.md in a temporary .claude/tasks directory."""
+    path = tmp_path / ".claude" / "tasks" / "taskboard.md"
+    path.parent.mkdir(parents=True)
+    path.write_text(SAMPLE_TASKBOARD)
+    return path
@@ -0,0 +1,170 @@
+"""
+Stress tests for concurrent taskboard writers.
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from src.services.taskboard_store import TaskboardStore
+
+WRITERS = 200
+# Separate taskboard-helper.py processes, each paying interpreter start-up
+PROCESS_WRITERS = 40
+HELPER = Path(__file__).parent.parent.parent / "scripts" / "taskboard-helper.py"
+
+
+class TestConcurrentTaskboardWriters:
+    """Many agents updating the board at once must not lose updates."""
+
+    def test_independent_writers_do_not_lose_updates(self, taskboard_path):
+        """200 writers with their own connections all land on the board."""
+        errors = []
+        barrier = threading.Barrier(WRITERS)
+
+        def writer(n):
+            try:
+                with TaskboardStore(taskboard_path, render_interval=0) as store:
+                    barrier.wait()
+                    store.add_task("developer", f"DEV-{n:04d}", f"Task {n}", "P2")
+                    store.move_task(f"DEV-{n:04d}", "In Progress")
+                    store.maybe_render()
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(WRITERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        with TaskboardStore(taskboard_path) as store:
+            assert len(store.tasks("In Progress")) == WRITERS
+            store.render()
+        content = taskboard_path.read_text()
+        assert content.count("- **Status**: In Progress") == WRITERS
+
+    def test_helper_processes_do_not_lose_updates(self, taskboard_path):
+        """Concurrent helper processes all land, and the view never vanishes."""
+        root = taskboard_path.parent.parent.parent
+        env = {k: v for k, v in os.environ.items() if k != "TASKBOARD_SOCKET"}
+        stop = threading.Event()
+        misses = []
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    if not taskboard_path.read_text():
+                        misses.append("empty")
+                except FileNotFoundError:
+                    misses.append("missing")
+
+        def wave(*commands):
+            procs = [
+                subprocess.Popen(
+                    [sys.executable, str(HELPER), *command],
+                    cwd=root,
+                    env=env,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                )
+                for command in commands
+            ]
+            return [(proc.communicate()[1], proc.returncode) for proc in procs]
+
+        reader_thread = threading.Thread(target=reader)
+        reader_thread.start()
+        try:
+            ids = [f"DEV-{n:04d}" for n in range(PROCESS_WRITERS)]
+            added = wave(*[("add", "developer", i, "P2", "Task", i) for i in ids])
+            started = wave(*[("start", i) for i in ids])
+        finally:
+            stop.set()
+            reader_thread.join()
+
+        assert added + started == [(b"", 0)] * (2 * PROCESS_WRITERS)
+        assert misses == []
+        # The last writer to commit also rendered, so the view is complete
+        content = taskboard_path.read_text()
+        assert content.count("- **Status**: In Progress") == PROCESS_WRITERS
+        with TaskboardStore(taskboard_path) as store:
+            assert len(store.tasks("In Progress")) == PROCESS_WRITERS
+
+    def test_readers_never_see_a_missing_board(self, taskboard_path):
+        """The view is replaced atomically while writers render it."""
+        stop = threading.Event()
+        misses = []
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    if not taskboard_path.read_text():
+                        misses.append("empty")
+                except FileNotFoundError:
+                    misses.append("missing")
+
+        reader_thread = threading.Thread(target=reader)
+        reader_thread.start()
+        try:
+            with TaskboardStore(taskboard_path, render_interval=0) as store:
+                for n in range(50):
+                    store.add_task("tester", f"TEST-{n}", f"Case {n}", "P3")
+                    store.render()
+        finally:
+            stop.set()
+            reader_thread.join()
+        assert misses == []
+
+    def test_bursts_are_group_committed(self, taskboard_path):
+        """Updates queued while a commit is in flight share one transaction."""
+        with TaskboardStore(taskboard_path) as store:
+            threads = [
+                threading.Thread(
+                    target=store.add_task,
+                    args=("developer", f"DEV-{n:04d}", f"Task {n}"),
+                )
+                for n in range(WRITERS)
+            ]
+            with store._locked():
+                for thread in threads:
+                    thread.start()
+                while len(store._queue) < WRITERS:
+                    threading.Event().wait(0.001)
+            for thread in threads:
+                thread.join()
+
+            assert store.commits == 1
+            assert store.count() == WRITERS + 1
+
+    def test_failed_commit_reaches_every_queued_writer(self, taskboard_path):
+        """When a group commit fails, no update in it reports success."""
+        errors = []
+
+        def broken_sync():
+            raise sqlite3.OperationalError("disk I/O error")
+
+        def writer(store, n):
+            try:
+                store.add_task("developer", f"DEV-{n:04d}", f"Task {n}")
+            except sqlite3.OperationalError as e:
+                errors.append(e)
+
+        with TaskboardStore(taskboard_path) as store:
+            threads = [
+                threading.Thread(target=writer, args=(store, n)) for n in range(20)
+            ]
+            with store._locked():
+                for thread in threads:
+                    thread.start()
+                while len(store._queue) < len(threads):
+                    threading.Event().wait(0.001)
+                store._sync_view = broken_sync
+            for thread in threads:
+                thread.join()
+
+            assert len(errors) == len(threads)
+            assert store.count() == 1
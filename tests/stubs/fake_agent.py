@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Fake Agent - a stand-in for the ``claude`` CLI in tests and dry runs.
+
+Accepts ``-p PROMPT`` (other flags are ignored) and echoes the prompt.
+Directives anywhere in the prompt control how it behaves:
+
+    sleep=SECONDS   wait before exiting
+    exit=CODE       exit with CODE (default 0)
+    fail-first=N    exit 1 on the first N runs of the same prompt; runs are
+                    counted in $FAKE_AGENT_STATE (a directory)
+
+When $FAKE_AGENT_LOG is set, every run appends a JSON line with its pid,
+start and end times and prompt, so tests can check concurrency.
+
+$FAKE_AGENT_STARTUP adds a start-up delay in seconds, standing in for CLI
+start-up cost. With ``--input-format stream-json`` the agent stays resident
+like the real CLI: each JSON user message on stdin is one turn, answered
+with an assistant message and a ``result`` line (``is_error`` when the turn
+has an exit= directive), until stdin closes.
+
+Usage:
+    CLAUDE_CMD=tests/stubs/fake_agent.py ./scripts/orchestrate.sh parallel "a:sleep=1"
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+
+def directive(prompt, name, default):
+    """Value of ``name=value`` in the prompt, or ``default``."""
+    match = re.search(rf"\b{name}=(\d+(?:\.\d+)?)", prompt)
+    return float(match.group(1)) if match else default
+
+
+def previous_runs(prompt):
+    """Count earlier runs of this prompt and record the current one."""
+    state_dir = os.environ.get("FAKE_AGENT_STATE")
+    if not state_dir:
+        return 0
+    counter = Path(state_dir) / hashlib.sha256(prompt.encode()).hexdigest()[:16]
+    runs = int(counter.read_text()) if counter.exists() else 0
+    counter.write_text(str(runs + 1))
+    return runs
+
+
+def log_run(start, prompt):
+    """Append this run to $FAKE_AGENT_LOG, if set."""
+    log = os.environ.get("FAKE_AGENT_LOG")
+    if log:
+        record = {
+            "pid": os.getpid(),
+            "start": start,
+            "end": time.time(),
+            "prompt": prompt,
+        }
+        with open(log, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def emit(message):
+    print(json.dumps(message), flush=True)
+
+
+def message_text(content):
+    """Text of a user message's content (a string or a list of blocks)."""
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content)
+
+
+def stream(session):
+    """Answer stream-json user messages until stdin closes."""
+    emit({"type": "system", "subtype": "init", "session_id": session})
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        start = time.time()
+        prompt = message_text(json.loads(line)["message"]["content"])
+        time.sleep(directive(prompt, "sleep", 0))
+        failed = directive(prompt, "exit", 0) != 0
+        text = f"fake agent {os.getpid()}: {prompt}"
+        reply = {"role": "assistant", "content": [{"type": "text", "text": text}]}
+        emit({"type": "assistant", "message": reply})
+        emit(
+            {
+                "type": "result",
+                "subtype": "error_during_execution" if failed else "success",
+                "is_error": failed,
+                "duration_ms": int((time.time() - start) * 1000),
+                "result": text,
+                "session_id": session,
+            }
+        )
+        log_run(start, prompt)
+
+
+def main():
+    args = sys.argv[1:]
+    time.sleep(float(os.environ.get("FAKE_AGENT_STARTUP") or 0))
+    if "stream-json" in args and "--input-format" in args:
+        stream(f"fake-{os.getpid()}")
+        return
+    prompt = args[args.index("-p") + 1] if "-p" in args[:-1] else ""
+    start = time.time()
+    print(f"fake agent {os.getpid()}: {prompt}", flush=True)
+
+    time.sleep(directive(prompt, "sleep", 0))
+    code = int(directive(prompt, "exit", 0))
+    if previous_runs(prompt) < directive(prompt, "fail-first", 0):
+        code = 1
+
+    log_run(start, prompt)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Fake Reviewer - a stand-in reviewer command for incremental review checkpoints.
+
+Reads one file's diff on stdin and rejects it when an added line contains
+``TODO``, printing those lines as the review notes; anything else is
+approved. When $FAKE_REVIEWER_LOG is set, every run appends a JSON line
+with the phase, file and diff it was given, so tests can see exactly what
+was sent.
+
+Usage:
+    REVIEW_CMD="python3 tests/stubs/fake_reviewer.py" \\
+        ./scripts/adaptive-workflow.sh adaptive "auth"
+"""
+
+import json
+import os
+import sys
+
+
+def main() -> None:
+    """Review the diff on stdin."""
+    diff = sys.stdin.read()
+    log = os.environ.get("FAKE_REVIEWER_LOG")
+    if log:
+        record = {
+            "phase": os.environ.get("REVIEW_PHASE"),
+            "file": os.environ.get("REVIEW_FILE"),
+            "diff": diff,
+        }
+        with open(log, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    todos = [
+        line[1:].strip()
+        for line in diff.splitlines()
+        if line.startswith("+") and not line.startswith("+++") and "TODO" in line
+    ]
+    for todo in todos:
+        print(f"Unfinished work: {todo}")
+    sys.exit(1 if todos else 0)
+
+
+if __name__ == "__main__":
+    main()
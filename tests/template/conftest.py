@@ -0,0 +1,42 @@
+"""
+Template Validation Fixtures
+
+Session-wide script index and command runner for the template tests: each
+script is parsed once (again only if it changes), and the script invocations
+the tests check are started together at session start instead of one by one.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+from script_index import CommandRunner, ScriptIndexCache  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Invocations shared by the template tests, run concurrently up front
+SCRIPT_COMMANDS = [
+    ("./scripts/orchestrate.sh",),
+    ("./scripts/orchestrate.sh", "analyze", "test"),
+    ("./scripts/orchestrate.sh", "analyze", "build a feature"),
+    ("./scripts/adaptive-workflow.sh",),
+    ("bash", "-n", "scripts/orchestrate.sh"),
+    ("bash", "-n", "scripts/meeting.sh"),
+]
+
+
+@pytest.fixture(scope="session")
+def script_index():
+    """Parsed scripts, keyed by path relative to the project root."""
+    return ScriptIndexCache(PROJECT_ROOT)
+
+
+@pytest.fixture(scope="session")
+def script_runs():
+    """Results of script invocations, each command line run once per session."""
+    runner = CommandRunner(PROJECT_ROOT)
+    runner.prefetch(SCRIPT_COMMANDS)
+    yield runner
+    runner.close()
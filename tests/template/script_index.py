@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Shell Script Index
+
+Parses a bash script once into its functions, case arms and the commands it
+invokes, so the template tests can ask structural questions ("is there a
+`workflow` arm?", "which gates does it call?") without re-reading the file
+and re-running regexes over it in every test.
+
+The parser is line based and made for the scripts in this template: a
+function runs from `name() {` (optionally `function name() {`) to the `}`
+at the same indent, and a case arm from its `pattern)` line to `;;`.
+
+ScriptIndexCache hands out one index per file, re-parsing only when the
+file's mtime or size changes, and CommandRunner runs script invocations
+(help output, `bash -n`) concurrently, once per distinct command line.
+Both are shared across the test session through tests/template/conftest.py.
+
+Usage:
+    python tests/template/script_index.py scripts/orchestrate.sh
+"""
+
+import json
+import re
+import shlex
+import subprocess
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+FUNCTION_RE = re.compile(r"^(\s*)(?:function\s+)?([A-Za-z_][\w-]*)\s*\(\)\s*\{?\s*$")
+CASE_RE = re.compile(r"^\s*case\s+.*\s+in\s*$")
+ESAC_RE = re.compile(r"^\s*esac\b")
+PATTERN = r"(?:\"[^\"]*\"|'[^']*'|[^\s()\"'|;])+"
+ARM_RE = re.compile(rf"^\s*({PATTERN}(?:\s*\|\s*{PATTERN})*)\)(.*)$")
+HEREDOC_RE = re.compile(r"(?<!<)<<-?(?!<)\s*(['\"]?)(\w+)\1")
+# A word in command position: line start, after ; & | $( or a keyword
+COMMAND_POSITION = r"(?:^|[;&|]|\$\(|\b(?:then|do|else|if|elif|while|until)\s)\s*"
+COMMAND_RE = re.compile(COMMAND_POSITION + r"([A-Za-z_./$][\w./${}-]*)(\+?=)?")
+KEYWORDS = {
+    "if",
+    "then",
+    "else",
+    "elif",
+    "fi",
+    "for",
+    "while",
+    "until",
+    "do",
+    "done",
+    "case",
+    "esac",
+    "in",
+    "function",
+    "select",
+    "time",
+}
+STOP_TOKENS = {
+    ";",
+    ";;",
+    "|",
+    "||",
+    "&",
+    "&&",
+    ">",
+    ">>",
+    "<",
+    "<<",
+    "<<<",
+    "2>&1",
+    ")",
+}
+
+
+class ScriptIndex:
+    """Functions, case arms and invoked commands of one shell script."""
+
+    __slots__ = ("path", "text", "lines", "functions", "case_arms", "commands")
+
+    def __init__(self, path, text):
+        self.path = Path(path)
+        self.text = text
+        self.lines = text.splitlines()
+        self.functions = {}
+        self.case_arms = {}
+        self.commands = Counter()
+        self._parse()
+
+    @classmethod
+    def from_file(cls, path):
+        """Parse a script from disk."""
+        return cls(path, Path(path).read_text())
+
+    def _parse(self):
+        open_functions = []  # (name, indent, first body line)
+        case_depth = 0
+        arm = None  # (labels, first body line)
+        heredoc = None  # terminator of the here-document being skipped
+        quote = None  # quote character of a string continued from an earlier line
+        for number, line in enumerate(self.lines):
+            stripped = line.strip()
+            if heredoc is not None:
+                if stripped == heredoc:
+                    heredoc = None
+                continue
+            in_string = quote is not None
+            code, quote = _scan(line, quote)
+            if in_string or not code.strip():
+                self._count_commands(code)
+                continue
+            match = HEREDOC_RE.search(line)
+            if match:
+                heredoc = match.group(2)
+
+            match = FUNCTION_RE.match(line)
+            if match:
+                open_functions.append((match.group(2), match.group(1), number + 1))
+                continue
+            if open_functions and line.rstrip() == open_functions[-1][1] + "}":
+                name, _, start = open_functions.pop()
+                self.functions[name] = "\n".join(self.lines[start:number])
+                continue
+
+            if CASE_RE.match(line):
+                case_depth += 1
+            elif ESAC_RE.match(line):
+                case_depth -= 1
+            elif case_depth and arm is None:
+                match = ARM_RE.match(line)
+                if match:
+                    labels = [
+                        label.strip().replace('"', "").replace("'", "")
+                        for label in match.group(1).split("|")
+                    ]
+                    arm = (labels, number)
+                    code, _ = _scan(match.group(2))
+            if arm is not None and stripped.endswith(";;"):
+                labels, start = arm
+                body = "\n".join(self.lines[start : number + 1])
+                for label in labels:
+                    self.case_arms.setdefault(label, []).append(body)
+                arm = None
+            self._count_commands(code)
+
+    def _count_commands(self, code):
+        for name, assignment in COMMAND_RE.findall(code):
+            if not assignment and name not in KEYWORDS and name.strip("${}./"):
+                self.commands[name] += 1
+
+    def has_function(self, name):
+        """Whether the script defines function ``name``."""
+        return name in self.functions
+
+    def arm(self, label):
+        """Body of the first case arm matching ``label`` (None if there is none)."""
+        bodies = self.case_arms.get(label)
+        return bodies[0] if bodies else None
+
+    def invokes(self, command):
+        """Whether ``command`` is run anywhere in the script."""
+        return command in self.commands
+
+    def calls(self, command):
+        """Arguments of every invocation of ``command``, one list per call."""
+        pattern = re.compile(COMMAND_POSITION + re.escape(command) + r"(?=\s|$)(.*)")
+        calls = []
+        for line in self.lines:
+            if line.lstrip().startswith("#"):
+                continue
+            for rest in pattern.findall(line):
+                calls.append(_arguments(rest))
+        return calls
+
+    def python_modules(self):
+        """Modules run with ``python3 -m``."""
+        return sorted(
+            {
+                args[args.index("-m") + 1]
+                for args in self.calls("python3")
+                if "-m" in args[:-1]
+            }
+        )
+
+    def summary(self):
+        """A JSON-friendly view of the index."""
+        return {
+            "path": str(self.path),
+            "functions": sorted(self.functions),
+            "case_arms": sorted(self.case_arms),
+            "commands": dict(self.commands.most_common()),
+            "python_modules": self.python_modules(),
+        }
+
+
+def _scan(line, quote=None):
+    """The code in ``line`` with quoted text blanked, and the quote still open.
+
+    Command substitutions inside double quotes are kept, since they run.
+    """
+    code = []
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if quote is None:
+            if char == "#" and (i == 0 or line[i - 1].isspace()):
+                break
+            if char in "'\"":
+                quote = char
+            elif char == "\\":
+                code.append(line[i : i + 2])
+                i += 2
+                continue
+            code.append(char)
+        elif quote == "'":
+            if char == "'":
+                quote = None
+                code.append(char)
+        elif char == "\\":
+            i += 1
+        elif char == '"':
+            quote = None
+            code.append(char)
+        elif line.startswith("$(", i):
+            end = line.find(")", i)
+            end = len(line) - 1 if end < 0 else end
+            code.append("; " + line[i : end + 1] + " ;")
+            i = end
+        i += 1
+    return "".join(code), quote
+
+
+def _arguments(rest):
+    lexer = shlex.shlex(rest, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    args = []
+    try:
+        for token in lexer:
+            if token in STOP_TOKENS:
+                break
+            args.append(token)
+    except ValueError:  # unbalanced quotes continue on another line
+        return rest.split()
+    return args
+
+
+class ScriptIndexCache:
+    """One parsed index per script, refreshed when the file changes."""
+
+    def __init__(self, root="."):
+        self.root = Path(root)
+        self.entries = {}
+        self.parses = 0
+
+    def get(self, path):
+        """The index of ``path`` (relative to the root), parsed once per version."""
+        full = self.root / path
+        stat = full.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        entry = self.entries.get(full)
+        if entry is None or entry[0] != stamp:
+            self.parses += 1
+            entry = (stamp, ScriptIndex.from_file(full))
+            self.entries[full] = entry
+        return entry[1]
+
+    __getitem__ = get
+
+
+class CommandRunner:
+    """Run script invocations concurrently, each distinct command line once."""
+
+    def __init__(self, root=".", max_workers=8, env=None):
+        self.root = Path(root)
+        self.env = env
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.futures = {}
+
+    def submit(self, argv):
+        """Start ``argv`` (a tuple) if it hasn't been started yet."""
+        argv = tuple(argv)
+        if argv not in self.futures:
+            self.futures[argv] = self.pool.submit(
+                subprocess.run,
+                list(argv),
+                cwd=self.root,
+                env=self.env,
+                capture_output=True,
+                text=True,
+            )
+        return self.futures[argv]
+
+    def prefetch(self, commands):
+        """Start every command now; results are collected on first use."""
+        for argv in commands:
+            self.submit(argv)
+
+    def run(self, argv):
+        """The finished ``CompletedProcess`` for ``argv``."""
+        return self.submit(argv).result()
+
+    def close(self):
+        """Wait for outstanding commands and stop the worker threads."""
+        self.pool.shutdown(wait=True)
+
+
+def main():
+    """Print the index of each script given on the command line."""
+    if len(sys.argv) < 2:
+        print("Usage: python tests/template/script_index.py SCRIPT [SCRIPT...]")
+        sys.exit(1)
+    cache = ScriptIndexCache()
+    print(json.dumps([cache.get(path).summary() for path in sys.argv[1:]], indent=2))
+
+
+if __name__ == "__main__":
+    main()
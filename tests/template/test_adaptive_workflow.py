@@ -4,11 +4,10 @@ Tests for Adaptive Workflow Functionality
 Written by: Tester Agent
 """
 
-import subprocess
 import os
 from pathlib import Path
+
 import pytest
-import re
 
 
 class TestAdaptiveWorkflow:
@@ -24,79 +23,100 @@ class TestAdaptiveWorkflow:
         assert script_path.exists(), "adaptive-workflow.sh not found"
         assert os.access(script_path, os.X_OK), "adaptive-workflow.sh not executable"
     
-    def test_adaptive_workflow_help(self, project_root):
+    def test_adaptive_workflow_help(self, script_runs):
         """Test that help is shown when no arguments provided."""
-        result = subprocess.run(
-            ["./scripts/adaptive-workflow.sh"],
-            cwd=project_root,
-            capture_output=True,
-            text=True
-        )
+        result = script_runs.run(["./scripts/adaptive-workflow.sh"])
         
         assert "Usage:" in result.stdout
         assert "adaptive" in result.stdout
         assert "continuous" in result.stdout
     
-    def test_quality_gates_present(self, project_root):
+    def test_quality_gates_present(self, script_index):
         """Verify quality gates are implemented in the workflow."""
-        with open(project_root / "scripts/adaptive-workflow.sh", "r") as f:
-            content = f.read()
+        script = script_index["scripts/adaptive-workflow.sh"]
         
         # Check for quality gate function
-        assert "function quality_gate()" in content
-        assert "Quality Gate:" in content
+        assert script.has_function("quality_gate")
+        assert "Quality Gate:" in script.functions["quality_gate"]
         
         # Check for multiple quality gates
-        quality_gates = re.findall(r"quality_gate\s+\"([^\"]+)\"", content)
+        quality_gates = [args[0] for args in script.calls("quality_gate") if args]
         assert len(quality_gates) >= 3, "Should have at least 3 quality gates"
         
         expected_gates = ["Design Validation", "Code Coverage", "Security Scan"]
         for gate in expected_gates:
             assert gate in quality_gates, f"Missing quality gate: {gate}"
     
-    def test_review_checkpoints(self, project_root):
+    def test_concurrent_pytest_gates_share_no_outputs(self, script_index):
+        """Gates run together, so only one pytest gate may write coverage data."""
+        script = script_index["scripts/adaptive-workflow.sh"]
+        
+        pytest_gates = {
+            args[0]: args[1] for args in script.calls("quality_gate")
+            if len(args) > 1 and "pytest" in args[1]
+        }
+        assert len(pytest_gates) >= 2
+        writers = [name for name, command in pytest_gates.items() if "--no-cov" not in command]
+        assert writers == ["Code Coverage"]
+    
+    def test_only_the_performance_gate_runs_benchmarks(self, script_index):
+        """Benchmarks write one results file, so only one gate may run them."""
+        script = script_index["scripts/adaptive-workflow.sh"]
+        
+        gates = {args[0]: args[1] for args in script.calls("quality_gate") if len(args) > 1}
+        runners = [
+            name for name, command in gates.items()
+            if "pytest tests/" in command and "--ignore=tests/benchmarks" not in command
+        ]
+        assert runners == ["Performance"]
+        # A regression has to fail the gate so it reaches remediation
+        assert "BENCH_STRICT=1" in gates["Performance"]
+        assert "||" not in gates["Performance"]
+    
+    def test_review_checkpoints(self, script_index):
         """Verify review checkpoints are implemented."""
-        with open(project_root / "scripts/adaptive-workflow.sh", "r") as f:
-            content = f.read()
+        script = script_index["scripts/adaptive-workflow.sh"]
         
         # Check for review checkpoint function
-        assert "function review_checkpoint()" in content
-        assert "Review Checkpoint:" in content
+        assert script.has_function("review_checkpoint")
+        assert "Review Checkpoint:" in script.functions["review_checkpoint"]
         
         # Check that reviews can fail and add steps
-        assert "Review found issues" in content
-        assert "add_remediation_steps" in content
+        assert "Review found issues" in script.functions["review_checkpoint"]
+        assert script.invokes("add_remediation_steps")
     
-    def test_adaptive_behavior(self, project_root):
+    def test_adaptive_behavior(self, script_index, script_runs):
         """Test that workflow can adapt by adding steps."""
-        with open(project_root / "scripts/adaptive-workflow.sh", "r") as f:
-            content = f.read()
+        script = script_index["scripts/adaptive-workflow.sh"]
         
         # Check for remediation step addition
-        assert "function add_remediation_steps()" in content
-        assert "ADDITIONAL_STEPS=" in content
+        assert script.has_function("add_remediation_steps")
+        assert "ADDITIONAL_STEPS=" in script.functions["add_remediation_steps"]
+        
+        # Remediation steps are queued as typed items in the remediation queue
+        assert "src.services.remediation" in script.python_modules()
+        result = script_runs.run(["python3", "-m", "src.services.remediation", "add", "--help"])
         
         # Verify different remediation types
         remediation_types = ["architecture", "implementation", "testing", "security"]
         for rtype in remediation_types:
-            assert f'"{rtype}"' in content, f"Missing remediation for: {rtype}"
+            assert rtype in result.stdout, f"Missing remediation for: {rtype}"
     
-    def test_continuous_review_workflow(self, project_root):
+    def test_continuous_review_workflow(self, script_index):
         """Test continuous review workflow option."""
-        with open(project_root / "scripts/adaptive-workflow.sh", "r") as f:
-            content = f.read()
+        script = script_index["scripts/adaptive-workflow.sh"]
         
-        assert "function continuous_review_workflow()" in content
-        assert "Every step is reviewed before proceeding" in content
+        assert script.has_function("continuous_review_workflow")
+        body = script.functions["continuous_review_workflow"]
+        assert "Every step is reviewed before proceeding" in body
         
         # Check that it can dynamically add steps
-        assert "steps+=(" in content
-        assert "Fix review issues" in content
+        assert "steps+=(" in body
+        assert "Fix review issues" in body
     
-    def test_orchestrate_integration(self, project_root):
+    def test_orchestrate_integration(self, script_index):
         """Verify orchestrate.sh references adaptive workflow."""
-        with open(project_root / "scripts/orchestrate.sh", "r") as f:
-            content = f.read()
+        content = script_index["scripts/orchestrate.sh"].text
         
         # Check that orchestrate mentions adaptive workflow
         assert "adaptive-workflow.sh" in content
@@ -104,14 +124,8 @@ class TestAdaptiveWorkflow:
     
     def test_workflow_has_qa_gates(self, project_root):
         """Test that standard workflow includes QA gates."""
-        with open(project_root / "scripts/orchestrate.sh", "r") as f:
-            content = f.read()
-        
-        # Find the workflow section
-        workflow_section = re.search(r'"workflow"\).*?;;', content, re.DOTALL)
-        assert workflow_section is not None
-        
-        workflow_content = workflow_section.group()
+        # The workflow is defined as a dependency graph
+        workflow_content = (project_root / "scripts/workflows/workflow.json").read_text()
         
         # Check for quality gates
         assert "Quality Gate:" in workflow_content
@@ -120,14 +134,9 @@ class TestAdaptiveWorkflow:
         assert "Test Results Review" in workflow_content
         assert "Documentation Review" in workflow_content
     
-    def test_reviewer_always_suggested(self, project_root):
+    def test_reviewer_always_suggested(self, script_runs):
         """Verify reviewer is always included in analysis."""
-        result = subprocess.run(
-            ["./scripts/orchestrate.sh", "analyze", "build a feature"],
-            cwd=project_root,
-            capture_output=True,
-            text=True
-        )
+        result = script_runs.run(["./scripts/orchestrate.sh", "analyze", "build a feature"])
         
         assert "Reviewer Agent: For continuous quality checks (ALWAYS)" in result.stdout
 
@@ -137,17 +146,13 @@ class TestQAIntegration:
     
     def test_all_workflows_have_review_steps(self):
         """Ensure all workflow types include review steps."""
-        orchestrate_path = Path("scripts/orchestrate.sh")
-        content = orchestrate_path.read_text()
-        
         workflows = ["workflow", "ml-workflow", "deployment-workflow", "product-workflow"]
         
         for workflow in workflows:
-            # Find workflow section
-            pattern = f'"{workflow}"\).*?;;'
-            match = re.search(pattern, content, re.DOTALL)
-            assert match is not None, f"Workflow {workflow} not found"
+            # Find workflow definition
+            definition = Path(f"scripts/workflows/{workflow}.json")
+            assert definition.exists(), f"Workflow {workflow} not found"
             
-            workflow_content = match.group()
+            workflow_content = definition.read_text()
             # Each workflow should have review/quality steps
             assert "review" in workflow_content.lower() or "Review" in workflow_content
\ No newline at end of file
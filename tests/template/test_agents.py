@@ -6,12 +6,13 @@ These tests are for template maintainers to ensure agents work correctly
 across Claude model updates. End users should NOT run these tests.
 """
 
-import subprocess
+import json
 import os
+import subprocess
 import sys
-import json
 import time
 from pathlib import Path
+
 import pytest
 
 
@@ -79,14 +80,9 @@ class TestAgentFunctionality:
         assert "Architect Agent" in result.stdout
         assert "Developer Agent" in result.stdout
     
-    def test_orchestration_help(self, project_root):
+    def test_orchestration_help(self, script_runs):
         """Test orchestration help functionality."""
-        result = subprocess.run(
-            ["./scripts/orchestrate.sh"],
-            cwd=project_root,
-            capture_output=True,
-            text=True
-        )
+        result = script_runs.run(["./scripts/orchestrate.sh"])
         
         # Should show usage when no args provided
         assert "Usage:" in result.stdout
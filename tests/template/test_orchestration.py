@@ -6,11 +6,12 @@ Tests for orchestration and meeting scripts functionality.
 These ensure the multi-agent coordination works correctly.
 """
 
-import subprocess
 import os
+import re
+import subprocess
 from pathlib import Path
+
 import pytest
-import re
 
 
 class TestOrchestrationScripts:
@@ -20,28 +21,19 @@ class TestOrchestrationScripts:
     def project_root(self):
         return Path(__file__).parent.parent.parent
     
-    def test_orchestrate_script_syntax(self, project_root):
+    def test_orchestrate_script_syntax(self, script_runs):
         """Verify orchestration script has valid bash syntax."""
-        result = subprocess.run(
-            ["bash", "-n", "scripts/orchestrate.sh"],
-            cwd=project_root,
-            capture_output=True
-        )
+        result = script_runs.run(["bash", "-n", "scripts/orchestrate.sh"])
         assert result.returncode == 0, f"Syntax error in orchestrate.sh: {result.stderr}"
     
-    def test_meeting_script_syntax(self, project_root):
+    def test_meeting_script_syntax(self, script_runs):
         """Verify meeting script has valid bash syntax."""
-        result = subprocess.run(
-            ["bash", "-n", "scripts/meeting.sh"],
-            cwd=project_root,
-            capture_output=True
-        )
+        result = script_runs.run(["bash", "-n", "scripts/meeting.sh"])
         assert result.returncode == 0, f"Syntax error in meeting.sh: {result.stderr}"
     
-    def test_all_agents_in_orchestration(self, project_root):
+    def test_all_agents_in_orchestration(self, script_index):
         """Verify all agents are included in orchestration script."""
-        with open(project_root / "scripts/orchestrate.sh", "r") as f:
-            content = f.read()
+        script = script_index["scripts/orchestrate.sh"]
         
         agents = [
             "architect", "developer", "tester", "reviewer", "documentation",
@@ -51,14 +43,13 @@ class TestOrchestrationScripts:
         
         for agent in agents:
             # Check agent is in case statement
-            assert f'"{agent}"' in content, f"Agent {agent} not found in orchestration"
+            assert script.arm(agent), f"Agent {agent} not found in orchestration"
             # Check agent has launch command
-            assert f'/$agent to load your role' in content, f"Agent {agent} missing launch command"
+            assert f'/{agent} to load your role' in script.arm(agent), f"Agent {agent} missing launch command"
     
     def test_meeting_types(self, project_root):
         """Verify all meeting types are implemented."""
-        with open(project_root / "scripts/meeting.sh", "r") as f:
-            content = f.read()
+        meetings_dir = project_root / "scripts/meetings"
         
         meeting_types = [
             "planning", "technical", "product", "retrospective",
@@ -66,9 +57,13 @@ class TestOrchestrationScripts:
         ]
         
         for meeting in meeting_types:
-            assert f'"{meeting}"' in content, f"Meeting type {meeting} not implemented"
+            definition = meetings_dir / f"{meeting}.json"
+            assert definition.exists(), f"Meeting type {meeting} not implemented"
+            with open(definition, "r") as f:
+                content = f.read()
+            assert f'"name": "{meeting}"' in content, f"Meeting type {meeting} misnamed"
     
-    def test_orchestration_modes(self, project_root):
+    def test_orchestration_modes(self, script_runs):
         """Test different orchestration modes."""
         modes = [
             (["./scripts/orchestrate.sh", "analyze", "test"], "Analyzing request"),
@@ -76,22 +71,36 @@ class TestOrchestrationScripts:
         ]
         
         for cmd, expected in modes:
-            result = subprocess.run(
-                cmd,
-                cwd=project_root,
-                capture_output=True,
-                text=True
-            )
+            result = script_runs.run(cmd)
             assert expected in result.stdout, f"Mode {cmd[1] if len(cmd) > 1 else 'help'} not working properly"
+    
+    def test_scripts_run_from_any_directory(self, project_root, tmp_path):
+        """Scripts that call src modules cd to the repository root first."""
+        scripts = [
+            "orchestrate.sh",
+            "orchestrate-parallel.sh",
+            "spawn-agent.sh",
+            "agent-task.sh",
+            "adaptive-workflow.sh",
+        ]
+        for name in scripts:
+            text = (project_root / "scripts" / name).read_text()
+            assert 'cd "$(dirname "$0")/.." || exit 1' in text, f"{name} depends on the caller's directory"
+        
+        result = subprocess.run(
+            [str(project_root / "scripts" / "orchestrate.sh"), "analyze", "build an api"],
+            cwd=tmp_path, capture_output=True, text=True,
+        )
+        assert "No module named" not in result.stderr
+        assert "Reviewer Agent" in result.stdout
 
 
 class TestWorkflowIntegration:
     """Test complete workflow scenarios."""
     
-    def test_workflow_patterns_exist(self):
+    def test_workflow_patterns_exist(self, script_index):
         """Verify predefined workflows are available."""
-        orchestrate_path = Path("scripts/orchestrate.sh")
-        content = orchestrate_path.read_text()
+        script = script_index["scripts/orchestrate.sh"]
         
         workflows = [
             "workflow",
@@ -101,21 +110,19 @@ class TestWorkflowIntegration:
         ]
         
         for workflow in workflows:
-            assert f'"{workflow}"' in content, f"Workflow {workflow} not found"
+            assert script.arm(workflow), f"Workflow {workflow} not found"
     
-    def test_parallel_execution_syntax(self):
+    def test_parallel_execution_syntax(self, script_index):
         """Verify parallel execution command structure."""
-        orchestrate_path = Path("scripts/orchestrate.sh")
-        content = orchestrate_path.read_text()
+        modules = script_index["scripts/orchestrate.sh"].python_modules()
         
-        # Check for parallel execution with & operator
-        assert "&" in content, "Parallel execution not implemented"
-        assert "wait" in content, "Wait for parallel processes not implemented"
+        # Parallel agents run through the bounded scheduler and the DAG engine
+        assert "src.services.scheduler" in modules, "Parallel execution not implemented"
+        assert "src.services.workflow" in modules, "Workflow engine not used"
     
-    def test_custom_orchestration_parsing(self):
+    def test_custom_orchestration_parsing(self, script_index):
         """Verify custom orchestration can parse agent:task format."""
-        orchestrate_path = Path("scripts/orchestrate.sh")
-        content = orchestrate_path.read_text()
+        content = script_index["scripts/orchestrate.sh"].arm("custom")
         
         # Check for IFS splitting on colon
         assert "IFS=':'" in content, "Task parsing not implemented correctly"
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Template Validation Tests - Script Index
+
+Tests for the parse-once shell script index the template tests share.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from script_index import CommandRunner, ScriptIndex, ScriptIndexCache  # noqa: E402
+
+SAMPLE = """#!/bin/bash
+# run() { is a comment, not a function
+function gate() {
+    local name=$1
+    echo "Gate: $name; not a command"
+    python3 -m src.services.gate_cache run "$name" "true"
+}
+
+helper() {
+    cat <<EOF
+inside() {
+EOF
+}
+
+case "$1" in
+    "build"|"ship")
+        gate "Build Check" "make build"
+        ;;
+    *"Design"*) echo design ;;
+    *)
+        echo "Usage: $0 <build|ship>
+multi-line; help" && exit 1
+        ;;
+esac
+"""
+
+
+class TestScriptIndex:
+    """Test script parsing, the mtime-keyed cache and the command runner."""
+
+    def test_functions_arms_and_commands(self):
+        """A script is split into functions, case arms and invoked commands."""
+        script = ScriptIndex("sample.sh", SAMPLE)
+        assert sorted(script.functions) == ["gate", "helper"]
+        assert "python3 -m" in script.functions["gate"]
+        assert set(script.case_arms) == {"build", "ship", "*Design*", "*"}
+        assert script.arm("build") == script.arm("ship")
+        assert 'gate "Build Check"' in script.arm("build")
+        assert script.invokes("gate") and script.invokes("cat")
+        assert not script.invokes("not") and not script.invokes("multi-line")
+
+    def test_calls_and_modules(self):
+        """Calls are split into arguments the way the shell would."""
+        script = ScriptIndex("sample.sh", SAMPLE)
+        assert script.calls("gate") == [["Build Check", "make build"]]
+        assert script.python_modules() == ["src.services.gate_cache"]
+
+    def test_cache_reparses_only_changed_files(self, tmp_path):
+        """The cache returns the same index until the file changes."""
+        path = tmp_path / "sample.sh"
+        path.write_text(SAMPLE)
+        cache = ScriptIndexCache(tmp_path)
+        first = cache["sample.sh"]
+        assert cache["sample.sh"] is first and cache.parses == 1
+
+        path.write_text(SAMPLE + "\nextra() {\n    :\n}\n")
+        os.utime(path, ns=(1, 1))
+        assert cache["sample.sh"].has_function("extra")
+        assert cache.parses == 2
+
+    def test_runner_runs_each_command_once(self, tmp_path):
+        """Repeated requests for one command line share a single run."""
+        counter = tmp_path / "runs"
+        argv = ["bash", "-c", f"echo run >> {counter}; echo done"]
+        runner = CommandRunner(tmp_path)
+        runner.prefetch([argv, ["bash", "-c", "exit 3"]])
+        assert runner.run(argv).stdout == "done\n"
+        assert runner.run(argv).stdout == "done\n"
+        assert runner.run(["bash", "-c", "exit 3"]).returncode == 3
+        runner.close()
+        assert counter.read_text() == "run\n"
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Template Validation Tests - Prompt Validator
+
+Tests for the incremental prompt signature computation.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+from validate_prompts import PromptValidator, split_sections  # noqa: E402
+
+
+class TestPromptSignatures:
+    """Test incremental prompt signatures."""
+
+    @pytest.fixture
+    def validator(self, tmp_path):
+        commands = tmp_path / "commands"
+        commands.mkdir()
+        (commands / "architect.md").write_text(
+            "# Architect\n\n## Role\nYou are the Architect.\n"
+        )
+        (commands / "tester.md").write_text("# Tester\n\n## Responsibilities\n- Test\n")
+        validator = PromptValidator()
+        validator.commands_dir = commands
+        validator.baseline_file = tmp_path / "baseline.json"
+        validator.stat_cache_file = tmp_path / "cache" / "stat_cache.json"
+        return validator
+
+    def test_signature_contents(self, validator):
+        """Signatures record structure plus the stat cache fields."""
+        signatures = validator.generate_prompt_signatures()
+        architect = signatures["architect"]
+        assert list(signatures) == ["architect", "tester"]
+        assert architect["sections"] == ["Architect", "Role"]
+        assert architect["has_role"] and not architect["has_responsibilities"]
+        assert (
+            architect["bytes"]
+            == (validator.commands_dir / "architect.md").stat().st_size
+        )
+
+    def test_unchanged_files_are_not_reread(self, validator, monkeypatch):
+        """Only files whose mtime or size changed are re-hashed."""
+        baseline = validator.generate_prompt_signatures()
+        tester = validator.commands_dir / "tester.md"
+        tester.write_text("# Tester\n\n## Role\n")
+        os.utime(tester, ns=(1, 1))
+
+        reread = []
+        original = validator._signature
+        monkeypatch.setattr(
+            validator, "_signature", lambda f: reread.append(f.stem) or original(f)
+        )
+        current = validator.generate_prompt_signatures(baseline)
+        assert reread == ["tester"]
+        assert current["architect"] is baseline["architect"]
+        assert current["tester"]["sections"] == ["Tester", "Role"]
+
+    def test_update_then_validate(self, validator):
+        """A fresh baseline validates cleanly from its own cache."""
+        validator.update_baseline()
+        assert validator.validate_against_baseline() == []
+        (validator.commands_dir / "ux.md").write_text("# UX\n")
+        assert validator.validate_against_baseline() == ["✨ New agent detected: ux"]
+
+    def test_stat_cache_stays_out_of_the_baseline(self, validator, monkeypatch):
+        """Only content signatures are committed; stat fields live in .cache."""
+        validator.update_baseline()
+        baseline = json.loads(validator.baseline_file.read_text())
+        assert not {"mtime_ns", "bytes"} & set(baseline["architect"])
+        cache = json.loads(validator.stat_cache_file.read_text())
+        assert cache["architect"]["bytes"] == baseline["architect"]["size"]
+
+        os.utime(validator.commands_dir / "tester.md", ns=(1, 1))
+        reread = []
+        original = validator._signature
+        monkeypatch.setattr(
+            validator, "_signature", lambda f: reread.append(f.stem) or original(f)
+        )
+        assert validator.validate_against_baseline() == []
+        assert reread == ["tester"]
+        cached = validator.stat_cache_file.read_text()
+        assert validator.validate_against_baseline() == []
+        assert reread == ["tester"]
+        assert validator.stat_cache_file.read_text() == cached
+        assert validator.baseline_file.read_text().count("mtime_ns") == 0
+
+
+class TestSectionHashes:
+    """Test per-section hashing, root short-circuiting and section diffs."""
+
+    @pytest.fixture
+    def validator(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        commands = Path("commands")
+        commands.mkdir()
+        (commands / "architect.md").write_text(
+            "# Architect\n\n## Role\nYou are the Architect.\n\n"
+            "## Responsibilities\n- Design\n"
+        )
+        (commands / "tester.md").write_text("# Tester\n\n## Responsibilities\n- Test\n")
+        validator = PromptValidator()
+        validator.commands_dir = commands
+        validator.baseline_file = Path("baseline.json")
+        validator.stat_cache_file = Path(".cache/stat_cache.json")
+        validator.create_baseline()
+        return validator
+
+    def test_chunks_and_root(self):
+        """Prompts split at headings; repeated titles get numbered keys."""
+        chunks = split_sections("intro\n# A\none\n## Ex\nx\n## Ex\ny\n")
+        assert [key for key, _ in chunks] == ["(preamble)", "A", "Ex", "Ex (2)"]
+        assert (
+            "".join(text for _, text in chunks)
+            == "intro\n# A\none\n## Ex\nx\n## Ex\ny\n"
+        )
+
+    def test_changed_section_is_pinpointed(self, validator):
+        """Only the edited section is reported, and unchanged prompts are skipped."""
+        architect = validator.commands_dir / "architect.md"
+        architect.write_text(
+            architect.read_text().replace("the Architect", "an Architect")
+        )
+        issues = validator.validate_against_baseline()
+        assert issues == ["✏️  architect: Changed sections: {'Role'}"]
+        assert list(validator.changed_sections) == ["architect"]
+
+    def test_inserted_section_leaves_others_unchanged(self, validator):
+        """Leaves are matched by title, so an insertion is not a change elsewhere."""
+        architect = validator.commands_dir / "architect.md"
+        architect.write_text(
+            architect.read_text().replace("## Role", "## Scope\n\n## Role")
+        )
+        issues = validator.validate_against_baseline()
+        assert issues == ["➕ architect: Added sections: {'Scope'}"]
+
+    def test_baseline_is_one_line_per_agent(self, validator):
+        """The baseline stays valid JSON with one compact entry per prompt."""
+        lines = validator.baseline_file.read_text().splitlines()
+        assert len(lines) == 4 and lines[0] == "{" and lines[-1] == "}"
+        assert set(json.loads(validator.baseline_file.read_text())) == {
+            "architect",
+            "tester",
+        }
+
+    def test_section_diff_against_committed_baseline(self, validator):
+        """--diff shows unified diffs of the changed sections only."""
+        git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+        subprocess.run(["git", "init", "-q"], check=True)
+        subprocess.run(["git", "add", "."], check=True)
+        subprocess.run(git + ["commit", "-qm", "baseline"], check=True)
+        architect = validator.commands_dir / "architect.md"
+        architect.write_text(
+            architect.read_text().replace("- Design", "- Design\n- Review")
+        )
+        validator.validate_against_baseline()
+        diff = validator.section_diff()
+        assert diff[0] == "--- a/commands/architect.md § Responsibilities"
+        assert "+- Review" in diff and "-You are the Architect." not in diff
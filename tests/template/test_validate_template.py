@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Template Validation Tests - Validation Engine
+
+Tests for the concurrent, cached template validation engine.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+from validate_template import (  # noqa: E402
+    Check,
+    TemplateValidator,
+    build_checks,
+    select,
+)
+
+SCRIPT = Path(__file__).parent / "validate_template.py"
+
+
+class TestTemplateValidator:
+    """Test check selection, concurrency and result caching."""
+
+    @pytest.fixture
+    def tree(self, tmp_path, monkeypatch):
+        scripts = tmp_path / "scripts"
+        scripts.mkdir()
+        (scripts / "good.sh").write_text("#!/bin/bash\necho ok\n")
+        (scripts / "other.sh").write_text("#!/bin/bash\necho other\n")
+        monkeypatch.chdir(tmp_path)
+        return tmp_path
+
+    @pytest.fixture
+    def validator(self, tree):
+        return TemplateValidator(cache_dir=tree / "cache")
+
+    def test_results_keep_check_order(self, validator):
+        """Structure and command checks are reported in declaration order."""
+        checks = [
+            Check("Fails", "syntax", "exit 3"),
+            Check("Passes", "syntax", "echo fine"),
+            Check("Stat", "files", func=lambda: (False, "Missing file: x")),
+        ]
+        results = validator.run(checks)
+        assert [r.name for r in results] == ["Fails", "Passes", "Stat"]
+        assert [r.passed for r in results] == [False, True, False]
+        assert results[1].output == "fine\n"
+        assert results[2].output == "Missing file: x"
+
+    def test_only_changed_inputs_rerun(self, validator, tree):
+        """A second run reuses every verdict except the edited script's."""
+        checks = select(build_checks(), ["syntax"])
+        assert [c.name for c in checks] == [
+            "Syntax: scripts/good.sh",
+            "Syntax: scripts/other.sh",
+        ]
+        assert not any(r.cached for r in validator.run(checks))
+        assert all(r.cached for r in validator.run(checks))
+
+        (tree / "scripts" / "other.sh").write_text("#!/bin/bash\nif then\n")
+        good, other = validator.run(checks)
+        assert good.cached and good.passed
+        assert not other.cached and not other.passed
+        assert "syntax error" in other.output
+
+    def test_missing_structure_is_reported(self, validator):
+        """Layout checks fail for a tree without the template's directories."""
+        results = validator.run(select(build_checks(), ["directories", "attribution"]))
+        assert [r.name for r in results if r.passed] == ["Directory: scripts"]
+        assert results[-1].name == "Attribution rules"
+        assert "Missing dir: .claude/commands" in results[0].output
+
+    def test_json_output(self, tmp_path):
+        """--json emits one machine-readable record per check."""
+        result = subprocess.run(
+            [sys.executable, str(SCRIPT), "--json", "--only", "syntax", "--no-cache"],
+            capture_output=True,
+            text=True,
+        )
+        report = json.loads(result.stdout)
+        assert report["passed"] is (result.returncode == 0)
+        names = [check["name"] for check in report["checks"]]
+        assert "Syntax: scripts/orchestrate.sh" in names
+        assert set(report["checks"][0]) == {
+            "name",
+            "group",
+            "required",
+            "passed",
+            "cached",
+            "duration",
+            "output",
+        }
@@ -4,57 +4,195 @@ Prompt Regression Testing
 
 Validates that agent prompts maintain expected functionality
 even as Claude models evolve. This helps catch breaking changes.
+
+Signatures are computed incrementally: a stat cache in .cache/prompts
+keeps each file's mtime and byte size next to its signature, so only
+prompts that changed since the last run are re-read and hashed (in a
+thread pool). Pass --full to re-read everything. The committed baseline
+holds only the content signatures, so it doesn't change when a checkout
+touches file times.
+
+Each signature also hashes the prompt section by section: a flat list of
+section hashes ("chunks", one per heading plus the text before the first)
+and a "root" hash over that list. Validation skips a prompt as soon as its
+root matches and otherwise compares the chunks to name exactly the sections
+that changed. Chunks are matched by section title rather than position, so
+inserting a section doesn't mark the rest as changed. Baselines written
+before chunks existed have neither field; run --update once to add them.
+With --diff the changed sections are printed as a unified diff against
+the prompt as it was when the baseline was last committed.
 """
 
+import difflib
 import hashlib
 import json
-from pathlib import Path
-from datetime import datetime
+import os
+import re
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+SECTION_RE = re.compile(r'^#{1,3}\s+(.+)$', re.MULTILINE)
+PREAMBLE = "(preamble)"
+STAT_FIELDS = ("mtime_ns", "bytes")
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def _content(signature):
+    """A signature without its stat cache fields."""
+    return {key: value for key, value in signature.items() if key not in STAT_FIELDS}
+
+
+def section_keys(titles):
+    """Unique keys for a prompt's chunks: the preamble, then each title.
+
+    A title that repeats is numbered ("Example (2)").
+    """
+    keys = []
+    seen = {}
+    for title in [PREAMBLE] + list(titles):
+        seen[title] = seen.get(title, 0) + 1
+        keys.append(title if seen[title] == 1 else f"{title} ({seen[title]})")
+    return keys
+
+
+def find_headings(content):
+    """Heading matches, trying only the lines that start with '#'.
+
+    Jumping between candidate lines with str.find is several times faster
+    than letting the multiline regex scan every position.
+    """
+    matches = []
+    pos = 0 if content.startswith("#") else content.find("\n#") + 1
+    end = 0
+    while pos >= 0:
+        match = SECTION_RE.match(content, pos) if pos >= end else None
+        if match:
+            matches.append(match)
+            end = match.end()
+        pos = content.find("\n#", pos)
+        pos = pos + 1 if pos >= 0 else -1
+    return matches
+
+
+def split_sections(content, headings=None):
+    """Split a prompt into (key, text) chunks, one per heading plus the preamble."""
+    if headings is None:
+        headings = find_headings(content)
+    bounds = [0] + [m.start() for m in headings] + [len(content)]
+    keys = section_keys(m.group(1) for m in headings)
+    return [(key, content[start:end]) for key, start, end in zip(keys, bounds, bounds[1:])]
+
+
+def sections_root(keys, hashes):
+    """One hash over a prompt's section keys and their hashes, in order."""
+    return _digest("\n".join(f"{key}\0{digest}" for key, digest in zip(keys, hashes)))
+
+
+def section_hashes(signature):
+    """Map of section key to hash (None for baselines without chunks)."""
+    if "chunks" not in signature:
+        return None
+    return dict(zip(section_keys(signature["sections"]), signature["chunks"]))
 
 
 class PromptValidator:
     """Validate prompt consistency and structure."""
     
-    def __init__(self):
+    def __init__(self, incremental=True):
         self.commands_dir = Path(".claude/commands")
         self.baseline_file = Path("tests/template/prompt_baseline.json")
+        self.stat_cache_file = Path(".cache/prompts/stat_cache.json")
+        self.incremental = incremental
+        self.changed_sections = {}
+        self.reread = 0
     
-    def generate_prompt_signatures(self):
-        """Generate signatures for all prompts."""
+    def generate_prompt_signatures(self, cache=None):
+        """Generate signatures for all prompts.
+
+        Entries of ``cache`` (a previous signature dict, e.g. the stat
+        cache) are reused for files whose mtime and size are unchanged.
+        """
+        cache = cache or {}
         signatures = {}
+        stale = []
         
-        for command_file in self.commands_dir.glob("*.md"):
-            content = command_file.read_text()
+        for command_file in sorted(self.commands_dir.glob("*.md")):
             agent = command_file.stem
-            
-            # Extract key sections
-            signatures[agent] = {
-                "file": str(command_file),
-                "size": len(content),
-                "hash": hashlib.sha256(content.encode()).hexdigest()[:16],
-                "has_role": "## Role" in content or "You are" in content,
-                "has_responsibilities": "Responsibilities" in content,
-                "has_coordination": "coordination" in content.lower(),
-                "sections": self._extract_sections(content),
-                "timestamp": datetime.now().isoformat()
-            }
+            stat = command_file.stat()
+            cached = cache.get(agent)
+            if (
+                cached
+                and cached.get("file") == str(command_file)
+                and cached.get("mtime_ns") == stat.st_mtime_ns
+                and cached.get("bytes") == stat.st_size
+            ):
+                signatures[agent] = cached
+            else:
+                stale.append(command_file)
         
-        return signatures
+        # Re-read and hash only the prompts that changed
+        self.reread = len(stale)
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as pool:
+            for command_file, signature in zip(stale, pool.map(self._signature, stale)):
+                signatures[command_file.stem] = signature
+        
+        return dict(sorted(signatures.items()))
+    
+    def _signature(self, command_file):
+        """Read one prompt file and compute its signature."""
+        stat = command_file.stat()
+        content = command_file.read_text()
+        headings = find_headings(content)
+        sections = split_sections(content, headings)
+        chunks = [_digest(text) for _, text in sections]
+        
+        # Extract key sections
+        return {
+            "file": str(command_file),
+            "size": len(content),
+            "hash": _digest(content),
+            "has_role": "## Role" in content or "You are" in content,
+            "has_responsibilities": "Responsibilities" in content,
+            "has_coordination": "coordination" in content.lower(),
+            "sections": [m.group(1) for m in headings],
+            "chunks": chunks,
+            "root": sections_root([key for key, _ in sections], chunks),
+            "timestamp": datetime.now().isoformat(),
+            "mtime_ns": stat.st_mtime_ns,
+            "bytes": stat.st_size
+        }
+    
+    def _load_baseline(self):
+        """Load the baseline signatures, or an empty dict if there are none."""
+        if not self.baseline_file.exists():
+            return {}
+        with open(self.baseline_file, 'r') as f:
+            return json.load(f)
+    
+    def _load_stat_cache(self):
+        """Load the stat cache, or an empty dict if it's missing or unreadable."""
+        try:
+            with open(self.stat_cache_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
     
-    def _extract_sections(self, content):
-        """Extract markdown section headers."""
-        import re
-        sections = re.findall(r'^#{1,3}\s+(.+)$', content, re.MULTILINE)
-        return sections
+    def _write_stat_cache(self, signatures):
+        """Keep the signatures with their stat fields for the next run."""
+        self.stat_cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.stat_cache_file.write_text(json.dumps(signatures, separators=(',', ':')))
     
     def create_baseline(self):
         """Create a baseline for prompt comparison."""
         signatures = self.generate_prompt_signatures()
-        
-        self.baseline_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.baseline_file, 'w') as f:
-            json.dump(signatures, f, indent=2)
+        self._write_baseline(signatures)
+        self._write_stat_cache(signatures)
         
         print(f"✅ Created prompt baseline with {len(signatures)} agents")
         return signatures
@@ -65,10 +203,13 @@ class PromptValidator:
             print("⚠️  No baseline found. Creating initial baseline...")
             return self.create_baseline()
         
-        with open(self.baseline_file, 'r') as f:
-            baseline = json.load(f)
+        baseline = self._load_baseline()
         
-        current = self.generate_prompt_signatures()
+        current = self.generate_prompt_signatures(
+            self._load_stat_cache() if self.incremental else None
+        )
+        if self.reread or not self.stat_cache_file.exists():
+            self._write_stat_cache(current)
         
         issues = []
         
@@ -83,11 +224,16 @@ class PromptValidator:
                 issues.append(f"✨ New agent detected: {agent}")
         
         # Check for significant changes
+        self.changed_sections = {}
         for agent in baseline:
             if agent in current:
                 base = baseline[agent]
                 curr = current[agent]
                 
+                # An unchanged root means every section is unchanged
+                if base.get("root") and base.get("root") == curr.get("root"):
+                    continue
+                
                 # Check structural changes
                 if base["has_role"] != curr["has_role"]:
                     issues.append(f"⚠️  {agent}: Role definition changed")
@@ -111,24 +257,92 @@ class PromptValidator:
                     issues.append(f"➖ {agent}: Removed sections: {removed}")
                 if added:
                     issues.append(f"➕ {agent}: Added sections: {added}")
+                
+                # Pinpoint edited sections from the section hashes
+                base_hashes = section_hashes(base)
+                curr_hashes = section_hashes(curr)
+                if base_hashes is not None and curr_hashes is not None:
+                    changed = [
+                        key for key, digest in curr_hashes.items()
+                        if key in base_hashes and base_hashes[key] != digest
+                    ]
+                    if changed:
+                        issues.append(f"✏️  {agent}: Changed sections: {set(changed)}")
+                    keys = changed + sorted(set(base_hashes) ^ set(curr_hashes))
+                    if keys:
+                        self.changed_sections[agent] = (base, curr, keys)
         
         return issues
     
+    def section_diff(self, ref=None):
+        """Unified diff of the sections changed in the last validation.
+
+        The old text comes from git, at ``ref`` or else the commit that last
+        touched the baseline; only the changed sections are diffed.
+        """
+        ref = ref or self._baseline_commit()
+        if ref is None:
+            return ["⚠️  Baseline is not committed; no earlier prompt text to diff against"]
+        lines = []
+        for agent, (base, curr, keys) in sorted(self.changed_sections.items()):
+            path = curr["file"]
+            old = dict(split_sections(self._git_show(ref, base["file"])))
+            new = dict(split_sections(Path(path).read_text()))
+            for key in keys:
+                lines.extend(difflib.unified_diff(
+                    old.get(key, "").splitlines(keepends=True),
+                    new.get(key, "").splitlines(keepends=True),
+                    fromfile=f"a/{base['file']} § {key}",
+                    tofile=f"b/{path} § {key}",
+                ))
+        return [line.rstrip("\n") for line in lines]
+    
+    def _baseline_commit(self):
+        """The last commit that changed the baseline file, if any."""
+        try:
+            result = subprocess.run(
+                ["git", "log", "-1", "--format=%H", "--", str(self.baseline_file)],
+                capture_output=True, text=True, check=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return result.stdout.strip() or None
+    
+    def _git_show(self, ref, path):
+        """A file's content at ``ref`` (empty if it didn't exist then)."""
+        result = subprocess.run(
+            ["git", "show", f"{ref}:./{os.path.relpath(path)}"],
+            capture_output=True, text=True,
+        )
+        return result.stdout if result.returncode == 0 else ""
+    
     def update_baseline(self):
         """Update the baseline with current prompts."""
-        signatures = self.generate_prompt_signatures()
-        
-        with open(self.baseline_file, 'w') as f:
-            json.dump(signatures, f, indent=2)
+        cache = self._load_stat_cache() if self.incremental else None
+        signatures = self.generate_prompt_signatures(cache)
+        self._write_baseline(signatures)
+        self._write_stat_cache(signatures)
         
         print(f"✅ Updated baseline for {len(signatures)} agents")
+    
+    def _write_baseline(self, signatures):
+        """Write one agent per line, so thousands of prompts stay compact.
+
+        The stat fields are local to this checkout and stay out of the baseline.
+        """
+        self.baseline_file.parent.mkdir(parents=True, exist_ok=True)
+        entries = [
+            f"  {json.dumps(agent)}: {json.dumps(_content(signature), separators=(',', ':'))}"
+            for agent, signature in signatures.items()
+        ]
+        self.baseline_file.write_text("{\n" + ",\n".join(entries) + "\n}\n")
 
 
 def main():
     """Run prompt validation."""
-    validator = PromptValidator()
+    validator = PromptValidator(incremental="--full" not in sys.argv)
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--update":
+    if "--update" in sys.argv[1:]:
         validator.update_baseline()
     else:
         issues = validator.validate_against_baseline()
@@ -138,6 +352,11 @@ def main():
             for issue in issues:
                 print(f"  {issue}")
             
+            if "--diff" in sys.argv[1:]:
+                print("\n📝 Changed sections:")
+                for line in validator.section_diff():
+                    print(line)
+            
             # Return non-zero if there are breaking changes
             breaking = [i for i in issues if i.startswith("❌")]
             if breaking:
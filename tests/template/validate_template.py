@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Template Validation Engine
+
+Runs the checks behind scripts/validate-template.sh: the directory and file
+layout, agent commands and launch scripts, `bash -n` on every script, the
+orchestrate and meeting entry points, the template test suite and the
+attribution rule.
+
+The script used to run every check one after another and redo all of them
+on each run. Here each check that runs a command is a quality gate in the
+gate cache (src/services/gate_cache.py): its verdict is keyed by the command
+and the content of the files it reads, so a run only re-executes the checks
+whose inputs changed, and those run concurrently. Structure checks only
+stat a path, which is cheaper than hashing it, so they always run.
+
+Usage:
+    python tests/template/validate_template.py
+    python tests/template/validate_template.py --json > validation.json
+    python tests/template/validate_template.py --only Syntax --no-cache
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+from src.services.gate_cache import (  # noqa: E402
+    CACHE_DIR,
+    GateCache,
+    cache_enabled,
+    run_gate,
+)
+
+AGENTS = [
+    "architect",
+    "developer",
+    "tester",
+    "reviewer",
+    "documentation",
+    "mlops",
+    "devops",
+    "project",
+    "product",
+    "portfolio",
+    "research",
+    "ux",
+    "customer",
+    "scrum",
+    "triage",
+]
+
+REQUIRED_DIRS = [
+    ".claude/commands",
+    ".claude/rules",
+    ".claude/tasks",
+    "scripts",
+    "tests/template",
+    "tests/example",
+]
+
+REQUIRED_FILES = [
+    "scripts/orchestrate.sh",
+    "scripts/meeting.sh",
+    ".claude/rules/project.md",
+    ".claude/tasks/taskboard.md",
+]
+
+ATTRIBUTION_RULE = "DO NOT include Claude attribution"
+
+# Sections in report order, with the headings the shell script printed
+GROUPS = [
+    ("python", "1️⃣ Checking Python environment..."),
+    ("directories", "2️⃣ Checking directory structure..."),
+    ("files", "3️⃣ Checking critical files..."),
+    ("agents", "4️⃣ Checking agent command files..."),
+    ("launch", "5️⃣ Checking launch scripts..."),
+    ("syntax", "6️⃣ Checking shell script syntax..."),
+    ("orchestration", "7️⃣ Testing orchestration script..."),
+    ("meeting", "8️⃣ Testing meeting script..."),
+    ("tests", "9️⃣ Running Python tests..."),
+    ("attribution", "🔟 Checking attribution rules..."),
+]
+
+
+class Check:
+    """One validation check.
+
+    A check either runs ``command`` (cached by the content of ``inputs``) or
+    calls ``func``, which returns ``(passed, message)``. Checks that are not
+    ``required`` only warn when they fail.
+    """
+
+    __slots__ = ("name", "group", "command", "inputs", "func", "required")
+
+    def __init__(self, name, group, command=None, inputs=(), func=None, required=True):
+        self.name = name
+        self.group = group
+        self.command = command
+        self.inputs = list(inputs)
+        self.func = func
+        self.required = required
+
+
+class CheckResult:
+    """Outcome of one check."""
+
+    __slots__ = ("name", "group", "required", "passed", "cached", "duration", "output")
+
+    def __init__(self, check, passed, output="", cached=False, duration=0.0):
+        self.name = check.name
+        self.group = check.group
+        self.required = check.required
+        self.passed = passed
+        self.output = output
+        self.cached = cached
+        self.duration = duration
+
+    def to_dict(self):
+        """The result as written by --json."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _exists(path, kind):
+    def check():
+        found = Path(path).is_dir() if kind == "dir" else Path(path).is_file()
+        return found, "" if found else f"Missing {kind}: {path}"
+
+    return check
+
+
+def _launch_script(path):
+    def check():
+        ok = Path(path).is_file() and os.access(path, os.X_OK)
+        return ok, "" if ok else f"Missing or not executable: {path}"
+
+    return check
+
+
+def _python():
+    return True, f"Python {platform.python_version()} ({sys.executable})"
+
+
+def _attribution():
+    rules = Path(".claude/rules/project.md")
+    try:
+        found = ATTRIBUTION_RULE in rules.read_text()
+    except OSError:
+        found = False
+    return found, "" if found else f"'{ATTRIBUTION_RULE}' not found in {rules}"
+
+
+def build_checks():
+    """Every template check, in report order, relative to the current directory."""
+    checks = [Check("Python environment", "python", func=_python)]
+    checks += [
+        Check(f"Directory: {d}", "directories", func=_exists(d, "dir"))
+        for d in REQUIRED_DIRS
+    ]
+    checks += [
+        Check(f"File: {f}", "files", func=_exists(f, "file")) for f in REQUIRED_FILES
+    ]
+    checks += [
+        Check(
+            f"Agent command: {a}",
+            "agents",
+            func=_exists(f".claude/commands/{a}.md", "file"),
+        )
+        for a in AGENTS
+    ]
+    # Triage doesn't have a launch script
+    checks += [
+        Check(
+            f"Launch script: {a}",
+            "launch",
+            func=_launch_script(f"scripts/launch-{a}.sh"),
+        )
+        for a in AGENTS
+        if a != "triage"
+    ]
+    checks += [
+        Check(f"Syntax: {script}", "syntax", f"bash -n {script}", [str(script)])
+        for script in sorted(Path("scripts").glob("*.sh"))
+    ]
+    checks += [
+        Check(
+            "Orchestration help",
+            "orchestration",
+            "./scripts/orchestrate.sh 2>&1 | grep 'Usage:'",
+            ["scripts/orchestrate.sh"],
+        ),
+        Check(
+            "Orchestration analyze",
+            "orchestration",
+            "./scripts/orchestrate.sh analyze 'test request' 2>&1"
+            " | grep 'Analyzing request'",
+            ["scripts/orchestrate.sh", "scripts/routing", "src"],
+        ),
+        Check(
+            "Meeting help",
+            "meeting",
+            "./scripts/meeting.sh 2>&1 | grep 'Usage:'",
+            ["scripts/meeting.sh", "scripts/meetings", "src"],
+        ),
+        # A failing template test is reported, but doesn't fail validation
+        Check(
+            "Template tests",
+            "tests",
+            "pytest tests/template/ -v --tb=short",
+            [
+                "tests/template",
+                "tests/conftest.py",
+                "scripts",
+                ".claude",
+                "src",
+                "pyproject.toml",
+            ],
+            required=False,
+        ),
+        Check("Attribution rules", "attribution", func=_attribution),
+    ]
+    return checks
+
+
+def select(checks, patterns):
+    """Checks whose name or group contains any of ``patterns`` (all if none)."""
+    if not patterns:
+        return checks
+    lowered = [p.lower() for p in patterns]
+    return [
+        check
+        for check in checks
+        if any(p in check.name.lower() or p == check.group for p in lowered)
+    ]
+
+
+class TemplateValidator:
+    """Run template checks concurrently, reusing cached verdicts."""
+
+    def __init__(self, cache_dir=CACHE_DIR, use_cache=True, max_workers=None):
+        self.cache_dir = Path(cache_dir)
+        self.use_cache = use_cache
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+
+    def run(self, checks):
+        """Run ``checks`` and return their results in the same order."""
+        results = {}
+        commands = []
+        for index, check in enumerate(checks):
+            if check.func is None:
+                commands.append((index, check))
+            else:
+                start = time.monotonic()
+                passed, message = check.func()
+                results[index] = CheckResult(
+                    check, passed, message, duration=time.monotonic() - start
+                )
+        # Commands are subprocesses, so the threads only wait on them
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            done = pool.map(self._run_command, [check for _, check in commands])
+            for (index, _), result in zip(commands, done):
+                results[index] = result
+        return [results[index] for index in range(len(checks))]
+
+    def _run_command(self, check):
+        # One cache connection per check; SQLite connections aren't shared
+        if not self.use_cache:
+            gate = run_gate(check.name, check.command)
+        else:
+            with GateCache(self.cache_dir) as cache:
+                gate = run_gate(check.name, check.command, check.inputs, cache)
+        return CheckResult(
+            check,
+            gate.passed,
+            gate.output.decode(errors="replace"),
+            cached=gate.cached,
+            duration=gate.duration,
+        )
+
+
+def print_report(results, wall_time):
+    """Print results grouped like the shell script's sections."""
+    print("🔍 Validating Agentic Python Template")
+    print("=====================================")
+    for group, heading in GROUPS:
+        members = [r for r in results if r.group == group]
+        if not members:
+            continue
+        print(f"\n{heading}")
+        for result in members:
+            mark = "✓" if result.passed else ("✗" if result.required else "⚠️")
+            source = " (cached)" if result.cached else ""
+            print(f"{mark} {result.name}{source}")
+            if result.group == "python" or not result.passed:
+                for line in result.output.rstrip().splitlines()[-20:]:
+                    print(f"   {line}")
+
+    failed = [r for r in results if r.required and not r.passed]
+    warned = [r for r in results if not r.required and not r.passed]
+    cached = sum(r.cached for r in results)
+    print("\n====================================")
+    print(
+        f"⏱️  {len(results)} checks in {wall_time:.1f}s"
+        f" ({cached} cached, {sum(r.duration for r in results):.1f}s of work)"
+    )
+    if warned:
+        print(f"⚠️  {len(warned)} check(s) reported warnings")
+    if failed:
+        print(f"❌ {len(failed)} check(s) failed")
+        return
+    print("✅ Template validation complete!")
+    print("")
+    print("The agentic Python template is properly configured.")
+    print("")
+    print("Note: This validates the template structure only.")
+    print("It does not test actual agent interactions with Claude.")
+
+
+def main():
+    """Run template validation."""
+    parser = argparse.ArgumentParser(description="Validate the agentic template")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        metavar="TEXT",
+        help="Run checks whose name contains TEXT or whose group is TEXT",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Re-run every check")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=int(os.environ.get("VALIDATE_MAX_PARALLEL", "0")) or None,
+        help="Checks allowed to run at once (env VALIDATE_MAX_PARALLEL)",
+    )
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    checks = select(build_checks(), args.only)
+    validator = TemplateValidator(
+        use_cache=not args.no_cache and cache_enabled(), max_workers=args.max_workers
+    )
+    start = time.monotonic()
+    results = validator.run(checks)
+    wall_time = time.monotonic() - start
+    passed = all(r.passed for r in results if r.required)
+
+    if args.json:
+        report = {
+            "passed": passed,
+            "wall_time": wall_time,
+            "checks": [r.to_dict() for r in results],
+        }
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(results, wall_time)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
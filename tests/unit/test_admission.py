@@ -0,0 +1,93 @@
+"""
+Tests for agent launch admission control.
+"""
+
+import pytest
+
+from src.services.admission import AdmissionController, TokenBucket
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """Test the launch-rate bucket."""
+
+    def test_burst_then_rate(self):
+        """A full bucket allows a burst, then refills at the rate."""
+        bucket = TokenBucket(rate=2.0, capacity=3, now=0.0)
+        assert [bucket.try_acquire(0.0) for _ in range(4)] == [True] * 3 + [False]
+        assert bucket.wait_time(0.0) == pytest.approx(0.5)
+        assert bucket.try_acquire(0.5)
+
+    def test_refill_is_capped(self):
+        """Idle time never banks more than the burst size."""
+        bucket = TokenBucket(rate=10.0, capacity=2, now=0.0)
+        assert sum(bucket.try_acquire(100.0) for _ in range(5)) == 2
+
+    def test_zero_rate_is_unlimited(self):
+        """A rate of 0 switches rate limiting off."""
+        bucket = TokenBucket(rate=0, capacity=1, now=0.0)
+        assert all(bucket.try_acquire(0.0) for _ in range(100))
+
+
+class TestAdmissionController:
+    """Test admission decisions and queue-wait metrics."""
+
+    def test_rate_limit_returns_wait(self):
+        """Beyond the burst, admit() says how long until the next token."""
+        clock = Clock()
+        controller = AdmissionController(rate=4, burst=2, clock=clock)
+        assert controller.admit(0) == 0 and controller.admit(1) == 0
+        assert controller.admit(2) == pytest.approx(0.25)
+        clock.now = 0.25
+        assert controller.admit(2) == 0
+        assert controller.metrics()["held_back"] == {"rate": 1}
+
+    def test_in_flight_cap(self):
+        """No launch is admitted while the in-flight cap is reached."""
+        controller = AdmissionController(rate=0, max_in_flight=2)
+        assert controller.admit(2) > 0
+        assert controller.admit(1) == 0
+
+    def test_load_and_memory_checks(self):
+        """Optional resource checks hold launches back; unknown values pass."""
+        load = [9.0]
+        controller = AdmissionController(
+            rate=0,
+            max_load=4.0,
+            min_free_mb=512,
+            load=lambda: load[0],
+            free_memory=lambda: 100.0,
+        )
+        assert controller.admit(0) > 0
+        load[0] = 1.0
+        assert controller.admit(0) > 0
+        controller.free_memory = lambda: None
+        assert controller.admit(0) == 0
+        assert controller.metrics()["held_back"] == {"load": 1, "memory": 1}
+
+    def test_wait_metrics(self):
+        """Queue waits are summarized as mean, percentiles and max."""
+        controller = AdmissionController()
+        for wait in range(1, 101):
+            controller.record_wait(wait / 100)
+        metrics = controller.metrics()
+        assert metrics["wait_mean"] == pytest.approx(0.505)
+        assert metrics["wait_p50"] == pytest.approx(0.51)
+        assert metrics["wait_p95"] == pytest.approx(0.96)
+        assert metrics["wait_max"] == pytest.approx(1.0)
+
+    def test_from_env(self, monkeypatch):
+        """Limits are read from the AGENT_* environment variables."""
+        monkeypatch.setenv("AGENT_SPAWN_RATE", "10")
+        monkeypatch.setenv("AGENT_MAX_IN_FLIGHT", "3")
+        controller = AdmissionController.from_env()
+        assert controller.bucket.rate == 10 and controller.max_in_flight == 3
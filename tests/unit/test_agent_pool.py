@@ -0,0 +1,204 @@
+"""
+Tests for the warm agent pool.
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services import agent_pool
+from src.services.agent_pool import (
+    AgentPool,
+    PoolClient,
+    PoolError,
+    PoolServer,
+    role_prompt,
+)
+
+FAKE_AGENT = Path(__file__).parent.parent / "stubs" / "fake_agent.py"
+STREAM_ARGS = ["-p", "--input-format", "stream-json", "--output-format", "stream-json"]
+
+
+def fake_command():
+    """A resident fake agent in stream-json mode."""
+    return [sys.executable, str(FAKE_AGENT), *STREAM_ARGS]
+
+
+def wait_for(predicate, timeout=10.0):
+    """Poll until ``predicate()`` is true."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting"
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def agent_log(tmp_path, monkeypatch):
+    """Path of the fake agents' turn log."""
+    log = tmp_path / "turns.jsonl"
+    monkeypatch.setenv("FAKE_AGENT_LOG", str(log))
+    return log
+
+
+@pytest.fixture
+def commands_dir(tmp_path):
+    """A command directory with one role file."""
+    directory = tmp_path / "commands"
+    directory.mkdir()
+    (directory / "developer.md").write_text("You are the developer. $ARGUMENTS\n")
+    return directory
+
+
+def make_pool(tmp_path, commands_dir, **kwargs):
+    return AgentPool(
+        command=fake_command, commands_dir=commands_dir, log_dir=tmp_path, **kwargs
+    )
+
+
+class TestRolePrompt:
+    """Test where workers get their role from."""
+
+    def test_command_file_or_slash_command(self, commands_dir):
+        """The command file is used when present, the slash command otherwise."""
+        assert role_prompt("developer", commands_dir) == "You are the developer."
+        assert role_prompt("tester", commands_dir) == "/tester"
+
+
+class TestAgentPool:
+    """Test task hand-off, recycling and savings reporting."""
+
+    def test_workers_load_role_before_tasks(self, tmp_path, commands_dir, agent_log):
+        """Each worker's first turn is its role prompt; tasks follow in-session."""
+        with make_pool(tmp_path, commands_dir, roles=["developer"]) as pool:
+            results = pool.run([("developer", "build a"), ("developer", "build b")])
+        assert all(result.ok for result in results)
+        assert results[0].output.endswith("build a")
+        turns = [json.loads(line) for line in agent_log.read_text().splitlines()]
+        assert [t["prompt"] for t in turns] == [
+            "You are the developer.",
+            "build a",
+            "build b",
+        ]
+        assert len({t["pid"] for t in turns}) == 1
+
+    def test_workers_are_recycled(self, tmp_path, commands_dir):
+        """A worker is replaced after max_tasks tasks."""
+        with make_pool(tmp_path, commands_dir, max_tasks=2) as pool:
+            results = pool.run([("developer", f"task {n}") for n in range(5)])
+            stats = pool.stats()
+        assert [r.worker_pid for r in results].count(results[0].worker_pid) == 2
+        assert len({r.worker_pid for r in results}) == 3
+        assert stats["recycled"] >= 2 and stats["tasks"] == 5
+
+    def test_failed_turn_keeps_worker(self, tmp_path, commands_dir):
+        """A task that reports an error fails without costing the worker."""
+        with make_pool(tmp_path, commands_dir) as pool:
+            bad, good = pool.run([("tester", "check exit=1"), ("tester", "check")])
+        assert not bad.ok and good.ok
+        assert bad.worker_pid == good.worker_pid
+
+    def test_timed_out_worker_is_replaced(self, tmp_path, commands_dir):
+        """A task that times out kills its worker; the next task gets a new one."""
+        with make_pool(tmp_path, commands_dir, timeout=0.5) as pool:
+            slow, fast = pool.run([("tester", "hang sleep=30"), ("tester", "check")])
+        assert not slow.ok and "timed out" in slow.output
+        assert fast.ok and fast.worker_pid != slow.worker_pid
+
+    def test_unwritable_log_dir_fails_the_task(self, tmp_path, commands_dir):
+        """A worker that can't get a log file fails its task, not its thread."""
+        not_a_dir = tmp_path / "logs"
+        not_a_dir.write_text("")
+        pool = AgentPool(
+            command=fake_command, commands_dir=commands_dir, log_dir=not_a_dir
+        )
+        with pool:
+            futures = [pool.submit("tester", "check") for _ in range(2)]
+            first, second = [future.result(timeout=10) for future in futures]
+        assert not first.ok and "Could not start a tester worker" in first.output
+        assert not second.ok
+
+    def test_unexpected_error_still_answers(self, tmp_path, commands_dir, monkeypatch):
+        """A task that fails unexpectedly sets its future; later tasks still run."""
+        span = agent_pool.tracing.span
+        calls = []
+
+        def failing_span(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("tracing broke")
+            return span(*args, **kwargs)
+
+        monkeypatch.setattr(agent_pool.tracing, "span", failing_span)
+        with make_pool(tmp_path, commands_dir) as pool:
+            broken = pool.submit("tester", "check")
+            fine = pool.submit("tester", "check")
+            with pytest.raises(RuntimeError, match="tracing broke"):
+                broken.result(timeout=10)
+            assert fine.result(timeout=10).ok
+
+    def test_launch_latency_savings(self, tmp_path, commands_dir, monkeypatch):
+        """Tasks handed to already warm workers save a whole cold start each."""
+        monkeypatch.setenv("FAKE_AGENT_STARTUP", "0.3")
+        with make_pool(tmp_path, commands_dir, roles=["developer"]) as pool:
+            wait_for(lambda: pool.stats()["worker_starts"] == 1)
+            start = time.monotonic()
+            results = pool.run([("developer", f"task {n}") for n in range(3)])
+            elapsed = time.monotonic() - start
+            stats = pool.stats()
+        assert all(result.startup_wait == 0 for result in results)
+        assert elapsed < 0.3
+        assert stats["cold_start"] >= 0.3
+        assert stats["launch_saved"] == pytest.approx(3 * stats["cold_start"])
+
+
+class TestPoolServer:
+    """Test the resident pool over its socket."""
+
+    def test_submit_and_stats(self, tmp_path, commands_dir):
+        """Tasks submitted by clients run on the server's warm workers."""
+        directory = tempfile.mkdtemp(prefix="ap-")
+        socket_path = Path(directory) / "pool.sock"
+        server = PoolServer(socket_path, make_pool(tmp_path, commands_dir))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with PoolClient.connect(socket_path) as client:
+                first = client.submit("developer", "build")
+                second = client.submit("developer", "test")
+                stats = client.stats()
+            assert first.ok and first.worker_pid == second.worker_pid
+            assert stats["tasks"] == 2 and stats["roles"] == ["developer"]
+        finally:
+            server.shutdown()
+            server.server_close()
+            shutil.rmtree(directory, ignore_errors=True)
+        assert PoolClient.connect(socket_path) is None
+
+    def test_unexpected_errors_are_returned(self, tmp_path, commands_dir, monkeypatch):
+        """A failure outside PoolError is answered, not a dropped connection."""
+        directory = tempfile.mkdtemp(prefix="ap-")
+        socket_path = Path(directory) / "pool.sock"
+        pool = make_pool(tmp_path, commands_dir)
+        server = PoolServer(socket_path, pool)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        def full_disk():
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(pool, "stats", full_disk)
+        try:
+            with PoolClient.connect(socket_path) as client:
+                with pytest.raises(PoolError, match="No space left on device"):
+                    client.stats()
+                assert client.call("ping")["ok"]
+        finally:
+            server.shutdown()
+            server.server_close()
+            shutil.rmtree(directory, ignore_errors=True)
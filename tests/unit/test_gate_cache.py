@@ -0,0 +1,107 @@
+"""
+Tests for the content-addressed quality-gate cache.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.services.gate_cache import GateCache, expand_inputs, run_gate
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """A scratch tree with a couple of source files, used as the cwd."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("print('hi')\n")
+    (tmp_path / "src" / "__pycache__").mkdir()
+    (tmp_path / "src" / "__pycache__" / "app.pyc").write_bytes(b"\0")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def cache(workdir):
+    with GateCache(workdir / ".cache" / "gates") as gate_cache:
+        yield gate_cache
+
+
+class TestGateCache:
+    """Test keys, hits, invalidation and eviction."""
+
+    def test_unchanged_inputs_hit(self, cache, workdir):
+        """A second run on unchanged inputs reuses the stored verdict."""
+        command = "echo ran >> runs.log; exit 3"
+        first = run_gate("Lint", command, ["src"], cache)
+        second = run_gate("Lint", command, ["src"], cache)
+        assert not first.cached and second.cached
+        assert second.exit_code == 3 and not second.passed
+        assert (workdir / "runs.log").read_text() == "ran\n"
+
+    def test_changed_input_misses(self, cache, workdir):
+        """Editing an input file produces a new key."""
+        before = cache.key("Lint", "flake8", ["src"])
+        (workdir / "src" / "app.py").write_text("print('changed')\n")
+        assert cache.key("Lint", "flake8", ["src"]) != before
+        assert cache.key("Lint", "ruff", ["src"]) != cache.key(
+            "Lint", "flake8", ["src"]
+        )
+
+    def test_ignored_directories_are_not_inputs(self, workdir):
+        """Bytecode caches never count as inputs."""
+        assert expand_inputs(["src"]) == [Path("src/app.py")]
+        assert expand_inputs(["src/*.py"]) == [Path("src/app.py")]
+
+    def test_invalidate(self, cache):
+        """Invalidation drops one gate's results or all of them."""
+        run_gate("A", "true", ["src"], cache)
+        run_gate("B", "true", ["src"], cache)
+        assert cache.invalidate("A") == 1
+        assert not run_gate("A", "true", ["src"], cache).cached
+        assert run_gate("B", "true", ["src"], cache).cached
+        assert cache.invalidate() == 2
+        assert cache.stats() == (0, 0)
+
+    def test_lru_eviction(self, workdir):
+        """The least recently used entries go first once bounds are exceeded."""
+        with GateCache(workdir / "lru", max_entries=2) as cache:
+            run_gate("A", "echo a", ["src"], cache)
+            run_gate("B", "echo b", ["src"], cache)
+            run_gate("A", "echo a", ["src"], cache)  # A is now most recent
+            run_gate("C", "echo c", ["src"], cache)
+            assert run_gate("A", "echo a", ["src"], cache).cached
+            assert not run_gate("B", "echo b", ["src"], cache).cached
+
+    def test_size_bound(self, workdir):
+        """Total cached output stays under the byte bound."""
+        with GateCache(workdir / "small", max_bytes=100) as cache:
+            for n in range(5):
+                run_gate(f"G{n}", f"printf '%040d' {n}", ["src"], cache)
+            count, size = cache.stats()
+            assert size <= 100 and count == 2
+
+
+class TestGateCacheCli:
+    """Test the command line used by adaptive-workflow.sh."""
+
+    def test_run_and_invalidate(self, workdir):
+        """The CLI replays cached output and exit codes."""
+        root = Path(__file__).parent.parent.parent
+        env = {**os.environ, "PYTHONPATH": str(root)}
+
+        def cli(*args):
+            return subprocess.run(
+                [sys.executable, "-m", "src.services.gate_cache", *args],
+                capture_output=True,
+                text=True,
+                env=env,
+            )
+
+        first = cli("run", "Scan", "echo scanning; exit 1", "--inputs", "src")
+        second = cli("run", "Scan", "echo scanning; exit 1", "--inputs", "src")
+        assert first.returncode == second.returncode == 1
+        assert "scanning" in second.stdout and "Cached fail" in second.stdout
+        assert "Removed 1" in cli("invalidate", "--gate", "Scan").stdout
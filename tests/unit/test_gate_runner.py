@@ -0,0 +1,71 @@
+"""
+Tests for the concurrent quality-gate runner.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from src.services.gate_runner import GateSpec, run_gates
+
+
+class TestRunGates:
+    """Test concurrency, streaming order and the aggregated verdict."""
+
+    def test_runs_concurrently(self):
+        """Wall time is close to the slowest gate, not the sum."""
+        gates = [GateSpec(f"G{n}", "sleep 0.5") for n in range(4)]
+        start = time.monotonic()
+        report = run_gates(gates, use_cache=False)
+        assert time.monotonic() - start < 1.5
+        assert report.passed and report.serial_time >= 2.0
+
+    def test_results_stream_in_completion_order(self):
+        """Each result is reported as soon as its gate finishes."""
+        seen = []
+        gates = [GateSpec("Slow", "sleep 0.6"), GateSpec("Fast", "exit 1")]
+        report = run_gates(
+            gates, use_cache=False, on_result=lambda r: seen.append(r.gate)
+        )
+        assert seen == ["Fast", "Slow"]
+        assert not report.passed
+        assert [result.gate for result in report.failed] == ["Fast"]
+
+    def test_no_gates(self):
+        """An empty batch passes trivially."""
+        assert run_gates([]).passed
+
+
+class TestGateRunnerCli:
+    """Test the command line used by adaptive-workflow.sh."""
+
+    def test_markers_and_exit_code(self, tmp_path):
+        """Every gate gets a marker line; any failure fails the run."""
+        root = Path(__file__).parent.parent.parent
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "src.services.gate_runner",
+                "--markers",
+                "--no-cache",
+                "--gate",
+                "Design Validation",
+                "echo ok",
+                "",
+                "--gate",
+                "Security Scan",
+                "printf vuln; exit 1",
+                "src",
+            ],
+            capture_output=True,
+            text=True,
+            cwd=tmp_path,
+            env={**os.environ, "PYTHONPATH": str(root)},
+        )
+        assert result.returncode == 1
+        assert "::gate-passed:: Design Validation" in result.stdout
+        assert "vuln\n::gate-failed:: Security Scan" in result.stdout
+        assert "1 of 2 quality gates failed" in result.stdout
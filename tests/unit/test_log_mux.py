@@ -0,0 +1,179 @@
+"""
+Tests for the agent log multiplexer.
+"""
+
+import asyncio
+import io
+import json
+import os
+
+import pytest
+
+from src.services.log_mux import FollowedLog, LogMultiplexer, LogSource, parse_source
+
+
+@pytest.fixture
+def logs(tmp_path):
+    """Two agent logs and their sources."""
+    paths = {name: tmp_path / f"{name}.log" for name in ("arch", "dev")}
+    for path in paths.values():
+        path.write_text("")
+    sources = [
+        LogSource("architect", "ARCH-1", str(paths["arch"])),
+        LogSource("developer", "DEV-1", str(paths["dev"])),
+    ]
+    return paths, sources
+
+
+def append(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+class TestFollowedLog:
+    """Test incremental reads, partial lines and rotation."""
+
+    def test_partial_lines_wait_for_newline(self, tmp_path):
+        """Only complete lines are returned until the file is drained."""
+        path = tmp_path / "a.log"
+        path.write_text("one\ntw")
+        followed = FollowedLog(LogSource("a", "A-1", str(path)))
+        assert followed.poll() == ["one"]
+        append(path, "o\n")
+        assert followed.poll() == ["two"]
+        append(path, "tail")
+        assert followed.poll() == [] and followed.flush() == ["tail"]
+
+    def test_rotation(self, tmp_path):
+        """A replaced file is read from the start after the old one drains."""
+        path = tmp_path / "a.log"
+        path.write_text("old 1\n")
+        followed = FollowedLog(LogSource("a", "A-1", str(path)))
+        assert followed.poll() == ["old 1"]
+        append(path, "old 2\n")
+        os.rename(path, tmp_path / "a.log.1")
+        path.write_text("new 1\n")
+        assert followed.poll() == ["old 2"]
+        assert followed.poll() == ["new 1"]
+
+    def test_truncation(self, tmp_path):
+        """A truncated file is read again from the top."""
+        path = tmp_path / "a.log"
+        path.write_text("a long first line\n")
+        followed = FollowedLog(LogSource("a", "A-1", str(path)))
+        followed.poll()
+        path.write_text("short\n")
+        assert followed.poll() == ["short"]
+
+
+class TestLogMultiplexer:
+    """Test the merged stream."""
+
+    def test_lines_are_prefixed(self, logs):
+        """Each line carries its agent and task ID."""
+        paths, sources = logs
+        out = io.StringIO()
+        mux = LogMultiplexer(lambda: sources, out, from_start=True)
+        mux.refresh()
+        append(paths["arch"], "designing\n")
+        append(paths["dev"], "building\n")
+        assert mux.poll() == 2
+        assert out.getvalue().splitlines() == [
+            "[architect ARCH-1] designing",
+            "[developer DEV-1] building",
+        ]
+
+    def test_json_lines_and_ring_buffer(self, logs):
+        """JSON output is one object per line; buffers keep the newest lines."""
+        paths, sources = logs
+        out = io.StringIO()
+        mux = LogMultiplexer(lambda: sources, out, json_lines=True, buffer_lines=3)
+        mux.refresh()
+        append(paths["dev"], "".join(f"line {n}\n" for n in range(10)))
+        mux.poll()
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert len(records) == 10 and records[0]["task_id"] == "DEV-1"
+        assert mux.tail("DEV-1") == ["line 7", "line 8", "line 9"]
+
+    def test_existing_logs_are_tailed_new_ones_read_whole(self, logs, tmp_path):
+        """Start-up logs begin at their end; agents found later from the top."""
+        paths, sources = logs
+        append(paths["arch"], "old output\n")
+        later = tmp_path / "test.log"
+        later.write_text("first words\n")
+        found = list(sources)
+        out = io.StringIO()
+        mux = LogMultiplexer(lambda: found, out)
+        mux.refresh()
+        found.append(LogSource("tester", "TEST-1", str(later)))
+        mux.refresh()
+        mux.poll()
+        assert out.getvalue() == "[tester TEST-1] first words\n"
+
+    def test_quiet_logs_back_off(self, logs):
+        """Idle logs are polled less and less often."""
+        _, sources = logs
+        mux = LogMultiplexer(lambda: sources[:1], io.StringIO(), interval=0.1)
+        mux.refresh()
+        for now in range(5):
+            mux.poll(now=float(now * 10))
+        followed = next(iter(mux.logs.values()))
+        assert followed.next_poll - 40.0 == pytest.approx(2.0)
+
+    def test_run_until_agents_finish(self, logs):
+        """With exit_when_done the loop stops and drains once nothing is active."""
+        paths, sources = logs
+        append(paths["arch"], "done")
+        finished = [source._replace(active=False) for source in sources]
+        out = io.StringIO()
+        mux = LogMultiplexer(lambda: finished, out, from_start=True, interval=0.01)
+        asyncio.run(mux.run(exit_when_done=True))
+        assert out.getvalue() == "[architect ARCH-1] done\n"
+
+    def test_finished_logs_are_closed(self, logs):
+        """A log inactive for a whole refresh cycle is drained and dropped."""
+        paths, sources = logs
+        found = list(sources)
+        out = io.StringIO()
+        mux = LogMultiplexer(lambda: found, out, from_start=True)
+        mux.refresh()
+        followed = mux.logs[str(paths["dev"])]
+        found[1] = found[1]._replace(active=False)
+        mux.refresh()
+        assert str(paths["dev"]) in mux.logs
+        append(paths["dev"], "last words\nno newline")
+        mux.refresh()
+        assert list(mux.logs) == [str(paths["arch"])]
+        assert followed.file is None
+        assert out.getvalue().splitlines() == [
+            "[developer DEV-1] last words",
+            "[developer DEV-1] no newline",
+        ]
+        mux.refresh()
+        assert list(mux.logs) == [str(paths["arch"])]
+
+    def test_restarted_task_resumes_its_log(self, logs):
+        """A retired log that becomes active again continues where it stopped."""
+        paths, sources = logs
+        append(paths["dev"], "first run\n")
+        found = [sources[1]._replace(active=False)]
+        out = io.StringIO()
+        mux = LogMultiplexer(lambda: found, out, from_start=True)
+        mux.refresh()
+        mux.poll()
+        mux.refresh()
+        assert mux.logs == {}
+        append(paths["dev"], "second run\n")
+        found[0] = found[0]._replace(active=True)
+        mux.refresh()
+        mux.poll()
+        assert out.getvalue().splitlines() == [
+            "[developer DEV-1] first run",
+            "[developer DEV-1] second run",
+        ]
+
+    def test_parse_source(self):
+        """Sources are given as agent:TASK-ID=path."""
+        assert parse_source("dev:DEV-1=/tmp/d.log") == LogSource(
+            "dev", "DEV-1", "/tmp/d.log"
+        )
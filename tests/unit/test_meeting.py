@@ -0,0 +1,139 @@
+"""
+Tests for the multi-agent meeting engine.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services.meeting import (
+    MEETING_DIR,
+    Meeting,
+    MeetingEngine,
+    MeetingError,
+    Transcript,
+    Turn,
+    compact,
+    load_meeting,
+)
+from src.services.scheduler import Scheduler
+
+FAKE_AGENT = Path(__file__).parent.parent / "stubs" / "fake_agent.py"
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """A quiet engine whose agents are the fake agent."""
+    monkeypatch.setenv("CLAUDE_CMD", f"{sys.executable} {FAKE_AGENT}")
+    monkeypatch.setenv("FAKE_AGENT_LOG", str(tmp_path / "runs.jsonl"))
+    scheduler = Scheduler(max_workers=4, log_dir=tmp_path)
+    return MeetingEngine(scheduler, context_chars=1000, verbose=False)
+
+
+def runs(tmp_path):
+    """The fake agent's run records, keyed by the first word of the prompt."""
+    lines = (tmp_path / "runs.jsonl").read_text().splitlines()
+    return {json.loads(line)["prompt"].split()[0]: json.loads(line) for line in lines}
+
+
+class TestTranscript:
+    """Test transcript compaction."""
+
+    def test_compact_keeps_short_text(self):
+        """Short answers only lose blank lines."""
+        assert compact("Plan:\n\n- ship it\n", 100) == "Plan: - ship it"
+
+    def test_compact_elides_the_middle(self):
+        """Long answers keep their opening and conclusion within the limit."""
+        text = "Opening. " + "filler " * 500 + "Conclusion."
+        short = compact(text, 200)
+        assert len(short) <= 200
+        assert short.startswith("Opening.") and short.endswith("Conclusion.")
+
+    def test_budget_is_shared(self):
+        """The whole context stays near the budget however many speakers."""
+        transcript = Transcript()
+        for n in range(8):
+            transcript.add(f"Agent {n}", "word " * 1000)
+        assert len(transcript.compacted(2000)) < 2000 + 8 * 20
+
+
+class TestMeetingDefinitions:
+    """Test loading the built-in meeting types."""
+
+    def test_builtin_meetings_load(self):
+        """Every definition parses and names its file."""
+        paths = sorted(MEETING_DIR.glob("*.json"))
+        assert len(paths) == 7
+        for path in paths:
+            assert load_meeting(str(path)).name == path.stem
+
+    def test_planning_inputs_share_a_round(self):
+        """Product, Developer and Tester input run together before the summary."""
+        rounds = load_meeting("planning").rounds
+        assert [t.agent for t in rounds[1]] == ["product", "developer", "tester"]
+        assert [t.agent for t in rounds[-1]] == ["scrum"]
+
+    def test_invalid_definitions(self):
+        """Unknown types and malformed definitions are errors."""
+        with pytest.raises(MeetingError, match="Unknown meeting type"):
+            load_meeting("no-such-meeting")
+        with pytest.raises(MeetingError, match="missing"):
+            Meeting.from_dict({"rounds": [{"turns": [{"agent": "x"}]}]})
+        with pytest.raises(MeetingError, match="at least one turn"):
+            Meeting("empty", [[]])
+
+
+class TestMeetingEngine:
+    """Test running meetings with the fake agent."""
+
+    def test_round_runs_concurrently(self, engine, tmp_path):
+        """Turns in a round overlap; the summary waits for all of them."""
+        meeting = Meeting(
+            "m",
+            [
+                [
+                    Turn("product", "product sleep=0.5 {topic}"),
+                    Turn("developer", "developer sleep=0.5 {topic}"),
+                    Turn("tester", "tester sleep=0.5 {topic}"),
+                ],
+                [Turn("scrum", "summary {topic}")],
+            ],
+        )
+        start = time.monotonic()
+        run = engine.run(meeting, "auth")
+        assert run.ok and time.monotonic() - start < 1.4
+        records = runs(tmp_path)
+        assert records["summary"]["start"] >= max(
+            records[agent]["end"] for agent in ("product", "developer", "tester")
+        )
+
+    def test_later_turns_see_the_transcript(self, engine, tmp_path):
+        """Each turn's prompt carries the earlier contributions, compacted."""
+        meeting = Meeting(
+            "m",
+            [
+                [Turn("architect", "design {topic}")],
+                [Turn("architect", "adr {topic}", speaker="Architect (ADR)")],
+            ],
+        )
+        run = engine.run(meeting, "caching")
+        prompt = runs(tmp_path)["adr"]["prompt"]
+        assert "The meeting so far" in prompt
+        assert "- Architect: fake agent" in prompt and "design caching" in prompt
+        assert [speaker for speaker, _ in run.transcript.entries] == [
+            "Architect",
+            "Architect (ADR)",
+        ]
+
+    def test_failed_turn_does_not_stop_the_meeting(self, engine):
+        """A failing participant is noted and the meeting continues."""
+        meeting = Meeting(
+            "m", [[Turn("developer", "dev exit=3")], [Turn("scrum", "summary")]]
+        )
+        run = engine.run(meeting, "x")
+        assert not run.ok and len(run.results) == 2
+        assert run.transcript.entries[0] == ("Developer", "(no contribution)")
@@ -0,0 +1,198 @@
+"""
+Tests for the deduplicated, dependency-ordered remediation queue.
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.services.remediation import (
+    PLAYBOOKS,
+    RemediationError,
+    RemediationQueue,
+    print_items,
+)
+from src.services.scheduler import Scheduler
+from src.services.workflow import WorkflowEngine
+
+ROOT = Path(__file__).parent.parent.parent
+FAKE_AGENT = ROOT / "tests" / "stubs" / "fake_agent.py"
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """An empty queue in a temporary state directory."""
+    with RemediationQueue(tmp_path / "state", max_attempts=2) as queue:
+        yield queue
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """A quiet engine that runs items with the fake agent."""
+    monkeypatch.setenv("CLAUDE_CMD", f"{sys.executable} {FAKE_AGENT}")
+    (tmp_path / "agent-state").mkdir()
+    monkeypatch.setenv("FAKE_AGENT_STATE", str(tmp_path / "agent-state"))
+    scheduler = Scheduler(max_workers=4, log_dir=tmp_path / "logs")
+    return WorkflowEngine(max_parallel=4, scheduler=scheduler, verbose=False)
+
+
+def statuses(queue):
+    return {(item.agent, item.issue): item.status for item in queue.items()}
+
+
+class FailingConnection:
+    """Wraps a connection; the second INSERT fails like a full disk."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.inserts = 0
+
+    def execute(self, sql, *args):
+        if sql.startswith("INSERT"):
+            self.inserts += 1
+            if self.inserts == 2:
+                raise sqlite3.OperationalError("database or disk is full")
+        return self.conn.execute(sql, *args)
+
+
+class TestRemediationQueue:
+    """Test deduplication, ordering and the shrinking execution loops."""
+
+    def test_repeated_reports_merge(self, queue):
+        """The same issue for the same target is queued once."""
+        assert queue.add("testing", "Code Coverage", "coverage 70%") == (4, 0)
+        assert queue.add("testing", "Code Coverage", "coverage 72%") == (0, 4)
+        assert queue.add("testing", "Final Quality Check") == (4, 0)
+        items = queue.items()
+        assert len(items) == 8
+        tester = items[0]
+        assert (tester.agent, tester.target, tester.reports) == (
+            "tester",
+            "Code Coverage",
+            2,
+        )
+        assert tester.feedback == "coverage 72%"
+        with pytest.raises(RemediationError, match="Unknown issue type"):
+            queue.add("flaky", "Code Coverage")
+
+    def test_failed_add_queues_nothing(self, queue):
+        """An add that fails part-way is rolled back, not half committed."""
+        conn = queue.conn
+        queue.conn = FailingConnection(conn)
+        with pytest.raises(sqlite3.OperationalError):
+            queue.add("testing", "Code Coverage")
+        queue.conn = conn
+        assert queue.items() == []
+        assert queue.add("testing", "Code Coverage") == (4, 0)
+
+    def test_plan_orders_by_dependency_then_priority(self, queue):
+        """Prerequisites come first; security work starts ahead of testing."""
+        queue.add("testing", "Code Coverage")
+        queue.add("security", "Security Scan")
+        workflow, blocked = queue.plan()
+        assert blocked == []
+        labels = [
+            [workflow.steps[s].label.rsplit(" (", 1)[0] for s in wave]
+            for wave in workflow.levels()
+        ]
+        assert labels[0] == [
+            "Reviewer: Conduct security audit",
+            "Tester: Expand test coverage",
+            "MLOps: Add performance benchmarks (if applicable)",
+        ]
+        assert labels[-1] == [
+            "Tester: Security regression tests",
+            "Reviewer: Validate test completeness",
+        ]
+        assert sum(len(wave) for wave in labels) == 2 * len(PLAYBOOKS["testing"])
+
+    def test_each_loop_runs_less_than_the_last(self, queue, engine):
+        """A failed item is retried with the items it held up, and only those."""
+        queue.add("testing", "Code Coverage")
+        queue.add("security", "Security Scan", "fail-first=1")
+        reports = queue.drain(engine)
+        # Each security item fails its first run, releasing its dependents
+        assert [report.size for report in reports] == [8, 4, 3, 1]
+        assert (reports[0].count("passed"), reports[0].count("failed")) == (4, 1)
+        assert set(statuses(queue).values()) == {"done"}
+        assert queue.drain(engine) == []
+
+    def test_exhausted_items_block_their_dependents(self, queue, engine):
+        """An item out of attempts stops the loops and blocks what needs it."""
+        queue.add("testing", "Code Coverage")
+        queue.add("security", "Security Scan", "exit=1")
+        reports = queue.drain(engine)
+        assert [report.size for report in reports] == [8, 4]
+        assert statuses(queue) == {
+            ("reviewer", "security"): "failed",
+            ("developer", "security"): "blocked",
+            ("devops", "security"): "blocked",
+            ("tester", "security"): "blocked",
+            **{(agent, "testing"): "done" for agent, _, _ in PLAYBOOKS["testing"]},
+        }
+
+        # A new report reopens finished items with attempts left, not failed ones
+        queue.add("testing", "Code Coverage")
+        queue.add("security", "Security Scan")
+        assert statuses(queue)[("tester", "testing")] == "pending"
+        assert statuses(queue)[("reviewer", "security")] == "failed"
+        assert [report.size for report in queue.drain(engine)] == [4]
+
+    def test_showing_the_queue_changes_nothing(self, queue, capsys):
+        """Blocked items are computed for display and only stored by a run."""
+        queue.add("security", "Security Scan")
+        queue.conn.execute(
+            "UPDATE items SET status = 'failed', attempts = 2 WHERE agent = 'reviewer'"
+        )
+        print_items(queue, show_all=False)
+        assert capsys.readouterr().out.splitlines() == [
+            "❌ Reviewer: Conduct security audit (Security Scan) [failed]",
+            "⛔ Developer: Implement security fixes (Security Scan) [blocked]",
+            "⛔ DevOps: Update security configurations (Security Scan) [blocked]",
+            "⛔ Tester: Security regression tests (Security Scan) [blocked]",
+            "✅ No remediation pending",
+        ]
+        assert list(statuses(queue).values()).count("pending") == 3
+        _, blocked = queue.plan()
+        assert len(blocked) == 3
+        assert list(statuses(queue).values()).count("pending") == 3
+
+        assert queue.run_loop(engine=None) is None
+        assert list(statuses(queue).values()).count("blocked") == 3
+
+    def test_workflow_queues_remediation(self, tmp_path):
+        """add_remediation_steps queues each issue's steps once per request."""
+        script = f"""
+            cd "{ROOT}"
+            eval "$(sed -n '/^function add_remediation_steps()/,/^}}/p' \\
+                scripts/adaptive-workflow.sh)"
+            INITIAL_REQUEST="search page"
+            add_remediation_steps security "Secrets in config" "Security Scan"
+            add_remediation_steps testing "Coverage too low" "Code Coverage"
+            INITIAL_REQUEST="user auth"
+            add_remediation_steps testing "Coverage too low" "Code Coverage"
+            add_remediation_steps testing "Coverage too low" "Code Coverage"
+            echo -e "$ADDITIONAL_STEPS"
+        """
+        env = dict(os.environ, REMEDIATION_CACHE_DIR=str(tmp_path))
+        result = subprocess.run(
+            ["bash", "-c", script], capture_output=True, text=True, env=env
+        )
+        steps = [line for line in result.stdout.splitlines() if line.startswith("- ")]
+        assert steps == [
+            "- Tester: Expand test coverage (Code Coverage)",
+            "- Developer: Fix failing tests (Code Coverage)",
+            "- MLOps: Add performance benchmarks (if applicable) (Code Coverage)",
+            "- Reviewer: Validate test completeness (Code Coverage)",
+        ]
+        queued = [line for line in result.stdout.splitlines() if "Queued" in line]
+        assert [line.split(",")[1] for line in queued] == [
+            " 0 already queued",
+            " 0 already queued",
+            " 0 already queued",
+            " 4 already queued",
+        ]
@@ -0,0 +1,167 @@
+"""
+Tests for incremental, diff-scoped review checkpoints.
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.services.review import IncrementalReviewer
+
+ROOT = Path(__file__).parent.parent.parent
+REVIEWER = f"{sys.executable} {ROOT / 'tests' / 'stubs' / 'fake_reviewer.py'}"
+
+
+def git(*args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A git work tree with two committed modules and a reviewer log."""
+    work = tmp_path / "work"
+    work.mkdir()
+    monkeypatch.chdir(work)
+    git("init", "-q")
+    Path(".gitignore").write_text(".cache/\n")
+    Path("auth.py").write_text("def login():\n    pass\n")
+    Path("api.py").write_text("def routes():\n    return []\n")
+    git("add", ".")
+    git("commit", "-qm", "initial")
+    monkeypatch.setenv("FAKE_REVIEWER_LOG", str(tmp_path / "reviews.jsonl"))
+    return work
+
+
+def sent(repo):
+    """Files sent to the reviewer since the last call, with their diffs."""
+    log = repo.parent / "reviews.jsonl"
+    if not log.exists():
+        return {}
+    records = [json.loads(line) for line in log.read_text().splitlines()]
+    log.unlink()
+    return {record["file"]: record["diff"] for record in records}
+
+
+class FailingConnection:
+    """Wraps a connection; clearing verdicts fails like a full disk."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, *args):
+        if sql.startswith("DELETE FROM verdicts"):
+            raise sqlite3.OperationalError("database or disk is full")
+        return self.conn.execute(sql, *args)
+
+
+class TestIncrementalReview:
+    """Test diff-scoped reviews, memoized verdicts and approved trees."""
+
+    def test_second_pass_reviews_only_the_fix(self, repo):
+        """After a small fix only the fixed file goes back to the reviewer."""
+        Path("auth.py").write_text("def login():\n    return check()  # TODO\n")
+        Path("api.py").write_text("def routes():\n    return ['/login']\n")
+        with IncrementalReviewer(REVIEWER, repo / ".cache") as reviewer:
+            first = reviewer.checkpoint("Implementation")
+            assert not first.passed
+            assert sorted(sent(repo)) == ["api.py", "auth.py"]
+            assert "Unfinished work" in first.files[1].output
+
+            Path("auth.py").write_text("def login():\n    return check()\n")
+            second = reviewer.checkpoint("Implementation")
+            assert second.passed
+            assert list(sent(repo)) == ["auth.py"]
+            assert [r.path for r in second.memoized] == ["api.py"]
+            assert reviewer.approved("Implementation") == second.tree
+
+    def test_approved_tree_scopes_the_next_diff(self, repo):
+        """Once approved, a phase is only shown hunks made after approval."""
+        Path("auth.py").write_text("def login():\n    return check()\n")
+        with IncrementalReviewer(REVIEWER, repo / ".cache") as reviewer:
+            assert reviewer.checkpoint("Implementation").passed
+            sent(repo)
+
+            unchanged = reviewer.checkpoint("Implementation")
+            assert unchanged.passed and unchanged.files == []
+            assert sent(repo) == {}
+
+            Path("auth.py").write_text("def login():\n    return check(strict=True)\n")
+            assert reviewer.checkpoint("Implementation").passed
+            diff = sent(repo)["auth.py"]
+            assert "-    return check()" in diff
+            assert "-    pass" not in diff
+
+    def test_failed_approval_records_nothing(self, repo):
+        """An approval that fails part-way is rolled back, not half-written."""
+        Path("auth.py").write_text("def login():\n    return check()\n")
+        with IncrementalReviewer(REVIEWER, repo / ".cache") as reviewer:
+            conn = reviewer.conn
+            reviewer.conn = FailingConnection(conn)
+            with pytest.raises(sqlite3.OperationalError):
+                reviewer.checkpoint("Implementation")
+            reviewer.conn = conn
+            assert reviewer.approvals() == []
+            sent(repo)
+            report = reviewer.checkpoint("Implementation")
+            assert [r.path for r in report.memoized] == ["auth.py"]
+            assert reviewer.approved("Implementation") == report.tree
+
+    def test_phases_and_inputs_are_independent(self, repo):
+        """Each phase keeps its own approval and only sees its inputs."""
+        Path("auth.py").write_text("def login():\n    return True\n")
+        Path("api.py").write_text("def routes():\n    return ['/']\n")
+        with IncrementalReviewer(REVIEWER, repo / ".cache") as reviewer:
+            report = reviewer.checkpoint("Architecture", ["api.py"])
+            assert [r.path for r in report.files] == ["api.py"]
+            report = reviewer.checkpoint("Implementation")
+            assert len(report.reviewed) == 2
+
+    def test_snapshot_leaves_the_index_alone(self, repo):
+        """Snapshotting the work tree never stages anything."""
+        Path("new.py").write_text("x = 1\n")
+        with IncrementalReviewer(REVIEWER, repo / ".cache") as reviewer:
+            report = reviewer.checkpoint("Implementation")
+        assert [(r.status, r.path) for r in report.files] == [("A", "new.py")]
+        status = subprocess.run(
+            ["git", "status", "--porcelain"], capture_output=True, text=True
+        ).stdout
+        assert status == "?? new.py\n"
+
+    def test_state_dir_is_never_reviewed(self, repo):
+        """The reviewer's own database is left out even when not ignored."""
+        Path("api.py").write_text("def routes():\n    return ['/']\n")
+        with IncrementalReviewer(REVIEWER, repo / "state") as reviewer:
+            report = reviewer.checkpoint("Implementation")
+        assert [r.path for r in report.files] == ["api.py"]
+
+    def test_workflow_checkpoint_uses_reviewer(self, repo):
+        """review_checkpoint sends changes to $REVIEW_CMD when it is set."""
+        Path("auth.py").write_text("# TODO: rate limiting\n")
+        script = f"""
+            cd "{repo}"
+            eval "$(sed -n '/^function review_checkpoint()/,/^}}/p' \\
+                "{ROOT}/scripts/adaptive-workflow.sh")"
+            trace_start() {{ :; }}; trace_end() {{ :; }}
+            review_checkpoint Implementation "login"; echo "status=$?"
+        """
+        env = dict(
+            os.environ,
+            REVIEW_CMD=REVIEWER,
+            PYTHONPATH=str(ROOT),
+            REVIEW_CACHE_DIR=str(repo / ".cache"),
+        )
+        result = subprocess.run(
+            ["bash", "-c", script], capture_output=True, text=True, env=env
+        )
+        assert "status=1" in result.stdout
+        assert "Unfinished work: # TODO: rate limiting" in result.stdout
+        assert list(sent(repo)) == ["auth.py"]
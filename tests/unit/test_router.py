@@ -0,0 +1,81 @@
+"""
+Tests for the keyword triage router.
+"""
+
+import io
+import json
+import random
+
+import pytest
+
+from src.services.router import (
+    KeywordAutomaton,
+    RouterError,
+    Rule,
+    TriageRouter,
+    load_router,
+    route_batch,
+)
+
+
+class TestKeywordAutomaton:
+    """Test Aho-Corasick matching against plain substring checks."""
+
+    def test_overlapping_keywords(self):
+        """Keywords found through failure links are reported too."""
+        automaton = KeywordAutomaton([("he", 0), ("she", 1), ("hers", 2), ("x", 3)])
+        assert automaton.matches("ushers") == {0, 1, 2}
+        assert automaton.matches("nothing here") == {0}
+
+    def test_matches_brute_force(self):
+        """Random keywords and texts agree with ``keyword in text``."""
+        rng = random.Random(7)
+        keywords = ["".join(rng.choices("abc", k=rng.randint(1, 4))) for _ in range(30)]
+        automaton = KeywordAutomaton((kw, i) for i, kw in enumerate(keywords))
+        for _ in range(200):
+            text = "".join(rng.choices("abcd", k=rng.randint(0, 20)))
+            expected = {i for i, kw in enumerate(keywords) if kw in text}
+            assert automaton.matches(text) == expected
+
+    def test_empty_keyword_rejected(self):
+        """An empty keyword would match everything, so it is an error."""
+        with pytest.raises(RouterError):
+            KeywordAutomaton([("", 0)])
+
+
+class TestTriageRouter:
+    """Test routing decisions."""
+
+    def test_analyze_rules(self):
+        """The shipped rules match case-sensitively, in rule order."""
+        router = load_router("analyze")
+        agents = [r.agent for r in router.route("implement the API and deploy it")]
+        assert agents == ["reviewer", "devops", "architect", "developer"]
+        assert [r.agent for r in router.route("IMPLEMENT")] == ["reviewer"]
+
+    def test_reviewer_always_first(self):
+        """The Reviewer is suggested even when the rules leave it out."""
+        router = TriageRouter([Rule("tester", "Tester", ["test"])])
+        rules = router.route("nothing relevant")
+        assert [r.agent for r in rules] == ["reviewer"]
+        assert "(ALWAYS)" in rules[0].label
+
+    def test_malformed_rules(self, tmp_path):
+        """Rule files without keywords are rejected."""
+        path = tmp_path / "bad.json"
+        path.write_text(json.dumps({"rules": [{"agent": "x", "label": "X"}]}))
+        with pytest.raises(RouterError, match="Malformed"):
+            load_router(str(path))
+        with pytest.raises(RouterError, match="not found"):
+            load_router("no-such-rules")
+
+    def test_batch(self):
+        """Batch mode writes one JSON line per request and counts agents."""
+        source = io.StringIO("write docs\n\ntrain a model\n")
+        out = io.StringIO()
+        summary = route_batch(load_router(), source, out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [r["line"] for r in records] == [1, 3]
+        assert records[1]["agents"] == ["reviewer", "mlops"]
+        assert summary["requests"] == 2
+        assert summary["agents"] == {"reviewer": 2, "documentation": 1, "mlops": 1}
@@ -0,0 +1,144 @@
+"""
+Tests for the bounded agent scheduler.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services import scheduler as scheduler_module
+from src.services.scheduler import AgentTask, Scheduler, parse_tasks
+
+FAKE_AGENT = Path(__file__).parent.parent / "stubs" / "fake_agent.py"
+
+
+@pytest.fixture
+def fake_agent(tmp_path, monkeypatch):
+    """Route agent commands to the fake agent and return its run log."""
+    state = tmp_path / "state"
+    state.mkdir()
+    run_log = tmp_path / "runs.jsonl"
+    monkeypatch.setenv("CLAUDE_CMD", f"{sys.executable} {FAKE_AGENT}")
+    monkeypatch.setenv("FAKE_AGENT_STATE", str(state))
+    monkeypatch.setenv("FAKE_AGENT_LOG", str(run_log))
+    return run_log
+
+
+def runs(run_log):
+    return [json.loads(line) for line in run_log.read_text().splitlines()]
+
+
+class TestParseTasks:
+    """Test agent:task parsing."""
+
+    def test_pairs_are_split(self):
+        """Pairs split on the first colon; blanks are skipped."""
+        tasks = parse_tasks("architect:design API: v2,developer:build,")
+        assert tasks == [
+            AgentTask("architect", "design API: v2"),
+            AgentTask("developer", "build"),
+        ]
+        assert tasks[0].prompt.startswith(
+            "You are the Architect Agent. First run /architect"
+        )
+
+    def test_prompt_uses_agent_display_name(self):
+        """Agents with an irregular display name are introduced by it."""
+        [task] = parse_tasks("devops:deploy")
+        assert task.prompt.startswith("You are the DevOps Agent. First run /devops")
+
+    def test_missing_agent_rejected(self):
+        """An empty agent name is an error."""
+        with pytest.raises(ValueError):
+            parse_tasks(":do something")
+
+
+class TestScheduler:
+    """Test concurrency, exit codes, timeouts and retries."""
+
+    def test_concurrency_is_capped(self, fake_agent, tmp_path):
+        """No more than max_workers agents overlap."""
+        tasks = [AgentTask(f"agent{n}", f"work {n} sleep=0.3") for n in range(6)]
+        results = Scheduler(max_workers=2, log_dir=tmp_path).run(tasks)
+        assert all(result.ok for result in results)
+        events = sorted(
+            [(r["start"], 1) for r in runs(fake_agent)]
+            + [(r["end"], -1) for r in runs(fake_agent)]
+        )
+        running = peak = 0
+        for _, delta in events:
+            running += delta
+            peak = max(peak, running)
+        assert peak == 2
+
+    def test_exit_codes_are_collected(self, fake_agent, tmp_path):
+        """Each result carries its own exit code, in input order."""
+        tasks = [AgentTask("a", "ok"), AgentTask("b", "boom exit=3")]
+        results = Scheduler(max_workers=2, log_dir=tmp_path).run(tasks)
+        assert [r.exit_code for r in results] == [0, 3]
+        assert "fake agent" in results[1].log_path.read_text()
+
+    def test_timeout_kills_agent(self, fake_agent, tmp_path):
+        """Attempts that run past the timeout are killed and reported."""
+        start = time.monotonic()
+        [result] = Scheduler(timeout=0.5, log_dir=tmp_path).run(
+            [AgentTask("a", "sleep=30")]
+        )
+        assert result.timed_out and not result.ok
+        assert time.monotonic() - start < 10
+
+    def test_failures_are_retried_with_backoff(self, fake_agent, tmp_path):
+        """A flaky task succeeds on retry; a broken one exhausts its retries."""
+        scheduler = Scheduler(retries=2, backoff=0.2, log_dir=tmp_path)
+        flaky, broken = scheduler.run(
+            [AgentTask("a", "flaky fail-first=1"), AgentTask("b", "broken exit=2")]
+        )
+        assert flaky.ok and flaky.attempts == 2
+        assert broken.exit_code == 2 and broken.attempts == 3
+        assert broken.duration >= 0.1 + 0.2
+        assert "--- attempt 3 ---" in broken.log_path.read_text()
+
+    def test_cancel_during_launch_kills_agent(self, fake_agent, tmp_path, monkeypatch):
+        """An agent started just as the run is cancelled does not outlive it."""
+        scheduler = Scheduler(log_dir=tmp_path)
+        popen = subprocess.Popen
+
+        def cancelled_while_starting(*args, **kwargs):
+            proc = popen(*args, **kwargs)
+            scheduler.cancel()
+            return proc
+
+        monkeypatch.setattr(
+            scheduler_module.subprocess, "Popen", cancelled_while_starting
+        )
+        start = time.monotonic()
+        [result] = scheduler.run([AgentTask("a", "sleep=30")])
+        assert not result.ok and result.attempts == 1
+        assert time.monotonic() - start < 10
+
+    def test_missing_command(self, tmp_path, monkeypatch):
+        """An agent CLI that cannot be started fails with exit code 127."""
+        monkeypatch.setenv("CLAUDE_CMD", str(tmp_path / "no-such-cli"))
+        [result] = Scheduler(log_dir=tmp_path).run([AgentTask("a", "x")])
+        assert result.exit_code == 127
+
+
+class TestOrchestrateParallel:
+    """Test the orchestrate.sh parallel mode end to end."""
+
+    def test_parallel_reports_failures(self, fake_agent):
+        """The script's exit status reflects failed tasks."""
+        result = subprocess.run(
+            ["bash", "scripts/orchestrate.sh", "parallel", "a:ok,b:bad exit=4"],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "ORCHESTRATE_RETRIES": "0"},
+        )
+        assert result.returncode == 1
+        assert "✅ a finished" in result.stdout
+        assert "❌ b failed (exit 4" in result.stdout
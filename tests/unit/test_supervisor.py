@@ -0,0 +1,191 @@
+"""
+Tests for the headless agent supervisor.
+"""
+
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services.admission import AdmissionController
+from src.services.supervisor import (
+    Supervisor,
+    SupervisorClient,
+    SupervisorError,
+    SupervisorServer,
+)
+
+FAKE_AGENT = Path(__file__).parent.parent / "stubs" / "fake_agent.py"
+
+
+def fake(prompt):
+    """Command line running the fake agent with ``prompt``."""
+    return [sys.executable, str(FAKE_AGENT), "-p", prompt]
+
+
+def wait_for(predicate, timeout=10.0):
+    """Poll until ``predicate()`` is true."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting"
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def supervisor(tmp_path):
+    supervisor = Supervisor(log_dir=tmp_path)
+    yield supervisor
+    supervisor.cancel_all()
+
+
+@pytest.fixture
+def socket_path():
+    """A short socket path (AF_UNIX paths are limited to ~100 bytes)."""
+    directory = tempfile.mkdtemp(prefix="sv-")
+    yield Path(directory) / "supervisor.sock"
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def server(supervisor, socket_path):
+    """A supervisor server running in a background thread."""
+    server = SupervisorServer(socket_path, supervisor)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestSupervisor:
+    """Test the registry, exit codes, cancel and restart."""
+
+    def test_exit_codes_are_recorded(self, supervisor):
+        """Each task's PID, exit code and log are tracked."""
+        supervisor.spawn("developer", "DEV-1", fake("build exit=3"))
+        supervisor.spawn("tester", "TEST-1", fake("test"))
+        wait_for(lambda: supervisor.running() == 0)
+        dev = supervisor.status("DEV-1")
+        assert dev["status"] == "failed" and dev["exit_code"] == 3
+        assert supervisor.status("TEST-1")["status"] == "exited"
+        assert "fake agent" in Path(dev["log_path"]).read_text()
+        assert [a["task_id"] for a in supervisor.list()] == ["DEV-1", "TEST-1"]
+
+    def test_cancel_targets_one_task(self, supervisor):
+        """Cancelling a task leaves the other agents running."""
+        supervisor.spawn("architect", "ARCH-1", fake("design sleep=30"))
+        supervisor.spawn("developer", "DEV-1", fake("build sleep=30"))
+        assert supervisor.cancel("ARCH-1")["status"] == "cancelled"
+        wait_for(lambda: supervisor.status("ARCH-1")["exit_code"] is not None)
+        assert supervisor.status("DEV-1")["status"] == "running"
+
+    def test_restart(self, supervisor):
+        """A restarted task gets a new process and keeps its log."""
+        first = supervisor.spawn("developer", "DEV-1", fake("build sleep=30"))
+        second = supervisor.restart("DEV-1")
+        assert second["pid"] != first["pid"] and second["restarts"] == 1
+        assert second["status"] == "running"
+        assert second["log_path"] == first["log_path"]
+
+    def test_duplicate_and_unknown_tasks(self, supervisor):
+        """A running task can't be spawned twice; unknown IDs are errors."""
+        supervisor.spawn("developer", "DEV-1", fake("build sleep=30"))
+        with pytest.raises(SupervisorError, match="already running"):
+            supervisor.spawn("developer", "DEV-1", fake("build"))
+        with pytest.raises(SupervisorError, match="Unknown task"):
+            supervisor.status("NOPE-1")
+
+    def test_missing_command_fails_cleanly(self, supervisor):
+        """An agent that can't start is recorded as failed with exit 127."""
+        info = supervisor.spawn("developer", "DEV-1", ["/nonexistent/agent"])
+        assert info["status"] == "failed" and info["exit_code"] == 127
+
+    def test_event_feed(self, supervisor):
+        """Starts, exits and cancels appear in order with sequence numbers."""
+        supervisor.spawn("developer", "DEV-1", fake("build"))
+        supervisor.spawn("tester", "TEST-1", fake("test sleep=30"))
+        wait_for(lambda: supervisor.status("DEV-1")["status"] == "exited")
+        supervisor.cancel("TEST-1")
+        wait_for(lambda: len(supervisor.events()) == 4)
+        events = supervisor.events()
+        assert [e["seq"] for e in events] == [1, 2, 3, 4]
+        assert ("TEST-1", "cancelled") in [(e["task_id"], e["event"]) for e in events]
+        assert supervisor.events(since=4) == []
+
+
+class TestSupervisorServer:
+    """Test the socket API."""
+
+    def test_client_round_trip(self, server, socket_path):
+        """Spawn, status, list, cancel and restart go through the socket."""
+        with SupervisorClient.connect(socket_path) as client:
+            info = client.spawn("architect", "ARCH-1", fake("design sleep=30"))
+            assert client.status("ARCH-1")["pid"] == info["pid"]
+            assert len(client.list()) == 1
+            assert client.restart("ARCH-1")["restarts"] == 1
+            assert client.cancel("ARCH-1")["status"] == "cancelled"
+            with pytest.raises(SupervisorError, match="Unknown task"):
+                client.cancel("NOPE-1")
+
+    def test_unexpected_errors_are_returned(self, server, socket_path, monkeypatch):
+        """A failure outside SupervisorError is answered, not a dropped socket."""
+
+        def full_disk():
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(server.supervisor, "list", full_disk)
+        with SupervisorClient.connect(socket_path) as client:
+            with pytest.raises(SupervisorError, match="No space left on device"):
+                client.list()
+            assert client.call("ping")["ok"]
+
+    def test_watch_streams_events(self, server, socket_path):
+        """A watcher sees events as they happen."""
+        with SupervisorClient.connect(socket_path) as watcher:
+            feed = watcher.watch()
+            with SupervisorClient.connect(socket_path) as client:
+                client.spawn("developer", "DEV-1", fake("build exit=2"))
+            started = next(feed)
+            exited = next(feed)
+        assert (started["event"], exited["event"]) == ("started", "exited")
+        assert exited["exit_code"] == 2
+
+
+class TestAdmission:
+    """Test that spawns are queued and admitted by the controller."""
+
+    def test_in_flight_cap_queues_spawns(self, tmp_path):
+        """Beyond the cap, agents wait and start as others exit."""
+        supervisor = Supervisor(tmp_path, AdmissionController(rate=0, max_in_flight=1))
+        supervisor.spawn("developer", "DEV-1", fake("build sleep=0.3"))
+        queued = supervisor.spawn("tester", "TEST-1", fake("test"))
+        assert queued["status"] == "queued" and queued["pid"] is None
+        wait_for(lambda: supervisor.status("TEST-1")["status"] == "exited")
+        assert supervisor.status("TEST-1")["queue_wait"] >= 0.2
+        metrics = supervisor.metrics()
+        assert metrics["admitted"] == 2 and metrics["queued"] == 0
+        assert metrics["held_back"]["in_flight"] >= 1
+
+    def test_rate_limit_paces_launches(self, tmp_path):
+        """A burst of spawns starts at the configured rate, not all at once."""
+        supervisor = Supervisor(tmp_path, AdmissionController(rate=20, burst=1))
+        for n in range(4):
+            supervisor.spawn("developer", f"DEV-{n}", fake("build"))
+        wait_for(lambda: supervisor.metrics()["admitted"] == 4)
+        starts = sorted(info["started"] for info in supervisor.list())
+        assert starts[-1] - starts[0] >= 0.1
+        assert supervisor.metrics()["wait_max"] >= 0.1
+
+    def test_cancel_queued_task(self, tmp_path):
+        """A queued task can be cancelled before it ever starts."""
+        supervisor = Supervisor(tmp_path, AdmissionController(rate=0, max_in_flight=1))
+        supervisor.spawn("developer", "DEV-1", fake("build sleep=30"))
+        supervisor.spawn("tester", "TEST-1", fake("test"))
+        assert supervisor.cancel("TEST-1")["status"] == "cancelled"
+        assert supervisor.metrics()["queued"] == 0
+        supervisor.cancel_all()
+        assert supervisor.status("TEST-1")["pid"] is None
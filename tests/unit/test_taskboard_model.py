@@ -0,0 +1,92 @@
+"""
+Tests for the structured taskboard model.
+"""
+
+import pytest
+
+from src.models.taskboard import Section, Task, parse
+from tests.conftest import SAMPLE_TASKBOARD
+
+IRREGULAR_TASK = """## Backlog
+
+### Medium Priority (P2)
+### [DEV-009] Odd layout
+- **Status**: Ready for QA
+- **Priority**: P2
+  Notes indented under the fields
+- **Reviewer**: @reviewer
+
+### Low Priority (P3)
+_No low priority tasks_
+"""
+
+
+class TestTaskboardParsing:
+    """Test parsing and byte-exact serialization."""
+
+    def test_round_trip_is_byte_exact(self):
+        """An untouched board serializes to the original text."""
+        assert parse(SAMPLE_TASKBOARD).serialize() == SAMPLE_TASKBOARD
+
+    def test_non_canonical_layout_is_preserved(self):
+        """Field order and unknown lines survive a round trip."""
+        board = parse(IRREGULAR_TASK)
+        task = board.task("DEV-009")
+        assert task.status == "Ready for QA"
+        assert task.extra == (
+            "  Notes indented under the fields",
+            "- **Reviewer**: @reviewer",
+        )
+        assert board.serialize() == IRREGULAR_TASK
+
+    def test_incremental_feed(self):
+        """Feeding arbitrary chunks gives the same board as one string."""
+        chunks = [
+            SAMPLE_TASKBOARD[i : i + 7] for i in range(0, len(SAMPLE_TASKBOARD), 7)
+        ]
+        board = parse(chunks)
+        assert board.serialize() == SAMPLE_TASKBOARD
+        assert board.task("DEV-001").assigned == "@developer"
+
+    def test_sections_and_index(self):
+        """Tasks are indexed by ID alongside their section."""
+        board = parse(SAMPLE_TASKBOARD)
+        assert len(board) == 1
+        assert "DEV-001" in board
+        assert board.section_of("DEV-001").title == "Medium Priority (P2)"
+        assert board.section("Review").placeholder == "_No tasks currently in review_"
+
+
+class TestTaskboardEdits:
+    """Test edits made through the object model."""
+
+    def test_move_swaps_placeholders(self):
+        """Moving the last task out of a section restores its placeholder."""
+        board = parse(SAMPLE_TASKBOARD)
+        task = board.move("DEV-001", "In Progress")
+        task.status = "In Progress"
+        text = board.serialize()
+        assert "### In Progress\n### [DEV-001] Set up project structure\n" in text
+        assert "_No tasks currently in progress_" not in text
+        assert "### Medium Priority (P2)\n_No medium priority tasks_\n\n### Low" in text
+        assert "- **Status**: In Progress" in text
+
+    def test_add_and_remove_restore_original(self):
+        """Adding then removing a task leaves the document unchanged."""
+        board = parse(SAMPLE_TASKBOARD)
+        board.add(Task("ARCH-001", "Design", "P1", "@architect"), "High Priority (P1)")
+        assert board.section("High Priority (P1)").tasks()[0].task_id == "ARCH-001"
+        board.remove("ARCH-001")
+        assert board.serialize() == SAMPLE_TASKBOARD
+
+    def test_add_creates_missing_section(self):
+        """Adding to an unknown section appends it to the board."""
+        board = parse(SAMPLE_TASKBOARD)
+        board.add(Task("OPS-001", "Rotate keys"), "Blocked")
+        assert board.serialize().endswith("\n### Blocked\n### [OPS-001] Rotate keys\n")
+
+    def test_records_use_slots(self):
+        """Task and section records carry no per-instance dict."""
+        with pytest.raises(AttributeError):
+            Task("X-1").notes = "nope"
+        assert not hasattr(Section("### Review"), "__dict__")
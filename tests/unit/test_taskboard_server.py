@@ -0,0 +1,197 @@
+"""
+Tests for the resident taskboard server and its client.
+"""
+
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services.taskboard_server import TaskboardClient, TaskboardServer
+from src.services.taskboard_store import TaskboardError, TaskboardStore
+
+
+@pytest.fixture
+def socket_path():
+    """A short socket path (AF_UNIX paths are limited to ~100 bytes)."""
+    directory = tempfile.mkdtemp(prefix="tb-")
+    yield Path(directory) / "taskboard.sock"
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def server(taskboard_path, socket_path):
+    """A taskboard server running in a background thread."""
+    store = TaskboardStore(taskboard_path)
+    server = TaskboardServer(socket_path, store, flush_interval=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    store.close()
+
+
+class TestTaskboardServer:
+    """Test the socket API and asynchronous flushing."""
+
+    def test_client_round_trip(self, server, socket_path):
+        """Mutations and lookups go through the socket."""
+        with TaskboardClient.connect(socket_path) as client:
+            task = client.add_task("architect", "ARCH-001", "Design auth", "P1")
+            assert task["section"] == "High Priority (P1)"
+            assert client.move_task("ARCH-001", "Review")["status"] == "Review"
+            assert client.get("ARCH-001")["section"] == "Review"
+            assert "### [ARCH-001] Design auth" in client.render_text()
+            assert [t["task_id"] for t in client.query(status="Review")] == ["ARCH-001"]
+
+    def test_errors_are_returned(self, server, socket_path):
+        """Store errors come back as TaskboardError on the client."""
+        with TaskboardClient.connect(socket_path) as client:
+            with pytest.raises(TaskboardError, match="not found"):
+                client.move_task("NOPE-1", "Review")
+            with pytest.raises(TaskboardError, match="Unknown action"):
+                client.call("explode")
+
+    def test_storage_errors_are_returned(self, server, socket_path, monkeypatch):
+        """Unexpected store failures are answered, not a dropped connection."""
+
+        def locked():
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(server.store, "compact", locked)
+        with TaskboardClient.connect(socket_path) as client:
+            with pytest.raises(TaskboardError, match="database is locked"):
+                client.compact()
+            assert client.call("ping")["ok"]
+
+    def test_view_is_flushed_asynchronously(self, server, socket_path, taskboard_path):
+        """The server writes taskboard.md on its own after a mutation."""
+        with TaskboardClient.connect(socket_path) as client:
+            client.add_task("tester", "TEST-001", "Write tests", "P3")
+        deadline = time.monotonic() + 5
+        while "TEST-001" not in taskboard_path.read_text():
+            assert time.monotonic() < deadline, "view was never flushed"
+            time.sleep(0.02)
+
+    def test_failed_flush_is_retried(
+        self, server, socket_path, taskboard_path, monkeypatch, capsys
+    ):
+        """A render that fails once does not stop the background flushes."""
+        render = server.store.render
+        failures = []
+
+        def flaky(force=False):
+            if not failures:
+                failures.append(force)
+                raise OSError("No space left on device")
+            return render(force)
+
+        monkeypatch.setattr(server.store, "render", flaky)
+        with TaskboardClient.connect(socket_path) as client:
+            client.add_task("tester", "TEST-002", "Write more tests", "P3")
+        deadline = time.monotonic() + 5
+        while "TEST-002" not in taskboard_path.read_text():
+            assert time.monotonic() < deadline, "flushing stopped after a failure"
+            time.sleep(0.05)
+        assert failures
+        assert "No space left on device" in capsys.readouterr().err
+
+    def test_socket_is_private(self, server, socket_path):
+        """Only the owner may connect to the server."""
+        assert socket_path.stat().st_mode & 0o777 == 0o600
+
+    def test_concurrent_clients(self, server, socket_path):
+        """Many clients can update the board at the same time."""
+
+        def worker(n):
+            with TaskboardClient.connect(socket_path) as client:
+                client.add_task("developer", f"DEV-{100 + n}", f"Task {n}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert server.store.count() == 51
+
+    def test_batch_over_socket(self, server, socket_path):
+        """Batches are applied server side and report each operation."""
+        with TaskboardClient(socket_path) as client:
+            results = client.batch(
+                [
+                    {
+                        "action": "add",
+                        "agent": "ops",
+                        "task_id": "OPS-1",
+                        "description": "x",
+                    },
+                    {"action": "move", "task_id": "OPS-1", "section": "Testing"},
+                    {"action": "nope", "task_id": "OPS-1"},
+                ]
+            )
+            assert [r["ok"] for r in results] == [True, True, False]
+            assert client.get("OPS-1")["status"] == "Testing"
+
+    def test_connect_without_server(self, socket_path):
+        """No server means no client, so callers fall back to direct mode."""
+        assert TaskboardClient.connect(socket_path) is None
+
+
+class TestHelperUsesServer:
+    """taskboard-helper.py prefers the server when one is running."""
+
+    def test_helper_routes_through_socket(self, server, socket_path, taskboard_path):
+        helper = Path(__file__).parent.parent.parent / "scripts" / "taskboard-helper.py"
+        result = subprocess.run(
+            [sys.executable, str(helper), "add", "ux", "UX-001", "P2", "Sketch"],
+            cwd=taskboard_path.parent.parent.parent,
+            env={"TASKBOARD_SOCKET": str(socket_path), "PATH": "/usr/bin:/bin"},
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert server.store.get("UX-001")["assigned"] == "@ux"
+
+
+class TestServerLifecycle:
+    """Starting and stopping the detached server from the command line."""
+
+    def test_start_from_another_directory(self, tmp_path, taskboard_path, socket_path):
+        """``start`` works outside the repository and serves the given board."""
+        root = Path(__file__).parent.parent.parent
+
+        def run(command):
+            return subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "src.services.taskboard_server",
+                    command,
+                    "--socket",
+                    str(socket_path),
+                    "--taskboard",
+                    str(taskboard_path),
+                    "--idle-timeout",
+                    "30",
+                ],
+                cwd=tmp_path,
+                env={"PYTHONPATH": str(root), "PATH": "/usr/bin:/bin"},
+                capture_output=True,
+                text=True,
+            )
+
+        started = run("start")
+        try:
+            assert started.returncode == 0, started.stdout + started.stderr
+            with TaskboardClient.connect(socket_path) as client:
+                assert client.get("DEV-001")["section"] == "Medium Priority (P2)"
+        finally:
+            run("stop")
+        assert not socket_path.exists()
@@ -0,0 +1,406 @@
+"""
+Tests for the indexed taskboard store.
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.models.taskboard import Task
+from src.services.taskboard_store import PROBE_LIMIT, TaskboardError, TaskboardStore
+from tests.conftest import SAMPLE_TASKBOARD
+
+
+class TestTaskboardStore:
+    """Test store mutations and the rendered markdown view."""
+
+    def test_import_round_trips_untouched_board(self, taskboard_path):
+        """An imported board renders back to the same document."""
+        with TaskboardStore(taskboard_path) as store:
+            assert store.count() == 1
+            assert store.render_text() == SAMPLE_TASKBOARD
+
+    def test_add_task_uses_priority_section(self, taskboard_path):
+        """New tasks land at the top of their priority section."""
+        with TaskboardStore(taskboard_path, render_interval=0) as store:
+            task = store.add_task("architect", "ARCH-001", "Design auth", "P1")
+            assert task["section"] == "High Priority (P1)"
+            assert task["assigned"] == "@architect"
+            assert task["status"] == "Backlog"
+            store.add_task("developer", "DEV-002", "Build API", "P2")
+            ids = [t["task_id"] for t in store.tasks("Medium Priority (P2)")]
+            assert ids == ["DEV-002", "DEV-001"]
+
+    def test_move_task_updates_status(self, taskboard_path):
+        """Moving a task updates its section and multi-word status."""
+        with TaskboardStore(taskboard_path) as store:
+            task = store.move_task("DEV-001", "In Progress")
+            assert task["section"] == "In Progress"
+            assert task["status"] == "In Progress"
+            assert store.move_task("DEV-001", "Recent Completions")["status"] == "Done"
+
+    def test_unknown_and_duplicate_tasks_rejected(self, taskboard_path):
+        """Bad task IDs raise instead of silently corrupting the board."""
+        with TaskboardStore(taskboard_path) as store:
+            with pytest.raises(TaskboardError):
+                store.move_task("NOPE-1", "Review")
+            with pytest.raises(TaskboardError):
+                store.add_task("developer", "DEV-001", "Duplicate")
+
+    def test_render_is_lazy(self, taskboard_path):
+        """Mutations leave the view stale until it is rendered."""
+        with TaskboardStore(taskboard_path) as store:
+            store.move_task("DEV-001", "Review")
+            assert store.is_stale()
+            assert "_No tasks currently in review_" in taskboard_path.read_text()
+            assert store.render()
+            assert not store.is_stale()
+            content = taskboard_path.read_text()
+            assert "### Review\n### [DEV-001] Set up project structure" in content
+            assert "_No medium priority tasks_" in content
+            assert not store.render()
+
+    def test_render_keeps_file_permissions(self, taskboard_path):
+        """The rendered view keeps the board's mode, or a readable default."""
+        taskboard_path.chmod(0o644)
+        with TaskboardStore(taskboard_path) as store:
+            store.move_task("DEV-001", "Review")
+            store.render()
+            assert taskboard_path.stat().st_mode & 0o777 == 0o644
+
+            taskboard_path.unlink()
+            umask = os.umask(0)
+            os.umask(umask)
+            store.render(force=True)
+            assert taskboard_path.stat().st_mode & 0o777 == 0o666 & ~umask
+
+    def test_batch_applies_in_one_commit(self, taskboard_path):
+        """A batch is one transaction with per-operation results."""
+        operations = [
+            {"action": "add", "agent": "qa", "task_id": f"QA-{n}", "description": "x"}
+            for n in range(50)
+        ]
+        operations += [
+            {"action": "move", "task_id": "QA-0", "section": "In Progress"},
+            {"action": "move", "task_id": "NOPE-1", "section": "Review"},
+            {"action": "add", "task_id": "QA-99"},
+        ]
+        with TaskboardStore(taskboard_path) as store:
+            results = store.batch(operations)
+            assert store.commits == 1
+            assert [r["ok"] for r in results] == [True] * 51 + [False, False]
+            assert results[-2]["error"] == "Task NOPE-1 not found"
+            assert store.count() == 51
+            assert store.get("QA-0")["status"] == "In Progress"
+
+    def test_hand_edits_are_reimported(self, taskboard_path):
+        """Edits made to taskboard.md are merged with unrendered updates."""
+        with TaskboardStore(taskboard_path) as store:
+            store.render()
+            store.add_task("tester", "TEST-001", "Write tests", "P3")
+        taskboard_path.write_text(
+            taskboard_path.read_text().replace(
+                "Set up project structure", "Scaffold repo"
+            )
+        )
+        with TaskboardStore(taskboard_path) as store:
+            assert store.get("DEV-001")["title"] == "Scaffold repo"
+            assert store.get("TEST-001")["section"] == "Low Priority (P3)"
+
+    def test_hand_edited_layout_survives_a_move(self, taskboard_path):
+        """A block written in its own field order keeps it when the task moves."""
+        taskboard_path.write_text(
+            taskboard_path.read_text().replace(
+                "- **Priority**: P2\n- **Assigned**: @developer\n"
+                "- **Created**: 2025-01-01\n- **Updated**: 2025-01-01\n"
+                "- **Status**: Backlog\n",
+                "- **Assigned**: @developer\n- Notes: pairs with @tester\n"
+                "- **Priority**: P2\n",
+            )
+        )
+        with TaskboardStore(taskboard_path) as store:
+            updated = store.move_task("DEV-001", "Review")["updated"]
+            store.render()
+        block = taskboard_path.read_text().split("### [DEV-001] ")[1].split("\n\n")[0]
+        assert block.splitlines()[1:] == [
+            "- **Assigned**: @developer",
+            "- Notes: pairs with @tester",
+            "- **Priority**: P2",
+            f"- **Updated**: {updated}",
+            "- **Status**: Review",
+        ]
+
+    def test_duplicate_ids_in_hand_edits_are_reported(self, taskboard_path):
+        """A hand edit that repeats a task ID is rejected, not half imported."""
+        text = taskboard_path.read_text()
+        block = text[text.index("### [DEV-001]") :].split("\n\n")[0]
+        taskboard_path.write_text(text.replace(block, f"{block}\n\n{block}"))
+        with pytest.raises(TaskboardError, match="more than once: DEV-001"):
+            TaskboardStore(taskboard_path)
+
+    def test_render_splices_stored_blocks(self, taskboard_path, monkeypatch):
+        """Writing the view re-renders only the tasks that changed."""
+        with TaskboardStore(taskboard_path) as store:
+            for n in range(20):
+                store.add_task("developer", f"DEV-1{n:02d}", f"Task {n}")
+            store.render()
+            rendered = []
+            original = Task.lines
+            monkeypatch.setattr(
+                Task,
+                "lines",
+                lambda task: rendered.append(task.task_id) or original(task),
+            )
+            store.move_task("DEV-105", "Review")
+            store.render()
+        assert rendered == ["DEV-105"]
+        assert "### Review\n### [DEV-105] Task 5" in taskboard_path.read_text()
+
+    def test_database_from_before_blocks_is_upgraded(self, taskboard_path):
+        """Rows stored without a rendered block get one when the store opens."""
+        TaskboardStore(taskboard_path).close()
+        conn = sqlite3.connect(taskboard_path.with_suffix(".db"))
+        conn.execute("ALTER TABLE tasks DROP COLUMN block")
+        conn.execute("ALTER TABLE tasks DROP COLUMN layout")
+        conn.close()
+        with TaskboardStore(taskboard_path) as store:
+            assert store.render_text() == SAMPLE_TASKBOARD
+
+
+class TestTaskboardArchive:
+    """Test compaction of Recent Completions into the archive."""
+
+    def complete(self, store, count):
+        for n in range(count):
+            store.add_task("developer", f"DEV-{n + 100}", f"Task {n}")
+            store.move_task(f"DEV-{n + 100}", "Recent Completions")
+
+    def test_completions_stay_bounded(self, taskboard_path):
+        """Completions beyond the limit move to the archive, newest stay live."""
+        with TaskboardStore(taskboard_path, keep_completed=3) as store:
+            self.complete(store, 5)
+            live = [t["task_id"] for t in store.tasks("Recent Completions")]
+            assert live == ["DEV-104", "DEV-103", "DEV-102"]
+            assert sum(store.archive_counts().values()) == 2
+            assert store.get("DEV-100") is None
+            store.render(force=True)
+        content = taskboard_path.read_text()
+        assert "DEV-102" in content and "DEV-100" not in content
+
+    def test_archived_tasks_found_by_id(self, taskboard_path):
+        """Archived tasks are still looked up, and their IDs stay taken."""
+        with TaskboardStore(taskboard_path, keep_completed=1) as store:
+            self.complete(store, 2)
+            task = store.find("DEV-100")
+            assert task["status"] == "Done" and task["title"] == "Task 0"
+            assert store.archive.path(task["partition"]).exists()
+            assert store.find("DEV-101")["section"] == "Recent Completions"
+            assert store.find("NOPE-1") is None
+            with pytest.raises(TaskboardError, match="archived"):
+                store.add_task("developer", "DEV-100", "Again")
+            with pytest.raises(TaskboardError, match="archived"):
+                store.move_task("DEV-100", "Review")
+
+    def test_old_completions_archived_by_date(self, taskboard_path):
+        """Completions older than the age limit go to their month's file."""
+        old = SAMPLE_TASKBOARD.replace(
+            "### Recent Completions\n_No recently completed tasks_",
+            "### Recent Completions\n### [OLD-1] Shipped long ago\n"
+            "- **Updated**: 2025-01-15\n- **Status**: Done",
+        )
+        taskboard_path.write_text(old)
+        with TaskboardStore(taskboard_path, archive_days=30) as store:
+            assert store.compact() == 1
+            assert store.archive.partitions() == ["2025-01"]
+            assert store.find("OLD-1")["updated"] == "2025-01-15"
+        assert "OLD-1" not in taskboard_path.read_text()
+
+    def test_index_rebuilt_from_archive_files(self, taskboard_path):
+        """A store opened without its database re-indexes the archive."""
+        with TaskboardStore(taskboard_path, keep_completed=1) as store:
+            self.complete(store, 3)
+            store.render(force=True)
+            db_path = store.db_path
+        db_path.unlink()
+        with TaskboardStore(taskboard_path) as store:
+            assert store.find("DEV-100")["title"] == "Task 0"
+            assert store.rebuild_archive_index() == 2
+
+
+class TestTaskboardQuery:
+    """Test indexed queries by assignee, status, priority and age."""
+
+    @pytest.fixture
+    def store(self, taskboard_path):
+        with TaskboardStore(taskboard_path) as store:
+            store.add_task("architect", "ARCH-001", "Design auth", "P1")
+            store.add_task("developer", "DEV-002", "Build API", "P1")
+            store.add_task("developer", "DEV-003", "Fix login", "P2")
+            store.move_task("DEV-002", "Review")
+            store.move_task("ARCH-001", "Review")
+            yield store
+
+    def ids(self, tasks):
+        return sorted(task["task_id"] for task in tasks)
+
+    def test_filters_combine(self, store):
+        """Every filter must match; lists are alternatives."""
+        assert self.ids(store.query(assigned="developer")) == [
+            "DEV-001",
+            "DEV-002",
+            "DEV-003",
+        ]
+        assert self.ids(store.query(priority="P1", status="Review")) == [
+            "ARCH-001",
+            "DEV-002",
+        ]
+        assert self.ids(store.query(assigned="@architect", section="Review")) == [
+            "ARCH-001"
+        ]
+        assert self.ids(store.query(status=["Backlog"], priority=["P1", "P3"])) == []
+        assert len(store.query(limit=2)) == 2
+
+    def test_stale_tasks(self, store):
+        """Tasks not updated within the window are stale."""
+        assert self.ids(store.query(stale_days=7)) == ["DEV-001"]
+        assert self.ids(store.query(updated_before="2025-01-01")) == []
+        assert store.query(stale_days=7, assigned="architect") == []
+
+    def test_queries_use_the_selective_index(self, store):
+        """A filter matching few rows drives the query, not a broad one."""
+        store.batch(
+            [
+                {
+                    "action": "add",
+                    "agent": "developer",
+                    "task_id": f"GEN-{n}",
+                    "description": "Generated",
+                    "priority": "P2",
+                }
+                for n in range(PROBE_LIMIT + 10)
+            ]
+        )
+        filters = [
+            ("tasks_by_priority", "priority IN (?)", ["P2"]),
+            ("tasks_by_status", "status IN (?)", ["Review"]),
+        ]
+        assert min(filters, key=store._probe)[0] == "tasks_by_status"
+        assert self.ids(store.query(priority="P1", status="Review")) == [
+            "ARCH-001",
+            "DEV-002",
+        ]
+
+
+class TestTaskboardHelperCli:
+    """Test the taskboard-helper.py command line."""
+
+    def test_add_start_complete(self, taskboard_path):
+        """The helper drives the store and renders on demand."""
+        helper = Path(__file__).parent.parent.parent / "scripts" / "taskboard-helper.py"
+        cwd = taskboard_path.parent.parent.parent
+
+        def run(*args):
+            return subprocess.run(
+                [sys.executable, str(helper), *args],
+                cwd=cwd,
+                capture_output=True,
+                text=True,
+            )
+
+        assert (
+            run("add", "architect", "ARCH-001", "P1", "Design", "auth").returncode == 0
+        )
+        assert run("start", "ARCH-001").returncode == 0
+        assert run("complete", "ARCH-001").returncode == 0
+        assert run("complete", "MISSING-1").returncode == 1
+
+        # Each call leaves the view current, however quickly they follow
+        content = taskboard_path.read_text()
+        completions = content.split("### Recent Completions")[1].split("## Backlog")[0]
+        assert "### [ARCH-001] Design auth" in completions
+        assert "- **Status**: Done" in completions
+        assert "_No high priority tasks_" in content
+        assert run("render").returncode == 0
+
+    def test_batch_from_stdin(self, taskboard_path):
+        """Batch mode reads helper commands and JSON lines with one write."""
+        helper = Path(__file__).parent.parent.parent / "scripts" / "taskboard-helper.py"
+        script = "\n".join(
+            [
+                "# setup",
+                "add tester TEST-001 P3 Write 'edge' tests",
+                "start TEST-001",
+                '{"action": "complete", "task_id": "DEV-001"}',
+                "review MISSING-1",
+            ]
+        )
+        result = subprocess.run(
+            [sys.executable, str(helper), "batch"],
+            cwd=taskboard_path.parent.parent.parent,
+            input=script,
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 1
+        assert "📦 Applied 3/4 operations" in result.stdout
+        assert "❌ Task MISSING-1 not found" in result.stdout
+
+        content = taskboard_path.read_text()
+        assert "### In Progress\n### [TEST-001] Write 'edge' tests" in content
+        assert "### Recent Completions\n### [DEV-001]" in content
+
+    def test_compact_and_find(self, taskboard_path):
+        """``compact`` archives old completions and ``find`` still shows them."""
+        helper = Path(__file__).parent.parent.parent / "scripts" / "taskboard-helper.py"
+        taskboard_path.write_text(
+            SAMPLE_TASKBOARD.replace(
+                "### Recent Completions\n_No recently completed tasks_",
+                "### Recent Completions\n### [OLD-1] Shipped long ago\n"
+                "- **Updated**: 2025-01-15\n- **Status**: Done",
+            )
+        )
+
+        def run(*args):
+            return subprocess.run(
+                [sys.executable, str(helper), *args],
+                cwd=taskboard_path.parent.parent.parent,
+                capture_output=True,
+                text=True,
+            )
+
+        assert "Archived 1 completed task(s)" in run("compact").stdout
+        found = run("find", "OLD-1")
+        assert found.returncode == 0
+        assert "(archived" in found.stdout and "to 2025-01)" in found.stdout
+        assert run("find", "MISSING-1").returncode == 1
+
+    def test_query_table_and_json(self, taskboard_path):
+        """``query`` prints matching tasks as a table or JSON lines."""
+        helper = Path(__file__).parent.parent.parent / "scripts" / "taskboard-helper.py"
+
+        def run(*args):
+            return subprocess.run(
+                [sys.executable, str(helper), "query", *args],
+                cwd=taskboard_path.parent.parent.parent,
+                capture_output=True,
+                text=True,
+            )
+
+        table = run("--agent", "developer", "--priority", "P2").stdout
+        assert table.splitlines()[0].split() == [
+            "ID",
+            "PRIORITY",
+            "STATUS",
+            "ASSIGNED",
+            "UPDATED",
+            "TITLE",
+        ]
+        assert "DEV-001" in table and "🔎 1 task(s)" in table
+        (line,) = run("--status", "Backlog", "--json").stdout.splitlines()
+        assert json.loads(line)["task_id"] == "DEV-001"
+        assert run("--agent", "tester").stdout.strip().endswith("🔎 0 task(s)")
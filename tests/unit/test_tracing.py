@@ -0,0 +1,133 @@
+"""
+Tests for the tracing layer and its bash shim.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.services.gate_cache import run_gate
+from src.services.taskboard_store import TaskboardStore
+from src.utils import tracing
+
+ROOT = Path(__file__).parent.parent.parent
+SHIM = ROOT / "scripts" / "lib" / "trace.sh"
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    """Trace into a scratch file for the duration of a test."""
+    path = tmp_path / "trace.json"
+    tracing.configure(str(path))
+    yield path
+    tracing.configure(None)
+
+
+def spans(path):
+    return [e for e in tracing.read_events(path) if e["ph"] == "X"]
+
+
+class TestTracing:
+    """Test spans, the trace file format and the command line shim."""
+
+    def test_disabled_is_a_shared_no_op(self, tmp_path):
+        """With tracing off no span object is built and nothing is written."""
+        tracing.configure(None)
+        with tracing.span("anything", "test", size=1) as span:
+            span.set(ok=True)
+        assert span is tracing.NULL_SPAN
+        assert not tracing.enabled()
+
+    def test_span_records_complete_event(self, trace_file):
+        """A span becomes one complete event with its arguments."""
+        with tracing.span("work", "test", size=3) as span:
+            span.set(ok=True)
+        with pytest.raises(ValueError):
+            with tracing.span("broken", "test"):
+                raise ValueError("boom")
+        work, broken = spans(trace_file)
+        assert work["name"] == "work" and work["cat"] == "test"
+        assert work["args"] == {"size": 3, "ok": True}
+        assert work["pid"] == os.getpid() and work["dur"] >= 0
+        assert broken["args"] == {"error": "ValueError"}
+
+    def test_file_is_a_valid_chrome_trace(self, trace_file):
+        """Closing the unterminated array yields plain JSON."""
+        tracing.complete("done", 1_000, 3_000, "test", tid=7)
+        text = trace_file.read_text()
+        events = json.loads(text.rstrip().rstrip(",") + "]")
+        assert events[0]["ph"] == "M"  # process name
+        assert events[1]["dur"] == 2_000 and events[1]["tid"] == 7
+
+    def test_concurrent_writers_keep_lines_whole(self, trace_file):
+        """Spans written from many threads all parse."""
+
+        def work(n):
+            for i in range(50):
+                with tracing.span(f"thread {n}", "test", i=i):
+                    pass
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(spans(trace_file)) == 400
+
+    def test_hot_paths_are_traced(self, trace_file, taskboard_path):
+        """Gates and taskboard commits, lock waits and renders emit spans."""
+        run_gate("Lint", "true")
+        with TaskboardStore(taskboard_path) as store:
+            store.add_task("developer", "DEV-100", "Traced task", "P1")
+            store.render(force=True)
+        names = {event["name"] for event in spans(trace_file)}
+        assert {"gate Lint", "taskboard lock wait", "taskboard commit"} <= names
+        assert "taskboard render" in names
+
+    def test_summary_orders_by_total_time(self, trace_file):
+        """The summary aggregates spans by name, slowest first."""
+        tracing.complete("fast", 0, 1_000, "test")
+        tracing.complete("slow", 0, 5_000, "test")
+        tracing.complete("fast", 0, 1_000, "test")
+        rows = tracing.summarize(tracing.read_events(trace_file))
+        assert [row["name"] for row in rows] == ["slow", "fast"]
+        assert rows[1]["count"] == 2 and rows[1]["total"] == pytest.approx(0.002)
+
+    def test_bash_shim(self, tmp_path):
+        """The shim records spans from a script, and is silent when disabled."""
+        script = f'. "{SHIM}"; trace_run "sleepy" test sleep 0.01; echo status=$?'
+        env = dict(os.environ, AGENT_TRACE="trace.json")
+        result = subprocess.run(
+            ["bash", "-c", script],
+            cwd=tmp_path,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        assert "status=0" in result.stdout
+        (event,) = spans(tmp_path / "trace.json")
+        assert event["name"] == "sleepy" and event["args"] == {"exit_code": 0}
+        assert event["dur"] >= 10_000
+
+        env.pop("AGENT_TRACE")
+        subprocess.run(["bash", "-c", script], cwd=tmp_path, env=env, check=True)
+        assert len(spans(tmp_path / "trace.json")) == 1
+
+    def test_record_command(self, tmp_path):
+        """``record`` files a finished span under the caller's process."""
+        trace = tmp_path / "trace.json"
+        subprocess.run(
+            [sys.executable, "-m", "src.utils.tracing", "--file", str(trace)]
+            + ["record", "review", "--start", "100", "--end", "600", "--pid", "42"]
+            + ["--arg", "result=passed", "--arg", "issues=0"],
+            cwd=ROOT,
+            check=True,
+        )
+        (event,) = spans(trace)
+        assert event["pid"] == 42 and event["dur"] == 500
+        assert event["args"] == {"result": "passed", "issues": 0}
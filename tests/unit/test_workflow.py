@@ -0,0 +1,146 @@
+"""
+Tests for the DAG workflow engine.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services.scheduler import AgentTask, Scheduler
+from src.services.workflow import (
+    WORKFLOW_DIR,
+    Step,
+    Workflow,
+    WorkflowEngine,
+    WorkflowError,
+    load_workflow,
+)
+
+FAKE_AGENT = Path(__file__).parent.parent / "stubs" / "fake_agent.py"
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """A quiet engine that runs steps with the fake agent."""
+    monkeypatch.setenv("CLAUDE_CMD", f"{sys.executable} {FAKE_AGENT}")
+    scheduler = Scheduler(max_workers=4, log_dir=tmp_path)
+    return WorkflowEngine(max_parallel=4, scheduler=scheduler, verbose=False)
+
+
+def diamond(b_prompt="b {target}"):
+    """design -> (build, docs) -> review."""
+    return Workflow(
+        "diamond",
+        [
+            Step("design", "architect", "design {target}"),
+            Step("build", "developer", b_prompt, needs=["design"]),
+            Step("docs", "documentation", "docs {target}", needs=["design"]),
+            Step("review", "reviewer", "review {target}", needs=["build", "docs"]),
+        ],
+    )
+
+
+class TestWorkflowDefinition:
+    """Test graph validation and the built-in definitions."""
+
+    def test_invalid_graphs_rejected(self):
+        """Unknown dependencies, duplicate IDs and cycles are errors."""
+        with pytest.raises(WorkflowError, match="unknown step"):
+            Workflow("w", [Step("a", "x", "p", needs=["nope"])])
+        with pytest.raises(WorkflowError, match="duplicate"):
+            Workflow("w", [Step("a", "x", "p"), Step("a", "x", "p")])
+        with pytest.raises(WorkflowError, match="cycle"):
+            Workflow(
+                "w",
+                [Step("a", "x", "p", needs=["b"]), Step("b", "x", "p", needs=["a"])],
+            )
+
+    def test_levels_group_independent_steps(self):
+        """Steps with satisfied dependencies share a wave."""
+        assert diamond().levels() == [["design"], ["build", "docs"], ["review"]]
+
+    @pytest.mark.parametrize(
+        "name", ["workflow", "ml-workflow", "deployment-workflow", "product-workflow"]
+    )
+    def test_builtin_workflows_load(self, name):
+        """Every built-in workflow is a valid DAG with some parallelism."""
+        workflow = load_workflow(name)
+        assert workflow.name == name
+        assert len(workflow.levels()) < len(workflow.steps)
+        assert (WORKFLOW_DIR / f"{name}.json").exists()
+
+    def test_step_prompt_loads_role(self):
+        """Step prompts load the agent role and substitute the target."""
+        task = Step("p", "product", "Define vision for {target}").task("Widget")
+        assert task.prompt == (
+            "You are the Product Manager Agent. First run /product to load your role."
+            " Define vision for Widget"
+        )
+
+
+class TestWorkflowEngine:
+    """Test parallel execution, failure propagation and critical paths."""
+
+    def test_independent_steps_overlap(self, engine):
+        """Wall-clock time tracks the critical path, not the sum of steps."""
+        start = time.monotonic()
+        run = engine.run(diamond(), "sleep=0.4")
+        elapsed = time.monotonic() - start
+        assert run.ok
+        assert elapsed < 0.4 * 4
+        path, length = run.critical_path()
+        assert path[0] == "design" and path[-1] == "review" and len(path) == 3
+        assert length <= elapsed
+
+    def test_failure_skips_dependents_only(self, engine):
+        """A failed step skips its dependents; other branches still run."""
+        run = engine.run(diamond(b_prompt="build exit=2"), "x")
+        status = {step_id: o.status for step_id, o in run.outcomes.items()}
+        assert status == {
+            "design": "passed",
+            "build": "failed",
+            "docs": "passed",
+            "review": "skipped",
+        }
+        assert run.outcomes["review"].blocked_by == "build"
+        assert not run.ok
+
+    def test_failed_gate_stops_the_run(self, engine):
+        """A failed gate skips every step not yet started, on any branch."""
+        workflow = Workflow(
+            "gated",
+            [
+                Step("design", "architect", "design"),
+                Step("check", "reviewer", "check exit=1", needs=["design"], gate=True),
+                Step("build", "developer", "build sleep=0.5", needs=["design"]),
+                Step("docs", "documentation", "docs", needs=["build"]),
+            ],
+        )
+        run = engine.run(workflow)
+        status = {step_id: o.status for step_id, o in run.outcomes.items()}
+        assert status == {
+            "design": "passed",
+            "check": "failed",
+            "build": "passed",
+            "docs": "skipped",
+        }
+        assert run.outcomes["docs"].blocked_by == "check"
+        assert run.failed_gates == ["check"]
+
+    def test_sequence_is_linear(self, engine):
+        """A sequence stops at the first failure."""
+        workflow = Workflow.sequence(
+            [
+                AgentTask("a", "one"),
+                AgentTask("b", "two exit=1"),
+                AgentTask("c", "three"),
+            ]
+        )
+        run = engine.run(workflow)
+        assert [o.status for o in run.outcomes.values()] == [
+            "passed",
+            "failed",
+            "skipped",
+        ]